@@ -0,0 +1,365 @@
+"""
+Testy wydajności bazy danych: parsowanie, wstawianie, zapytania o różnej selektywności,
+aktualizacja, usuwanie oraz zapis i odczyt stanu.
+
+Uruchamianie (z katalogu PPYProject):
+
+    python -m benchmarks.benchmark --rows 100k --output results.json
+    python -m benchmarks.benchmark --rows 100k --baseline results.json --threshold 0.2
+
+Dane są generowane deterministycznie (--seed), więc wyniki kolejnych uruchomień można porównywać.
+Przy podanym --baseline program kończy się kodem 1, jeśli któryś test jest wolniejszy od wyniku
+bazowego o więcej niż --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+from time import perf_counter
+
+from database import DDL, Database, DataModificationLanguage, DataQueryLanguage
+from database.sql_parser import parse
+from state_management import StateManagement
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Schemat tabeli testowej (jak tabela students w main.py, z dodatkową kolumną FLOAT)
+SCHEMA = {'id': 'INTEGER', 'name': 'TEXT', 'age': 'INTEGER', 'score': 'FLOAT', 'enrollment_date': 'DATE'}
+
+# Udział wierszy zwracanych przez zapytania SELECT
+SELECTIVITIES = (0.001, 0.01, 0.1, 1.0)
+
+# Percentyle czasu pojedynczej operacji zapisywane w wynikach
+PERCENTILES = (50, 90, 99)
+
+_NAMES = ('John', 'Jane', 'Adam', 'Ewa', 'Piotr', 'Anna', 'Marek', 'Zofia')
+_SURNAMES = ('Doe', 'Smith', 'Nowak', 'Kowalski', 'Wiśniewska', 'Lewandowski')
+_FIRST_DATE = date(2015, 9, 1)
+
+
+def parse_count(text):
+    """
+    Zamienia liczbę wierszy z przyrostkiem k lub M (np. '10k', '1M') na liczbę całkowitą.
+
+    Parametry:
+    text (str): Liczba wierszy.
+
+    Zwraca:
+    int: Liczba wierszy.
+    """
+    multipliers = {'k': 1000, 'm': 1000000}
+    text = text.strip()
+    if text and text[-1].lower() in multipliers:
+        return int(float(text[:-1]) * multipliers[text[-1].lower()])
+    return int(text)
+
+
+def generate_rows(count, seed=0, start=0):
+    """
+    Generuje wiersze tabeli testowej.
+
+    Parametry:
+    count (int): Liczba wierszy.
+    seed (int): Ziarno generatora liczb losowych.
+    start (int): Identyfikator pierwszego wiersza.
+
+    Zwraca:
+    list: Krotki wartości w kolejności kolumn SCHEMA; score ma rozkład jednostajny na [0, 100).
+    """
+    generator = random.Random(seed)
+    return [(row_id, f"{generator.choice(_NAMES)} {generator.choice(_SURNAMES)}", generator.randint(18, 30),
+             generator.random() * 100, _FIRST_DATE + timedelta(days=generator.randrange(3650)))
+            for row_id in range(start, start + count)]
+
+
+def percentile(sorted_values, percent):
+    """
+    Zwraca percentyl (metoda najbliższej pozycji) posortowanej listy.
+
+    Parametry:
+    sorted_values (list): Posortowane wartości.
+    percent (float): Percentyl od 0 do 100.
+
+    Zwraca:
+    float: Wartość percentyla lub None dla pustej listy.
+    """
+    if not sorted_values:
+        return None
+    position = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[int(position)]
+
+
+def peak_rss_kb():
+    """
+    Zwraca największe dotychczasowe zużycie pamięci procesu.
+
+    Zwraca:
+    int: Szczytowy rozmiar zbioru roboczego w KB lub None, jeśli system go nie udostępnia.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # macOS podaje bajty
+
+
+def summarize(latencies, rows):
+    """
+    Podsumowuje czasy operacji jednego testu.
+
+    Parametry:
+    latencies (list): Czas każdej operacji w sekundach.
+    rows (int): Łączna liczba wierszy przetworzonych przez operacje.
+
+    Zwraca:
+    dict: Liczba operacji i wierszy, łączny czas, przepustowość (operacje i wiersze na sekundę),
+        percentyle i największy czas operacji w milisekundach oraz szczytowe zużycie pamięci.
+    """
+    total = sum(latencies)
+    ordered = sorted(latencies)
+    result = {'operations': len(latencies), 'rows': rows, 'seconds': total,
+              'operations_per_second': len(latencies) / total if total else None,
+              'rows_per_second': rows / total if total else None}
+    for percent in PERCENTILES:
+        result[f'p{percent}_ms'] = percentile(ordered, percent) * 1000 if ordered else None
+    result['max_ms'] = ordered[-1] * 1000 if ordered else None
+    result['peak_rss_kb'] = peak_rss_kb()
+    return result
+
+
+def timed(function, *args):
+    """
+    Wywołuje funkcję i mierzy czas jej wykonania.
+
+    Zwraca:
+    tuple: Czas w sekundach i wynik funkcji.
+    """
+    start = perf_counter()
+    result = function(*args)
+    return perf_counter() - start, result
+
+
+class BenchmarkSuite:
+    """
+    Zestaw testów wydajności wykonywanych na tabeli z danymi syntetycznymi.
+    """
+
+    def __init__(self, rows=10000, storage='list', repeat=5, seed=0, batch_size=10000, statements=1000):
+        """
+        Inicjalizuje zestaw testów.
+
+        Parametry:
+        rows (int): Liczba wierszy tabeli testowej.
+        storage (str): Sposób przechowywania kolumn: 'list' lub 'numpy'.
+        repeat (int): Liczba powtórzeń zapytań, aktualizacji, usuwania i zapisu stanu.
+        seed (int): Ziarno generatora danych.
+        batch_size (int): Liczba wierszy w jednej partii wstawiania hurtowego.
+        statements (int): Liczba pojedynczych instrukcji INSERT i parsowanych instrukcji.
+        """
+        self.rows = rows
+        self.storage = storage
+        self.repeat = repeat
+        self.seed = seed
+        self.batch_size = batch_size
+        self.statements = statements
+        self.db_instance = Database.get_instance()
+        self.results = {}
+
+    def run(self):
+        """
+        Wykonuje wszystkie testy na pustej bazie danych (tabele bazy są usuwane).
+
+        Zwraca:
+        dict: Parametry uruchomienia (meta), wyniki testów (benchmarks) i szczytowe zużycie pamięci.
+        """
+        self.db_instance.tables.clear()
+        self.db_instance.plan_cache.clear()
+        try:
+            self.bench_parse()
+            self.bench_insert_statements()
+            self.bench_bulk_insert()
+            self.bench_select()
+            self.bench_update()
+            self.bench_snapshot()
+            self.bench_delete()
+        finally:
+            self.db_instance.tables.clear()
+            self.db_instance.plan_cache.clear()
+        return {'meta': {'rows': self.rows, 'storage': self.storage, 'repeat': self.repeat, 'seed': self.seed,
+                         'python': platform.python_version(), 'platform': platform.platform()},
+                'benchmarks': self.results, 'peak_rss_kb': peak_rss_kb()}
+
+    def record(self, name, latencies, rows):
+        self.results[name] = summarize(latencies, rows)
+
+    def insert_text(self, row):
+        row_id, name, age, score, enrollment_date = row
+        return (f"INSERT INTO students_insert ({', '.join(SCHEMA)}) "
+                f"VALUES ({row_id}, '{name}', {age}, {score!r}, '{enrollment_date.isoformat()}')")
+
+    def bench_parse(self):
+        """
+        Mierzy parsowanie instrukcji SELECT, INSERT, UPDATE i DELETE (bez pamięci podręcznej planów).
+        """
+        rows = generate_rows(self.statements, self.seed + 1)
+        texts = [[self.insert_text(row),
+                  f"SELECT id, name FROM students WHERE score < {row[3]!r} AND age >= {row[2]}",
+                  f"UPDATE students SET age = age + 1 WHERE id = {row[0]}",
+                  f"DELETE FROM students WHERE enrollment_date < '{row[4].isoformat()}'"][i % 4]
+                 for i, row in enumerate(rows)]
+        self.record('parse', [timed(parse, text)[0] for text in texts], 0)
+
+    def bench_insert_statements(self):
+        """
+        Mierzy pojedyncze instrukcje INSERT wykonywane z tekstu.
+        """
+        DDL(self.db_instance).create_table('students_insert', SCHEMA, self.storage)
+        latencies = []
+        for row in generate_rows(self.statements, self.seed + 2):
+            dml = DataModificationLanguage(self.insert_text(row), self.db_instance)
+            latencies.append(timed(dml.read_instruction)[0])
+        self.record('insert_statement', latencies, len(latencies))
+        DDL(self.db_instance).drop_table('students_insert')
+
+    def bench_bulk_insert(self):
+        """
+        Mierzy wstawianie hurtowe (executemany) całej tabeli testowej w partiach po batch_size wierszy.
+        """
+        DDL(self.db_instance).create_table('students', SCHEMA, self.storage)
+        latencies = []
+        for start in range(0, self.rows, self.batch_size):
+            batch = generate_rows(min(self.batch_size, self.rows - start), self.seed + start, start)
+            latencies.append(timed(DataModificationLanguage.executemany, 'students', batch, None,
+                                   self.db_instance)[0])
+        self.record('insert_bulk', latencies, self.rows)
+
+    def bench_select(self):
+        """
+        Mierzy zapytania SELECT z warunkiem na kolumnie score o różnej selektywności.
+        """
+        generator = random.Random(self.seed + 3)
+        for selectivity in SELECTIVITIES:
+            latencies, returned = [], 0
+            for _ in range(self.repeat):
+                # Przedział score o szerokości selectivity * 100 w losowym miejscu zakresu [0, 100)
+                low = generator.random() * (1 - selectivity) * 100
+                query = DataQueryLanguage(f"SELECT id, name, age FROM students WHERE score >= {low!r} "
+                                          f"AND score < {low + selectivity * 100!r}", self.db_instance)
+                latency, result = timed(query.read_instruction)
+                latencies.append(latency)
+                returned += len(result)
+            self.record(f'select_{selectivity:g}', latencies, returned)
+
+    def bench_update(self):
+        """
+        Mierzy aktualizację 1% wierszy (zakres identyfikatorów) z wyrażeniem w SET.
+        """
+        generator = random.Random(self.seed + 4)
+        width = max(1, self.rows // 100)
+        latencies = []
+        for _ in range(self.repeat):
+            low = generator.randrange(max(1, self.rows - width))
+            dml = DataModificationLanguage(f"UPDATE students SET age = age + 1, score = score * 0.5 "
+                                           f"WHERE id >= {low} AND id < {low + width}", self.db_instance)
+            latencies.append(timed(dml.read_instruction)[0])
+        self.record('update', latencies, width * self.repeat)
+
+    def bench_delete(self):
+        """
+        Mierzy usuwanie kolejnych fragmentów po 1% wierszy (rozłączne zakresy identyfikatorów).
+        """
+        width = max(1, self.rows // 100)
+        latencies = []
+        for step in range(min(self.repeat, 100)):
+            dml = DataModificationLanguage(f"DELETE FROM students WHERE id >= {step * width} "
+                                           f"AND id < {(step + 1) * width}", self.db_instance)
+            latencies.append(timed(dml.read_instruction)[0])
+        self.record('delete', latencies, width * len(latencies))
+
+    def bench_snapshot(self):
+        """
+        Mierzy zapis i odczyt stanu bazy danych w formacie JSON i binarnym.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            for format in ('json', 'binary'):
+                filename = os.path.join(directory, f'state.{format}')
+                saves, loads = [], []
+                for _ in range(self.repeat):
+                    saves.append(timed(StateManagement.save_state, filename, format)[0])
+                    loads.append(timed(StateManagement.load_state, filename)[0])
+                self.record(f'save_state_{format}', saves, self.rows * self.repeat)
+                self.record(f'load_state_{format}', loads, self.rows * self.repeat)
+                self.results[f'save_state_{format}']['file_bytes'] = os.path.getsize(filename)
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Porównuje wyniki z wynikami bazowymi.
+
+    Test jest uznawany za regresję, jeśli jego mediana czasu operacji (p50) jest większa
+    od bazowej o więcej niż threshold (np. 0.2 - o 20%).
+
+    Parametry:
+    results (dict): Wyniki uruchomienia (BenchmarkSuite.run).
+    baseline (dict): Wyniki bazowe w tym samym formacie.
+    threshold (float): Dopuszczalny względny wzrost czasu.
+
+    Zwraca:
+    list: Słowniki z nazwą testu, medianami czasu (baseline_ms, current_ms), ich stosunkiem (ratio)
+        i informacją o regresji (regression), w kolejności nazw testów.
+    """
+    comparison = []
+    for name in sorted(set(results['benchmarks']) & set(baseline['benchmarks'])):
+        current_ms = results['benchmarks'][name]['p50_ms']
+        baseline_ms = baseline['benchmarks'][name]['p50_ms']
+        if not current_ms or not baseline_ms:
+            continue
+        ratio = current_ms / baseline_ms
+        comparison.append({'name': name, 'baseline_ms': baseline_ms, 'current_ms': current_ms, 'ratio': ratio,
+                           'regression': ratio > 1 + threshold})
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Testy wydajności bazy danych.')
+    parser.add_argument('--rows', type=parse_count, default=10000, help='liczba wierszy, np. 10k, 1M (domyślnie 10k)')
+    parser.add_argument('--storage', choices=('list', 'numpy'), default='list')
+    parser.add_argument('--repeat', type=int, default=5, help='liczba powtórzeń każdego pomiaru')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--statements', type=int, default=1000, help='liczba pojedynczych instrukcji INSERT')
+    parser.add_argument('--output', help='plik JSON z wynikami')
+    parser.add_argument('--baseline', help='plik JSON z wynikami bazowymi do porównania')
+    parser.add_argument('--threshold', type=float, default=0.2, help='dopuszczalny względny wzrost czasu')
+    args = parser.parse_args(argv)
+
+    results = BenchmarkSuite(args.rows, args.storage, args.repeat, args.seed,
+                             statements=args.statements).run()
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    print(f"{'benchmark':<20}{'ops/s':>12}{'rows/s':>14}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, result in results['benchmarks'].items():
+        print(f"{name:<20}{result['operations_per_second'] or 0:>12.1f}{result['rows_per_second'] or 0:>14.0f}"
+              f"{result['p50_ms']:>10.3f}{result['p90_ms']:>10.3f}{result['p99_ms']:>10.3f}")
+    print(f"peak RSS: {results['peak_rss_kb']} KB")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as file:
+        comparison = compare(results, json.load(file), args.threshold)
+    for entry in comparison:
+        status = 'REGRESSION' if entry['regression'] else 'ok'
+        print(f"{entry['name']:<20}{entry['baseline_ms']:>10.3f} -> {entry['current_ms']:>10.3f} ms "
+              f"({entry['ratio']:.2f}x) {status}")
+    return 1 if any(entry['regression'] for entry in comparison) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
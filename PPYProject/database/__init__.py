@@ -1,14 +1,19 @@
 # __init__.py in /database
 
+from .cursor import Cursor
 from .db_structure import Table, Database
 from .ddl_operations import DDL
 from .dml_operations import DataModificationLanguage
 from .dql_operations import DataQueryLanguage
+from .prepared import PreparedStatement, prepare
 
 __all__ = [
+    'Cursor',
     'Table',
     'Database',
     'DDL',
     'DataModificationLanguage',
-    'DataQueryLanguage'
+    'DataQueryLanguage',
+    'PreparedStatement',
+    'prepare'
 ]
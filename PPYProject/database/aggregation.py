@@ -0,0 +1,278 @@
+from database.storage import np, NumpyColumn, EncodedTextColumn
+from database.sql_parser import Aggregate, Column, Comparison, InList, Between, And, Or, Not
+
+
+class _Count:
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+    def step(self, value):
+        if value is not None:
+            self.count += 1
+
+    def result(self):
+        return self.count
+
+
+class _CountRows(_Count):
+    __slots__ = ()
+
+    def step(self, value):
+        self.count += 1
+
+
+class _Sum:
+    __slots__ = ('total', 'count')
+
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+
+    def step(self, value):
+        if value is not None:
+            self.total += value
+            self.count += 1
+
+    def result(self):
+        return self.total if self.count else None
+
+
+class _Avg(_Sum):
+    __slots__ = ()
+
+    def result(self):
+        return self.total / self.count if self.count else None
+
+
+class _Min:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = None
+
+    def step(self, value):
+        if value is not None and (self.value is None or value < self.value):
+            self.value = value
+
+    def result(self):
+        return self.value
+
+
+class _Max(_Min):
+    __slots__ = ()
+
+    def step(self, value):
+        if value is not None and (self.value is None or value > self.value):
+            self.value = value
+
+
+_ACCUMULATORS = {'COUNT': _Count, 'SUM': _Sum, 'AVG': _Avg, 'MIN': _Min, 'MAX': _Max}
+
+
+class _Distinct:
+    """Agregacja po zbiorze różnych wartości (np. COUNT(DISTINCT kolumna))."""
+
+    __slots__ = ('values', 'accumulator')
+
+    def __init__(self, accumulator):
+        self.values = set()
+        self.accumulator = accumulator
+
+    def step(self, value):
+        self.values.add(value)
+
+    def result(self):
+        accumulator = self.accumulator()
+        for value in self.values:
+            accumulator.step(value)
+        return accumulator.result()
+
+
+def _factory(aggregate):
+    if aggregate.column is None:
+        return _CountRows
+    accumulator = _ACCUMULATORS[aggregate.function]
+    if aggregate.distinct:
+        return lambda: _Distinct(accumulator)
+    return accumulator
+
+
+def result_type(aggregate, columns):
+    """
+    Zwraca typ kolumny wyniku funkcji agregującej.
+
+    Parametry:
+        aggregate (Aggregate): Funkcja agregująca.
+        columns (dict): Słownik kolumna -> typ kolumny tabeli.
+
+    Zwraca:
+        str: Typ wyniku (COUNT - INTEGER, AVG - FLOAT, pozostałe - typ kolumny).
+    """
+    if aggregate.function == 'COUNT':
+        return 'INTEGER'
+    if aggregate.function == 'AVG':
+        return 'FLOAT'
+    return columns[aggregate.column]
+
+
+def replace_aggregates(node):
+    """
+    Zamienia funkcje agregujące w wyrażeniu HAVING na odwołania do kolumn wyniku grupowania.
+
+    Parametry:
+        node: Drzewo wyrażenia.
+
+    Zwraca:
+        Drzewo wyrażenia, w którym każda funkcja Aggregate jest zastąpiona przez Column(nazwa funkcji).
+    """
+    if isinstance(node, Aggregate):
+        return Column(node.key)
+    if isinstance(node, Comparison):
+        return Comparison(node.operator, replace_aggregates(node.left), replace_aggregates(node.right))
+    if isinstance(node, InList):
+        return InList(replace_aggregates(node.operand), [replace_aggregates(value) for value in node.values],
+                      node.negated)
+    if isinstance(node, Between):
+        return Between(replace_aggregates(node.operand), replace_aggregates(node.low),
+                       replace_aggregates(node.high), node.negated)
+    if isinstance(node, (And, Or)):
+        return type(node)([replace_aggregates(item) for item in node.items])
+    if isinstance(node, Not):
+        return Not(replace_aggregates(node.item))
+    return node
+
+
+def hash_aggregate(table, row_ids, group_by, aggregates):
+    """
+    Grupuje wiersze tabeli i oblicza funkcje agregujące w jednym przebiegu (agregacja haszująca).
+
+    Pamięć zależy od liczby grup, a nie od liczby wierszy. Dla tabel NumPy obliczenia są wykonywane
+    wektorowo, jeśli pozwalają na to typy kolumn. Bez GROUP BY wynik ma zawsze jedną grupę
+    (także dla pustego zbioru wierszy).
+
+    Parametry:
+        table (Table): Tabela.
+        row_ids (iterable): Numery wierszy spełniających warunek WHERE.
+        group_by (list): Kolumny grupujące.
+        aggregates (list): Funkcje agregujące (Aggregate).
+
+    Zwraca:
+        dict: Słownik kolumna grupująca lub nazwa funkcji -> lista wartości, po jednej dla każdej grupy
+        (grupy w kolejności pierwszego wystąpienia).
+    """
+    if _vectorizable(table, group_by, aggregates):
+        return _numpy_aggregate(table, row_ids, group_by, aggregates)
+
+    factories = [_factory(aggregate) for aggregate in aggregates]
+    value_columns = [table.data[aggregate.column] if aggregate.column else None for aggregate in aggregates]
+    key_columns = [table.data[column] for column in group_by]
+    inputs = list(zip(range(len(aggregates)), value_columns))
+
+    groups = {}
+    for i in row_ids:
+        key = tuple([values[i] for values in key_columns])
+        states = groups.get(key)
+        if states is None:
+            states = groups[key] = [factory() for factory in factories]
+        for position, values in inputs:
+            states[position].step(values[i] if values is not None else None)
+    if not group_by and not groups:
+        groups[()] = [factory() for factory in factories]
+
+    result = {column: [key[position] for key in groups] for position, column in enumerate(group_by)}
+    for position, aggregate in enumerate(aggregates):
+        result[aggregate.key] = [states[position].result() for states in groups.values()]
+    return result
+
+
+def _vectorizable(table, group_by, aggregates):
+    if np is None or table.storage != 'numpy':
+        return False
+    for column in group_by:
+        if not isinstance(table.data[column], (NumpyColumn, EncodedTextColumn)):
+            return False
+    for aggregate in aggregates:
+        if aggregate.distinct:
+            return False
+        if aggregate.column is None:
+            continue
+        values = table.data[aggregate.column]
+        # Kody słownika TEXT nie zachowują porządku, więc dla tekstu wektorowo liczymy tylko COUNT
+        text_count = isinstance(values, EncodedTextColumn) and aggregate.function == 'COUNT'
+        if not isinstance(values, NumpyColumn) and not text_count:
+            return False
+    return True
+
+
+def _valid_rows(values, rows):
+    valid = values.valid()
+    return None if valid is None else valid[rows]
+
+
+def _numpy_aggregate(table, row_ids, group_by, aggregates):
+    rows = np.asarray(row_ids, dtype=np.int64)
+    if group_by:
+        group_ids = np.zeros(len(rows), dtype=np.int64)
+        for column in group_by:
+            values = table.data[column]
+            keys = values.codes.array()[rows] if isinstance(values, EncodedTextColumn) else values.array()[rows]
+            unique, inverse = np.unique(keys, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            valid = _valid_rows(values, rows) if isinstance(values, NumpyColumn) else None
+            if valid is not None:
+                inverse[~valid] = len(unique)  # None tworzy osobną grupę
+            # Identyfikatory grup pozostają gęste, więc iloczyn liczności kolumn nie przepełni int64
+            _, group_ids = np.unique(group_ids * (len(unique) + 1) + inverse, return_inverse=True)
+            group_ids = group_ids.reshape(-1)
+        count = int(group_ids.max()) + 1 if len(group_ids) else 0
+        # Numerujemy grupy w kolejności pierwszego wystąpienia
+        first = np.full(count, len(rows), dtype=np.int64)
+        np.minimum.at(first, group_ids, np.arange(len(rows)))
+        order = np.argsort(first)
+        rank = np.empty(count, dtype=np.int64)
+        rank[order] = np.arange(count)
+        group_ids = rank[group_ids]
+        first_rows = rows[first[order]]
+        result = {column: table.column_values(column, first_rows) for column in group_by}
+    else:
+        group_ids = np.zeros(len(rows), dtype=np.int64)
+        count = 1
+        result = {}
+
+    for aggregate in aggregates:
+        if aggregate.column is None:
+            result[aggregate.key] = np.bincount(group_ids, minlength=count).tolist()
+            continue
+        column = table.data[aggregate.column]
+        valid = _valid_rows(column, rows)
+        ids = group_ids if valid is None else group_ids[valid]
+        counts = np.bincount(ids, minlength=count)
+        if aggregate.function == 'COUNT':
+            result[aggregate.key] = counts.tolist()
+            continue
+        values = column.array()[rows]
+        if valid is not None:
+            values = values[valid]
+        if aggregate.function in ('SUM', 'AVG'):
+            totals = np.zeros(count, dtype=np.float64 if values.dtype.kind == 'f' else np.int64)
+            np.add.at(totals, ids, values)
+            if aggregate.function == 'AVG':
+                totals = totals / np.maximum(counts, 1)
+        else:
+            kind = values.dtype
+            numbers = values.view(np.int64) if kind.kind == 'M' else values
+            if aggregate.function == 'MIN':
+                totals = np.full(count, numbers.max() if len(numbers) else 0, dtype=numbers.dtype)
+                np.minimum.at(totals, ids, numbers)
+            else:
+                totals = np.full(count, numbers.min() if len(numbers) else 0, dtype=numbers.dtype)
+                np.maximum.at(totals, ids, numbers)
+            if kind.kind == 'M':
+                totals = totals.view(kind)
+        results = totals.tolist()
+        for position in np.flatnonzero(counts == 0):
+            results[position] = None
+        result[aggregate.key] = results
+    return result
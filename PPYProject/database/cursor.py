@@ -0,0 +1,197 @@
+from database.parallel import morsels, scan_morsel
+from database.predicates import compiled_where
+from database.zone_maps import scan_ranges
+
+
+class Cursor:
+    """
+    Kursor wyniku zapytania SELECT pobierający wiersze leniwie.
+
+    Proste zapytania (jedna tabela, bez GROUP BY, funkcji agregujących i ORDER BY) są wykonywane
+    porcjami: każda porcja wierszy tabeli jest filtrowana i rzutowana dopiero przy pobieraniu, pod
+    blokadą odczytu zakładaną tylko na czas tej porcji. Czas do pierwszego wiersza i zajęta pamięć
+    zależą więc od rozmiaru porcji, a nie od rozmiaru wyniku. Kursor widzi wiersze istniejące
+    w chwili jego otwarcia, z wyjątkiem usuniętych w trakcie odczytu; kompakcja lub zmiana
+    schematu tabeli przerywa odczyt. Bloki pomijane według map stref są wyznaczane przy otwarciu.
+    Pozostałe zapytania są wykonywane w całości przy otwarciu kursora.
+    """
+
+    def __init__(self, dql, batch_size):
+        """
+        Otwiera kursor dla zapytania.
+
+        Parametry:
+            dql (DataQueryLanguage): Obiekt zapytania z ustawioną instrukcją SELECT.
+            batch_size (int): Liczba wierszy tabeli w jednej porcji.
+
+        Podnosi:
+            ValueError: Jeśli zapytanie odwołuje się do nieistniejącej kolumny.
+        """
+        self.arraysize = 1  # domyślna liczba wierszy zwracanych przez fetchmany
+        self.batch_size = batch_size
+        self._rows = []  # wiersze bieżącej porcji
+        self._position = 0
+        self._closed = False
+
+        statement = dql.statement
+        if statement.joins or statement.aggregates or statement.group_by or statement.order_by:
+            self.columns, projection = dql.result_columns()
+            self._blocks = iter([projection])
+        else:
+            self._blocks = self._scan(dql)
+
+    def _scan(self, dql):
+        """Generator porcji wyniku (listy wartości kolumn) dla zapytania do jednej tabeli."""
+        statement, params = dql.statement, dql.params
+        table = dql.db_instance.get_table(statement.table_name)
+        with table.lock.read():
+            columns = statement.columns or list(table.columns)
+            for col in columns:
+                if col not in table.columns:
+                    raise ValueError(f"Column {col} does not exist in table {table.name}.")
+            compiled = compiled_where(statement, table) if statement.where is not None else None
+            candidates = table.candidate_rows(statement.where, params) if compiled is not None else None
+            ranges = None
+            if candidates is None and compiled is not None:
+                # Bloki, które według map stref nie mogą pasować do warunku, są wyznaczane raz przy otwarciu
+                ranges = scan_ranges(table, compiled.node, params)
+            row_count = table.row_count()
+            layout = table.layout_version
+        self.columns = columns if statement.items is None else [name for _, name in statement.items]
+        skip, remaining = dql.slice_bounds()
+        return self._batches(table, columns, compiled, params, candidates, ranges, row_count, layout, skip, remaining)
+
+    def _batches(self, table, columns, compiled, params, candidates, ranges, row_count, layout, skip, remaining):
+        if candidates is not None:
+            # Wiersze wskazane przez indeks są sprawdzane warunkiem porcjami
+            bounds = [(start, min(start + self.batch_size, len(candidates)))
+                      for start in range(0, len(candidates), self.batch_size)]
+        elif ranges is not None:
+            # Porcje obejmują tylko zakresy bloków, które mogą zawierać pasujące wiersze
+            bounds = [(low + start, low + end)
+                      for low, high in ranges for start, end in morsels(high - low, self.batch_size)]
+        else:
+            bounds = morsels(row_count, self.batch_size)
+        for start, end in bounds:
+            if remaining == 0:
+                return
+            with table.lock.read():
+                if table.layout_version != layout:
+                    raise RuntimeError(f"Table {table.name} was modified during iteration.")
+                if candidates is not None:
+                    row_ids = compiled.filter(table.data, table.live_only(candidates[start:end]), params)
+                    values = [table.column_values(col, row_ids) for col in columns]
+                elif compiled is not None:
+                    row_ids, values = scan_morsel(table, compiled, params, columns, start, end)
+                else:
+                    row_ids = table.all_rows(start, end)
+                    values = [table.column_values(col, row_ids) for col in columns]
+            # OFFSET i LIMIT są stosowane w trakcie skanowania, więc po LIMIT wierszach skanowanie się kończy
+            count = len(row_ids)
+            first = min(skip, count)
+            stop = count if remaining is None else min(count, first + remaining)
+            if first or stop < count:
+                values = [column[first:stop] for column in values]
+            skip -= first
+            if remaining is not None:
+                remaining -= stop - first
+            if stop > first:
+                yield values
+
+    def _next_block(self):
+        if self._closed:
+            raise ValueError("Cursor is closed")
+        for block in self._blocks:
+            self._rows = list(zip(*block))
+            self._position = 0
+            if self._rows:
+                return True
+        return False
+
+    def fetchone(self):
+        """
+        Pobiera kolejny wiersz wyniku.
+
+        Zwraca:
+            tuple: Wartości kolumn wiersza (w kolejności Cursor.columns) lub None po ostatnim wierszu.
+        """
+        if self._position >= len(self._rows) and not self._next_block():
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchmany(self, size=None):
+        """
+        Pobiera kolejne wiersze wyniku.
+
+        Parametry:
+            size (int, opcjonalnie): Największa liczba wierszy. Domyślnie Cursor.arraysize.
+
+        Zwraca:
+            list: Krotki wartości kolumn (mniej niż size na końcu wyniku).
+        """
+        size = self.arraysize if size is None else size
+        rows = []
+        while len(rows) < size:
+            if self._position >= len(self._rows) and not self._next_block():
+                break
+            end = min(len(self._rows), self._position + size - len(rows))
+            rows.extend(self._rows[self._position:end])
+            self._position = end
+        return rows
+
+    def fetchall(self):
+        """
+        Pobiera wszystkie pozostałe wiersze wyniku.
+
+        Zwraca:
+            list: Krotki wartości kolumn.
+        """
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        while self._next_block():
+            rows.extend(self._rows)
+            self._position = len(self._rows)
+        return rows
+
+    def batches(self):
+        """
+        Pobiera pozostałe wiersze wyniku porcjami w układzie kolumnowym.
+
+        Zwraca:
+            generator: Słowniki nazwa kolumny -> lista wartości z kolejnych porcji.
+        """
+        if self._position < len(self._rows):
+            block = list(zip(*self._rows[self._position:]))
+            self._position = len(self._rows)
+            yield {name: list(values) for name, values in zip(self.columns, block)}
+        if self._closed:
+            raise ValueError("Cursor is closed")
+        for block in self._blocks:
+            yield dict(zip(self.columns, block))
+
+    def close(self):
+        """
+        Zamyka kursor i zwalnia pozostałe porcje wyniku.
+        """
+        if hasattr(self._blocks, 'close'):
+            self._blocks.close()
+        self._rows = []
+        self._position = 0
+        self._closed = True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,30 +1,572 @@
-from datetime import date, time
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from database.indexes import INDEX_TYPES
+from database.locking import ReadWriteLock
+from database.plan_cache import PlanCache
+from database import profiling
+from database.profiling import QueryStatistics
+from database.result_cache import ResultCache
+from database.schema import ColumnSchema, compile_schema
+from database import storage as column_storage
+from database.predicates import evaluate_mask
+from database import planner
+from database.statistics import ColumnStatistics
+from database import zone_maps
+from database import parallel
+from database.parallel import scan_morsel
+from database.zone_maps import ZoneMap
+
+# Wspólny licznik wersji wszystkich tabel: tabela utworzona ponownie pod tą samą nazwą
+# (lub wczytana z migawki) nigdy nie powtórzy numeru wersji poprzedniej
+_versions = itertools.count(1)
 
 
 class Table:
-    def __init__(self, name, columns):
+    def __init__(self, name, columns, storage='list'):
         """
         Inicjalizuje tabelę z nazwą i słownikiem kolumn.
 
         Parametry:
         name (str): Nazwa tabeli.
         columns (dict): Słownik, gdzie klucze to nazwy kolumn, a wartości to typy kolumn.
+        storage (str): Sposób przechowywania kolumn: 'list' (listy Pythona, domyślnie)
+            lub 'numpy' (tablice NumPy dla INTEGER/FLOAT/BOOLEAN/DATE i kodowanie słownikowe dla TEXT).
         """
         self.name = name
         self.columns = columns
-        # Inicjalizuje pustą listę dla każdej kolumny w danych tabeli
-        self.data = {column: [] for column in columns}
+        self.storage = storage
+        # Skompilowany schemat: kolumna -> ColumnSchema z funkcją konwertującą i walidującą wartości,
+        # wspólną dla INSERT, UPDATE i wstawiania wsadowego (kompilowany ponownie przy zmianie schematu)
+        self.schema = compile_schema(columns)
+        # Inicjalizuje pustą kolumnę dla każdej kolumny w danych tabeli
+        self.data = {column: column_storage.make_column(column_type, storage)
+                     for column, column_type in columns.items()}
+        # Indeksy pomocnicze: nazwa indeksu -> HashIndex / SortedIndex
+        self.indexes = {}
+        # Zmiany od ostatniej migawki: liczba wierszy zapisanych w migawce (None - tabelę trzeba
+        # zapisać w całości) oraz zmienione komórki tych wierszy (kolumna -> zbiór numerów wierszy)
+        self.saved_rows = None
+        self.dirty_cells = {}
+        # Wiersze usunięte od ostatniej migawki (zapisywane w pliku delta)
+        self.dirty_deletes = set()
+        # Mapa żywych wierszy: None - brak usuniętych wierszy, w przeciwnym razie bytearray
+        # z 1 dla wiersza żywego i 0 dla usuniętego. Usunięte wiersze zostają w kolumnach
+        # do kompakcji, więc numery wierszy nie zmieniają się przy DELETE.
+        self.live = None
+        self.deleted_count = 0
+        # Zadanie kompakcji w tle (concurrent.futures.Future) lub None
+        self.compaction = None
+        # Mapy stref: kolumna -> ZoneMap z najmniejszą i największą wartością każdego bloku
+        # block_size wierszy, pozwalające pominąć przy skanowaniu bloki, które nie mogą pasować do warunku
+        self.block_size = zone_maps.BLOCK_SIZE
+        self.zone_maps = {column: ZoneMap(self.block_size) for column in columns}
+        # Statystyki kolumn dla planisty (TableStatistics) - None do pierwszego ANALYZE
+        self.statistics = None
+        # Numer układu wierszy i kolumn - zmienia się, gdy wiersze się przesuwają (kompakcja) lub zmienia
+        # się schemat, co unieważnia otwarte kursory
+        self.layout_version = 0
+        # Wersja danych - zmienia się przy każdym wstawieniu, zmianie i usunięciu wierszy oraz zmianie schematu
+        self.version = next(_versions)
+        # Blokada czytelników i pisarzy: zapytania SELECT czytają równolegle, zmiany danych są wyłączne
+        self.lock = ReadWriteLock()
+
+    def touch(self):
+        """
+        Nadaje tabeli nową wersję danych (unieważnia zapamiętane wyniki zapytań).
+        """
+        self.version = next(_versions)
+
+    def mark_clean(self):
+        """
+        Oznacza bieżący stan tabeli jako zapisany w migawce.
+        """
+        self.saved_rows = self.row_count()
+        self.dirty_cells = {}
+        self.dirty_deletes = set()
+
+    def mark_dirty(self):
+        """
+        Oznacza tabelę jako wymagającą zapisania w całości (zmiana schematu lub przesunięcie wierszy).
+        """
+        self.saved_rows = None
+        self.dirty_cells = {}
+        self.dirty_deletes = set()
+
+    def is_dirty(self):
+        """
+        Sprawdza, czy tabela zmieniła się od ostatniej migawki.
+
+        Zwraca:
+        bool: True, jeśli tabela ma niezapisane zmiany.
+        """
+        return (self.saved_rows is None or self.saved_rows != self.row_count()
+                or bool(self.dirty_cells) or bool(self.dirty_deletes))
 
     def add_column(self, column_name, column_type):
         """
-        Dodaje nową kolumnę do tabeli.
+        Dodaje nową kolumnę do tabeli. Istniejące wiersze otrzymują wartość None.
 
         Parametry:
         column_name (str): Nazwa nowej kolumny.
         column_type (str): Typ nowej kolumny.
         """
+        row_count = self.row_count()
+        values = column_storage.make_column(column_type, self.storage)
+        values.extend([None] * row_count)
         self.columns[column_name] = column_type
-        self.data[column_name] = []
+        self.schema[column_name] = ColumnSchema(column_name, column_type)
+        self.data[column_name] = values
+        self.zone_maps[column_name] = ZoneMap(self.block_size)
+        self.zone_maps[column_name].extend([None] * row_count)
+        if self.statistics is not None:
+            self.statistics.columns[column_name] = ColumnStatistics()
+            self.statistics.columns[column_name].null_count = row_count
+        self.layout_version += 1
+        self.touch()
+        self.mark_dirty()
+
+    def drop_column(self, column_name):
+        """
+        Usuwa kolumnę z tabeli razem z indeksami założonymi na tej kolumnie.
+
+        Parametry:
+        column_name (str): Nazwa kolumny do usunięcia.
+        """
+        del self.columns[column_name]
+        del self.schema[column_name]
+        del self.data[column_name]
+        for index_name in [name for name, index in self.indexes.items() if index.column == column_name]:
+            del self.indexes[index_name]
+        del self.zone_maps[column_name]
+        if self.statistics is not None:
+            self.statistics.columns.pop(column_name, None)
+        self.layout_version += 1
+        self.touch()
+        self.mark_dirty()
+
+    def row_count(self):
+        """
+        Zwraca liczbę wierszy w kolumnach tabeli, razem z usuniętymi wierszami oczekującymi na kompakcję.
+
+        Zwraca:
+        int: Liczba wierszy.
+        """
+        for values in self.data.values():
+            return len(values)
+        return 0
+
+    def deleted_fraction(self):
+        """
+        Zwraca udział usuniętych wierszy oczekujących na kompakcję.
+
+        Zwraca:
+        float: Liczba usuniętych wierszy podzielona przez liczbę wierszy w kolumnach (0.0 dla pustej tabeli).
+        """
+        row_count = self.row_count()
+        return self.deleted_count / row_count if row_count else 0.0
+
+    def all_rows(self, start=0, end=None):
+        """
+        Zwraca numery żywych (nieusuniętych) wierszy z podanego zakresu.
+
+        Parametry:
+        start (int, opcjonalnie): Numer pierwszego wiersza. Domyślnie 0.
+        end (int, opcjonalnie): Numer wiersza za ostatnim. Domyślnie liczba wierszy tabeli.
+
+        Zwraca:
+        range | list: Numery wierszy w kolejności rosnącej.
+        """
+        end = self.row_count() if end is None else end
+        if self.live is None:
+            return range(start, end)
+        return list(itertools.compress(range(start, end), self.live[start:end]))
+
+    def live_only(self, row_ids):
+        """
+        Pomija usunięte wiersze wśród podanych.
+
+        Parametry:
+        row_ids (list): Numery wierszy.
+
+        Zwraca:
+        list: Numery żywych wierszy w tej samej kolejności.
+        """
+        if self.live is None:
+            return row_ids
+        live = self.live
+        return [row_idx for row_idx in row_ids if live[row_idx]]
+
+    def deleted_rows(self):
+        """
+        Zwraca numery usuniętych wierszy oczekujących na kompakcję.
+
+        Zwraca:
+        list: Numery wierszy w kolejności rosnącej.
+        """
+        if self.live is None:
+            return []
+        return [row_idx for row_idx, alive in enumerate(self.live) if not alive]
+
+    def live_mask(self, start=0, end=None):
+        """
+        Zwraca maskę NumPy żywych wierszy z podanego zakresu.
+
+        Parametry:
+        start (int, opcjonalnie): Numer pierwszego wiersza. Domyślnie 0.
+        end (int, opcjonalnie): Numer wiersza za ostatnim. Domyślnie liczba wierszy tabeli.
+
+        Zwraca:
+        numpy.ndarray: Maska logiczna lub None, jeśli tabela nie ma usuniętych wierszy.
+        """
+        if self.live is None:
+            return None
+        end = self.row_count() if end is None else end
+        return column_storage.np.frombuffer(self.live, dtype=column_storage.np.uint8,
+                                            count=end - start, offset=start).astype(bool)
+
+    def insert_row(self, row):
+        """
+        Dopisuje wiersz na końcu tabeli i aktualizuje indeksy.
+
+        Parametry:
+        row (dict): Słownik kolumna -> wartość. Brakujące kolumny otrzymują wartość None.
+        """
+        row_idx = self.row_count()
+        for column in self.columns:
+            self.data[column].append(row.get(column))
+            self.zone_maps[column].extend([row.get(column)])
+        if self.live is not None:
+            self.live.append(1)
+        for index in self.indexes.values():
+            index.add(self.data[index.column][row_idx], row_idx)
+        if self.statistics is not None:
+            for column, column_statistics in self.statistics.columns.items():
+                column_statistics.add([row.get(column)])
+            self.statistics.record_changes(1)
+        if (row_idx + 1) % column_storage.ENCODING_MIN_ROWS == 0:
+            self.settle_encoding()
+        self.touch()
+
+    def insert_columns(self, data):
+        """
+        Dopisuje wiele wierszy naraz, rozszerzając każdą kolumnę jedną operacją, i aktualizuje indeksy.
+
+        Parametry:
+        data (dict): Słownik kolumna -> lista wartości; wszystkie listy mają tę samą długość.
+            Brakujące kolumny otrzymują wartość None.
+        """
+        count = len(next(iter(data.values()))) if data else 0
+        if not count:
+            return
+        start = self.row_count()
+        for column in self.columns:
+            values = data.get(column)
+            if values is None:
+                values = [None] * count
+            self.data[column].extend(values)
+            self.zone_maps[column].extend(values)
+        if self.live is not None:
+            self.live.extend(b'\x01' * count)
+        for index in self.indexes.values():
+            index.add_many(self.data[index.column][start:], start)
+        if self.statistics is not None:
+            for column, column_statistics in self.statistics.columns.items():
+                values = data.get(column)
+                column_statistics.add(values if values is not None else [None] * count)
+            self.statistics.record_changes(count)
+        self.settle_encoding()
+        self.touch()
+
+    def update_value(self, row_idx, column_name, value):
+        """
+        Zmienia wartość w jednej komórce tabeli i aktualizuje indeksy tej kolumny.
+
+        Parametry:
+        row_idx (int): Numer wiersza.
+        column_name (str): Nazwa kolumny.
+        value: Nowa wartość.
+        """
+        old_value = self.data[column_name][row_idx]
+        self.data[column_name][row_idx] = value
+        self.zone_maps[column_name].update([row_idx], [old_value], [value])
+        if self.statistics is not None:
+            self.statistics.columns[column_name].remove([old_value])
+            self.statistics.columns[column_name].add([value])
+            self.statistics.record_changes(1)
+        self.touch()
+        if self.saved_rows is not None and row_idx < self.saved_rows:
+            self.dirty_cells.setdefault(column_name, set()).add(row_idx)
+        for index in self.indexes.values():
+            if index.column == column_name:
+                index.remove(old_value, row_idx)
+                index.add(value, row_idx)
+
+    def update_columns(self, row_ids, updates):
+        """
+        Zmienia wartości wielu wierszy naraz, zapisując każdą kolumnę w jednym przebiegu, i aktualizuje indeksy.
+
+        Indeks kolumny jest aktualizowany o zmienione wiersze, a gdy zmienia się co najmniej
+        ćwierć wierszy tabeli - budowany od nowa jednym przebiegiem.
+
+        Parametry:
+        row_ids (list): Numery wierszy.
+        updates (dict): Słownik kolumna -> lista nowych wartości w kolejności numerów wierszy.
+        """
+        if not row_ids:
+            return
+        rebuild = 4 * len(row_ids) >= self.row_count()
+        for column_name, values in updates.items():
+            column = self.data[column_name]
+            indexes = [index for index in self.indexes.values() if index.column == column_name]
+            old_values = column_storage.take(column, row_ids)
+            column_storage.put(column, row_ids, values)
+            self.zone_maps[column_name].update(row_ids, old_values, values)
+            for index in indexes:
+                if rebuild:
+                    index.build(column)
+                    continue
+                index.replace_many(row_ids, old_values, values)
+            if self.saved_rows is not None:
+                saved_rows = self.saved_rows
+                self.dirty_cells.setdefault(column_name, set()).update(
+                    row_idx for row_idx in row_ids if row_idx < saved_rows)
+            if self.statistics is not None:
+                self.statistics.columns[column_name].remove(old_values)
+                self.statistics.columns[column_name].add(values)
+        if self.statistics is not None:
+            self.statistics.record_changes(len(row_ids))
+        self.settle_encoding(updates)
+        self.touch()
+
+    def delete_rows(self, row_ids):
+        """
+        Oznacza wiersze o podanych numerach jako usunięte.
+
+        Wiersze zostają w kolumnach i indeksach (skanowanie i wyszukiwanie w indeksach je pomija)
+        aż do kompakcji, więc koszt usunięcia zależy od liczby usuniętych wierszy, a nie od rozmiaru tabeli.
+
+        Parametry:
+        row_ids (list): Numery wierszy do usunięcia.
+        """
+        if not row_ids:
+            return
+        if self.live is None:
+            self.live = bytearray(b'\x01') * self.row_count()
+        live = self.live
+        for row_idx in row_ids:
+            if live[row_idx]:
+                live[row_idx] = 0
+                self.deleted_count += 1
+        if self.saved_rows is not None:
+            self.dirty_deletes.update(row_ids)
+        if self.statistics is not None:
+            self.statistics.record_changes(len(row_ids))
+        self.touch()
+
+    def settle_encoding(self, columns=None):
+        """
+        Zamienia na listy kolumny kodowane słownikowo, w których wartości powtarzają się zbyt rzadko,
+        aby kodowanie zmniejszało zajmowaną pamięć (zob. storage.settle_encoding).
+
+        Parametry:
+        columns (iterable, opcjonalnie): Nazwy sprawdzanych kolumn. Domyślnie wszystkie kolumny.
+        """
+        for column in self.columns if columns is None else columns:
+            self.data[column] = column_storage.settle_encoding(self.data[column])
+
+    def build_zone_maps(self):
+        """
+        Buduje od nowa mapy stref wszystkich kolumn (np. po kompakcji).
+        """
+        for column, values in self.data.items():
+            self.zone_maps[column].build(values)
+
+    def defer_zone_maps(self):
+        """
+        Odkłada budowę map stref wszystkich kolumn do pierwszego skanowania, które z nich korzysta
+        (np. po wczytaniu kolumn z migawki, aby nie odczytywać od razu całego pliku).
+        """
+        for zone_map in self.zone_maps.values():
+            zone_map.defer()
+
+    def zone_map(self, column_name):
+        """
+        Zwraca mapę stref kolumny, budując ją, jeśli jej budowa była odłożona.
+
+        Parametry:
+        column_name (str): Nazwa kolumny.
+
+        Zwraca:
+        ZoneMap: Mapa stref kolumny.
+        """
+        zone_map = self.zone_maps[column_name]
+        if zone_map.stale:
+            zone_map.build(self.data[column_name])
+        return zone_map
+
+    def compact(self):
+        """
+        Usuwa z kolumn wiersze oznaczone jako usunięte, przepisując każdą kolumnę w jednym przebiegu,
+        i przebudowuje indeksy. Numery pozostałych wierszy się zmieniają, ale ich zawartość nie,
+        więc wersja danych tabeli pozostaje ta sama.
+
+        Zwraca:
+        int: Liczba usuniętych wierszy.
+        """
+        removed = self.deleted_count
+        if not removed:
+            return 0
+        for column in self.columns:
+            column_storage.compact(self.data[column], self.live)
+        # Numery kolejnych wierszy się przesunęły, więc indeksy budujemy od nowa
+        for index in self.indexes.values():
+            index.build(self.data[index.column])
+        self.build_zone_maps()
+        self.live = None
+        self.deleted_count = 0
+        self.layout_version += 1
+        self.mark_dirty()
+        return removed
+
+    def column_values(self, column_name, row_ids):
+        """
+        Zwraca wartości kolumny z podanych wierszy.
+
+        Parametry:
+        column_name (str): Nazwa kolumny.
+        row_ids (iterable): Numery wierszy.
+
+        Zwraca:
+        list: Wartości kolumny w kolejności numerów wierszy.
+        """
+        return column_storage.take(self.data[column_name], row_ids)
+
+    def candidate_rows(self, condition, params=()):
+        """
+        Wyznacza wiersze, które mogą spełniać warunek, na podstawie indeksów.
+
+        Indeks jest używany dla składowych koniunkcji postaci "kolumna operator stała".
+        Jeśli tabela ma statystyki (ANALYZE), planista najpierw sprawdza, czy zakresy wartości
+        kolumn nie wykluczają każdego wiersza, a potem przegląda tylko indeks składowej
+        o najmniejszej szacowanej selektywności. Bez statystyk przeglądane są wszystkie pasujące
+        indeksy i wybierany jest najmniejszy zbiór wierszy.
+
+        Parametry:
+        condition: Drzewo warunku WHERE.
+        params (sequence): Wartości parametrów '?'.
+
+        Zwraca:
+        list: Numery wierszy do sprawdzenia warunkiem lub None, jeśli żaden indeks nie pasuje.
+        """
+        if planner.provably_empty(condition, self, params):
+            return []
+        return planner.index_lookup(self, condition, params)[1]
+
+    def matching_rows(self, condition, row_ids=None, params=()):
+        """
+        Zwraca numery wierszy spełniających skompilowany warunek.
+
+        Pełne skanowanie pomija bloki wierszy, które według map stref nie mogą spełniać warunku.
+        Dla tabel przechowywanych w NumPy skanowanie jest wykonywane maską logiczną dla całych
+        kolumn (lub ich przejrzanych fragmentów); w pozostałych przypadkach warunek jest sprawdzany
+        wiersz po wierszu, a przy statystykach tabeli - ze składowymi koniunkcji w kolejności
+        wybranej przez planistę.
+
+        Parametry:
+        condition (CompiledCondition): Skompilowany warunek WHERE.
+        row_ids (list, opcjonalnie): Wiersze-kandydaci (np. z indeksu). Domyślnie None - wszystkie wiersze.
+        params (sequence): Wartości parametrów '?'.
+
+        Zwraca:
+        list: Numery pasujących wierszy w kolejności rosnącej.
+        """
+        if row_ids is None:
+            ranges = zone_maps.scan_ranges(self, condition.node, params)
+            if ranges is not None and self.storage == 'numpy':
+                profiling.add('rows_scanned', sum(end - start for start, end in ranges))
+                return [row_idx for start, end in ranges
+                        for row_idx in scan_morsel(self, condition, params, [], start, end)[0]]
+            if ranges is not None:
+                row_ids = [row_idx for start, end in ranges for row_idx in self.all_rows(start, end)]
+            elif self.storage == 'numpy':
+                profiling.add('rows_scanned', self.row_count())
+                mask = evaluate_mask(condition.node, self.columns, self.data, self.row_count(), condition.text, params)
+                if self.live is not None:
+                    mask = mask & self.live_mask()
+                return column_storage.np.flatnonzero(mask).tolist()
+            else:
+                row_ids = self.all_rows()
+        profiling.add('rows_scanned', len(row_ids))
+        return planner.filter_rows(self, condition, row_ids, params)
+
+    def create_index(self, index_name, column_name, index_type='HASH'):
+        """
+        Tworzy indeks na kolumnie tabeli i wypełnia go istniejącymi danymi.
+
+        Parametry:
+        index_name (str): Nazwa indeksu.
+        column_name (str): Nazwa indeksowanej kolumny.
+        index_type (str): Rodzaj indeksu: 'HASH' (równość) lub 'SORTED' (równość i zakresy).
+
+        Podnosi:
+        ValueError: Jeśli indeks już istnieje, kolumna nie istnieje lub rodzaj indeksu jest nieznany.
+        """
+        if index_name in self.indexes:
+            raise ValueError(f"Index {index_name} already exists on table {self.name}.")
+        if column_name not in self.columns:
+            raise ValueError(f"Column {column_name} does not exist in table {self.name}.")
+        index_class = INDEX_TYPES.get(index_type.upper())
+        if index_class is None:
+            raise ValueError(f"Unknown index type: {index_type}")
+        index = index_class(index_name, column_name)
+        index.build(self.data[column_name])
+        self.indexes[index_name] = index
+        self.mark_dirty()
+
+    def drop_index(self, index_name):
+        """
+        Usuwa indeks z tabeli.
+
+        Parametry:
+        index_name (str): Nazwa indeksu.
+
+        Podnosi:
+        ValueError: Jeśli indeks nie istnieje.
+        """
+        if index_name not in self.indexes:
+            raise ValueError(f"Index {index_name} does not exist on table {self.name}.")
+        del self.indexes[index_name]
+        self.mark_dirty()
+
+    def find_rows(self, column_name, operator, value):
+        """
+        Wyszukuje wiersze spełniające warunek "kolumna operator wartość" przy użyciu indeksu.
+
+        Parametry:
+        column_name (str): Nazwa kolumny.
+        operator (str): Operator porównania ('==', '!=', '>', '>=', '<', '<=').
+        value: Wartość, z którą porównywana jest kolumna.
+
+        Zwraca:
+        list: Posortowane numery pasujących wierszy lub None, jeśli żaden indeks nie może zostać użyty.
+        """
+        candidates = [index for index in self.indexes.values()
+                      if index.column == column_name and operator in index.operators]
+        if not candidates:
+            return None
+        # Dla równości indeks haszujący jest tańszy niż posortowany
+        candidates.sort(key=lambda index: index.kind != 'HASH')
+        try:
+            row_ids = candidates[0].lookup(operator, value)
+        except TypeError:
+            # Wartość nieporównywalna z kluczami indeksu - zostawiamy to pełnemu skanowaniu
+            return None
+        profiling.add('index_hits')
+        # Indeksy zawierają też usunięte wiersze oczekujące na kompakcję
+        return self.live_only(row_ids)
 
     @staticmethod
     def get_type(python_type):
@@ -50,11 +592,14 @@ class Table:
 
 class Database:
     _instance = None
+    _instance_lock = threading.Lock()
 
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
-            cls._instance = cls()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
 
     def __init__(self):
@@ -62,6 +607,225 @@ class Database:
         Inicjalizuje bazę danych zawierającą słownik tabel.
         """
         self.tables = {}
+        # Blokada katalogu tabel (tworzenie, usuwanie i podmiana tabel)
+        self.lock = threading.RLock()
+        # Dziennik zapisu z wyprzedzeniem (WriteAheadLog) i numer ostatniej zapisanej w nim operacji
+        self.wal = None
+        self.lsn = 0
+        # Blokada numeru operacji: pisarze różnych tabel dopisują rekordy równolegle, a lsn nie może maleć
+        self._lsn_lock = threading.Lock()
+        # Łańcuch migawek przyrostowych: plik bazowy, jego identyfikator i liczba plików delta
+        self.snapshot_chain = None
+        # Skanowanie równoległe (domyślnie wyłączone - jeden proces)
+        self.parallel_workers = 1
+        self.parallel_min_rows = 100000
+        self.morsel_size = 65536
+        # Pamięć podręczna sparsowanych instrukcji (czyszczona przy zmianach schematu)
+        self.plan_cache = PlanCache()
+        # Pamięć podręczna wyników zapytań SELECT (domyślnie wyłączona, zob. enable_result_cache)
+        self.result_cache = None
+        # Liczba wierszy sortowanych w pamięci; większe wyniki ORDER BY są sortowane przez scalanie serii z dysku
+        self.sort_buffer_rows = 1000000
+        # Kompakcja tabel: udział usuniętych wierszy, od którego DELETE uruchamia kompakcję
+        # (None - tylko na żądanie), i czy kompakcja ma działać w tle. Wątek roboczy
+        # jest tworzony dopiero przy pierwszym zleceniu.
+        self.compaction_threshold = 0.3
+        self.background_compaction = False
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='compaction')
+        # Profilery instrukcji: funkcje wywoływane z profilem (StatementProfile) każdej wykonanej
+        # instrukcji DDL/DML/DQL; bez profilerów instrukcje nie są profilowane
+        self.profilers = []
+        # Rejestr statystyk instrukcji (domyślnie wyłączony, zob. enable_query_statistics)
+        self.query_statistics = None
+
+    def set_parallelism(self, workers=None, min_rows=100000, morsel_size=65536):
+        """
+        Ustawia stopień równoległości pełnego skanowania tabel w zapytaniach SELECT.
+
+        Parametry:
+        workers (int, opcjonalnie): Liczba procesów lub wątków (1 wyłącza skanowanie równoległe
+            i zamyka pulę procesów). Domyślnie liczba rdzeni procesora.
+        min_rows (int): Najmniejsza liczba wierszy tabeli, od której skanowanie jest równoległe.
+        morsel_size (int): Liczba wierszy we fragmencie przydzielanym jednemu procesowi.
+
+        Podnosi:
+        ValueError: Jeśli liczba procesów lub rozmiar fragmentu nie jest dodatni.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers < 1 or morsel_size < 1:
+            raise ValueError("Parallelism and morsel size must be positive")
+        if workers != self.parallel_workers:
+            # Pula procesów poprzedniego rozmiaru nie będzie już używana
+            parallel.shutdown()
+        self.parallel_workers = workers
+        self.parallel_min_rows = min_rows
+        self.morsel_size = morsel_size
+
+    def set_sort_buffer(self, rows=1000000):
+        """
+        Ustawia bufor sortowania ORDER BY bez LIMIT.
+
+        Wyniki mające więcej wierszy są dzielone na posortowane serie zapisywane do plików
+        tymczasowych, a następnie scalane.
+
+        Parametry:
+        rows (int): Największa liczba wierszy sortowanych w pamięci naraz.
+
+        Podnosi:
+        ValueError: Jeśli rozmiar bufora nie jest dodatni.
+        """
+        if rows < 1:
+            raise ValueError("Sort buffer size must be positive")
+        self.sort_buffer_rows = rows
+
+    def set_compaction(self, threshold=0.3, background=False):
+        """
+        Ustawia próg i tryb kompakcji tabel po usunięciu wierszy.
+
+        Parametry:
+        threshold (float, opcjonalnie): Udział usuniętych wierszy tabeli (od 0 do 1), po przekroczeniu
+            którego DELETE uruchamia kompakcję. None - kompakcja tylko na żądanie (Database.compact).
+        background (bool): Czy kompakcja ma być wykonywana w wątku tła zamiast w instrukcji DELETE.
+
+        Podnosi:
+        ValueError: Jeśli próg nie należy do przedziału (0, 1].
+        """
+        if threshold is not None and not 0 < threshold <= 1:
+            raise ValueError("Compaction threshold must be between 0 and 1")
+        self.compaction_threshold = threshold
+        self.background_compaction = background
+
+    def compact(self, table_name):
+        """
+        Usuwa z kolumn tabeli wiersze oznaczone jako usunięte.
+
+        Parametry:
+        table_name (str): Nazwa tabeli.
+
+        Zwraca:
+        int: Liczba usuniętych wierszy.
+
+        Podnosi:
+        ValueError: Jeśli tabela o podanej nazwie nie istnieje.
+        """
+        return self._compact(self.get_table(table_name))
+
+    def _compact(self, table):
+        with table.lock.write():
+            if self.tables.get(table.name) is not table:
+                return 0  # tabela została usunięta lub podmieniona przed kompakcją w tle
+            removed = table.compact()
+            if removed:
+                self.log('compact', table.name)
+            return removed
+
+    def maybe_compact(self, table):
+        """
+        Uruchamia kompakcję tabeli, jeśli udział usuniętych wierszy przekroczył próg.
+
+        Parametry:
+        table (Table): Tabela, z której usunięto wiersze (z założoną blokadą zapisu).
+        """
+        if self.compaction_threshold is None or table.deleted_fraction() < self.compaction_threshold:
+            return
+        if not self.background_compaction:
+            self._compact(table)
+        elif table.compaction is None or table.compaction.done():
+            table.compaction = self._compactor.submit(self._compact, table)
+
+    def enable_result_cache(self, max_entries=1024, max_rows=1000000, ttl=None):
+        """
+        Włącza pamięć podręczną wyników zapytań SELECT.
+
+        Parametry:
+        max_entries (int): Największa liczba zapamiętanych wyników.
+        max_rows (int): Największa łączna liczba wierszy zapamiętanych wyników.
+        ttl (float, opcjonalnie): Czas życia wyniku w sekundach. Domyślnie bez limitu.
+
+        Zwraca:
+        ResultCache: Nowa pamięć podręczna wyników.
+        """
+        self.result_cache = ResultCache(max_entries, max_rows, ttl)
+        return self.result_cache
+
+    def disable_result_cache(self):
+        """
+        Wyłącza pamięć podręczną wyników zapytań SELECT.
+        """
+        self.result_cache = None
+
+    def add_profiler(self, profiler):
+        """
+        Rejestruje profiler wywoływany po każdej wykonanej instrukcji.
+
+        Parametry:
+        profiler (callable): Funkcja przyjmująca profil instrukcji (StatementProfile).
+        """
+        self.profilers.append(profiler)
+
+    def remove_profiler(self, profiler):
+        """
+        Wyrejestrowuje profiler.
+
+        Parametry:
+        profiler (callable): Zarejestrowany wcześniej profiler.
+
+        Podnosi:
+        ValueError: Jeśli profiler nie jest zarejestrowany.
+        """
+        self.profilers.remove(profiler)
+
+    def enable_query_statistics(self):
+        """
+        Włącza rejestr statystyk instrukcji (liczba wykonań, czasy i histogramy czasu według
+        znormalizowanego tekstu instrukcji).
+
+        Zwraca:
+        QueryStatistics: Nowy rejestr statystyk.
+        """
+        self.disable_query_statistics()
+        self.query_statistics = QueryStatistics()
+        self.add_profiler(self.query_statistics)
+        return self.query_statistics
+
+    def disable_query_statistics(self):
+        """
+        Wyłącza rejestr statystyk instrukcji.
+        """
+        if self.query_statistics is not None:
+            self.remove_profiler(self.query_statistics)
+            self.query_statistics = None
+
+    def profile(self, kind, text, parse_time=0.0):
+        """
+        Zwraca menedżer kontekstu profilujący wykonanie instrukcji (zob. profiling.statement).
+
+        Parametry:
+        kind (str): Rodzaj instrukcji.
+        text (str): Znormalizowany tekst instrukcji.
+        parse_time (float): Czas parsowania instrukcji.
+
+        Zwraca:
+        Menedżer kontekstu zwracający StatementProfile lub None, jeśli nie ma profilerów.
+        """
+        return profiling.statement(self.profilers, kind, text, parse_time)
+
+    def log(self, *record):
+        """
+        Zapisuje udaną operację w dzienniku WAL, jeśli jest podłączony.
+
+        Operacje na różnych tabelach są zapisywane równolegle, więc rekord z mniejszym numerem może
+        wrócić z dziennika później niż nowszy; lsn jest wtedy zostawiany bez zmian (migawka z cofniętym
+        lsn odtworzyłaby przy odzyskiwaniu operacje, które już zawiera).
+
+        Parametry:
+        record: Rodzaj operacji, nazwa tabeli i argumenty operacji.
+        """
+        if self.wal is not None:
+            lsn = self.wal.append(record)
+            with self._lsn_lock:
+                if lsn > self.lsn:
+                    self.lsn = lsn
 
     def get_table(self, name):
         """
@@ -92,39 +856,26 @@ class Database:
         ValueError: Jeśli tabela o podanej nazwie nie istnieje.
         TypeError: Jeśli typ danych w kolumnie jest nieprawidłowy.
         """
+        self.validate_columns(table_name, {column: (value,) for column, value in data.items()})
+
+    def validate_columns(self, table_name, data):
+        """
+        Waliduje całe kolumny danych wstawianych do tabeli (wstawianie wsadowe).
+
+        Typ i maksymalna długość kolumny pochodzą ze skompilowanego schematu tabeli (Table.schema).
+        Wartości None (NULL) są dozwolone w każdej kolumnie.
+
+        Parametry:
+        table_name (str): Nazwa tabeli.
+        data (dict): Słownik, gdzie klucze to nazwy kolumn, a wartości to listy wstawianych danych.
+
+        Podnosi:
+        ValueError: Jeśli tabela o podanej nazwie nie istnieje lub tekst jest za długi.
+        TypeError: Jeśli typ danych w kolumnie jest nieprawidłowy.
+        """
         if table_name not in self.tables:
             raise ValueError(f"Table {table_name} does not exist.")
-        table = self.tables[table_name]
-        columns = table.columns
-        for column, value in data.items():
-            if column in columns:
-                expected_type = columns[column]
-                # Sprawdzanie typu INTEGER
-                if 'INTEGER' in expected_type and not isinstance(value, int):
-                    raise TypeError(
-                        f"Invalid type for column {column}: expected INTEGER, got {type(value).__name__}")
-                # Sprawdzanie typu i długości TEXT
-                elif 'TEXT' in expected_type:
-                    max_length = int(expected_type.strip()[5:-1]) if len(expected_type.strip()) > 4 else None
-                    if not isinstance(value, str):
-                        raise TypeError(
-                            f"Invalid type for column {column}: expected TEXT, got {type(value).__name__}")
-                    if max_length and len(value) > max_length:
-                        raise ValueError(
-                            f"Invalid length for column {column}: expected max {max_length}, got {len(value)}")
-                # Sprawdzanie typu FLOAT
-                elif 'FLOAT' in expected_type and not isinstance(value, float):
-                    raise TypeError(
-                        f"Invalid type for column {column}: expected FLOAT, got {type(value).__name__}")
-                # Sprawdzanie typu BOOLEAN
-                elif 'BOOLEAN' in expected_type and not isinstance(value, bool):
-                    raise TypeError(
-                        f"Invalid type for column {column}: expected BOOLEAN, got {type(value).__name__}")
-                # Sprawdzanie typu DATE
-                elif 'DATE' in expected_type and not isinstance(value, date):
-                    raise TypeError(
-                        f"Invalid type for column {column}: expected DATE, got {type(value).__name__}")
-                # Sprawdzanie typu TIME
-                elif 'TIME' in expected_type and not isinstance(value, time):
-                    raise TypeError(
-                        f"Invalid type for column {column}: expected TIME, got {type(value).__name__}")
+        schema = self.tables[table_name].schema
+        for column, values in data.items():
+            if column in schema:
+                schema[column].validate(values)
@@ -1,4 +1,11 @@
+import logging
 from database.db_structure import Database, Table
+from database.events import log_event
+from database.sql_parser import parse
+from database.statistics import analyze
+
+logger = logging.getLogger(__name__)
+
 
 class DDL:
     def __init__(self, db_instance=None):
@@ -10,21 +17,27 @@ class DDL:
         """
         self.db_instance = db_instance or Database.get_instance()
 
-    def create_table(self, name, columns):
+    def create_table(self, name, columns, storage='list'):
         """
         Tworzy nową tabelę o podanej nazwie i kolumnach.
 
         Parametry:
         name (str): Nazwa tabeli.
         columns (dict): Słownik kolumn, gdzie klucze to nazwy kolumn, a wartości to typy kolumn.
+        storage (str): Sposób przechowywania kolumn: 'list' lub 'numpy'. Domyślnie 'list'.
 
         Podnosi:
         Exception: Jeśli tabela o podanej nazwie już istnieje.
         """
-        if name in self.db_instance.tables:
-            raise Exception(f"Table {name} already exists")
-        self.db_instance.tables[name] = Table(name, columns)
-        print(f"Table {name} created successfully with columns: {columns}")
+        with self.db_instance.profile('CREATE TABLE', f'CREATE TABLE {name}'):
+            with self.db_instance.lock:
+                if name in self.db_instance.tables:
+                    raise Exception(f"Table {name} already exists")
+                self.db_instance.tables[name] = Table(name, columns, storage)
+                self.db_instance.log('create_table', name, dict(columns), storage)
+                self.db_instance.plan_cache.clear()  # cached plans may refer to the old schema
+            log_event(logger, logging.INFO, 'create_table', "Table %s created successfully with columns: %s",
+                      name, columns, table=name, storage=storage)
 
     def drop_table(self, name):
         """
@@ -36,10 +49,15 @@ class DDL:
         Podnosi:
         Exception: Jeśli tabela o podanej nazwie nie istnieje.
         """
-        if name not in self.db_instance.tables:
-            raise Exception(f"Table {name} does not exist")
-        del self.db_instance.tables[name]
-        print(f"Table {name} dropped successfully")
+        with self.db_instance.profile('DROP TABLE', f'DROP TABLE {name}'):
+            with self.db_instance.lock:
+                if name not in self.db_instance.tables:
+                    raise Exception(f"Table {name} does not exist")
+                with self.db_instance.tables[name].lock.write():  # waits for statements in progress
+                    del self.db_instance.tables[name]
+                    self.db_instance.log('drop_table', name)
+                    self.db_instance.plan_cache.clear()  # cached plans may refer to the old schema
+            log_event(logger, logging.INFO, 'drop_table', "Table %s dropped successfully", name, table=name)
 
     def add_column(self, table_name, column_name, column_type):
         """
@@ -53,11 +71,16 @@ class DDL:
         Podnosi:
         Exception: Jeśli tabela o podanej nazwie nie istnieje.
         """
-        if table_name not in self.db_instance.tables:
-            raise Exception(f"Table {table_name} does not exist")
-        table = self.db_instance.tables[table_name]
-        table.add_column(column_name, column_type)
-        print(f"Column {column_name} of type {column_type} added to table {table_name}")
+        with self.db_instance.profile('ALTER TABLE', f'ALTER TABLE {table_name} ADD COLUMN {column_name}'):
+            if table_name not in self.db_instance.tables:
+                raise Exception(f"Table {table_name} does not exist")
+            table = self.db_instance.tables[table_name]
+            with table.lock.write():
+                table.add_column(column_name, column_type)
+                self.db_instance.log('add_column', table_name, column_name, column_type)
+                self.db_instance.plan_cache.clear()  # cached plans may refer to the old schema
+            log_event(logger, logging.INFO, 'add_column', "Column %s of type %s added to table %s",
+                      column_name, column_type, table_name, table=table_name, column=column_name)
 
     def drop_column(self, table_name, column_name):
         """
@@ -71,11 +94,123 @@ class DDL:
         Exception: Jeśli tabela o podanej nazwie nie istnieje.
         Exception: Jeśli kolumna o podanej nazwie nie istnieje w tabeli.
         """
-        if table_name not in self.db_instance.tables:
-            raise Exception(f"Table {table_name} does not exist")
-        table = self.db_instance.tables[table_name]
-        if column_name not in table.columns:
-            raise Exception(f"Column {column_name} does not exist in table {table_name}")
-        del table.columns[column_name]
-        del table.data[column_name]
-        print(f"Column {column_name} dropped from table {table_name}")
+        with self.db_instance.profile('ALTER TABLE', f'ALTER TABLE {table_name} DROP COLUMN {column_name}'):
+            if table_name not in self.db_instance.tables:
+                raise Exception(f"Table {table_name} does not exist")
+            table = self.db_instance.tables[table_name]
+            with table.lock.write():
+                if column_name not in table.columns:
+                    raise Exception(f"Column {column_name} does not exist in table {table_name}")
+                table.drop_column(column_name)
+                self.db_instance.log('drop_column', table_name, column_name)
+                self.db_instance.plan_cache.clear()  # cached plans may refer to the old schema
+            log_event(logger, logging.INFO, 'drop_column', "Column %s dropped from table %s", column_name, table_name,
+                      table=table_name, column=column_name)
+
+    def create_index(self, table_name, index_name, column_name, index_type='HASH'):
+        """
+        Tworzy indeks na kolumnie istniejącej tabeli.
+
+        Parametry:
+        table_name (str): Nazwa tabeli.
+        index_name (str): Nazwa nowego indeksu.
+        column_name (str): Nazwa indeksowanej kolumny.
+        index_type (str): Rodzaj indeksu: 'HASH' (równość) lub 'SORTED' (równość i zakresy). Domyślnie 'HASH'.
+
+        Podnosi:
+        Exception: Jeśli tabela o podanej nazwie nie istnieje.
+        ValueError: Jeśli indeksu nie można utworzyć.
+        """
+        with self.db_instance.profile('CREATE INDEX', f'CREATE INDEX {index_name} ON {table_name}'):
+            if table_name not in self.db_instance.tables:
+                raise Exception(f"Table {table_name} does not exist")
+            table = self.db_instance.tables[table_name]
+            with table.lock.write():
+                table.create_index(index_name, column_name, index_type)
+                self.db_instance.log('create_index', table_name, index_name, column_name, index_type)
+            log_event(logger, logging.INFO, 'create_index', "Index %s (%s) created on %s(%s)",
+                      index_name, index_type, table_name, column_name, table=table_name, index=index_name)
+
+    def drop_index(self, table_name, index_name):
+        """
+        Usuwa indeks z istniejącej tabeli.
+
+        Parametry:
+        table_name (str): Nazwa tabeli.
+        index_name (str): Nazwa indeksu do usunięcia.
+
+        Podnosi:
+        Exception: Jeśli tabela o podanej nazwie nie istnieje.
+        ValueError: Jeśli indeks nie istnieje.
+        """
+        with self.db_instance.profile('DROP INDEX', f'DROP INDEX {index_name} ON {table_name}'):
+            if table_name not in self.db_instance.tables:
+                raise Exception(f"Table {table_name} does not exist")
+            table = self.db_instance.tables[table_name]
+            with table.lock.write():
+                table.drop_index(index_name)
+                self.db_instance.log('drop_index', table_name, index_name)
+            log_event(logger, logging.INFO, 'drop_index', "Index %s dropped from table %s", index_name, table_name,
+                      table=table_name, index=index_name)
+
+    def analyze(self, table_name=None, buckets=16):
+        """
+        Zbiera statystyki kolumn tabeli używane przez planistę zapytań.
+
+        Najmniejsze i największe wartości oraz szkice liczby różnych wartości są potem uzupełniane
+        przy każdym zapisie; histogramy są odświeżane tylko przez ponowne ANALYZE.
+
+        Parametry:
+        table_name (str, opcjonalnie): Nazwa tabeli. Domyślnie None - wszystkie tabele.
+        buckets (int): Liczba przedziałów histogramu. Domyślnie 16.
+
+        Podnosi:
+        Exception: Jeśli tabela o podanej nazwie nie istnieje.
+        """
+        with self.db_instance.profile('ANALYZE', 'ANALYZE ' + (table_name or '')):
+            if table_name is not None and table_name not in self.db_instance.tables:
+                raise Exception(f"Table {table_name} does not exist")
+            names = [table_name] if table_name is not None else list(self.db_instance.tables)
+            for name in names:
+                table = self.db_instance.tables[name]
+                # Statystyki są uzupełniane przez zapisy, więc pisarze muszą poczekać do ich podmiany
+                with table.lock.write():
+                    table.statistics = analyze(table, buckets)
+            log_event(logger, logging.INFO, 'analyze', "Statistics collected for %s", ', '.join(names), tables=names)
+
+    def read_instruction(self, instruction):
+        """
+        Parsowanie i wykonanie instrukcji DDL w stylu SQL.
+
+        Obsługiwana składnia:
+            CREATE INDEX index_name ON table_name (column_name) [USING HASH|SORTED];
+            DROP INDEX index_name ON table_name;
+            ANALYZE [table_name];
+
+        Parametry:
+        instruction (str): Instrukcja w stylu SQL (może zawierać kilka instrukcji rozdzielonych średnikami).
+
+        Zwraca:
+        bool: True jeśli instrukcje zostały wykonane, False jeśli któraś z nich nie jest instrukcją DDL.
+
+        Podnosi:
+        TypeError: Jeśli instrukcja nie jest ciągiem znaków.
+        ValueError: Jeśli instrukcja jest niepoprawna.
+        """
+        if not isinstance(instruction, str):
+            raise TypeError(f'{instruction} is not a string')
+
+        statements = parse(instruction)
+        if not statements or any(statement.kind not in ('CREATE INDEX', 'DROP INDEX', 'ANALYZE')
+                                 for statement in statements):
+            return False
+
+        for statement in statements:
+            if statement.kind == 'CREATE INDEX':
+                self.create_index(statement.table_name, statement.index_name, statement.column_name,
+                                  statement.index_type)
+            elif statement.kind == 'DROP INDEX':
+                self.drop_index(statement.table_name, statement.index_name)
+            else:
+                self.analyze(statement.table_name)
+        return True
@@ -1,74 +1,92 @@
-import re
+import logging
+from time import perf_counter
+
+from database import profiling
+from database.events import log_event
 from database.db_structure import Database, Table
-from datetime import date, time
+from database.predicates import compile_condition, compiled_where, compiled_assignments, constant_value
+from database.sql_parser import Literal, Parameter, InsertStatement, UpdateStatement, DeleteStatement
+
+logger = logging.getLogger(__name__)
+
 
 class DataModificationLanguage:
     """Klasa do obsługi operacji języka manipulacji danymi (DML)."""
 
     __insert = 'INSERT'
-    __into = 'INTO'
-    __values = 'VALUES'
     __update = 'UPDATE'
-    __set = 'SET'
     __delete = 'DELETE'
-    __from = 'FROM'
-    __where = 'WHERE'
 
-    def __init__(self, instruction, db_instance=None):
+    def __init__(self, instruction, db_instance=None, params=()):
         """
         Inicjalizacja DataModificationLanguage z instrukcjami i instancją bazy danych.
 
         Parametry:
-        instruction (str): Instrukcja w stylu SQL.
+        instruction (str): Instrukcja w stylu SQL lub gotowy obiekt instrukcji z sql_parser.parse.
         db_instance (Database, opcjonalnie): Instancja bazy danych. Domyślnie None.
+        params (sequence, opcjonalnie): Wartości parametrów '?' instrukcji przygotowanej.
 
         Podnosi:
             TypeError: Jeśli instrukcja nie jest ciągiem znaków.
+            ValueError: Jeśli instrukcja jest niepoprawna składniowo.
         """
-        if not isinstance(instruction, str):  # check if instructions are strings
+        self.db_instance = db_instance or Database.get_instance()  # shared database instance
+        self.parse_time = 0.0  # czas parsowania instrukcji (dla profilerów)
+        if isinstance(instruction, (InsertStatement, UpdateStatement, DeleteStatement)):  # already parsed (prepared)
+            self.statements = [instruction]
+            self.statement_params = [params]
+            self.statement_texts = [None]  # the prepared statement text already holds its own literals
+        elif isinstance(instruction, str):  # check if instructions are strings
+            # in case of many instructions in one string; literals become parameters of cached plans
+            start = perf_counter()
+            self.statements, self.statement_params, self.statement_texts = self.db_instance.plan_cache.parse(
+                instruction, params)
+            self.parse_time = perf_counter() - start
+        else:
             raise TypeError(f'{instruction} is not a string')
 
-        self.allInstructions = instruction.split(';')  # in case of many instructions in one string
-        self.allInstIdx = 0  # index of instruction currently read
-        self.currentInstruction = self.allInstructions[self.allInstIdx]
-        self.instArr = self.currentInstruction.split(' ')  # current instruction split to find key words
+        self.params = params
+        self.statement = None  # statement currently executed
         self.table = None  # will be later found based on instruction
-        self.db_instance = db_instance or Database.get_instance()  # shared database instance
 
     def read_instruction(self):
         """
-        Parsowanie i wykonanie instrukcji.
+        Wykonanie sparsowanych instrukcji.
+
+        Jeśli w bazie danych są zarejestrowane profilery (Database.add_profiler), każda instrukcja
+        jest profilowana osobno; czas parsowania jest przypisywany pierwszej z nich.
 
         Zwraca:
-            bool: True jeśli instrukcja została wykonana pomyślnie, w przeciwnym razie False.
+            bool: True jeśli instrukcje zostały wykonane pomyślnie, False jeśli któraś z nich nie jest instrukcją DML.
         """
         # looking for type of instruction: insert, update, delete
-        if self.instArr[0].upper() == self.__insert and self.instArr[1].upper() == self.__into:  # syntax: INSERT INTO table_name ...
-            self.table = self.db_instance.get_table(self.instArr[2])  # table index in this case
-            self.instArr = self.instArr[3:]  # deleting already read instructions
-            self.insert()
-
-        elif self.instArr[0].upper() == self.__update:  # syntax: UPDATE table_name ...
-            self.table = self.db_instance.get_table(self.instArr[1])  # table index in this case
-            self.instArr = self.instArr[2:]  # deleting already read instructions
-            self.update()
-
-        elif self.instArr[0].upper() == self.__delete and self.instArr[1].upper() == self.__from:
-            self.table = self.db_instance.get_table(self.instArr[2])  # table index in this case
-            self.instArr = self.instArr[3:]  # deleting already read instructions
-            self.delete()
-        else:
+        if not self.statements or any(statement.kind not in (self.__insert, self.__update, self.__delete)
+                                      for statement in self.statements):
             return False
 
-        if len(self.allInstructions) > (self.allInstIdx + 1):  # checking for next instruction (if exists)
-            self.allInstIdx += 1
-            self.currentInstruction = self.allInstructions[self.allInstIdx]
-            self.instArr = self.currentInstruction.split(' ')
-            self.read_instruction()
-        else:
-            return True
-
-    def insert(self):  # syntax: column1, column2, ... VALUES value1, value2;
+        parse_time = self.parse_time
+        for statement, params, text in zip(self.statements, self.statement_params, self.statement_texts):
+            self.statement = statement
+            self.params = params
+            with self.db_instance.profile(statement.kind, statement.text, parse_time):
+                self.table = self.db_instance.get_table(statement.table_name)
+                with self.table.lock.write():  # readers never see a half-applied statement
+                    try:
+                        if statement.kind == self.__insert:
+                            self.insert()
+                        elif statement.kind == self.__update:
+                            self.update()
+                        else:
+                            self.delete()
+                    except ValueError as error:
+                        # cached plans quote the normalized text, so name the statement with its literals
+                        if text is None:
+                            raise
+                        raise ValueError(f"{error} in statement: {text}") from error
+            parse_time = 0.0
+        return True
+
+    def insert(self):  # syntax: INSERT INTO table_name (column1, column2, ...) VALUES (value1, value2, ...)
         """
         Wykonanie operacji INSERT.
 
@@ -76,100 +94,184 @@ class DataModificationLanguage:
             Exception: Jeśli liczba kolumn nie zgadza się z liczbą wartości.
             TypeError: Jeśli kolumna ma niepoprawny typ.
         """
-        # Use regex to match the columns and values
-        match = re.match(r"INSERT INTO (\w+)\s*\(([^)]+)\)\s*VALUES\s*\(([^)]+)\);?", self.currentInstruction, re.IGNORECASE)
-        if not match:
-            raise Exception(f"Invalid INSERT statement: {self.currentInstruction}")
+        columns = self.statement.columns
+        rows = [[constant_value(node, self.params) for node in row] for row in self.statement.rows]
 
-        table_name, columns_str, values_str = match.groups()
+        # Rows are passed unformatted; they are rendered only when DEBUG is enabled
+        log_event(logger, logging.DEBUG, 'insert', "Inserting %d row(s) into %s: columns %s, values %s",
+                  len(rows), self.statement.table_name, columns, rows, table=self.statement.table_name)
+
+        self.insert_batch(columns, rows)
+
+    def insert_batch(self, columns, rows):
+        """
+        Wstawienie wielu wierszy naraz: konwersja i walidacja całych kolumn, a potem jedno
+        rozszerzenie każdej kolumny tabeli. Przy błędzie żaden wiersz nie zostaje wstawiony.
 
-        # Split columns and values
-        columns = [col.strip() for col in columns_str.split(',')]
-        values = [val.strip().strip("'") for val in re.split(r",\s*(?=(?:[^']*'[^']*')*[^']*$)", values_str)]
+        Parametry:
+            columns (list): Nazwy kolumn w kolejności wartości w wierszach.
+            rows (list): Lista wierszy (krotek lub list wartości).
 
-        # Debug: Print columns and values
-        print(f"Debug: Columns: {columns}")
-        print(f"Debug: Values: {values}")
+        Zwraca:
+            int: Liczba wstawionych wierszy.
 
+        Podnosi:
+            Exception: Jeśli liczba kolumn nie zgadza się z liczbą wartości.
+            TypeError: Jeśli kolumna ma niepoprawny typ.
+        """
         # checking if amount of columns and values is correct
-        if len(columns) != len(values):
-            raise Exception(f'Column count does not match value count in {self.currentInstruction}')
-
-        self.table = self.db_instance.get_table(table_name)
-
-        data = dict(zip(columns, values))  # creating dictionary of pairs - columns and values
-        # converting types
-        for col, val in data.items():
-            if self.table.columns[col] == 'INTEGER':
-                data[col] = int(val)
-            elif self.table.columns[col] == 'DATE':
-                data[col] = date.fromisoformat(val)
-            elif self.table.columns[col] == 'TEXT':
-                data[col] = str(val)
-            elif self.table.columns[col] == 'FLOAT':
-                data[col] = float(val)
-            elif self.table.columns[col] == 'BOOLEAN':
-                data[col] = bool(val)
-            elif self.table.columns[col] == 'TIME':
-                data[col] = time.fromisoformat(val)
-            else:
-                raise TypeError(f'Column {col} is not given the right type in value {val}')
+        if any(len(row) != len(columns) for row in rows):
+            raise Exception(f'Column count does not match value count in {self.statement.text or columns}')
+        if not rows:
+            return 0
+
+        # converting and validating types column by column with the table's compiled converters
+        data = {}
+        for col, values in zip(columns, zip(*rows)):
+            convert = self.converter(col)
+            data[col] = [convert(val) for val in values]
 
         # adding data to the table
-        self.db_instance.validate_data(self.table.name, data)
-        for col, val in data.items():
-            self.table.data[col].append(val)
+        with self.table.lock.write():
+            self.table.insert_columns(data)
+            self.db_instance.log('insert', self.table.name, data)
+        profiling.add('rows_affected', len(rows))
+        return len(rows)
 
-    def update(self):  # syntax: UPDATE
+    @staticmethod
+    def executemany(table_name, rows, columns=None, db_instance=None):
+        """
+        Wstawienie wielu wierszy z poziomu Pythona bez budowania tekstu instrukcji.
+
+        Parametry:
+            table_name (str): Nazwa tabeli.
+            rows (list): Wiersze jako krotki/listy (w kolejności columns) lub słowniki kolumna -> wartość.
+            columns (list, opcjonalnie): Nazwy kolumn. Domyślnie wszystkie kolumny tabeli
+                (lub klucze pierwszego słownika).
+            db_instance (Database, opcjonalnie): Instancja bazy danych. Domyślnie None.
+
+        Zwraca:
+            int: Liczba wstawionych wierszy.
+        """
+        rows = list(rows)
+        dml = DataModificationLanguage(InsertStatement(table_name, columns, []), db_instance)
+        dml.statement = dml.statements[0]
+        dml.table = dml.db_instance.get_table(table_name)
+        if columns is None:
+            columns = list(rows[0]) if rows and isinstance(rows[0], dict) else list(dml.table.columns)
+        if rows and isinstance(rows[0], dict):
+            rows = [[row.get(col) for col in columns] for row in rows]
+        text = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        with dml.db_instance.profile('INSERT', text):
+            return dml.insert_batch(columns, rows)
+
+    def update(self):  # syntax: UPDATE table_name SET column = expression, ... WHERE condition
         """
         Wykonanie operacji UPDATE.
 
+        Warunek WHERE i wyrażenia SET są kompilowane raz dla instrukcji. Nowe wartości są obliczane
+        dla wszystkich pasujących wierszy przed zapisem (wyrażenia widzą wartości sprzed zmiany),
+        a następnie każda zmieniana kolumna jest zapisywana w jednym przebiegu.
+
         Podnosi:
-            ValueError: Jeśli nie znaleziono żadnych poprawnych aktualizacji.
+            ValueError: Jeśli nie znaleziono żadnych poprawnych aktualizacji lub wyrażenie jest nieprawidłowe.
+            TypeError: Jeśli kolumna ma niepoprawny typ.
         """
-        set_index = self.instArr.index(self.__set) + 1
-        where_index = self.instArr.index(self.__where) + 1
+        if not self.statement.assignments:
+            raise ValueError(f"No valid updates found in {self.statement.text}")
+
+        # constants are converted and validated once, before any row is touched
+        converters = {col: self.converter(col) for col, _ in self.statement.assignments}
+        constants = {}
+        for col, node in self.statement.assignments:
+            if isinstance(node, (Literal, Parameter)):
+                constants[col] = converters[col](constant_value(node, self.params))
+
+        row_ids = self.matching_rows()
+        computed = {}
+        for col, compiled in compiled_assignments(self.statement, self.table):
+            if compiled is not None:
+                convert = converters[col]
+                computed[col] = [convert(value) for value in compiled.evaluate(self.table.data, row_ids, self.params)]
+
+        updates = {col: [value] * len(row_ids) for col, value in constants.items()}
+        updates.update(computed)
+        self.table.update_columns(row_ids, updates)
+        profiling.add('rows_affected', len(row_ids))
+        if computed:
+            self.db_instance.log('update_rows', self.table.name, row_ids, updates)
+        else:
+            self.db_instance.log('update', self.table.name, row_ids, constants)
 
-        updates = self.instArr[set_index:where_index - 1]
-        conditions = self.instArr[where_index:]
+    def delete(self):  # syntax: DELETE FROM table_name WHERE condition
+        """
+        Wykonanie operacji DELETE.
+        """
+        row_ids = self.matching_rows()
+        self.table.delete_rows(row_ids)
+        profiling.add('rows_affected', len(row_ids))
+        self.db_instance.log('delete', self.table.name, row_ids)
+        self.db_instance.maybe_compact(self.table)
 
-        updates_dict = {}
-        for i in range(0, len(updates), 2):
-            if i + 1 < len(updates):
-                key = updates[i].strip(',').strip('=')
-                value = updates[i + 1].strip(',').strip('=').strip("'")
-                updates_dict[key] = value
+    def matching_rows(self):
+        """
+        Wyznaczenie wierszy spełniających warunek WHERE bieżącej instrukcji - z indeksu, jeśli to możliwe.
 
-        if not updates_dict:
-            raise ValueError(f"No valid updates found in {self.currentInstruction}")
+        Warunek jest kompilowany raz dla instrukcji, a nie sprawdzany osobno dla każdego wiersza.
 
-        for row_idx in range(len(self.table.data[next(iter(self.table.data))])):
-            row = {col: self.table.data[col][row_idx] for col in self.table.columns}
-            if self.check_condition(conditions, row):
-                for col, val in updates_dict.items():
-                    if self.table.columns[col] == 'INTEGER':
-                        self.table.data[col][row_idx] = int(val)
-                    elif self.table.columns[col] == 'DATE':
-                        self.table.data[col][row_idx] = date.fromisoformat(val)
-                    else:
-                        self.table.data[col][row_idx] = val
+        Zwraca:
+            list: Numery pasujących wierszy w kolejności rosnącej.
 
-    def delete(self):
+        Podnosi:
+            ValueError: Jeśli podano nieprawidłowy warunek.
         """
-        Wykonanie operacji DELETE.
+        if self.statement.where is None:
+            row_ids = list(self.table.all_rows())
+            profiling.add('rows_scanned', len(row_ids))
+            return row_ids
+        with profiling.planning():
+            compiled = compiled_where(self.statement, self.table)
+            candidates = self.table.candidate_rows(self.statement.where, self.params)
+        return self.table.matching_rows(compiled, candidates, self.params)
+
+    def convert_value(self, column, value):
+        """
+        Konwersja wartości z instrukcji na typ kolumny.
+
+        Parametry:
+            column (str): Nazwa kolumny.
+            value: Wartość z instrukcji (stała lub parametr).
+
+        Zwraca:
+            Wartość przekonwertowana na typ kolumny (None pozostaje bez zmian).
+
+        Podnosi:
+            ValueError: Jeśli kolumna nie istnieje w tabeli.
+            TypeError: Jeśli kolumna ma nieobsługiwany typ.
         """
-        where_index = self.instArr.index(self.__where) + 1
-        conditions = self.instArr[where_index:]
+        return self.converter(column)(value)
 
-        rows_to_delete = []
-        for row_idx in range(len(self.table.data[next(iter(self.table.data))])):
-            row = {col: self.table.data[col][row_idx] for col in self.table.columns}
-            if self.check_condition(conditions, row):
-                rows_to_delete.append(row_idx)
+    def converter(self, column):
+        """
+        Funkcja konwertująca i walidująca wartości kolumny ze skompilowanego schematu tabeli.
 
-        for row_idx in sorted(rows_to_delete, reverse=True):
-            for col in self.table.columns:
-                del self.table.data[col][row_idx]
+        Parametry:
+            column (str): Nazwa kolumny.
+
+        Zwraca:
+            function: Funkcja konwertująca pojedynczą wartość (None pozostaje bez zmian) i sprawdzająca
+                długość tekstu.
+
+        Podnosi:
+            ValueError: Jeśli kolumna nie istnieje w tabeli.
+            TypeError: Jeśli kolumna ma nieobsługiwany typ.
+        """
+        column_schema = self.table.schema.get(column)
+        if column_schema is None:
+            raise ValueError(f"Column {column} does not exist in table {self.table.name}.")
+        if column_schema.convert is None:
+            raise TypeError(f'Column {column} is not given the right type')
+        return column_schema.convert
 
     def check_condition(self, conditions, row):
         """
@@ -185,44 +287,8 @@ class DataModificationLanguage:
         Podnosi:
             ValueError: Jeśli podano nieprawidłowy warunek.
         """
-        condition_str = ' '.join(conditions)
-        if "==" in condition_str:
-            key, value = condition_str.split("==")
-            key = key.strip()
-            value = value.strip().strip("'")
-            if key in row:
-                return row[key] == value
-        elif "!=" in condition_str:
-            key, value = condition_str.split("!=")
-            key = key.strip()
-            value = value.strip().strip("'")
-            if key in row:
-                return row[key] != value
-        elif ">" in condition_str:
-            key, value = condition_str.split(">")
-            key = key.strip()
-            value = value.strip().strip("'")
-            if key in row:
-                return row[key] > value
-        elif "<" in condition_str:
-            key, value = condition_str.split("<")
-            key = key.strip()
-            value = value.strip().strip("'")
-            if key in row:
-                return row[key] < value
-        elif ">=" in condition_str:
-            key, value = condition_str.split(">=")
-            key = key.strip()
-            value = value.strip().strip("'")
-            if key in row:
-                return row[key] >= value
-        elif "<=" in condition_str:
-            key, value = condition_str.split("<=")
-            key = key.strip()
-            value = value.strip().strip("'")
-            if key in row:
-                return row[key] <= value
-        raise ValueError(f"Invalid condition: {condition_str}")
+        compiled = compile_condition(' '.join(conditions), {col: None for col in row})
+        return bool(compiled.filter({col: [value] for col, value in row.items()}, [0]))
 
     @staticmethod
     def has_comma(string):
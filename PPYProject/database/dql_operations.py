@@ -1,44 +1,123 @@
+import logging
+from time import perf_counter
+
+from database.aggregation import hash_aggregate, replace_aggregates, result_type
+from database.cursor import Cursor
 from database.db_structure import Database
+from database.events import log_event
+from database.joins import column_names, has_equality_index, hash_join, index_join, joined_values, rename_columns
+from database.locking import read_locked
+from database.parallel import parallel_scan
+from database import planner, profiling
+from database.predicates import CompiledCondition, compile_condition, compiled_where, conjuncts, constant_value
+from database.sorting import order_items, sort_key
+from database.sql_parser import Aggregate, And, ExplainStatement, SelectStatement
+
+logger = logging.getLogger(__name__)
 
 
 class DataQueryLanguage:
     """Klasa do obsługi operacji zapytania danych (DQL)."""
 
     __select = 'SELECT'
-    __from = 'FROM'
-    __where = 'WHERE'
+    __explain = 'EXPLAIN'
 
-    def __init__(self, instruction, db_instance=None):
+    def __init__(self, instruction, db_instance=None, params=()):
         """
         Inicjalizacja DataQueryLanguage z instrukcją.
 
         Parametry:
-            instruction (str): Instrukcja w stylu SQL.
+            instruction (str): Instrukcja w stylu SQL lub gotowy obiekt instrukcji z sql_parser.parse.
             db_instance (Database, opcjonalnie): Instancja bazy danych. Domyślnie None.
+            params (sequence, opcjonalnie): Wartości parametrów '?' instrukcji przygotowanej.
 
         Podnosi:
             TypeError: Jeśli instrukcja nie jest ciągiem znaków.
+            ValueError: Jeśli instrukcja jest niepoprawna składniowo.
         """
-        if not isinstance(instruction, str):
+        self.db_instance = db_instance or Database.get_instance()  # shared database instance
+        self.params = params
+        self.parse_time = 0.0  # czas parsowania instrukcji (dla profilerów)
+        self.text = None  # original text of a statement taken from the plan cache (for error messages)
+        if isinstance(instruction, (SelectStatement, ExplainStatement)):
+            self.statements = [instruction]
+        elif isinstance(instruction, str):
+            # the plan cache turns literals into parameters, so statements of the same shape are parsed once
+            start = perf_counter()
+            self.statements, bound, texts = self.db_instance.plan_cache.parse(instruction, params)
+            self.text = texts[0] if texts else None
+            self.parse_time = perf_counter() - start
+            self.params = bound[0] if bound else params
+        else:
             raise TypeError(f'{instruction} is not a string')
 
-        self.allInstructions = instruction.split(';')
-        self.currentInstruction = self.allInstructions[0]
-        self.instArr = self.currentInstruction.split(' ')
+        self.statement = None
         self.table = None
-        self.db_instance = db_instance or Database.get_instance()  # shared database instance
+        self.join_plan = []  # wybrane algorytmy złączeń ostatniego zapytania z JOIN
+        self.join_rows = []  # liczba wierszy po kolejnych złączeniach
 
     def read_instruction(self):
         """
-        Parsowanie i wykonanie instrukcji.
+        Wykonanie sparsowanej instrukcji.
+
+        Jeśli w bazie danych są zarejestrowane profilery (Database.add_profiler), wykonanie jest profilowane.
 
         Zwraca:
-            list: Wyniki zapytania SELECT.
+            list: Wyniki zapytania SELECT lub kroki planu instrukcji EXPLAIN.
         """
-        if self.instArr[0].upper() == self.__select:  # finding SELECT in instruction
-            return self.select()
-        else:
+        if not self.statements or self.statements[0].kind not in (self.__select, self.__explain):
             return False
+        statement = self.statements[0]
+        with self.db_instance.profile(statement.kind, statement.text, self.parse_time):
+            try:
+                if statement.kind == self.__select:  # finding SELECT in instruction
+                    self.statement = statement
+                    result = self.select()
+                else:
+                    self.statement = statement.statement
+                    result = self.explain()
+            except ValueError as error:
+                # cached plans quote the normalized text, so name the statement with its literals
+                if self.text is None:
+                    raise
+                raise ValueError(f"{error} in statement: {self.text}") from error
+            profiling.add('rows_returned', len(result))
+        return result
+
+    def explain(self):
+        """
+        Wykonanie instrukcji EXPLAIN: opis planu wybranego dla instrukcji SELECT, UPDATE lub DELETE.
+
+        Wyszukiwanie wierszy jest wykonywane krok po kroku, więc przy każdym kroku podawana jest
+        szacowana (ze statystyk tabeli) i rzeczywista liczba wierszy. Zapytanie SELECT jest
+        wykonywane w całości; UPDATE i DELETE nie zmieniają danych.
+
+        Zwraca:
+            list: Kroki planu - słowniki z kluczami step, detail, estimated_rows i actual_rows.
+
+        Podnosi:
+            ValueError: Jeśli instrukcja odwołuje się do nieistniejącej kolumny.
+        """
+        statement = self.statement
+        estimated = None
+        if statement.kind == self.__select and statement.joins:
+            names, projection = self.select_columns()
+            steps = [{'step': 'JOIN ' + algorithm, 'detail': alias, 'estimated_rows': None, 'actual_rows': rows}
+                     for (algorithm, alias), rows in zip(self.join_plan, self.join_rows)]
+        else:
+            self.table = self.db_instance.get_table(statement.table_name)
+            with self.table.lock.read():
+                compiled = compiled_where(statement, self.table) if statement.where is not None else None
+                steps, row_ids = planner.explain_where(self.table, compiled, self.params)
+            if statement.kind != self.__select:
+                estimated = steps[-1]['estimated_rows']
+                return steps + [{'step': statement.kind, 'detail': statement.table_name,
+                                 'estimated_rows': estimated, 'actual_rows': len(row_ids)}]
+            names, projection = self.select_columns()
+            if not (statement.aggregates or statement.group_by or statement.limit is not None):
+                estimated = steps[-1]['estimated_rows']
+        return steps + [{'step': 'RESULT', 'detail': ', '.join(names), 'estimated_rows': estimated,
+                         'actual_rows': len(projection[0]) if projection else 0}]
 
     def select(self):
         """
@@ -46,47 +125,364 @@ class DataQueryLanguage:
 
         Zwraca:
             list: Lista wierszy spełniających warunki zapytania.
+
+        Podnosi:
+            ValueError: Jeśli zapytanie odwołuje się do nieistniejącej kolumny lub niepoprawnie grupuje wiersze.
         """
-        columns = []
-        condition = []
-        index_counter = 1
+        names, projection = self.result_columns()
+        return [dict(zip(names, values)) for values in zip(*projection)]
 
-        # Extract columns
-        while index_counter < len(self.instArr) and self.instArr[index_counter].upper() != self.__from:
-            columns.append(self.instArr[index_counter].strip(','))
-            index_counter += 1
+    def result_columns(self):
+        """
+        Wykonanie operacji SELECT z użyciem pamięci podręcznej wyników, jeśli jest włączona.
 
-        # Move past the FROM keyword
-        if index_counter < len(self.instArr) and self.instArr[index_counter].upper() == self.__from:
-            index_counter += 1
-        else:
-            raise ValueError(f"Invalid SELECT statement: {self.currentInstruction}")
+        Wynik jest zapamiętywany razem z wersjami odczytywanych tabel, więc każda zmiana danych
+        lub schematu tych tabel powoduje ponowne wykonanie zapytania.
 
-        # Extract table name
-        if index_counter < len(self.instArr):
-            table_name = self.instArr[index_counter]
-            index_counter += 1
-        else:
-            raise ValueError(f"Invalid SELECT statement: {self.currentInstruction}")
+        Zwraca:
+            tuple: Nazwy kolumn wyniku oraz lista wartości każdej z nich.
+        """
+        cache = self.db_instance.result_cache
+        key = cache.key(self.statement, self.params) if cache is not None else None
+        if key is None:
+            return self.select_columns()
+        # versions are read before the query runs, so a concurrent write can only make the entry stale
+        versions = cache.versions(self.statement, self.db_instance.tables)
+        cached = cache.get(key, versions)
+        if cached is not None:
+            return cached
+        names, projection = self.select_columns()
+        cache.put(key, versions, names, projection)
+        return names, projection
 
-        # Debug: Print the table name
-        print(f"Debug: Table name: {table_name}")
+    def cursor(self, batch_size=None):
+        """
+        Wykonanie zapytania SELECT z leniwym pobieraniem wyników.
+
+        Parametry:
+            batch_size (int, opcjonalnie): Liczba wierszy tabeli skanowanych w jednym kroku.
+                Domyślnie rozmiar fragmentu skanowania bazy danych (Database.morsel_size).
+
+        Zwraca:
+            Cursor: Kursor zwracający wiersze jako krotki.
+
+        Podnosi:
+            ValueError: Jeśli instrukcja nie jest zapytaniem SELECT lub odwołuje się do nieistniejącej kolumny.
+        """
+        if not self.statements or self.statements[0].kind != self.__select:
+            raise ValueError("Only SELECT statements can be executed with a cursor")
+        self.statement = self.statements[0]
+        return Cursor(self, batch_size or self.db_instance.morsel_size)
+
+    def select_columns(self):
+        """
+        Wykonanie operacji SELECT z wynikiem w postaci kolumn.
+
+        Zwraca:
+            tuple: Nazwy kolumn wyniku oraz lista wartości każdej z nich.
+
+        Podnosi:
+            ValueError: Jeśli zapytanie odwołuje się do nieistniejącej kolumny lub niepoprawnie grupuje wiersze.
+        """
+        table_name = self.statement.table_name
+
+        log_event(logger, logging.DEBUG, 'select', "Selecting from %s", table_name, table=table_name)
+
+        if self.statement.joins:
+            return self.select_join()
 
         self.table = self.db_instance.get_table(table_name)
+        with self.table.lock.read():  # many readers at once, never during a write
+            grouped = bool(self.statement.aggregates or self.statement.group_by)
+            ordered = (bool(self.statement.order_by) or self.statement.limit is not None
+                       or self.statement.offset is not None)
+            columns = self.statement.columns or list(self.table.columns)  # SELECT * returns every column
+            for col in columns + self.statement.group_by:
+                if col not in self.table.columns:
+                    raise ValueError(f"Column {col} does not exist in table {table_name}.")
+            if grouped:
+                self.check_grouping()
+
+            projection = None
+            if self.statement.where is not None:
+                # the condition is compiled once per statement, then run over the column lists
+                with profiling.planning():
+                    compiled = compiled_where(self.statement, self.table)
+                    candidates = self.table.candidate_rows(self.statement.where, self.params)
+                if candidates is None and self.parallel():
+                    # full scan split into row-range morsels evaluated by a pool of workers
+                    row_ids, projection = parallel_scan(self.table, compiled, self.params,
+                                                        [] if grouped or ordered else columns,
+                                                        self.db_instance.parallel_workers,
+                                                        self.db_instance.morsel_size)
+                else:
+                    row_ids = self.table.matching_rows(compiled, candidates, self.params)
+            else:
+                row_ids = self.table.all_rows()
+                profiling.add('rows_scanned', len(row_ids))
+
+            if grouped:
+                return self.aggregate(row_ids)
+            if ordered:
+                aliases = {name: node.name for node, name in self.statement.items or ()}
+                accessors = []
+                for node, descending in self.statement.order_by:
+                    col = aliases.get(node.name, node.name)
+                    if col not in self.table.columns:
+                        raise ValueError(f"Column {node.name} does not exist in table {table_name}.")
+                    accessors.append((self.table.data[col].__getitem__, descending))
+                row_ids, projection = self.order_positions(row_ids, accessors), None
+            if projection is None:
+                projection = [self.table.column_values(col, row_ids) for col in columns]
+        names = columns if self.statement.items is None else [name for _, name in self.statement.items]
+        return names, projection
+
+    def check_grouping(self):
+        """
+        Sprawdzenie poprawności zapytania z funkcjami agregującymi lub GROUP BY.
+
+        Podnosi:
+            ValueError: Jeśli kolumna spoza GROUP BY występuje poza funkcją agregującą
+                lub funkcja agregująca nie pasuje do typu kolumny.
+        """
+        if self.statement.items is None:
+            raise ValueError(f"SELECT * cannot be used with GROUP BY or aggregate functions: {self.statement.text}")
+        for col in self.statement.columns:
+            if col not in self.statement.group_by:
+                raise ValueError(f"Column {col} must appear in GROUP BY or be used in an aggregate function.")
+        for aggregate in self.statement.aggregates.values():
+            if aggregate.column is None:
+                continue
+            if aggregate.column not in self.table.columns:
+                raise ValueError(f"Column {aggregate.column} does not exist in table {self.table.name}.")
+            column_type = self.table.columns[aggregate.column].split('(')[0].strip().upper()
+            if aggregate.function in ('SUM', 'AVG') and column_type not in ('INTEGER', 'FLOAT', 'BOOLEAN'):
+                raise ValueError(f"{aggregate.function} cannot be applied to {column_type} column {aggregate.column}.")
+
+    def aggregate(self, row_ids):
+        """
+        Grupowanie wierszy, obliczenie funkcji agregujących i filtrowanie grup klauzulą HAVING.
 
-        # Extract condition if present
-        if index_counter < len(self.instArr) and self.instArr[index_counter].upper() == self.__where:
-            index_counter += 1
-            condition = self.instArr[index_counter:]
+        Parametry:
+            row_ids (iterable): Numery wierszy spełniających warunek WHERE.
+
+        Zwraca:
+            tuple: Nazwy kolumn wyniku oraz lista wartości każdej z nich (po jednej dla grupy spełniającej
+            warunek HAVING).
+
+        Podnosi:
+            ValueError: Jeśli warunek HAVING jest nieprawidłowy.
+        """
+        statement = self.statement
+        aggregates = list(statement.aggregates.values())
+        result = hash_aggregate(self.table, row_ids, statement.group_by, aggregates)
+        keys = [node.key if isinstance(node, Aggregate) else node.name for node, _ in statement.items]
+        names = [name for _, name in statement.items]
+        group_count = len(next(iter(result.values())))
+        groups = range(group_count)
+        for key, name in zip(keys, names):  # HAVING and ORDER BY may refer to aliases from the SELECT list
+            result.setdefault(name, result[key])
+
+        if statement.having is not None:
+            types = {col: self.table.columns[col] for col in statement.group_by}
+            types.update({aggregate.key: result_type(aggregate, self.table.columns) for aggregate in aggregates})
+            for key, name in zip(keys, names):
+                types.setdefault(name, types[key])
+            having = CompiledCondition(replace_aggregates(statement.having), types, statement.having_text)
+            groups = having.filter(result, groups, self.params)
 
-        results = []
-        for row_idx in range(len(self.table.data[next(iter(self.table.data))])):
-            row = {col: self.table.data[col][row_idx] for col in self.table.columns}
-            if not condition or self.check_condition(condition, row):
-                result_row = {col: row[col] for col in columns}
-                results.append(result_row)
+        accessors = []
+        for node, descending in statement.order_by:
+            name = node.key if isinstance(node, Aggregate) else node.name
+            if name not in result:
+                raise ValueError(f"Column {name} must appear in GROUP BY or be used in an aggregate function.")
+            accessors.append((result[name].__getitem__, descending))
+        groups = self.order_positions(groups, accessors)
+
+        return names, [[result[key][group] for group in groups] for key in keys]
+
+    def select_join(self):
+        """
+        Wykonanie operacji SELECT ze złączeniami tabel (JOIN).
+
+        Warunki WHERE dotyczące jednej tabeli są sprawdzane przed złączeniem (z użyciem indeksów),
+        pozostałe - na złączonych wierszach. Dla każdego złączenia wybierany jest algorytm:
+        złączenie zagnieżdżonymi pętlami z indeksem, jeśli prawa tabela ma indeks na kolumnie klucza,
+        a lewa strona nie jest większa od prawej; w przeciwnym razie złączenie haszujące
+        z tablicą budowaną z mniejszej strony.
+
+        Zwraca:
+            tuple: Nazwy kolumn wyniku oraz lista wartości każdej z nich.
 
-        return results
+        Podnosi:
+            ValueError: Jeśli zapytanie odwołuje się do nieistniejącej lub niejednoznacznej kolumny,
+                powtarza alias tabeli lub zawiera funkcje agregujące.
+        """
+        statement = self.statement
+        if statement.aggregates or statement.group_by:
+            raise ValueError(f"GROUP BY and aggregate functions cannot be used with JOIN: {statement.text}")
+        tables = {statement.alias or statement.table_name: self.db_instance.get_table(statement.table_name)}
+        for join in statement.joins:
+            alias = join.alias or join.table_name
+            if alias in tables:
+                raise ValueError(f"Table {alias} appears more than once in the query; use an alias.")
+            tables[alias] = self.db_instance.get_table(join.table_name)
+        sources = {}  # qualified name alias.column -> (alias, column)
+
+        def resolve(name):
+            if '.' in name:
+                alias, column = name.split('.', 1)
+                if alias not in tables or column not in tables[alias].columns:
+                    raise ValueError(f"Column {name} does not exist.")
+            else:
+                owners = [alias for alias, table in tables.items() if name in table.columns]
+                if len(owners) != 1:
+                    raise ValueError(f"Column {name} {'is ambiguous' if owners else 'does not exist'}.")
+                alias, column = owners[0], name
+            sources[f"{alias}.{column}"] = (alias, column)
+            return f"{alias}.{column}"
+
+        with read_locked(tables.values()):  # the tables are locked in name order, so joins cannot deadlock
+            if statement.items is None:  # SELECT * returns every column of every table
+                names = [resolve(f"{alias}.{col}") for alias, table in tables.items() for col in table.columns]
+                outputs = names
+            else:
+                names = [name for _, name in statement.items]
+                outputs = [resolve(node.name) for node, _ in statement.items]
+
+            # WHERE conjuncts over a single table are pushed below the join, except for the
+            # optional side of a LEFT JOIN, where filtering first would keep unmatched rows
+            optional = {join.alias or join.table_name for join in statement.joins if join.kind == 'LEFT'}
+            pushed = {alias: [] for alias in tables}
+            residual = []
+            if statement.where is not None:
+                for part in conjuncts(rename_columns(statement.where, resolve)):
+                    owners = {sources[name][0] for name in column_names(part)}
+                    if len(owners) == 1 and not owners & optional:
+                        pushed[owners.pop()].append(part)
+                    else:
+                        residual.append(part)
+            rows = {alias: self.filter_rows(tables[alias], parts, sources) for alias, parts in pushed.items()}
+
+            base = next(iter(tables))
+            joined = {base: rows[base]}  # alias -> row ids of the joined rows
+            self.join_plan = []
+            self.join_rows = []
+            for join in statement.joins:
+                alias = join.alias or join.table_name
+                outer, inner = sources[resolve(join.left.name)], sources[resolve(join.right.name)]
+                if outer[0] == alias:
+                    outer, inner = inner, outer
+                if inner[0] != alias or outer[0] not in joined:
+                    raise ValueError(f"Invalid join condition for table {alias}: {statement.text}")
+                outer_keys = joined_values(tables[outer[0]], outer[1], joined[outer[0]])
+                table = tables[alias]
+                if has_equality_index(table, inner[1]) and len(outer_keys) <= len(rows[alias]):
+                    allowed = None if not pushed[alias] else set(rows[alias])
+                    pairs = index_join(outer_keys, table, inner[1], allowed, join.kind == 'LEFT')
+                    self.join_plan.append(('INDEX NESTED LOOP', alias))
+                else:
+                    build_outer = len(outer_keys) < len(rows[alias])
+                    pairs = hash_join(outer_keys, rows[alias], table.column_values(inner[1], rows[alias]),
+                                      join.kind == 'LEFT', build_outer)
+                    self.join_plan.append(('HASH BUILD ' + ('LEFT' if build_outer else 'RIGHT'), alias))
+                positions = [position for position, _ in pairs]
+                joined = {key: [row_ids[position] for position in positions] for key, row_ids in joined.items()}
+                joined[alias] = [row_idx for _, row_idx in pairs]
+                self.join_rows.append(len(pairs))
+
+            size = len(joined[base])
+            if residual:
+                node = residual[0] if len(residual) == 1 else And(residual)
+                used = column_names(node)
+                data = {name: joined_values(tables[sources[name][0]], sources[name][1], joined[sources[name][0]])
+                        for name in used}
+                types = {name: tables[sources[name][0]].columns[sources[name][1]] for name in used}
+                keep = CompiledCondition(node, types, statement.where_text).filter(data, range(size), self.params)
+                joined = {key: [row_ids[position] for position in keep] for key, row_ids in joined.items()}
+                size = len(keep)
+            accessors = []
+            for node, descending in statement.order_by:
+                name = outputs[names.index(node.name)] if node.name in names else resolve(node.name)
+                values = joined_values(tables[sources[name][0]], sources[name][1], joined[sources[name][0]])
+                accessors.append((values.__getitem__, descending))
+            positions = self.order_positions(range(size), accessors)
+            if positions != range(size):
+                joined = {key: [row_ids[position] for position in positions] for key, row_ids in joined.items()}
+            projection = [joined_values(tables[sources[name][0]], sources[name][1], joined[sources[name][0]])
+                          for name in outputs]
+        return names, projection
+
+    def order_positions(self, positions, accessors):
+        """
+        Sortowanie wierszy według ORDER BY i wybór fragmentu wyniku według LIMIT i OFFSET.
+
+        Z LIMIT sortowanie używa kopca ograniczonego do OFFSET + LIMIT wierszy; bez LIMIT wyniki
+        większe niż bufor sortowania bazy danych są sortowane przez scalanie serii z dysku.
+
+        Parametry:
+            positions (list | range): Numery wierszy (lub grup) w kolejności wyniku.
+            accessors (list): Pary (funkcja numer -> wartość kolumny ORDER BY, czy malejąco).
+
+        Zwraca:
+            list | range: Numery wierszy w kolejności i zakresie wyniku.
+
+        Podnosi:
+            ValueError: Jeśli LIMIT lub OFFSET nie jest nieujemną liczbą całkowitą.
+        """
+        offset, limit = self.slice_bounds()
+        if accessors:
+            return order_items(positions, sort_key(accessors), offset, limit, self.db_instance.sort_buffer_rows)
+        return positions[offset:None if limit is None else offset + limit]
+
+    def slice_bounds(self):
+        """
+        Wartości OFFSET i LIMIT zapytania.
+
+        Zwraca:
+            tuple: OFFSET (domyślnie 0) i LIMIT (domyślnie None - bez limitu).
+
+        Podnosi:
+            ValueError: Jeśli LIMIT lub OFFSET nie jest nieujemną liczbą całkowitą.
+        """
+        bounds = []
+        for node, default in ((self.statement.offset, 0), (self.statement.limit, None)):
+            value = default if node is None else constant_value(node, self.params)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+                raise ValueError(f"LIMIT and OFFSET must be non-negative integers: {self.statement.text}")
+            bounds.append(value)
+        return tuple(bounds)
+
+    def filter_rows(self, table, parts, sources):
+        """
+        Wyznaczenie wierszy jednej tabeli złączenia spełniających jej warunki z klauzuli WHERE.
+
+        Parametry:
+            table (Table): Tabela.
+            parts (list): Warunki z kolumnami w postaci alias.kolumna.
+            sources (dict): Słownik alias.kolumna -> (alias, kolumna).
+
+        Zwraca:
+            list: Numery pasujących wierszy.
+        """
+        if not parts:
+            profiling.add('rows_scanned', table.row_count() - table.deleted_count)
+            return list(table.all_rows())
+        with profiling.planning():
+            node = rename_columns(parts[0] if len(parts) == 1 else And(parts), lambda name: sources[name][1])
+            compiled = CompiledCondition(node, table.columns, self.statement.where_text)
+            candidates = table.candidate_rows(node, self.params)
+        return table.matching_rows(compiled, candidates, self.params)
+
+    def parallel(self):
+        """
+        Sprawdzenie, czy pełne skanowanie tabeli ma być wykonane równolegle.
+
+        Zwraca:
+            bool: True jeśli włączono równoległość, a tabela jest wystarczająco duża.
+        """
+        return (self.db_instance.parallel_workers > 1
+                and self.table.row_count() >= max(self.db_instance.parallel_min_rows, 2 * self.db_instance.morsel_size))
 
     def check_condition(self, condition, row):
         """
@@ -102,12 +498,8 @@ class DataQueryLanguage:
         Podnosi:
             ValueError: Jeśli podano nieprawidłowy warunek.
         """
-        condition_str = ' '.join(condition)
-        condition_str = condition_str.replace("=", "==")
-        try:
-            return eval(condition_str, {}, row)
-        except:
-            raise ValueError(f"Invalid condition: {condition_str}")
+        compiled = compile_condition(' '.join(condition), {col: None for col in row})
+        return bool(compiled.filter({col: [value] for col, value in row.items()}, [0]))
 
     @staticmethod
     def has_comma(string):
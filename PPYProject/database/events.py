@@ -0,0 +1,109 @@
+import json
+import logging
+import logging.handlers
+import queue
+
+# Loggery pakietów; moduły zapisują zdarzenia do loggerów potomnych (logging.getLogger(__name__)).
+# Bez konfiguracji (configure) zdarzenia nie są nigdzie wypisywane.
+PACKAGES = ('database', 'state_management')
+
+for _package in PACKAGES:
+    logging.getLogger(_package).addHandler(logging.NullHandler())
+
+_installed = []  # handlery dodane przez configure
+_listener = None  # QueueListener wypisujący zdarzenia w osobnym wątku
+
+
+def log_event(logger, level, event, message, *args, **fields):
+    """
+    Zapisuje zdarzenie z polami strukturalnymi.
+
+    Jeśli poziom jest wyłączony, komunikat nie jest formatowany, a rekord nie jest tworzony;
+    argumenty komunikatu są formatowane (%) dopiero przez handler.
+
+    Parametry:
+    logger (logging.Logger): Logger modułu.
+    level (int): Poziom zdarzenia (np. logging.DEBUG).
+    event (str): Nazwa zdarzenia (np. 'create_table').
+    message (str): Komunikat w stylu % (np. "Table %s created").
+    args: Argumenty komunikatu.
+    fields: Pola zdarzenia (np. table='students'), dostępne w rekordzie jako record.fields.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, *args, extra={'event': event, 'fields': fields})
+
+
+class EventFormatter(logging.Formatter):
+    """
+    Formatuje zdarzenie jako jedną linię tekstu z polami w postaci klucz=wartość
+    lub jako obiekt JSON.
+    """
+
+    def __init__(self, as_json=False):
+        """
+        Inicjalizuje formater.
+
+        Parametry:
+        as_json (bool): Czy zapisywać zdarzenia jako obiekty JSON. Domyślnie False.
+        """
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+        self.as_json = as_json
+
+    def format(self, record):
+        event = getattr(record, 'event', None)
+        fields = getattr(record, 'fields', {})
+        if self.as_json:
+            return json.dumps({'time': self.formatTime(record), 'level': record.levelname, 'logger': record.name,
+                               'event': event, 'message': record.getMessage(), **fields}, default=str)
+        line = super().format(record)
+        if event is not None:
+            line += ' ' + ' '.join([f'event={event}'] + [f'{key}={value!r}' for key, value in fields.items()])
+        return line
+
+
+def configure(level=logging.INFO, handler=None, queued=False, as_json=False):
+    """
+    Konfiguruje zapis zdarzeń pakietów database i state_management (zastępując poprzednią konfigurację).
+
+    Parametry:
+    level (int | str): Najniższy zapisywany poziom. Domyślnie logging.INFO.
+    handler (logging.Handler, opcjonalnie): Handler zapisujący zdarzenia. Domyślnie wypisywanie
+        na standardowe wyjście błędów.
+    queued (bool): Czy zapisywać zdarzenia w osobnym wątku (QueueHandler i QueueListener), tak aby
+        wykonanie instrukcji nie czekało na terminal ani plik. Domyślnie False.
+    as_json (bool): Czy handler domyślny ma zapisywać zdarzenia jako JSON. Domyślnie False.
+
+    Zwraca:
+    logging.Handler: Handler zapisujący zdarzenia.
+    """
+    global _listener
+    shutdown()
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(EventFormatter(as_json))
+    installed = handler
+    if queued:
+        events = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(events, handler, respect_handler_level=True)
+        _listener.start()
+        installed = logging.handlers.QueueHandler(events)
+    for package in PACKAGES:
+        logger = logging.getLogger(package)
+        logger.setLevel(level)
+        logger.addHandler(installed)
+    _installed.append(installed)
+    return handler
+
+
+def shutdown():
+    """
+    Zapisuje zdarzenia oczekujące w kolejce i usuwa handlery dodane przez configure.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    while _installed:
+        installed = _installed.pop()
+        for package in PACKAGES:
+            logging.getLogger(package).removeHandler(installed)
@@ -0,0 +1,259 @@
+import bisect
+import heapq
+
+# Do tej liczby nowych par wstawianie każdej z osobna jest tańsze niż scalanie całych list
+BISECT_INSERTS = 64
+
+
+class HashIndex:
+    """Indeks haszujący - szybkie wyszukiwanie wierszy po równości wartości."""
+
+    kind = 'HASH'
+    operators = ('==',)
+
+    def __init__(self, name, column):
+        """
+        Inicjalizuje pusty indeks haszujący.
+
+        Parametry:
+        name (str): Nazwa indeksu.
+        column (str): Nazwa indeksowanej kolumny.
+        """
+        self.name = name
+        self.column = column
+        self.entries = {}  # wartość -> zbiór numerów wierszy
+
+    def build(self, values):
+        """
+        Buduje indeks od nowa na podstawie wartości kolumny.
+
+        Parametry:
+        values (list): Wartości kolumny, gdzie pozycja na liście to numer wiersza.
+        """
+        self.entries = {}
+        for row_idx, value in enumerate(values):
+            self.add(value, row_idx)
+
+    def add(self, value, row_idx):
+        """
+        Dodaje wiersz do indeksu.
+
+        Parametry:
+        value: Wartość kolumny w wierszu.
+        row_idx (int): Numer wiersza.
+        """
+        self.entries.setdefault(value, set()).add(row_idx)
+
+    def add_many(self, values, start):
+        """
+        Dodaje do indeksu kolejne wiersze wstawione wsadowo.
+
+        Parametry:
+        values (list): Wartości kolumny w nowych wierszach.
+        start (int): Numer pierwszego z nowych wierszy.
+        """
+        entries = self.entries
+        for row_idx, value in enumerate(values, start):
+            entries.setdefault(value, set()).add(row_idx)
+
+    def remove(self, value, row_idx):
+        """
+        Usuwa wiersz z indeksu.
+
+        Parametry:
+        value: Wartość kolumny w wierszu.
+        row_idx (int): Numer wiersza.
+        """
+        rows = self.entries.get(value)
+        if rows is None:
+            return
+        rows.discard(row_idx)
+        if not rows:
+            del self.entries[value]
+
+    def replace_many(self, row_ids, old_values, values):
+        """
+        Zmienia wartości wielu wierszy w indeksie.
+
+        Parametry:
+        row_ids (list): Numery wierszy.
+        old_values (list): Dotychczasowe wartości kolumny w tych wierszach.
+        values (list): Nowe wartości kolumny w tych wierszach.
+        """
+        for row_idx, old_value, value in zip(row_ids, old_values, values):
+            self.remove(old_value, row_idx)
+            self.add(value, row_idx)
+
+    def lookup(self, operator, value):
+        """
+        Zwraca numery wierszy spełniających warunek.
+
+        Parametry:
+        operator (str): Operator porównania.
+        value: Wartość, z którą porównywana jest kolumna.
+
+        Zwraca:
+        list: Posortowane numery wierszy lub None, jeśli indeks nie obsługuje operatora.
+        """
+        if operator not in self.operators:
+            return None
+        return sorted(self.entries.get(value, ()))
+
+
+class SortedIndex:
+    """Indeks posortowany - wyszukiwanie wierszy po równości i zakresie wartości."""
+
+    kind = 'SORTED'
+    operators = ('==', '>', '>=', '<', '<=')
+
+    def __init__(self, name, column):
+        """
+        Inicjalizuje pusty indeks posortowany.
+
+        Parametry:
+        name (str): Nazwa indeksu.
+        column (str): Nazwa indeksowanej kolumny.
+        """
+        self.name = name
+        self.column = column
+        # Dwie równoległe listy posortowane po (wartość, numer wiersza)
+        self.keys = []
+        self.rows = []
+
+    def build(self, values):
+        """
+        Buduje indeks od nowa na podstawie wartości kolumny.
+
+        Parametry:
+        values (list): Wartości kolumny, gdzie pozycja na liście to numer wiersza.
+        """
+        pairs = sorted((value, row_idx) for row_idx, value in enumerate(values) if value is not None)
+        self.keys = [value for value, _ in pairs]
+        self.rows = [row_idx for _, row_idx in pairs]
+
+    def add(self, value, row_idx):
+        """
+        Dodaje wiersz do indeksu. Wartości None nie są indeksowane.
+
+        Parametry:
+        value: Wartość kolumny w wierszu.
+        row_idx (int): Numer wiersza.
+        """
+        if value is None:
+            return
+        position = self._position(value, row_idx)
+        self.keys.insert(position, value)
+        self.rows.insert(position, row_idx)
+
+    def _position(self, value, row_idx):
+        # Pozycja pary (wartość, numer wiersza): wśród równych wartości numery wierszy są rosnące
+        start = bisect.bisect_left(self.keys, value)
+        end = bisect.bisect_right(self.keys, value, start)
+        return bisect.bisect_left(self.rows, row_idx, start, end)
+
+    def add_many(self, values, start):
+        """
+        Dodaje do indeksu kolejne wiersze wstawione wsadowo.
+
+        Nowe pary są sortowane osobno. Jeśli wszystkie są nie mniejsze od największej wartości
+        indeksu, są dopisywane na końcu; kilka par jest wstawianych na swoje pozycje, a większa
+        partia jest scalana z istniejącymi parami w jednym przebiegu.
+
+        Parametry:
+        values (list): Wartości kolumny w nowych wierszach.
+        start (int): Numer pierwszego z nowych wierszy.
+        """
+        new_pairs = sorted((value, row_idx) for row_idx, value in enumerate(values, start) if value is not None)
+        if not new_pairs:
+            return
+        self._insert_pairs(new_pairs)
+
+    def _insert_pairs(self, new_pairs):
+        # new_pairs: posortowane pary (wartość, numer wiersza) spoza indeksu
+        if not self.keys or new_pairs[0] > (self.keys[-1], self.rows[-1]):
+            self.keys.extend(value for value, _ in new_pairs)
+            self.rows.extend(row_idx for _, row_idx in new_pairs)
+        elif len(new_pairs) <= BISECT_INSERTS:
+            for value, row_idx in new_pairs:
+                self.add(value, row_idx)
+        else:
+            pairs = list(heapq.merge(zip(self.keys, self.rows), new_pairs))
+            self.keys = [value for value, _ in pairs]
+            self.rows = [row_idx for _, row_idx in pairs]
+
+    def remove(self, value, row_idx):
+        """
+        Usuwa wiersz z indeksu.
+
+        Parametry:
+        value: Wartość kolumny w wierszu.
+        row_idx (int): Numer wiersza.
+        """
+        if value is None:
+            return
+        position = self._position(value, row_idx)
+        if position < len(self.rows) and self.rows[position] == row_idx and self.keys[position] == value:
+            del self.keys[position]
+            del self.rows[position]
+
+    def replace_many(self, row_ids, old_values, values):
+        """
+        Zmienia wartości wielu wierszy w indeksie.
+
+        Przy większej liczbie wierszy stare pary są usuwane, a nowe scalane z pozostałymi
+        w jednym przebiegu, zamiast przesuwania list przy każdym wierszu.
+
+        Parametry:
+        row_ids (list): Numery wierszy.
+        old_values (list): Dotychczasowe wartości kolumny w tych wierszach.
+        values (list): Nowe wartości kolumny w tych wierszach.
+        """
+        if len(row_ids) <= BISECT_INSERTS:
+            for row_idx, old_value, value in zip(row_ids, old_values, values):
+                self.remove(old_value, row_idx)
+                self.add(value, row_idx)
+            return
+        removed = set()
+        for row_idx, old_value in zip(row_ids, old_values):
+            if old_value is None:
+                continue
+            position = self._position(old_value, row_idx)
+            if position < len(self.rows) and self.rows[position] == row_idx and self.keys[position] == old_value:
+                removed.add(position)
+        if removed:
+            self.keys = [value for position, value in enumerate(self.keys) if position not in removed]
+            self.rows = [row_idx for position, row_idx in enumerate(self.rows) if position not in removed]
+        new_pairs = sorted((value, row_idx) for row_idx, value in zip(row_ids, values) if value is not None)
+        if new_pairs:
+            self._insert_pairs(new_pairs)
+
+    def lookup(self, operator, value):
+        """
+        Zwraca numery wierszy spełniających warunek.
+
+        Parametry:
+        operator (str): Operator porównania.
+        value: Wartość, z którą porównywana jest kolumna.
+
+        Zwraca:
+        list: Posortowane numery wierszy lub None, jeśli indeks nie obsługuje operatora.
+        """
+        if operator == '==':
+            start, end = bisect.bisect_left(self.keys, value), bisect.bisect_right(self.keys, value)
+        elif operator == '>':
+            start, end = bisect.bisect_right(self.keys, value), len(self.keys)
+        elif operator == '>=':
+            start, end = bisect.bisect_left(self.keys, value), len(self.keys)
+        elif operator == '<':
+            start, end = 0, bisect.bisect_left(self.keys, value)
+        elif operator == '<=':
+            start, end = 0, bisect.bisect_right(self.keys, value)
+        else:
+            return None
+        return sorted(self.rows[start:end])
+
+
+INDEX_TYPES = {
+    'HASH': HashIndex,
+    'SORTED': SortedIndex,
+}
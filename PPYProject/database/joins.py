@@ -0,0 +1,175 @@
+from database.sql_parser import Column, Comparison, InList, Between, And, Or, Not
+
+
+def rename_columns(node, rename):
+    """
+    Zwraca kopię drzewa wyrażenia z nazwami kolumn zmienionymi podaną funkcją.
+
+    Parametry:
+        node: Drzewo wyrażenia.
+        rename (callable): Funkcja nazwa kolumny -> nowa nazwa.
+
+    Zwraca:
+        Drzewo wyrażenia z nowymi nazwami kolumn.
+    """
+    if isinstance(node, Column):
+        return Column(rename(node.name))
+    if isinstance(node, Comparison):
+        return Comparison(node.operator, rename_columns(node.left, rename), rename_columns(node.right, rename))
+    if isinstance(node, InList):
+        return InList(rename_columns(node.operand, rename), [rename_columns(value, rename) for value in node.values],
+                      node.negated)
+    if isinstance(node, Between):
+        return Between(rename_columns(node.operand, rename), rename_columns(node.low, rename),
+                       rename_columns(node.high, rename), node.negated)
+    if isinstance(node, (And, Or)):
+        return type(node)([rename_columns(item, rename) for item in node.items])
+    if isinstance(node, Not):
+        return Not(rename_columns(node.item, rename))
+    return node
+
+
+def column_names(node, found=None):
+    """
+    Zwraca nazwy kolumn, do których odwołuje się wyrażenie.
+
+    Parametry:
+        node: Drzewo wyrażenia.
+        found (set, opcjonalnie): Zbiór uzupełniany o znalezione nazwy.
+
+    Zwraca:
+        set: Nazwy kolumn.
+    """
+    found = set() if found is None else found
+    if isinstance(node, Column):
+        found.add(node.name)
+    elif isinstance(node, Comparison):
+        column_names(node.left, found)
+        column_names(node.right, found)
+    elif isinstance(node, InList):
+        for child in [node.operand] + node.values:
+            column_names(child, found)
+    elif isinstance(node, Between):
+        for child in (node.operand, node.low, node.high):
+            column_names(child, found)
+    elif isinstance(node, (And, Or)):
+        for child in node.items:
+            column_names(child, found)
+    elif isinstance(node, Not):
+        column_names(node.item, found)
+    return found
+
+
+def hash_join(outer_keys, inner_rows, inner_keys, left=False, build_outer=False):
+    """
+    Złączenie haszujące po równości klucza.
+
+    Tablica haszująca jest budowana z jednej strony złączenia, a druga strona jest po niej
+    sprawdzana w jednym przebiegu - koszt jest liniowy względem sumy liczby wierszy obu stron.
+    Wartości None nie pasują do żadnego klucza. Niezależnie od strony budowania wynik
+    zachowuje kolejność wierszy lewej strony.
+
+    Parametry:
+        outer_keys (list): Wartości klucza w kolejnych wierszach lewej strony złączenia.
+        inner_rows (list): Numery wierszy prawej tabeli.
+        inner_keys (list): Wartości klucza w tych wierszach.
+        left (bool, opcjonalnie): LEFT JOIN - wiersz lewej strony bez dopasowania jest łączony z None.
+        build_outer (bool, opcjonalnie): Budowanie tablicy haszującej z lewej strony zamiast z prawej.
+
+    Zwraca:
+        list: Pary (pozycja wiersza lewej strony, numer wiersza prawej tabeli lub None).
+    """
+    pairs = []
+    if not build_outer:
+        buckets = {}
+        for row_idx, key in zip(inner_rows, inner_keys):
+            if key is not None:
+                buckets.setdefault(key, []).append(row_idx)
+        for position, key in enumerate(outer_keys):
+            matches = buckets.get(key) if key is not None else None
+            if matches:
+                pairs.extend([(position, row_idx) for row_idx in matches])
+            elif left:
+                pairs.append((position, None))
+        return pairs
+
+    buckets = {}
+    for position, key in enumerate(outer_keys):
+        if key is not None:
+            buckets.setdefault(key, []).append(position)
+    matches = {}  # pozycja wiersza lewej strony -> dopasowane wiersze prawej tabeli
+    for row_idx, key in zip(inner_rows, inner_keys):
+        for position in buckets.get(key, ()) if key is not None else ():
+            matches.setdefault(position, []).append(row_idx)
+    for position in range(len(outer_keys)):
+        rows = matches.get(position)
+        if rows:
+            pairs.extend([(position, row_idx) for row_idx in rows])
+        elif left:
+            pairs.append((position, None))
+    return pairs
+
+
+def index_join(outer_keys, table, column, allowed=None, left=False):
+    """
+    Złączenie zagnieżdżonymi pętlami z indeksem: dla każdego wiersza lewej strony pasujące
+    wiersze prawej tabeli są wyszukiwane w indeksie kolumny klucza.
+
+    Parametry:
+        outer_keys (list): Wartości klucza w kolejnych wierszach lewej strony złączenia.
+        table (Table): Prawa tabela złączenia.
+        column (str): Kolumna klucza prawej tabeli (z indeksem obsługującym równość).
+        allowed (set, opcjonalnie): Dopuszczalne wiersze prawej tabeli (po filtrze WHERE). Domyślnie wszystkie.
+        left (bool, opcjonalnie): LEFT JOIN - wiersz lewej strony bez dopasowania jest łączony z None.
+
+    Zwraca:
+        list: Pary (pozycja wiersza lewej strony, numer wiersza prawej tabeli lub None).
+    """
+    pairs = []
+    probes = {}  # powtarzające się klucze są wyszukiwane w indeksie tylko raz
+    for position, key in enumerate(outer_keys):
+        matches = None
+        if key is not None:
+            matches = probes.get(key)
+            if matches is None:
+                matches = table.find_rows(column, '==', key) or []
+                if allowed is not None:
+                    matches = [row_idx for row_idx in matches if row_idx in allowed]
+                probes[key] = matches
+        if matches:
+            pairs.extend([(position, row_idx) for row_idx in matches])
+        elif left:
+            pairs.append((position, None))
+    return pairs
+
+
+def has_equality_index(table, column):
+    """
+    Sprawdza, czy kolumna tabeli ma indeks obsługujący wyszukiwanie po równości.
+
+    Parametry:
+        table (Table): Tabela.
+        column (str): Nazwa kolumny.
+
+    Zwraca:
+        bool: True jeśli taki indeks istnieje.
+    """
+    return any(index.column == column and '==' in index.operators for index in table.indexes.values())
+
+
+def joined_values(table, column, row_ids):
+    """
+    Zwraca wartości kolumny z podanych wierszy, gdzie None oznacza brak wiersza (LEFT JOIN).
+
+    Parametry:
+        table (Table): Tabela.
+        column (str): Nazwa kolumny.
+        row_ids (list): Numery wierszy lub None.
+
+    Zwraca:
+        list: Wartości kolumny (None dla brakujących wierszy).
+    """
+    if None not in row_ids:
+        return table.column_values(column, row_ids)
+    values = iter(table.column_values(column, [row_idx for row_idx in row_ids if row_idx is not None]))
+    return [next(values) if row_idx is not None else None for row_idx in row_ids]
@@ -0,0 +1,120 @@
+import threading
+from contextlib import contextmanager, ExitStack
+
+
+class ReadWriteLock:
+    """
+    Blokada czytelników i pisarzy: wielu czytelników naraz albo jeden pisarz.
+
+    Oczekujący pisarz ma pierwszeństwo przed nowymi czytelnikami, więc ciągły strumień
+    zapytań nie zagłodzi zapisu. Blokada jest wielowejściowa: wątek trzymający blokadę
+    zapisu może ponownie założyć blokadę zapisu lub odczytu, a czytelnik - ponownie
+    blokadę odczytu. Zamiana blokady odczytu na blokadę zapisu nie jest dozwolona.
+    """
+
+    def __init__(self):
+        """
+        Inicjalizuje wolną blokadę.
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = {}  # identyfikator wątku -> liczba założonych blokad odczytu
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        """
+        Zakłada blokadę odczytu, czekając na zakończenie zapisu.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+
+    def release_read(self):
+        """
+        Zwalnia blokadę odczytu.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            count = self._readers[me] - 1
+            if count:
+                self._readers[me] = count
+            else:
+                del self._readers[me]
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Zakłada blokadę zapisu, czekając na zakończenie wszystkich odczytów i zapisów.
+
+        Podnosi:
+            RuntimeError: Jeśli wątek trzyma już blokadę odczytu.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        """
+        Zwalnia blokadę zapisu.
+        """
+        with self._condition:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        """
+        Menedżer kontekstu blokady odczytu.
+        """
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """
+        Menedżer kontekstu blokady zapisu.
+        """
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
+@contextmanager
+def read_locked(tables):
+    """
+    Menedżer kontekstu zakładający blokady odczytu kilku tabel.
+
+    Blokady są zakładane w kolejności nazw tabel, więc dwa wątki blokujące te same tabele
+    nie zakleszczą się z oczekującym pisarzem.
+
+    Parametry:
+        tables (iterable): Tabele (Table) do zablokowania; powtórzenia są pomijane.
+    """
+    with ExitStack() as stack:
+        for table in sorted(set(tables), key=lambda table: table.name):
+            stack.enter_context(table.lock.read())
+        yield
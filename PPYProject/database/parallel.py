@@ -0,0 +1,160 @@
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from database import profiling
+from database import shared_columns
+from database import storage as column_storage
+from database.predicates import CompiledCondition, evaluate_mask
+from database.zone_maps import scan_ranges
+
+# Pula procesów skanujących tabele list Pythona - tworzona przy pierwszym skanowaniu równoległym,
+# używana ponownie przez kolejne zapytania i zamykana przez shutdown. Procesy są uruchamiane przez
+# forkserver (lub spawn), a nie przez fork procesu, w którym działają już inne wątki (blokady tabel,
+# zapis zdarzeń w tle), więc nie dziedziczą blokad zajętych w chwili fork. Kolumny warunku procesy
+# czytają z pamięci współdzielonej (shared_columns), więc do procesu trafiają tylko nazwy segmentów
+# i granice fragmentu, a z powrotem wracają numery pasujących wierszy.
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+# Warunki skompilowane w procesie roboczym: (tekst warunku, schemat tabeli) -> CompiledCondition
+_conditions = {}
+
+
+def morsels(row_count, morsel_size):
+    """
+    Dzieli zakres wierszy tabeli na fragmenty o stałym rozmiarze.
+
+    Parametry:
+    row_count (int): Liczba wierszy tabeli.
+    morsel_size (int): Liczba wierszy we fragmencie.
+
+    Zwraca:
+    list: Pary (początek, koniec) kolejnych fragmentów.
+    """
+    return [(start, min(start + morsel_size, row_count)) for start in range(0, row_count, morsel_size)]
+
+
+def scan_morsel(table, condition, params, columns, start, end):
+    """
+    Wyznacza wiersze fragmentu tabeli spełniające warunek i pobiera z nich wartości kolumn.
+
+    Parametry:
+    table (Table): Skanowana tabela.
+    condition (CompiledCondition): Skompilowany warunek WHERE.
+    params (sequence): Wartości parametrów '?'.
+    columns (list): Kolumny do pobrania.
+    start (int): Numer pierwszego wiersza fragmentu.
+    end (int): Numer wiersza za ostatnim.
+
+    Zwraca:
+    tuple: Numery pasujących wierszy oraz lista wartości każdej z kolumn.
+    """
+    if table.storage == 'numpy':
+        data = {column: column_storage.view(values, start, end) for column, values in table.data.items()}
+        mask = evaluate_mask(condition.node, table.columns, data, end - start, condition.text, params)
+        if table.live is not None:
+            mask = mask & table.live_mask(start, end)
+        row_ids = (column_storage.np.flatnonzero(mask) + start).tolist()
+    else:
+        row_ids = condition.filter(table.data, table.all_rows(start, end), params)
+    return row_ids, [table.column_values(column, row_ids) for column in columns]
+
+
+def _scan_shared(task):
+    # Wykonywane w procesie roboczym; numery wierszy we fragmencie liczone są od 0
+    node, columns, text, params, shared, start, end = task
+    key = (text, tuple(columns.items()))
+    condition = _conditions.get(key) if text else None
+    if condition is None:
+        condition = CompiledCondition(node, columns, text)
+        if text:
+            _conditions[key] = condition
+    data, rows = shared_columns.read(shared, start, end)
+    return [start + row_idx for row_idx in condition.filter(data, rows, params)]
+
+
+def _use_processes(table):
+    # Maski NumPy zwalniają GIL, więc dla nich wystarczą wątki; listy Pythona wymagają procesów
+    return table.storage != 'numpy'
+
+
+def _process_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.close()  # zadania innych zapytań zostaną dokończone
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            if context.get_start_method() == 'forkserver':
+                context.set_forkserver_preload([__name__])
+            _pool, _pool_workers = context.Pool(workers), workers
+        return _pool
+
+
+def shutdown():
+    """
+    Zamyka pulę procesów skanowania równoległego (kolejne skanowanie utworzy nową)
+    i usuwa segmenty pamięci współdzielonej z kolumnami tabel.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        pool, _pool, _pool_workers = _pool, None, 0
+    if pool is not None:
+        pool.close()
+        pool.join()
+    shared_columns.release()
+
+
+def parallel_scan(table, condition, params, columns, workers, morsel_size):
+    """
+    Skanuje tabelę równolegle we fragmentach wierszy.
+
+    Tabele NumPy są skanowane w puli wątków, a tabele list Pythona we wspólnej puli procesów.
+    Procesy czytają kolumny warunku z pamięci współdzielonej, do której każda kolumna jest
+    zapisywana raz dla danej wersji tabeli; wartości kolumn wyniku pobierane są z tabeli
+    dopiero dla pasujących wierszy. Tabela z kolumną, której nie da się tak zapisać, jest
+    skanowana szeregowo. Fragmenty są przycinane do bloków, które według map stref mogą
+    zawierać pasujące wiersze. Wyniki fragmentów są łączone w kolejności wierszy.
+
+    Parametry:
+    table (Table): Skanowana tabela (z założoną blokadą odczytu).
+    condition (CompiledCondition): Skompilowany warunek WHERE.
+    params (sequence): Wartości parametrów '?'.
+    columns (list): Kolumny do pobrania.
+    workers (int): Liczba procesów lub wątków.
+    morsel_size (int): Liczba wierszy we fragmencie.
+
+    Zwraca:
+    tuple: Numery pasujących wierszy oraz lista wartości każdej z kolumn.
+    """
+    bounds = morsels(table.row_count(), morsel_size)
+    ranges = scan_ranges(table, condition.node, params, bounds)
+    if ranges is not None:
+        bounds = ranges
+    profiling.add('rows_scanned', sum(end - start for start, end in bounds))
+    if not bounds:
+        return [], [[] for _ in columns]
+    shared = shared_columns.share(table, condition.column_names) if _use_processes(table) else None
+    if shared is not None:
+        pool = _process_pool(workers)
+        tasks = [(condition.node, condition.columns, condition.text, params, shared, start, end)
+                 for start, end in bounds]
+        results = [(morsel_rows, [table.column_values(column, morsel_rows) for column in columns])
+                   for morsel_rows in pool.imap(_scan_shared, tasks)]
+    elif _use_processes(table):
+        results = [scan_morsel(table, condition, params, columns, *bound) for bound in bounds]
+    else:
+        with ThreadPoolExecutor(min(workers, len(bounds))) as executor:
+            results = list(executor.map(lambda bound: scan_morsel(table, condition, params, columns, *bound),
+                                        bounds))
+
+    row_ids = []
+    projection = [[] for _ in columns]
+    for morsel_rows, morsel_values in results:
+        row_ids.extend(morsel_rows)
+        for values, part in zip(projection, morsel_values):
+            values.extend(part)
+    return row_ids, projection
@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+
+from database.sql_parser import parse, tokenize, token_value
+
+# Znacznik miejsca parametru '?' podanego przez użytkownika (w odróżnieniu od stałej z tekstu)
+_USER_PARAMETER = object()
+
+
+def _ends_operand(token):
+    # Minus po operandzie (np. "age - 1") jest odejmowaniem, a nie znakiem liczby
+    if token is None:
+        return False
+    if token.kind == 'keyword':
+        return token.value in ('TRUE', 'FALSE', 'NULL')
+    return token.kind in ('string', 'number', 'param', 'name') or token.value == ')'
+
+
+def normalize(sql):
+    """
+    Zamienia stałe tekstowe i liczbowe instrukcji na parametry '?'.
+
+    Parametry:
+        sql (str): Tekst jednej lub kilku instrukcji rozdzielonych średnikami.
+
+    Zwraca:
+        tuple: Znormalizowany tekst (słowa kluczowe wielkimi literami, tokeny rozdzielone spacjami)
+        oraz dla każdej instrukcji lista wartości kolejnych parametrów: stałych z tekstu
+        lub znaczników parametrów '?' użytkownika.
+
+    Podnosi:
+        ValueError: Jeśli tekst zawiera niedozwolone znaki.
+    """
+    key, slots, _ = _normalize(sql)
+    return key, slots
+
+
+def _normalize(sql):
+    # Jak normalize, a dodatkowo zwraca oryginalny tekst każdej instrukcji (do komunikatów błędów)
+    tokens = tokenize(sql)
+    parts = []
+    slots = [[]]
+    texts = []
+    empty = True  # puste instrukcje (';;') są pomijane przez parser
+    start = 0
+    position = 0
+    while position < len(tokens):
+        previous = tokens[position - 1] if position else None
+        token = tokens[position]
+        position += 1
+        if token.kind == 'punct' and token.value == ';':
+            parts.append(';')
+            if not empty:
+                texts.append(sql[start:previous.end])
+                slots.append([])
+                empty = True
+            continue
+        if empty:
+            start = token.start
+        empty = False
+        if token.kind == 'punct' and token.value == '-' and position < len(tokens) \
+                and tokens[position].kind == 'number' and not _ends_operand(previous):
+            slots[-1].append(-token_value(tokens[position]))
+            position += 1
+            parts.append('?')
+        elif token.kind in ('string', 'number'):
+            slots[-1].append(token_value(token))
+            parts.append('?')
+        elif token.kind == 'param':
+            slots[-1].append(_USER_PARAMETER)
+            parts.append('?')
+        else:
+            parts.append(token.value)
+    if not empty:
+        texts.append(sql[start:tokens[-1].end])
+    return ' '.join(parts), slots, texts
+
+
+class PlanCache:
+    """
+    Pamięć podręczna LRU sparsowanych instrukcji DML/DQL.
+
+    Kluczem jest znormalizowany tekst instrukcji, w którym stałe są zastąpione parametrami '?',
+    więc instrukcje różniące się tylko wartościami stałych mają wspólny plan: drzewo instrukcji
+    razem z zapamiętanym w nim skompilowanym warunkiem WHERE. Stałe są przekazywane przy
+    wykonaniu jako wartości parametrów.
+    """
+
+    def __init__(self, capacity=256):
+        """
+        Inicjalizuje pustą pamięć podręczną.
+
+        Parametry:
+            capacity (int, opcjonalnie): Największa liczba planów (0 wyłącza pamięć podręczną). Domyślnie 256.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, sql, params=()):
+        """
+        Zwraca sparsowane instrukcje z pamięci podręcznej (parsując je przy pierwszym użyciu).
+
+        Parametry:
+            sql (str): Tekst jednej lub kilku instrukcji.
+            params (sequence, opcjonalnie): Wartości parametrów '?' podanych w tekście.
+
+        Zwraca:
+            tuple: Lista obiektów instrukcji, lista wartości parametrów każdej z nich
+            (stałe z tekstu i parametry użytkownika w kolejności wystąpienia) oraz lista
+            oryginalnych tekstów instrukcji (ze stałymi) do komunikatów błędów.
+
+        Podnosi:
+            ValueError: Jeśli instrukcja jest nieprawidłowa lub liczba wartości parametrów
+                nie zgadza się z liczbą parametrów '?' w instrukcjach.
+        """
+        key, slots, texts = _normalize(sql)
+        with self._lock:
+            statements = self._plans.get(key)
+            if statements is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if statements is None:
+            try:
+                statements = parse(key)
+            except ValueError:
+                parse(sql)  # komunikat błędu z oryginalnym tekstem instrukcji
+                raise
+            if self.capacity > 0:
+                with self._lock:
+                    self._plans[key] = statements
+                    while len(self._plans) > self.capacity:
+                        self._plans.popitem(last=False)
+
+        bound = []
+        expected = 0
+        for values in slots[:len(statements)]:
+            statement_params = []
+            used = 0  # numeracja parametrów użytkownika zaczyna się od nowa w każdej instrukcji
+            for value in values:
+                if value is _USER_PARAMETER:
+                    if used >= len(params):
+                        raise ValueError(f"Not enough parameters for: {sql}")
+                    value = params[used]
+                    used += 1
+                statement_params.append(value)
+            bound.append(tuple(statement_params))
+            expected = max(expected, used)
+        if len(params) != expected:
+            raise ValueError(f"Expected {expected} parameters, got {len(params)}: {sql}")
+        return statements, bound, texts
+
+    def clear(self):
+        """
+        Usuwa wszystkie plany (po zmianie schematu bazy danych).
+        """
+        with self._lock:
+            self._plans.clear()
+
+    def stats(self):
+        """
+        Zwraca statystyki pamięci podręcznej.
+
+        Zwraca:
+            dict: Liczba trafień (hits), chybień (misses), zapamiętanych planów (size) i pojemność (capacity).
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._plans), 'capacity': self.capacity}
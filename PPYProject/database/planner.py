@@ -0,0 +1,376 @@
+from database.predicates import CompiledCondition, conjuncts, constant_value, simple_comparison, coerce_literal
+from database.sql_parser import Column, Literal, Parameter, Comparison, InList, Between, And, Or, Not, Arithmetic
+from database.zone_maps import scan_ranges
+
+# Selektywność warunku, której nie da się oszacować ze statystyk
+DEFAULT_SELECTIVITY = 1 / 3
+
+
+def _column_statistics(table, node):
+    if table.statistics is None or not isinstance(node, Column):
+        return None
+    return table.statistics.columns.get(node.name)
+
+
+def _constant(table, node, column, params):
+    if not isinstance(node, (Literal, Parameter)):
+        raise TypeError('not a constant')
+    return coerce_literal(constant_value(node, params), table.columns.get(column))
+
+
+def _comparison_selectivity(statistics, operator, value):
+    if value is None:
+        return DEFAULT_SELECTIVITY
+    if not statistics.may_contain(operator, value):
+        return 0.0
+    present = 1 - statistics.null_fraction()
+    if operator == '==':
+        return present / statistics.distinct()
+    if operator == '!=':
+        return present * (1 - 1 / statistics.distinct())
+    if operator in ('<', '<='):
+        fraction = statistics.fraction_below(value, operator == '<=')
+    else:
+        fraction = statistics.fraction_below(value, operator == '>')
+        fraction = None if fraction is None else 1 - fraction
+    return present * (DEFAULT_SELECTIVITY if fraction is None else fraction)
+
+
+def selectivity(node, table, params=()):
+    """
+    Szacuje udział wierszy tabeli spełniających warunek.
+
+    Parametry:
+    node: Drzewo warunku.
+    table (Table): Tabela ze statystykami (Table.statistics) lub bez nich.
+    params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+    float: Szacowany udział od 0 do 1.
+    """
+    if isinstance(node, And):
+        result = 1.0
+        for item in node.items:
+            result *= selectivity(item, table, params)
+        return result
+    if isinstance(node, Or):
+        missed = 1.0
+        for item in node.items:
+            missed *= 1 - selectivity(item, table, params)
+        return 1 - missed
+    if isinstance(node, Not):
+        return 1 - selectivity(node.item, table, params)
+    comparison = simple_comparison(node, params)
+    if comparison is not None:
+        column, operator, value = comparison
+        statistics = _column_statistics(table, Column(column))
+        if statistics is not None:
+            return _comparison_selectivity(statistics, operator, coerce_literal(value, table.columns[column]))
+    statistics = _column_statistics(table, getattr(node, 'operand', None))
+    try:
+        if isinstance(node, InList) and statistics is not None:
+            column = node.operand.name
+            matched = sum(_comparison_selectivity(statistics, '==', _constant(table, value, column, params))
+                          for value in node.values)
+            matched = min(matched, 1 - statistics.null_fraction())
+            return 1 - statistics.null_fraction() - matched if node.negated else matched
+        if isinstance(node, Between) and statistics is not None:
+            column = node.operand.name
+            low = statistics.fraction_below(_constant(table, node.low, column, params), False)
+            high = statistics.fraction_below(_constant(table, node.high, column, params), True)
+            if low is not None and high is not None:
+                inside = max(0.0, high - low) * (1 - statistics.null_fraction())
+                return 1 - statistics.null_fraction() - inside if node.negated else inside
+    except TypeError:
+        pass
+    return DEFAULT_SELECTIVITY
+
+
+def provably_empty(node, table, params=()):
+    """
+    Sprawdza, czy ze statystyk wynika, że warunku nie spełnia żaden wiersz.
+
+    Korzysta tylko z najmniejszej i największej wartości kolumn, które zawsze obejmują
+    wszystkie wartości, więc wynik True jest pewny (a nie tylko prawdopodobny).
+
+    Parametry:
+    node: Drzewo warunku.
+    table (Table): Tabela.
+    params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+    bool: True, jeśli wynik jest na pewno pusty.
+    """
+    if table.statistics is None:
+        return False
+    if isinstance(node, And):
+        return any(provably_empty(item, table, params) for item in node.items)
+    if isinstance(node, Or):
+        return all(provably_empty(item, table, params) for item in node.items)
+    comparison = simple_comparison(node, params)
+    if comparison is not None:
+        column, operator, value = comparison
+        statistics = _column_statistics(table, Column(column))
+        return statistics is not None and not statistics.may_contain(
+            operator, coerce_literal(value, table.columns[column]))
+    statistics = _column_statistics(table, getattr(node, 'operand', None))
+    if statistics is None or getattr(node, 'negated', True):
+        return False
+    column = node.operand.name
+    try:
+        if isinstance(node, InList):
+            return all(not statistics.may_contain('==', _constant(table, value, column, params))
+                       for value in node.values)
+        low = _constant(table, node.low, column, params)
+        high = _constant(table, node.high, column, params)
+        return (not statistics.may_contain('>=', low) or not statistics.may_contain('<=', high)
+                or (low is not None and high is not None and low > high))
+    except TypeError:
+        return False
+
+
+def cost(node):
+    """
+    Zwraca względny koszt sprawdzenia warunku dla jednego wiersza (liczbę porównań).
+
+    Parametry:
+    node: Drzewo warunku.
+
+    Zwraca:
+    int: Koszt warunku.
+    """
+    if isinstance(node, (And, Or)):
+        return sum(cost(item) for item in node.items)
+    if isinstance(node, Not):
+        return cost(node.item)
+    if isinstance(node, InList):
+        # Lista samych stałych jest sprawdzana w zbiorze, pozostałe - element po elemencie
+        return 1 if all(isinstance(value, Literal) for value in node.values) else len(node.values)
+    if isinstance(node, Between):
+        return 2
+    return 1
+
+
+def order_conjuncts(parts, table, params=()):
+    """
+    Porządkuje składowe koniunkcji tak, by najpierw były sprawdzane te, które najtaniej
+    odrzucają najwięcej wierszy (malejąco według (1 - selektywność) / koszt).
+
+    Parametry:
+    parts (list): Drzewa składowych warunku.
+    table (Table): Tabela.
+    params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+    list: Pary (składowa, selektywność) w kolejności sprawdzania. Przy równych ocenach
+        zachowywana jest kolejność z instrukcji.
+    """
+    rated = [(part, selectivity(part, table, params)) for part in parts]
+    return sorted(rated, key=lambda item: -(1 - item[1]) / cost(item[0]))
+
+
+def choose_index(table, condition, params=()):
+    """
+    Wybiera składową koniunkcji, dla której warto użyć indeksu - o najmniejszej szacowanej selektywności.
+
+    Parametry:
+    table (Table): Tabela ze statystykami.
+    condition: Drzewo warunku WHERE.
+    params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+    tuple: (kolumna, operator, wartość, selektywność) lub None, jeśli żaden indeks nie pasuje.
+    """
+    best = None
+    for part in conjuncts(condition):
+        comparison = simple_comparison(part, params)
+        if comparison is None or comparison[0] not in table.columns:
+            continue
+        column, operator, value = comparison
+        if not any(index.column == column and operator in index.operators for index in table.indexes.values()):
+            continue
+        estimate = selectivity(part, table, params)
+        if best is None or estimate < best[3]:
+            best = (column, operator, coerce_literal(value, table.columns[column]), estimate)
+    return best
+
+
+def index_lookup(table, condition, params=()):
+    """
+    Wyszukuje w indeksach wiersze, które mogą spełniać warunek.
+
+    Ze statystykami przeglądany jest tylko indeks składowej wybranej przez choose_index;
+    bez nich - indeksy wszystkich pasujących składowych, a wybierany jest najmniejszy zbiór wierszy.
+
+    Parametry:
+    table (Table): Tabela.
+    condition: Drzewo warunku WHERE.
+    params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+    tuple: Użyte porównanie (kolumna, operator, wartość) i numery wierszy
+        albo (None, None), jeśli żaden indeks nie pasuje.
+    """
+    if table.statistics is not None:
+        choice = choose_index(table, condition, params)
+        if choice is None:
+            return None, None
+        row_ids = table.find_rows(*choice[:3])
+        return (choice[:3], row_ids) if row_ids is not None else (None, None)
+    best = (None, None)
+    for part in conjuncts(condition):
+        comparison = simple_comparison(part, params)
+        if comparison is None or comparison[0] not in table.columns:
+            continue
+        column, operator, value = comparison
+        value = coerce_literal(value, table.columns[column])
+        row_ids = table.find_rows(column, operator, value)
+        if row_ids is not None and (best[1] is None or len(row_ids) < len(best[1])):
+            best = ((column, operator, value), row_ids)
+    return best
+
+
+def filter_rows(table, condition, row_ids, params=()):
+    """
+    Sprawdza warunek na podanych wierszach ze składowymi koniunkcji w kolejności wybranej przez planistę.
+
+    Warunek w każdej kolejności składowych jest kompilowany raz i zapamiętywany w skompilowanym
+    warunku instrukcji. Jeśli w wybranej kolejności porównanie zgłosi błąd (np. z wartością innego typu
+    w wierszu, który w kolejności z instrukcji odrzuciłaby wcześniejsza składowa), warunek jest
+    sprawdzany ponownie w kolejności z instrukcji.
+
+    Parametry:
+    table (Table): Tabela.
+    condition (CompiledCondition): Skompilowany warunek WHERE.
+    row_ids (iterable): Numery wierszy do sprawdzenia.
+    params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+    list: Numery pasujących wierszy.
+    """
+    parts = conjuncts(condition.node)
+    if len(parts) == 1 or table.statistics is None:
+        return condition.filter(table.data, row_ids, params)
+    order = tuple(sorted(range(len(parts)), key=lambda i: -(1 - selectivity(parts[i], table, params)) / cost(parts[i])))
+    if order == tuple(range(len(parts))):
+        return condition.filter(table.data, row_ids, params)
+    orderings = condition.__dict__.setdefault('orderings', {})
+    reordered = orderings.get(order)
+    if reordered is None:
+        reordered = CompiledCondition(And([parts[i] for i in order]), condition.columns, condition.text)
+        orderings[order] = reordered
+    try:
+        return reordered.filter(table.data, row_ids, params)
+    except ValueError:
+        return condition.filter(table.data, row_ids, params)
+
+
+def describe(node, params=()):
+    """
+    Zwraca tekst warunku lub wyrażenia z podstawionymi wartościami parametrów.
+
+    Parametry:
+    node: Drzewo warunku lub wyrażenia.
+    params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+    str: Tekst w składni SQL.
+    """
+    if isinstance(node, Column):
+        return node.name
+    if isinstance(node, (Literal, Parameter)):
+        value = constant_value(node, params)
+        if value is None:
+            return 'NULL'
+        if isinstance(value, bool):
+            return 'TRUE' if value else 'FALSE'
+        if isinstance(value, (int, float)):
+            return repr(value)
+        return "'" + str(value).replace("'", "''") + "'"
+    if isinstance(node, Comparison):
+        operator = '=' if node.operator == '==' else node.operator
+        return f'{describe(node.left, params)} {operator} {describe(node.right, params)}'
+    if isinstance(node, InList):
+        values = ', '.join(describe(value, params) for value in node.values)
+        return f"{describe(node.operand, params)} {'NOT IN' if node.negated else 'IN'} ({values})"
+    if isinstance(node, Between):
+        return (f"{describe(node.operand, params)} {'NOT BETWEEN' if node.negated else 'BETWEEN'} "
+                f"{describe(node.low, params)} AND {describe(node.high, params)}")
+    if isinstance(node, (And, Or)):
+        separator = ' AND ' if isinstance(node, And) else ' OR '
+        return separator.join(f'({describe(item, params)})' if isinstance(item, (And, Or)) else describe(item, params)
+                              for item in node.items)
+    if isinstance(node, Not):
+        return f'NOT ({describe(node.item, params)})'
+    if isinstance(node, Arithmetic):
+        return f'({describe(node.left, params)} {node.operator} {describe(node.right, params)})'
+    return '?'
+
+
+def _step(step, detail, estimated, actual):
+    return {'step': step, 'detail': detail,
+            'estimated_rows': None if estimated is None else round(estimated), 'actual_rows': actual}
+
+
+def explain_where(table, condition, params=()):
+    """
+    Wykonuje wyszukiwanie wierszy spełniających warunek krok po kroku i opisuje wybrany plan.
+
+    Parametry:
+    table (Table): Tabela (z założoną blokadą odczytu).
+    condition (CompiledCondition): Skompilowany warunek WHERE lub None.
+    params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+    tuple: Lista kroków planu (słowniki step, detail, estimated_rows, actual_rows)
+        oraz numery pasujących wierszy.
+    """
+    total = table.row_count() - table.deleted_count
+    if condition is None:
+        return [_step('FULL SCAN', table.name, total, total)], table.all_rows()
+    node = condition.node
+    if provably_empty(node, table, params):
+        return [_step('EMPTY RESULT', f'{describe(node, params)} is outside the column ranges', 0, 0)], []
+
+    comparison, candidates = index_lookup(table, node, params)
+    steps = []
+    estimated = total
+    if candidates is not None:
+        column, operator, value = comparison
+        index = next(index for index in sorted(table.indexes.values(), key=lambda index: index.kind != 'HASH')
+                     if index.column == column and operator in index.operators)
+        lookup = Comparison(operator, Column(column), Literal(value))
+        estimated = total * selectivity(lookup, table)
+        steps.append(_step('INDEX LOOKUP', f'{index.name}: {describe(lookup)}', estimated, len(candidates)))
+        row_ids = candidates
+    else:
+        ranges = scan_ranges(table, node, params)
+        if ranges is None:
+            steps.append(_step('FULL SCAN', table.name, total, total))
+            row_ids = table.all_rows()
+        else:
+            row_ids = [row_idx for start, end in ranges for row_idx in table.all_rows(start, end)]
+            scanned = sum(end - start for start, end in ranges)
+            blocks = -(-table.row_count() // table.block_size)
+            kept = sum(-(-end // table.block_size) - start // table.block_size for start, end in ranges)
+            steps.append(_step('BLOCK SCAN', f'{table.name}: {kept} of {blocks} blocks ({scanned} rows)',
+                               total, len(row_ids)))
+
+    parts = conjuncts(node)
+    ordered = order_conjuncts(parts, table, params) if table.statistics is not None else \
+        [(part, DEFAULT_SELECTIVITY) for part in parts]
+    scanned, filters = row_ids, []
+    try:
+        for part, fraction in ordered:
+            looked_up = simple_comparison(part, params)
+            # Selektywność składowej użytej do wyszukania w indeksie jest już uwzględniona
+            if comparison is None or looked_up is None or looked_up[:2] != comparison[:2] \
+                    or coerce_literal(looked_up[2], table.columns[looked_up[0]]) != comparison[2]:
+                estimated *= fraction
+            row_ids = CompiledCondition(part, table.columns, condition.text).filter(table.data, row_ids, params)
+            filters.append(_step('FILTER', describe(part, params), estimated, len(row_ids)))
+    except ValueError:
+        # Kolejność z instrukcji (zob. filter_rows)
+        row_ids = condition.filter(table.data, scanned, params)
+        filters = [_step('FILTER', describe(node, params), estimated, len(row_ids))]
+    return steps + filters, row_ids
@@ -0,0 +1,635 @@
+import operator
+from datetime import date, time
+
+from database.storage import np, DictionaryColumn, EncodedTextColumn, take
+from database.sql_parser import (Column, Literal, Parameter, Comparison, InList, Between, And, Or, Not,
+                                 Arithmetic, FLIPPED, parse_expression)
+
+
+def parse_condition(text):
+    """
+    Parsuje tekst warunku WHERE do drzewa wyrażenia.
+
+    Obsługiwane są operatory =, ==, !=, <>, <, <=, >, >=, IN, BETWEEN, AND, OR, NOT oraz nawiasy.
+
+    Parametry:
+        text (str): Tekst warunku.
+
+    Zwraca:
+        Drzewo warunku (Comparison, InList, Between, And, Or, Not, Column, Literal lub Parameter).
+
+    Podnosi:
+        ValueError: Jeśli warunek jest nieprawidłowy.
+    """
+    return parse_expression(text)
+
+
+def conjuncts(node):
+    """
+    Zwraca listę warunków połączonych na najwyższym poziomie operatorem AND.
+
+    Parametry:
+        node: Drzewo warunku.
+
+    Zwraca:
+        list: Warunki składowe koniunkcji.
+    """
+    if isinstance(node, And):
+        return [item for child in node.items for item in conjuncts(child)]
+    return [node]
+
+
+def constant_value(node, params=()):
+    """
+    Zwraca wartość stałej lub związanego parametru.
+
+    Parametry:
+        node (Literal | Parameter): Węzeł stałej.
+        params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+        Wartość stałej.
+    """
+    if isinstance(node, Parameter):
+        return params[node.index]
+    return node.value
+
+
+def simple_comparison(node, params=()):
+    """
+    Rozpoznaje porównanie postaci "kolumna operator stała" (lub odwrotnie).
+
+    Parametry:
+        node: Drzewo warunku.
+        params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+        tuple: (kolumna, operator, wartość) lub None.
+    """
+    if not isinstance(node, Comparison):
+        return None
+    if isinstance(node.left, Column) and isinstance(node.right, (Literal, Parameter)):
+        return node.left.name, node.operator, constant_value(node.right, params)
+    if isinstance(node.left, (Literal, Parameter)) and isinstance(node.right, Column):
+        return node.right.name, FLIPPED[node.operator], constant_value(node.left, params)
+    return None
+
+
+def coerce_literal(value, column_type):
+    """
+    Dopasowuje stałą z warunku do typu kolumny, z którą jest porównywana.
+
+    Parametry:
+        value: Stała z warunku.
+        column_type (str): Typ kolumny.
+
+    Zwraca:
+        Wartość przekonwertowana dla kolumn DATE/TIME/FLOAT, w pozostałych przypadkach bez zmian.
+    """
+    if column_type is None or value is None:
+        return value
+    try:
+        if 'DATE' in column_type and isinstance(value, str):
+            return date.fromisoformat(value)
+        if 'TIME' in column_type and isinstance(value, str):
+            return time.fromisoformat(value)
+    except ValueError:
+        return value
+    if 'FLOAT' in column_type and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def _null_safe(function):
+    # Działanie arytmetyczne z NULL daje NULL
+    def apply(left, right):
+        if left is None or right is None:
+            return None
+        return function(left, right)
+    return apply
+
+
+# Funkcje działań arytmetycznych dostępne w kodzie generowanym dla wyrażeń
+_ARITHMETIC = {
+    '+': ('_add', _null_safe(operator.add)),
+    '-': ('_sub', _null_safe(operator.sub)),
+    '*': ('_mul', _null_safe(operator.mul)),
+    '/': ('_div', _null_safe(operator.truediv)),
+}
+
+
+def _member_set(values):
+    # Zbiór pozwala sprawdzić przynależność w czasie O(1); wartości niehaszowalne zostają w krotce
+    try:
+        return frozenset(values)
+    except TypeError:
+        return tuple(values)
+
+
+class CompiledCondition:
+    """
+    Warunek WHERE skompilowany do kodu Pythona.
+
+    Kompilacja odbywa się raz na instrukcję; wygenerowana funkcja odwołuje się bezpośrednio
+    do list kolumn, więc dla wiersza nie jest budowany słownik ani ponownie parsowany tekst.
+
+    Wartości NULL (None): porównania =, != i IN traktują NULL jak zwykłą wartość (kolumna = NULL
+    wybiera wiersze z NULL), porównania <, <=, >, >= i BETWEEN z NULL nie są spełnione, działania
+    arytmetyczne z NULL dają NULL, a NOT jest zwykłym zaprzeczeniem. Tak samo oblicza warunek
+    evaluate_mask dla tabel NumPy.
+
+    Dla kolumn kodowanych słownikowo (DictionaryColumn) przy pierwszym wiązaniu kompilowany jest
+    osobny wariant warunku, który czyta kody wierszy: porównania "kolumna = stała", "kolumna != stała"
+    i IN ze stałymi lub parametrami porównują kody, a pozostałe wyrażenia dekodują wartość z listy słownika.
+    """
+
+    label = 'condition'  # rodzaj wyrażenia w komunikatach błędów
+
+    def __init__(self, node, columns, text='', encoded=frozenset()):
+        """
+        Kompiluje drzewo warunku dla tabeli o podanym schemacie.
+
+        Parametry:
+            node: Drzewo warunku z parse_condition.
+            columns (dict): Słownik kolumna -> typ kolumny.
+            text (str): Tekst warunku, używany w komunikatach błędów.
+            encoded (frozenset): Kolumny kodowane słownikowo, dla których generowany jest kod czytający kody.
+
+        Podnosi:
+            ValueError: Jeśli warunek odwołuje się do nieistniejącej kolumny.
+        """
+        self.node = node
+        self.text = text
+        self.columns = columns
+        self.encoded = encoded
+        self.column_names = []  # kolumny używane w warunku, w kolejności zmiennych c0, c1, ...
+        self.constants = []  # stałe warunku, w kolejności zmiennych k0, k1, ...
+        self.parameters = []  # (pozycja stałej, numer parametru, typ kolumny) dla parametrów '?'
+        self.member_sets = []  # (pozycja stałej, stałe, numery parametrów, typ kolumny) dla list IN z parametrami
+        self.coded = []  # (pozycja stałej, kolumna, czy lista IN) - stałe zamieniane przy wiązaniu na kody kolumny
+        self._variants = {}  # zbiór kolumn kodowanych -> wariant warunku
+        expression = self._generate(node)
+        # Dla kolumny kodowanej zmienna cN to kody wierszy, a dN - lista dekodująca (DictionaryColumn.decoder)
+        arguments = ', '.join([f'c{i}' for i in range(len(self.column_names))] +
+                              [f'k{i}' for i in range(len(self.constants))] +
+                              [f'd{i}' for i, name in enumerate(self.column_names) if name in encoded])
+        namespace = {name: function for name, function in _ARITHMETIC.values()}
+        exec(compile(self._source(arguments, expression), '<where>', 'exec'), namespace)
+        self._bind = namespace['_bind']
+
+    def _source(self, arguments, expression):
+        return (f"def _bind({arguments}):\n"
+                f"    def matches(i):\n"
+                f"        return {expression}\n"
+                f"    def select(row_ids):\n"
+                f"        return [i for i in row_ids if {expression}]\n"
+                f"    return matches, select\n")
+
+    def _column(self, name):
+        if name not in self.columns:
+            raise ValueError(f"Invalid {self.label}: unknown column {name} in {self.text}")
+        if name not in self.column_names:
+            self.column_names.append(name)
+        position = self.column_names.index(name)
+        if name in self.encoded:
+            return f'd{position}[c{position}[i]]'
+        return f'c{position}[i]'
+
+    def _code(self, name):
+        # Kod wiersza kolumny kodowanej (bez dekodowania wartości)
+        self._column(name)
+        return f'c{self.column_names.index(name)}[i]'
+
+    def _coded_constant(self, node, name):
+        # Stała porównywana z kodami kolumny - przy wiązaniu zamieniana na kod (lub zbiór kodów)
+        self.coded.append((len(self.constants), name, False))
+        return self._operand(node, self.columns.get(name))
+
+    def _members(self, values, column_type):
+        # Lista IN ze stałych i parametrów '?' jest jedną stałą - zbiorem wartości; parametry (a po
+        # przejściu przez PlanCache każda stała jest parametrem) są dopisywane do zbioru w bind()
+        literals = [coerce_literal(value.value, column_type) for value in values if isinstance(value, Literal)]
+        indexes = [value.index for value in values if isinstance(value, Parameter)]
+        if indexes:
+            self.member_sets.append((len(self.constants), literals, indexes, column_type))
+            return self._constant(None)
+        return self._constant(_member_set(literals))
+
+    def _constant(self, value):
+        self.constants.append(value)
+        return f'k{len(self.constants) - 1}'
+
+    def _operand(self, node, column_type=None):
+        if isinstance(node, Column):
+            return self._column(node.name)
+        if isinstance(node, Literal):
+            return self._constant(coerce_literal(node.value, column_type))
+        if isinstance(node, Parameter):
+            # Wartość parametru zostanie podstawiona dopiero w bind()
+            self.parameters.append((len(self.constants), node.index, column_type))
+            return self._constant(None)
+        return f'({self._generate(node)})'
+
+    @staticmethod
+    def _not_null(expression, *operands):
+        # Porównanie <, <=, >, >= (i BETWEEN) z NULL nie jest spełnione - operandy, które mogą być None,
+        # są sprawdzane przed porównaniem
+        checks = []
+        for node, code in operands:
+            if isinstance(node, Literal):
+                if node.value is None:
+                    return 'False'
+            else:
+                checks.append(f'{code} is not None')
+        return ' and '.join(checks + [expression])
+
+    def _type_of(self, *nodes):
+        for node in nodes:
+            if isinstance(node, Column):
+                return self.columns.get(node.name)
+        return None
+
+    def _generate(self, node):
+        if isinstance(node, And):
+            return ' and '.join(f'({self._generate(item)})' for item in node.items)
+        if isinstance(node, Or):
+            return ' or '.join(f'({self._generate(item)})' for item in node.items)
+        if isinstance(node, Not):
+            return f'not ({self._generate(node.item)})'
+        if isinstance(node, Comparison):
+            if node.operator in ('==', '!='):
+                for column, other in ((node.left, node.right), (node.right, node.left)):
+                    if isinstance(column, Column) and column.name in self.encoded \
+                            and isinstance(other, (Literal, Parameter)):
+                        return f'{self._code(column.name)} {node.operator} {self._coded_constant(other, column.name)}'
+            column_type = self._type_of(node.left, node.right)
+            left, right = self._operand(node.left, column_type), self._operand(node.right, column_type)
+            if node.operator in ('==', '!='):
+                return f'{left} {node.operator} {right}'
+            return self._not_null(f'{left} {node.operator} {right}', (node.left, left), (node.right, right))
+        if isinstance(node, InList):
+            column_type = self._type_of(node.operand)
+            operator = 'not in' if node.negated else 'in'
+            if isinstance(node.operand, Column) and node.operand.name in self.encoded \
+                    and all(isinstance(value, (Literal, Parameter)) for value in node.values):
+                # Zbiór wartości (także z parametrów) jest przy wiązaniu zamieniany na zbiór kodów
+                name = node.operand.name
+                self.coded.append((len(self.constants), name, True))
+                return f'{self._code(name)} {operator} {self._members(node.values, column_type)}'
+            if all(isinstance(value, (Literal, Parameter)) for value in node.values):
+                members = self._members(node.values, column_type)
+            else:
+                members = '(' + ', '.join(self._operand(value, column_type) for value in node.values) + ',)'
+            return f'{self._operand(node.operand, column_type)} {operator} {members}'
+        if isinstance(node, Between):
+            column_type = self._type_of(node.operand, node.low, node.high)
+            operands = [(item, self._operand(item, column_type)) for item in (node.low, node.operand, node.high)]
+            expression = self._not_null(' <= '.join(code for _, code in operands), *operands)
+            return f'not ({expression})' if node.negated else expression
+        if isinstance(node, Arithmetic):
+            column_type = self._type_of(node.left, node.right)
+            return (f'{_ARITHMETIC[node.operator][0]}({self._operand(node.left, column_type)}, '
+                    f'{self._operand(node.right, column_type)})')
+        if isinstance(node, (Column, Literal, Parameter)):
+            return self._operand(node)
+        raise ValueError(f"Invalid {self.label}: {self.text}")
+
+    def bind(self, data, params=()):
+        """
+        Wiąże skompilowany warunek z listami kolumn tabeli i wartościami parametrów.
+
+        Parametry:
+            data (dict): Słownik kolumna -> lista wartości (Table.data).
+            params (sequence): Wartości parametrów '?'.
+
+        Zwraca:
+            tuple: Funkcje (matches, select): matches(numer_wiersza) -> bool
+            oraz select(numery_wierszy) -> lista pasujących numerów wierszy.
+        """
+        encoded = frozenset(name for name in self.column_names if isinstance(data[name], DictionaryColumn))
+        if encoded != self.encoded:
+            variant = self._variants.get(encoded)
+            if variant is None:
+                variant = self._variants[encoded] = type(self)(self.node, self.columns, self.text, encoded)
+            return variant.bind(data, params)
+        constants = self.constants
+        if self.parameters or self.member_sets or self.coded:
+            constants = list(constants)
+            for position, index, column_type in self.parameters:
+                constants[position] = coerce_literal(params[index], column_type)
+            for position, literals, indexes, column_type in self.member_sets:
+                constants[position] = _member_set(literals + [coerce_literal(params[index], column_type)
+                                                              for index in indexes])
+            for position, name, members in self.coded:
+                code_of = data[name].code_of
+                constants[position] = frozenset(map(code_of, constants[position])) if members \
+                    else code_of(constants[position])
+        columns = [data[name].codes if name in encoded else data[name] for name in self.column_names]
+        decoders = [data[name].decoder() for name in self.column_names if name in encoded]
+        return self._bind(*columns, *constants, *decoders)
+
+    def filter(self, data, row_ids, params=()):
+        """
+        Zwraca numery wierszy spełniających warunek.
+
+        Parametry:
+            data (dict): Słownik kolumna -> lista wartości (Table.data).
+            row_ids (iterable): Numery wierszy do sprawdzenia.
+            params (sequence): Wartości parametrów '?'.
+
+        Zwraca:
+            list: Numery pasujących wierszy.
+
+        Podnosi:
+            ValueError: Jeśli wartości w kolumnach nie dają się porównać.
+        """
+        _, select = self.bind(data, params)
+        try:
+            return select(row_ids)
+        except TypeError as error:
+            raise ValueError(f"Invalid condition: {self.text} ({error})")
+
+
+def compiled_where(statement, table):
+    """
+    Zwraca skompilowany warunek WHERE instrukcji dla podanej tabeli.
+
+    Warunek jest kompilowany przy pierwszym wykonaniu i zapamiętywany w obiekcie instrukcji,
+    więc instrukcja przygotowana wykonywana wielokrotnie kompiluje go tylko raz
+    (ponownie dopiero po zmianie schematu tabeli).
+
+    Parametry:
+        statement: Obiekt instrukcji z klauzulą WHERE (statement.where nie może być None).
+        table (Table): Tabela, na której wykonywana jest instrukcja.
+
+    Zwraca:
+        CompiledCondition: Skompilowany warunek.
+    """
+    schema = tuple(table.columns.items())
+    cached = statement.compiled
+    if cached is None or cached[0] is not table or cached[1] != schema:
+        cached = (table, schema, CompiledCondition(statement.where, table.columns, statement.where_text))
+        statement.compiled = cached
+    return cached[2]
+
+
+def compiled_assignments(statement, table):
+    """
+    Zwraca skompilowane wyrażenia SET instrukcji UPDATE dla podanej tabeli.
+
+    Jak w compiled_where, wyrażenia są kompilowane raz i zapamiętywane w obiekcie instrukcji.
+    Stałe i parametry nie są kompilowane - ich wartość jest wspólna dla wszystkich wierszy.
+
+    Parametry:
+        statement (UpdateStatement): Instrukcja UPDATE.
+        table (Table): Tabela, na której wykonywana jest instrukcja.
+
+    Zwraca:
+        list: Pary (kolumna, CompiledExpression lub None dla stałej).
+    """
+    schema = tuple(table.columns.items())
+    cached = statement.compiled_assignments
+    if cached is None or cached[0] is not table or cached[1] != schema:
+        assignments = [(column, None if isinstance(node, (Literal, Parameter))
+                        else CompiledExpression(node, table.columns, statement.text))
+                       for column, node in statement.assignments]
+        cached = (table, schema, assignments)
+        statement.compiled_assignments = cached
+    return cached[2]
+
+
+def compile_condition(text, columns):
+    """
+    Parsuje i kompiluje warunek WHERE dla tabeli o podanym schemacie.
+
+    Parametry:
+        text (str): Tekst warunku.
+        columns (dict): Słownik kolumna -> typ kolumny.
+
+    Zwraca:
+        CompiledCondition: Skompilowany warunek.
+
+    Podnosi:
+        ValueError: Jeśli warunek jest nieprawidłowy.
+    """
+    return CompiledCondition(parse_condition(text), columns, text)
+
+
+class CompiledExpression(CompiledCondition):
+    """
+    Wyrażenie SET instrukcji UPDATE skompilowane do kodu Pythona.
+
+    Wygenerowana funkcja oblicza wartości wyrażenia dla wszystkich zmienianych wierszy w jednym przebiegu.
+    """
+
+    label = 'expression'
+
+    def _source(self, arguments, expression):
+        return (f"def _bind({arguments}):\n"
+                f"    def values(row_ids):\n"
+                f"        return [{expression} for i in row_ids]\n"
+                f"    return values\n")
+
+    def evaluate(self, data, row_ids, params=()):
+        """
+        Oblicza wartości wyrażenia dla podanych wierszy.
+
+        Parametry:
+            data (dict): Słownik kolumna -> kolumna tabeli (Table.data).
+            row_ids (list): Numery wierszy.
+            params (sequence): Wartości parametrów '?'.
+
+        Zwraca:
+            list: Wartości wyrażenia w kolejności numerów wierszy (None, jeśli operand jest None).
+
+        Podnosi:
+            ValueError: Jeśli działania nie da się wykonać na wartościach kolumn.
+        """
+        if any(not isinstance(data[name], list) for name in self.column_names):
+            # Kolumny NumPy są odczytywane jedną operacją, a wyrażenie liczone na listach wartości
+            data = {name: take(data[name], row_ids) for name in self.column_names}
+            row_ids = range(len(row_ids))
+        values = self.bind(data, params)
+        try:
+            return values(row_ids)
+        except (TypeError, ZeroDivisionError) as error:
+            raise ValueError(f"Invalid expression: {self.text} ({error})")
+
+
+_COMPARE = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+
+class _MaskEvaluator:
+    """
+    Obliczanie warunku dla całej tabeli naraz jako maski logicznej NumPy.
+
+    Wartości NULL są traktowane tak samo jak w CompiledCondition, więc wynik nie zależy
+    od sposobu przechowywania tabeli.
+    """
+
+    def __init__(self, columns, data, size, text, params):
+        self.columns = columns
+        self.data = data
+        self.size = size
+        self.text = text
+        self.params = params
+
+    def literal(self, node):
+        if isinstance(node, Parameter):
+            return Literal(self.params[node.index])
+        return node
+
+    def column(self, name):
+        if name not in self.columns:
+            raise ValueError(f"Invalid condition: unknown column {name} in {self.text}")
+        return self.data[name]
+
+    def array(self, name):
+        values = self.column(name)
+        if isinstance(values, list):
+            return np.array(values, dtype=object)
+        return values.array()
+
+    def valid(self, name):
+        values = self.column(name)
+        if isinstance(values, list):
+            valid = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+            return None if valid.all() else valid
+        return values.valid()
+
+    def constant(self, name, value):
+        value = coerce_literal(value, self.columns.get(name))
+        values = self.column(name)
+        if isinstance(value, date) and not isinstance(values, list) and values.array().dtype.kind == 'M':
+            return np.datetime64(value, 'D')
+        return value
+
+    def evaluate(self, node):
+        if isinstance(node, And):
+            mask = self.evaluate(node.items[0])
+            for item in node.items[1:]:
+                mask = mask & self.evaluate(item)
+            return mask
+        if isinstance(node, Or):
+            mask = self.evaluate(node.items[0])
+            for item in node.items[1:]:
+                mask = mask | self.evaluate(item)
+            return mask
+        if isinstance(node, Not):
+            return ~self.evaluate(node.item)
+        if isinstance(node, Comparison):
+            return self.compare(node.operator, node.left, node.right)
+        if isinstance(node, InList):
+            mask = self.member(node.operand, node.values)
+            return ~mask if node.negated else mask
+        if isinstance(node, Between):
+            mask = self.compare('<=', node.low, node.operand) & self.compare('<=', node.operand, node.high)
+            return ~mask if node.negated else mask
+        if isinstance(node, (Literal, Parameter)):
+            return np.full(self.size, bool(self.literal(node).value))
+        if isinstance(node, Column):
+            mask = self.array(node.name).astype(bool)
+            valid = self.valid(node.name)
+            return mask if valid is None else mask & valid
+        raise ValueError(f"Invalid condition: {self.text}")
+
+    def compare(self, operator_name, left, right):
+        left, right = self.literal(left), self.literal(right)
+        if isinstance(left, Literal) and isinstance(right, Column):
+            left, right, operator_name = right, left, FLIPPED[operator_name]
+        if isinstance(left, Literal):
+            if operator_name not in ('==', '!=') and (left.value is None or right.value is None):
+                return np.zeros(self.size, dtype=bool)
+            return np.full(self.size, bool(_COMPARE[operator_name](left.value, right.value)))
+        if not isinstance(left, Column):
+            raise ValueError(f"Invalid condition: {self.text}")
+        values, valid = self.column(left.name), self.valid(left.name)
+        if isinstance(right, Column):
+            other, other_valid = self.array(right.name), self.valid(right.name)
+        elif right.value is None:
+            # Porównanie z NULL: = wybiera wiersze z NULL, != pozostałe, a <, <=, >, >= żadnego
+            if operator_name not in ('==', '!=') or valid is None:
+                return np.full(self.size, operator_name == '!=')
+            return ~valid if operator_name == '==' else valid
+        elif isinstance(values, EncodedTextColumn) and operator_name in ('==', '!=') and isinstance(right.value, str):
+            # Równość dla kolumny kodowanej słownikowo porównuje kody, a nie napisy (NULL ma własny kod)
+            return _COMPARE[operator_name](values.codes.array(), values.code_of(right.value))
+        else:
+            other, other_valid = self.constant(left.name, right.value), None
+        both = other_valid if valid is None else valid if other_valid is None else valid & other_valid
+        if operator_name not in ('==', '!='):
+            return self.apply(operator_name, self.array(left.name), other, both)
+        # Równość: NULL jest równy tylko NULL
+        mask = self.apply('==', self.array(left.name), other, both)
+        if valid is not None and other_valid is not None:
+            mask |= ~(valid | other_valid)
+        return mask if operator_name == '==' else ~mask
+
+    def apply(self, operator_name, values, other, valid):
+        # Porównanie tylko w wierszach, w których oba operandy są różne od NULL (pozostałe nie pasują)
+        if valid is not None:
+            values = values[valid]
+            if isinstance(other, np.ndarray):
+                other = other[valid]
+        try:
+            result = _COMPARE[operator_name](values, other)
+        except TypeError as error:
+            raise ValueError(f"Invalid condition: {self.text} ({error})")
+        if not isinstance(result, np.ndarray):
+            # Porównanie z wartością innego typu - równość nigdy nie zachodzi
+            if operator_name != '==':
+                raise ValueError(f"Invalid condition: {self.text}")
+            result = np.zeros(len(values), dtype=bool)
+        result = result.astype(bool, copy=False)
+        if valid is None:
+            return result
+        mask = np.zeros(self.size, dtype=bool)
+        mask[valid] = result
+        return mask
+
+    def member(self, operand, values):
+        values = [self.literal(value) for value in values]
+        if not isinstance(operand, Column) or not all(isinstance(value, Literal) for value in values):
+            raise ValueError(f"Invalid condition: {self.text}")
+        column = self.column(operand.name)
+        if isinstance(column, EncodedTextColumn):
+            # code_of(None) zwraca kod NULL, więc NULL na liście wybiera wiersze z NULL
+            return np.isin(column.codes.array(), [column.code_of(value.value) for value in values])
+        constants = np.array([self.constant(operand.name, value.value) for value in values
+                              if value.value is not None], dtype=object)
+        array, valid = self.array(operand.name), self.valid(operand.name)
+        try:
+            found = np.isin(array if valid is None else array[valid], constants)
+        except TypeError as error:
+            raise ValueError(f"Invalid condition: {self.text} ({error})")
+        if valid is None:
+            return found
+        mask = np.zeros(self.size, dtype=bool)
+        mask[valid] = found
+        if len(constants) < len(values):
+            mask |= ~valid
+        return mask
+
+
+def evaluate_mask(node, columns, data, size, text='', params=()):
+    """
+    Oblicza warunek dla wszystkich wierszy naraz (wymaga NumPy).
+
+    Parametry:
+        node: Drzewo warunku z parse_condition.
+        columns (dict): Słownik kolumna -> typ kolumny.
+        data (dict): Słownik kolumna -> kolumna (Table.data).
+        size (int): Liczba wierszy.
+        text (str): Tekst warunku, używany w komunikatach błędów.
+        params (sequence): Wartości parametrów '?'.
+
+    Zwraca:
+        numpy.ndarray: Maska logiczna wierszy spełniających warunek.
+
+    Podnosi:
+        ValueError: Jeśli warunek jest nieprawidłowy.
+    """
+    return _MaskEvaluator(columns, data, size, text, params).evaluate(node)
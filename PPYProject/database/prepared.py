@@ -0,0 +1,116 @@
+from database.db_structure import Database
+from database.dml_operations import DataModificationLanguage
+from database.dql_operations import DataQueryLanguage
+from database.predicates import constant_value
+from database.sql_parser import parse
+
+
+class PreparedStatement:
+    """
+    Instrukcja przygotowana: parsowana raz, wykonywana wielokrotnie z różnymi parametrami '?'.
+    """
+
+    def __init__(self, sql, db_instance=None):
+        """
+        Parsuje instrukcję z parametrami '?'.
+
+        Parametry:
+            sql (str): Pojedyncza instrukcja SELECT, INSERT, UPDATE lub DELETE.
+            db_instance (Database, opcjonalnie): Instancja bazy danych. Domyślnie None.
+
+        Podnosi:
+            TypeError: Jeśli instrukcja nie jest ciągiem znaków.
+            ValueError: Jeśli instrukcja jest niepoprawna lub tekst zawiera więcej niż jedną instrukcję.
+        """
+        if not isinstance(sql, str):
+            raise TypeError(f'{sql} is not a string')
+        statements = parse(sql)
+        if len(statements) != 1:
+            raise ValueError(f"A prepared statement must contain exactly one instruction: {sql}")
+        self.sql = sql
+        self.statement = statements[0]
+        self.parameter_count = self.statement.parameter_count
+        self.db_instance = db_instance or Database.get_instance()
+
+    def execute(self, params=()):
+        """
+        Wykonuje instrukcję z podanymi wartościami parametrów.
+
+        Parametry:
+            params (sequence): Wartości parametrów '?' w kolejności wystąpienia.
+
+        Zwraca:
+            list: Wyniki dla instrukcji SELECT, kroki planu dla EXPLAIN, True dla instrukcji DML.
+
+        Podnosi:
+            ValueError: Jeśli liczba parametrów jest niezgodna z instrukcją.
+        """
+        if len(params) != self.parameter_count:
+            raise ValueError(f"Expected {self.parameter_count} parameters, got {len(params)}")
+        if self.statement.kind in ('SELECT', 'EXPLAIN'):
+            return DataQueryLanguage(self.statement, self.db_instance, params).read_instruction()
+        return DataModificationLanguage(self.statement, self.db_instance, params).read_instruction()
+
+    def cursor(self, params=(), batch_size=None):
+        """
+        Wykonuje zapytanie SELECT z podanymi wartościami parametrów, zwracając wiersze leniwie.
+
+        Parametry:
+            params (sequence): Wartości parametrów '?' w kolejności wystąpienia.
+            batch_size (int, opcjonalnie): Liczba wierszy tabeli skanowanych w jednym kroku.
+
+        Zwraca:
+            Cursor: Kursor wyniku zapytania.
+
+        Podnosi:
+            ValueError: Jeśli instrukcja nie jest zapytaniem SELECT lub liczba parametrów jest niezgodna.
+        """
+        if len(params) != self.parameter_count:
+            raise ValueError(f"Expected {self.parameter_count} parameters, got {len(params)}")
+        return DataQueryLanguage(self.statement, self.db_instance, params).cursor(batch_size)
+
+    def executemany(self, param_rows):
+        """
+        Wykonuje instrukcję dla każdego zestawu parametrów.
+
+        Dla INSERT wszystkie zestawy są wstawiane jedną operacją wsadową
+        (konwersja i walidacja całych kolumn, jedno rozszerzenie każdej kolumny).
+
+        Parametry:
+            param_rows (iterable): Zestawy wartości parametrów.
+
+        Zwraca:
+            int: Liczba wykonań (dla INSERT - liczba wstawionych wierszy).
+
+        Podnosi:
+            ValueError: Jeśli liczba parametrów jest niezgodna z instrukcją.
+        """
+        param_rows = list(param_rows)
+        for params in param_rows:
+            if len(params) != self.parameter_count:
+                raise ValueError(f"Expected {self.parameter_count} parameters, got {len(params)}")
+        if self.statement.kind != 'INSERT':
+            for params in param_rows:
+                self.execute(params)
+            return len(param_rows)
+
+        dml = DataModificationLanguage(self.statement, self.db_instance)
+        dml.statement = self.statement
+        dml.table = self.db_instance.get_table(self.statement.table_name)
+        rows = [[constant_value(node, params) for node in template]
+                for params in param_rows for template in self.statement.rows]
+        return dml.insert_batch(self.statement.columns, rows)
+
+
+def prepare(sql, db_instance=None):
+    """
+    Przygotowuje instrukcję do wielokrotnego wykonania.
+
+    Parametry:
+        sql (str): Pojedyncza instrukcja z parametrami '?'.
+        db_instance (Database, opcjonalnie): Instancja bazy danych. Domyślnie None.
+
+    Zwraca:
+        PreparedStatement: Instrukcja przygotowana.
+    """
+    return PreparedStatement(sql, db_instance)
@@ -0,0 +1,221 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Profil instrukcji wykonywanej w bieżącym wątku (StatementProfile lub brak atrybutu)
+_current = threading.local()
+
+# Górne granice przedziałów histogramu czasu wykonania (w milisekundach); ostatni przedział jest otwarty
+LATENCY_BUCKETS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# Liczniki profilu sumowane w rejestrze statystyk
+COUNTERS = ('rows_scanned', 'rows_returned', 'rows_affected', 'index_hits', 'bytes_written')
+
+
+class StatementProfile:
+    """
+    Profil jednej wykonanej instrukcji: czasy kolejnych faz i liczniki pracy.
+
+    Czasy są podawane w sekundach. bytes_written to liczba bajtów dopisanych do dziennika WAL.
+    """
+
+    def __init__(self, kind, text, parse_time=0.0):
+        """
+        Inicjalizuje profil instrukcji.
+
+        Parametry:
+        kind (str): Rodzaj instrukcji (np. 'SELECT', 'INSERT', 'CREATE TABLE').
+        text (str): Znormalizowany tekst instrukcji (stałe zastąpione przez '?').
+        parse_time (float): Czas parsowania instrukcji.
+        """
+        self.kind = kind
+        self.text = text
+        self.parse_time = parse_time
+        self.plan_time = 0.0
+        self.execute_time = 0.0
+        self.rows_scanned = 0
+        self.rows_returned = 0
+        self.rows_affected = 0
+        self.index_hits = 0
+        self.bytes_written = 0
+        self.error = None  # nazwa klasy wyjątku, jeśli instrukcja się nie powiodła
+
+    @property
+    def total_time(self):
+        return self.parse_time + self.execute_time
+
+    def as_dict(self):
+        """
+        Zwraca profil jako słownik.
+
+        Zwraca:
+        dict: Rodzaj, tekst, czasy faz, liczniki i błąd instrukcji.
+        """
+        return {'kind': self.kind, 'text': self.text, 'parse_time': self.parse_time, 'plan_time': self.plan_time,
+                'execute_time': self.execute_time, 'total_time': self.total_time,
+                **{counter: getattr(self, counter) for counter in COUNTERS}, 'error': self.error}
+
+
+def current():
+    """
+    Zwraca profil instrukcji wykonywanej w bieżącym wątku.
+
+    Zwraca:
+    StatementProfile: Profil lub None, jeśli instrukcja nie jest profilowana.
+    """
+    return getattr(_current, 'profile', None)
+
+
+def add(counter, amount=1):
+    """
+    Zwiększa licznik profilu bieżącej instrukcji (bez profilu nic nie robi).
+
+    Parametry:
+    counter (str): Nazwa licznika (jeden z COUNTERS).
+    amount (int): Wartość dodawana do licznika.
+    """
+    profile = getattr(_current, 'profile', None)
+    if profile is not None:
+        setattr(profile, counter, getattr(profile, counter) + amount)
+
+
+@contextmanager
+def planning():
+    """
+    Mierzy czas planowania (kompilacja warunku, wybór indeksu i bloków) bieżącej instrukcji.
+    """
+    profile = getattr(_current, 'profile', None)
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.plan_time += time.perf_counter() - start
+
+
+@contextmanager
+def statement(profilers, kind, text, parse_time=0.0):
+    """
+    Profiluje wykonanie instrukcji i przekazuje gotowy profil do wszystkich profilerów.
+
+    Bez zarejestrowanych profilerów instrukcja nie jest profilowana (zwracany jest None).
+
+    Parametry:
+    profilers (list): Funkcje wywoływane z gotowym profilem (Database.profilers).
+    kind (str): Rodzaj instrukcji.
+    text (str): Znormalizowany tekst instrukcji.
+    parse_time (float): Czas parsowania instrukcji zmierzony przed wykonaniem.
+
+    Zwraca:
+    StatementProfile: Profil instrukcji lub None.
+    """
+    if not profilers:
+        yield None
+        return
+    profile = StatementProfile(kind, text, parse_time)
+    outer = getattr(_current, 'profile', None)
+    _current.profile = profile
+    start = time.perf_counter()
+    try:
+        yield profile
+    except BaseException as error:
+        profile.error = type(error).__name__
+        raise
+    finally:
+        profile.execute_time = time.perf_counter() - start
+        _current.profile = outer
+        for profiler in list(profilers):
+            profiler(profile)
+
+
+class QueryStatistics:
+    """
+    Rejestr statystyk wykonanych instrukcji zbieranych według znormalizowanego tekstu instrukcji.
+
+    Dla każdej instrukcji zapamiętywana jest liczba wykonań i błędów, łączny i największy czas,
+    sumy liczników profilu oraz histogram czasu wykonania. Stałe w tekście są zastąpione przez '?',
+    więc liczba wpisów zależy od liczby różnych kształtów instrukcji, a nie od liczby wykonań.
+    """
+
+    def __init__(self):
+        """
+        Inicjalizuje pusty rejestr.
+        """
+        self._entries = {}  # (rodzaj, tekst) -> słownik statystyk
+        self._lock = threading.Lock()
+
+    def __call__(self, profile):
+        """
+        Dopisuje profil wykonanej instrukcji do statystyk (rejestr jest profilerem Database).
+
+        Parametry:
+        profile (StatementProfile): Profil instrukcji.
+        """
+        key = (profile.kind, profile.text)
+        total = profile.total_time
+        bucket = bisect_left(LATENCY_BUCKETS, total * 1000)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {'kind': profile.kind, 'text': profile.text, 'count': 0, 'errors': 0,
+                         'total_time': 0.0, 'max_time': 0.0, 'parse_time': 0.0, 'plan_time': 0.0,
+                         **{counter: 0 for counter in COUNTERS},
+                         'latency_histogram': [0] * (len(LATENCY_BUCKETS) + 1)}
+                self._entries[key] = entry
+            entry['count'] += 1
+            entry['errors'] += profile.error is not None
+            entry['total_time'] += total
+            entry['max_time'] = max(entry['max_time'], total)
+            entry['parse_time'] += profile.parse_time
+            entry['plan_time'] += profile.plan_time
+            for counter in COUNTERS:
+                entry[counter] += getattr(profile, counter)
+            entry['latency_histogram'][bucket] += 1
+
+    def snapshot(self):
+        """
+        Zwraca kopię statystyk wszystkich instrukcji.
+
+        Zwraca:
+        list: Słowniki statystyk (z dodanym średnim czasem mean_time), od największego łącznego czasu.
+        """
+        with self._lock:
+            entries = [dict(entry, latency_histogram=list(entry['latency_histogram']))
+                       for entry in self._entries.values()]
+        for entry in entries:
+            entry['mean_time'] = entry['total_time'] / entry['count']
+        return sorted(entries, key=lambda entry: entry['total_time'], reverse=True)
+
+    def to_json(self, indent=None):
+        """
+        Zwraca statystyki jako tekst JSON.
+
+        Parametry:
+        indent (int, opcjonalnie): Wcięcie JSON. Domyślnie None - zapis w jednej linii.
+
+        Zwraca:
+        str: Obiekt JSON z granicami przedziałów histogramu (latency_buckets_ms) i listą instrukcji (statements).
+        """
+        return json.dumps({'latency_buckets_ms': list(LATENCY_BUCKETS), 'statements': self.snapshot()},
+                          indent=indent)
+
+    def dump(self, filename):
+        """
+        Zapisuje statystyki do pliku JSON.
+
+        Parametry:
+        filename (str): Ścieżka pliku.
+        """
+        with open(filename, 'w') as file:
+            file.write(self.to_json(indent=2))
+
+    def clear(self):
+        """
+        Usuwa wszystkie statystyki.
+        """
+        with self._lock:
+            self._entries.clear()
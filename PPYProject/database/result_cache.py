@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Pamięć podręczna wyników zapytań SELECT.
+
+    Kluczem jest tekst instrukcji razem z wartościami parametrów. Przy każdym wyniku zapamiętywane
+    są wersje tabel, z których go obliczono; wynik jest używany tylko wtedy, gdy żadna z tych
+    tabel nie zmieniła się od tego czasu (Table.version) i nie minął jego czas życia.
+    Po przekroczeniu limitu wyników lub łącznej liczby wierszy usuwane są najdawniej używane wyniki.
+    """
+
+    def __init__(self, max_entries=1024, max_rows=1000000, ttl=None):
+        """
+        Inicjalizuje pustą pamięć podręczną wyników.
+
+        Parametry:
+            max_entries (int, opcjonalnie): Największa liczba zapamiętanych wyników. Domyślnie 1024.
+            max_rows (int, opcjonalnie): Największa łączna liczba wierszy zapamiętanych wyników;
+                większe wyniki nie są zapamiętywane. Domyślnie 1000000.
+            ttl (float, opcjonalnie): Czas życia wyniku w sekundach. Domyślnie None - bez limitu.
+
+        Podnosi:
+            ValueError: Jeśli limity nie są dodatnie.
+        """
+        if max_entries < 1 or max_rows < 1 or (ttl is not None and ttl <= 0):
+            raise ValueError("Result cache limits must be positive")
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.rows = 0
+        self._entries = OrderedDict()  # klucz -> (wersje tabel, chwila wygaśnięcia, nazwy kolumn, kolumny)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(statement, params):
+        """
+        Zwraca klucz wyniku instrukcji lub None, jeśli parametrów nie da się użyć jako klucza.
+
+        Parametry:
+            statement (SelectStatement): Instrukcja SELECT.
+            params (sequence): Wartości parametrów '?'.
+
+        Zwraca:
+            tuple: Klucz wyniku lub None.
+        """
+        key = (statement.text, tuple(params))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def versions(statement, tables):
+        """
+        Zwraca bieżące wersje tabel, z których czyta instrukcja.
+
+        Parametry:
+            statement (SelectStatement): Instrukcja SELECT.
+            tables (dict): Tabele bazy danych (Database.tables).
+
+        Zwraca:
+            tuple: Wersje kolejnych tabel (None dla tabeli, która nie istnieje).
+        """
+        names = [statement.table_name] + [join.table_name for join in statement.joins]
+        return tuple(tables[name].version if name in tables else None for name in names)
+
+    def get(self, key, versions):
+        """
+        Zwraca zapamiętany wynik, jeśli jest aktualny.
+
+        Parametry:
+            key (tuple): Klucz wyniku (ResultCache.key).
+            versions (tuple): Bieżące wersje tabel zapytania.
+
+        Zwraca:
+            tuple: Nazwy kolumn i lista wartości każdej z nich albo None, jeśli wyniku nie ma lub jest nieaktualny.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] != versions or (entry[1] is not None and entry[1] <= time.monotonic())):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2], entry[3]
+
+    def put(self, key, versions, names, projection):
+        """
+        Zapamiętuje wynik zapytania.
+
+        Parametry:
+            key (tuple): Klucz wyniku (ResultCache.key).
+            versions (tuple): Wersje tabel odczytane przed wykonaniem zapytania.
+            names (list): Nazwy kolumn wyniku.
+            projection (list): Lista wartości każdej z kolumn wyniku.
+        """
+        row_count = len(projection[0]) if projection else 0
+        if row_count > self.max_rows:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        # Krotki chronią zapamiętany wynik przed zmianą przez wywołującego
+        entry = (versions, expires, tuple(names), tuple(tuple(values) for values in projection), row_count)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.rows += row_count
+            while len(self._entries) > self.max_entries or self.rows > self.max_rows:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.rows -= entry[4]
+
+    def clear(self):
+        """
+        Usuwa wszystkie zapamiętane wyniki.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.rows = 0
+
+    def stats(self):
+        """
+        Zwraca statystyki pamięci podręcznej.
+
+        Zwraca:
+            dict: Liczba trafień (hits), chybień (misses), zapamiętanych wyników (size) i ich wierszy (rows).
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'rows': self.rows}
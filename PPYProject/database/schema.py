@@ -0,0 +1,123 @@
+from datetime import date, time
+
+# Klasy Pythona odpowiadające typom kolumn
+PYTHON_TYPES = {
+    'INTEGER': int,
+    'TEXT': str,
+    'FLOAT': float,
+    'BOOLEAN': bool,
+    'DATE': date,
+    'TIME': time,
+}
+
+
+def parse_column_type(column_type):
+    """
+    Rozdziela typ kolumny na typ bazowy i największą długość.
+
+    Parametry:
+    column_type (str): Typ kolumny (np. 'INTEGER', 'TEXT(50)').
+
+    Zwraca:
+    tuple: Typ bazowy wielkimi literami (np. 'TEXT') i największa długość lub None.
+    """
+    base_type, _, rest = column_type.partition('(')
+    length = rest.rstrip().rstrip(')').strip()
+    return base_type.strip().upper(), int(length) if length.isdigit() and int(length) else None
+
+
+def _to_bool(value):
+    return value.strip().lower() in ('true', 't', '1') if isinstance(value, str) else bool(value)
+
+
+def _converter(name, base_type, max_length):
+    # Każda funkcja przepuszcza None (NULL), a wartość już mającą typ kolumny zwraca bez konwersji
+    if base_type == 'INTEGER':
+        def convert(value):
+            return value if value is None or type(value) is int else int(value)
+    elif base_type == 'FLOAT':
+        def convert(value):
+            return value if value is None or type(value) is float else float(value)
+    elif base_type == 'BOOLEAN':
+        def convert(value):
+            return value if value is None or type(value) is bool else _to_bool(value)
+    elif base_type == 'DATE':
+        def convert(value):
+            return value if value is None or isinstance(value, date) else date.fromisoformat(value)
+    elif base_type == 'TIME':
+        def convert(value):
+            return value if value is None or isinstance(value, time) else time.fromisoformat(value)
+    elif base_type == 'TEXT' and max_length is None:
+        def convert(value):
+            return value if value is None or type(value) is str else str(value)
+    elif base_type == 'TEXT':
+        def convert(value):
+            if value is None:
+                return None
+            if type(value) is not str:
+                value = str(value)
+            if len(value) > max_length:
+                raise ValueError(f"Invalid length for column {name}: expected max {max_length}, got {len(value)}")
+            return value
+    else:
+        return None
+    return convert
+
+
+class ColumnSchema:
+    """
+    Opis kolumny skompilowany raz dla schematu tabeli: typ bazowy, klasa wartości, największa
+    długość tekstu oraz funkcja konwertująca i walidująca pojedynczą wartość.
+    """
+
+    def __init__(self, name, column_type):
+        """
+        Kompiluje opis kolumny.
+
+        Parametry:
+        name (str): Nazwa kolumny.
+        column_type (str): Typ kolumny (np. 'TEXT(50)').
+        """
+        self.name = name
+        self.column_type = column_type
+        self.base_type, self.max_length = parse_column_type(column_type)
+        self.python_type = PYTHON_TYPES.get(self.base_type)
+        # Funkcja wartość -> wartość typu kolumny (None dla nieobsługiwanego typu). Podnosi ValueError
+        # lub TypeError, jeśli wartości nie da się przekonwertować albo tekst jest za długi.
+        self.convert = _converter(name, self.base_type, self.max_length)
+
+    def validate(self, values):
+        """
+        Sprawdza, czy wartości mają typ kolumny i mieszczą się w jej długości (bez konwersji).
+
+        Parametry:
+        values (iterable): Wartości kolumny (None jest dozwolone).
+
+        Podnosi:
+        TypeError: Jeśli wartość ma nieprawidłowy typ.
+        ValueError: Jeśli tekst jest za długi.
+        """
+        if self.python_type is None:
+            return
+        for value in values:
+            if value is not None and not isinstance(value, self.python_type):
+                raise TypeError(f"Invalid type for column {self.name}: expected {self.base_type}, "
+                                f"got {type(value).__name__}")
+        if self.max_length is not None and self.base_type == 'TEXT':
+            longest = max((len(value) for value in values if value is not None), default=0)
+            if longest > self.max_length:
+                raise ValueError(
+                    f"Invalid length for column {self.name}: expected max {self.max_length}, got {longest}")
+
+
+def compile_schema(columns):
+    """
+    Kompiluje opisy wszystkich kolumn tabeli.
+
+    Parametry:
+    columns (dict): Słownik kolumna -> typ kolumny.
+
+    Zwraca:
+    dict: Słownik kolumna -> ColumnSchema.
+    """
+    return {name: ColumnSchema(name, column_type) for name, column_type in columns.items()}
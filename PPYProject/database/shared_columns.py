@@ -0,0 +1,229 @@
+import threading
+from array import array
+from datetime import date, time
+from itertools import compress
+from multiprocessing import shared_memory
+
+from database.schema import parse_column_type
+from database.storage import DictionaryColumn
+
+# Kolumny listowe zapisywane w pamięci współdzielonej jako tablice o stałej szerokości (kod typu modułu array);
+# daty są zapisywane jako numer dnia, a czas jako liczba mikrosekund od północy
+_FIXED_WIDTH = {
+    'INTEGER': 'q',
+    'FLOAT': 'd',
+    'BOOLEAN': 'B',
+    'DATE': 'q',
+    'TIME': 'q',
+}
+_ALIGNMENT = 8
+
+# Segmenty opublikowane przez proces główny: (tabela, kolumna lub None dla mapy żywych wierszy)
+# -> (wersja danych i układu tabeli, opis segmentu, SharedMemory). Segment jest zastępowany nowym,
+# gdy tabela się zmieni, i usuwany przez release.
+_published = {}
+_published_lock = threading.Lock()
+
+# Segmenty dołączone w procesie roboczym: nazwa segmentu -> _Attached
+_attached = {}
+# Nazwa ostatnio dołączonego segmentu dla klucza (tabela, kolumna) - starszy segment jest wtedy zamykany
+_current = {}
+
+
+def _time_value(value):
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+
+
+def _from_time_value(value):
+    seconds, microsecond = divmod(value, 1000000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, microsecond)
+
+
+def _text_parts(values):
+    # Przesunięcia (uint64, n+1) i wspólny blok UTF-8
+    encoded = [b'' if value is None else value.encode('utf-8') for value in values]
+    offsets = array('Q', [0])
+    position = 0
+    for chunk in encoded:
+        position += len(chunk)
+        offsets.append(position)
+    return [('offsets', 'Q', offsets.tobytes()), ('blob', 'B', b''.join(encoded))]
+
+
+def _encode(values, column_type):
+    """
+    Koduje kolumnę listową jako nazwane części bajtów.
+
+    Zwraca:
+    tuple: Rodzaj kodowania i lista trójek (nazwa części, kod typu, bajty) lub None,
+        jeśli kolumny nie da się zapisać w stałej postaci.
+    """
+    if isinstance(values, DictionaryColumn):
+        return 'dict', _text_parts(values.dictionary) + [('codes', 'i', values.code_bytes())]
+    base_type = parse_column_type(column_type)[0]
+    if base_type == 'TEXT':
+        parts = _text_parts(values)
+    elif base_type in _FIXED_WIDTH:
+        convert = {'DATE': date.toordinal, 'TIME': _time_value}.get(base_type)
+        try:
+            payload = array(_FIXED_WIDTH[base_type], [0 if value is None else convert(value) if convert else value
+                                                      for value in values])
+        except (OverflowError, TypeError, AttributeError):
+            return None
+        parts = [('values', _FIXED_WIDTH[base_type], payload.tobytes())]
+    else:
+        return None
+    nulls = bytes(value is None for value in values)
+    if any(nulls):
+        parts.append(('nulls', 'B', nulls))
+    return base_type, parts
+
+
+def _publish(key, version, kind, parts):
+    size = 0
+    layout = {}
+    for name, typecode, payload in parts:
+        size += -size % _ALIGNMENT
+        layout[name] = (size, len(payload), typecode)
+        size += len(payload)
+    segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for name, typecode, payload in parts:
+        offset = layout[name][0]
+        segment.buf[offset:offset + len(payload)] = payload
+    descriptor = (key, segment.name, kind, layout)
+    previous = _published.get(key)
+    _published[key] = (version, descriptor, segment)
+    if previous is not None:
+        _unlink(previous[2])
+    return descriptor
+
+
+def _unlink(segment):
+    segment.close()
+    segment.unlink()
+
+
+def share(table, columns):
+    """
+    Udostępnia kolumny tabeli list Pythona procesom roboczym przez pamięć współdzieloną.
+
+    Każda kolumna jest kodowana raz dla danej wersji tabeli i używana ponownie przez kolejne
+    skanowania, dopóki tabela się nie zmieni. Wywoływane w procesie głównym pod blokadą odczytu tabeli.
+
+    Parametry:
+    table (Table): Tabela przechowywana w listach.
+    columns (iterable): Nazwy kolumn.
+
+    Zwraca:
+    tuple: Opisy segmentów kolumn (kolumna -> opis) i mapy żywych wierszy (lub None) dla read,
+        albo None, jeśli którejś kolumny nie da się zapisać w pamięci współdzielonej.
+    """
+    version = (table.version, table.layout_version)
+    descriptors = {}
+    with _published_lock:
+        for column in list(columns) + [None]:
+            key = (table.name, column)
+            published = _published.get(key)
+            if published is not None and published[0] == version:
+                descriptors[column] = published[1]
+                continue
+            if column is None:
+                if table.live is None:
+                    continue
+                encoded = 'live', [('values', 'B', bytes(table.live))]
+            else:
+                encoded = _encode(table.data[column], table.columns[column])
+                if encoded is None:
+                    return None
+            descriptors[column] = _publish(key, version, *encoded)
+    return descriptors, descriptors.pop(None, None)
+
+
+def release():
+    """
+    Usuwa wszystkie segmenty pamięci współdzielonej opublikowane przez proces główny.
+    """
+    with _published_lock:
+        for _, _, segment in _published.values():
+            _unlink(segment)
+        _published.clear()
+
+
+class _Attached:
+    """Segment dołączony w procesie roboczym razem z widokami jego części."""
+
+    def __init__(self, name, kind, layout):
+        self.segment = shared_memory.SharedMemory(name=name)
+        self.views = {part: self.segment.buf[offset:offset + length].cast(typecode)
+                      for part, (offset, length, typecode) in layout.items()}
+        self.template = None
+        if kind == 'dict':
+            # Pusta kolumna ze słownikiem - fragmenty dostają jej słownik i własne kody
+            offsets = self.views['offsets'].tolist()
+            blob = bytes(self.views['blob'])
+            self.template = DictionaryColumn.from_codes(
+                [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)], [])
+
+    def close(self):
+        for view in self.views.values():
+            view.release()
+        self.segment.close()
+
+
+def _attach(descriptor):
+    key, name, kind, layout = descriptor
+    attached = _attached.get(name)
+    if attached is None:
+        previous = _current.get(key)
+        if previous is not None:
+            _attached.pop(previous).close()
+        attached = _attached[name] = _Attached(name, kind, layout)
+        _current[key] = name
+    return attached
+
+
+def _decode(descriptor, start, end):
+    kind = descriptor[2]
+    attached = _attach(descriptor)
+    views = attached.views
+    if kind == 'dict':
+        column = attached.template.view(0, 0)
+        column.codes = views['codes'][start:end].tolist()
+        return column
+    if kind == 'TEXT':
+        offsets = views['offsets'][start:end + 1].tolist()
+        base = offsets[0]
+        blob = bytes(views['blob'][base:offsets[-1]])
+        values = [blob[offsets[i] - base:offsets[i + 1] - base].decode('utf-8') for i in range(end - start)]
+    else:
+        values = views['values'][start:end].tolist()
+    if 'nulls' in views:
+        values = [None if null else value for value, null in zip(values, views['nulls'][start:end])]
+    convert = {'DATE': date.fromordinal, 'TIME': _from_time_value, 'BOOLEAN': bool}.get(kind)
+    if convert is not None:
+        values = [None if value is None else convert(value) for value in values]
+    return values
+
+
+def read(shared, start, end):
+    """
+    Odczytuje w procesie roboczym fragment kolumn udostępnionych przez share.
+
+    Parametry:
+    shared (tuple): Wynik share.
+    start (int): Numer pierwszego wiersza fragmentu.
+    end (int): Numer wiersza za ostatnim.
+
+    Zwraca:
+    tuple: Słownik kolumna -> wartości fragmentu (lista lub DictionaryColumn) oraz numery
+        żywych wierszy fragmentu liczone od 0.
+    """
+    descriptors, live = shared
+    data = {column: _decode(descriptor, start, end) for column, descriptor in descriptors.items()}
+    if live is None:
+        rows = range(end - start)
+    else:
+        rows = list(compress(range(end - start), _attach(live).views['values'][start:end]))
+    return data, rows
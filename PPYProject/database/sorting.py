@@ -0,0 +1,134 @@
+import heapq
+import pickle
+import tempfile
+from itertools import islice
+
+# Liczba elementów zapisywanych jednym wywołaniem pickle w pliku tymczasowym
+_BLOCK_SIZE = 4096
+
+
+class _Descending:
+    """Klucz sortowania o odwróconym porządku (kolumna ORDER BY ... DESC)."""
+
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def sort_key(accessors):
+    """
+    Buduje funkcję klucza sortowania dla kilku kolumn ORDER BY.
+
+    Wartości None są traktowane jako najmniejsze: trafiają na początek przy ASC i na koniec przy DESC.
+
+    Parametry:
+        accessors (list): Pary (funkcja element -> wartość kolumny, czy malejąco).
+
+    Zwraca:
+        callable: Funkcja element -> klucz porównywalny operatorem <.
+    """
+    def key(item):
+        parts = []
+        for get, descending in accessors:
+            value = get(item)
+            part = (value is not None, value)
+            parts.append(_Descending(part) if descending else part)
+        return tuple(parts)
+    return key
+
+
+def top_k(items, key, count):
+    """
+    Zwraca count najmniejszych elementów w kolejności klucza (sortowanie stabilne).
+
+    Kopiec ograniczony do count elementów daje czas O(n log k) i pamięć O(k).
+
+    Parametry:
+        items (iterable): Sortowane elementy.
+        key (callable): Funkcja klucza.
+        count (int): Liczba zwracanych elementów.
+
+    Zwraca:
+        list: Posortowane elementy.
+    """
+    return heapq.nsmallest(count, items, key=key)
+
+
+def _spill(run):
+    # Posortowana seria jest zapisywana blokami do pliku tymczasowego usuwanego po zamknięciu
+    file = tempfile.TemporaryFile()
+    for start in range(0, len(run), _BLOCK_SIZE):
+        pickle.dump(run[start:start + _BLOCK_SIZE], file, pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def _read_run(file):
+    try:
+        while True:
+            try:
+                block = pickle.load(file)
+            except EOFError:
+                return
+            yield from block
+    finally:
+        file.close()
+
+
+def external_sort(items, key, buffer_rows):
+    """
+    Sortuje elementy stabilnie, zapisując posortowane serie do plików tymczasowych,
+    jeśli nie mieszczą się w buforze, i scalając je k-drożnie.
+
+    Parametry:
+        items (iterable): Sortowane elementy (muszą dać się zapisać modułem pickle).
+        key (callable): Funkcja klucza.
+        buffer_rows (int): Największa liczba elementów sortowanych w pamięci naraz.
+
+    Zwraca:
+        iterator: Elementy w kolejności klucza.
+    """
+    iterator = iter(items)
+    runs = []
+    while True:
+        chunk = list(islice(iterator, buffer_rows))
+        if not runs and len(chunk) < buffer_rows:
+            return iter(sorted(chunk, key=key))  # wszystko zmieściło się w pamięci
+        if not chunk:
+            break
+        chunk.sort(key=key)
+        runs.append(_spill(chunk))
+        del chunk
+    # heapq.merge przy równych kluczach zachowuje kolejność serii, więc sortowanie pozostaje stabilne
+    return heapq.merge(*[_read_run(file) for file in runs], key=key)
+
+
+def order_items(items, key, offset=0, limit=None, buffer_rows=None):
+    """
+    Sortuje elementy i wybiera fragment wyniku (ORDER BY ... LIMIT ... OFFSET ...).
+
+    Z limitem używany jest ograniczony kopiec (top_k), bez limitu - sortowanie w pamięci
+    lub zewnętrzne sortowanie przez scalanie, gdy elementów jest więcej niż buffer_rows.
+
+    Parametry:
+        items (iterable): Sortowane elementy.
+        key (callable): Funkcja klucza.
+        offset (int, opcjonalnie): Liczba pomijanych pierwszych elementów.
+        limit (int, opcjonalnie): Największa liczba zwracanych elementów. Domyślnie bez limitu.
+        buffer_rows (int, opcjonalnie): Bufor sortowania w pamięci. Domyślnie bez ograniczenia.
+
+    Zwraca:
+        list: Posortowany fragment elementów.
+    """
+    if limit is not None:
+        return top_k(items, key, offset + limit)[offset:]
+    if buffer_rows is None:
+        return sorted(items, key=key)[offset:]
+    return list(islice(external_sort(items, key, buffer_rows), offset, None))
@@ -0,0 +1,745 @@
+import re
+
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<number>\d+\.\d*|\.\d+|\d+)
+      | (?P<operator>==|!=|<>|<=|>=|=|<|>)
+      | (?P<param>\?)
+      | (?P<name>[A-Za-z_][\w.]*)
+      | (?P<punct>[(),;*+\-/])
+    )""", re.VERBOSE)
+
+KEYWORDS = {
+    'SELECT', 'FROM', 'WHERE', 'INSERT', 'INTO', 'VALUES', 'UPDATE', 'SET', 'DELETE',
+    'AND', 'OR', 'NOT', 'IN', 'BETWEEN', 'TRUE', 'FALSE', 'NULL',
+    'GROUP', 'BY', 'HAVING', 'AS', 'DISTINCT', 'JOIN', 'INNER', 'LEFT', 'OUTER', 'ON',
+    'ORDER', 'ASC', 'DESC', 'LIMIT', 'OFFSET', 'EXPLAIN',
+    'CREATE', 'DROP', 'INDEX', 'USING', 'ANALYZE',
+}
+
+# Funkcje agregujące rozpoznawane po nazwie, po której następuje nawias
+AGGREGATE_FUNCTIONS = ('COUNT', 'SUM', 'AVG', 'MIN', 'MAX')
+
+_OPERATORS = {'=': '==', '==': '==', '!=': '!=', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+
+# Operator po zamianie stron porównania (stała op kolumna -> kolumna op' stała)
+FLIPPED = {'==': '==', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+
+class Token:
+    """Pojedynczy token instrukcji SQL."""
+
+    __slots__ = ('kind', 'value', 'start', 'end')
+
+    def __init__(self, kind, value, start, end):
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+
+
+def tokenize(sql):
+    """
+    Dzieli tekst instrukcji na tokeny w jednym przebiegu.
+
+    Parametry:
+        sql (str): Tekst instrukcji (może zawierać kilka instrukcji rozdzielonych średnikami).
+
+    Zwraca:
+        list: Lista tokenów (Token). Słowa kluczowe mają rodzaj 'keyword' i są zapisane wielkimi literami.
+
+    Podnosi:
+        ValueError: Jeśli tekst zawiera niedozwolone znaki.
+    """
+    tokens = []
+    position = 0
+    end = len(sql.rstrip())
+    while position < end:
+        match = _TOKEN_PATTERN.match(sql, position)
+        if not match:
+            raise ValueError(f"Invalid statement: {sql}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        start = match.start(kind)
+        if kind == 'name' and value.upper() in KEYWORDS:
+            kind, value = 'keyword', value.upper()
+        tokens.append(Token(kind, value, start, match.end()))
+        position = match.end()
+    return tokens
+
+
+def token_value(token):
+    """
+    Zwraca wartość tokenu stałej tekstowej lub liczbowej.
+
+    Parametry:
+        token (Token): Token rodzaju 'string' lub 'number'.
+
+    Zwraca:
+        str | int | float: Wartość stałej.
+    """
+    if token.kind == 'string':
+        return token.value[1:-1].replace("''", "'")
+    return float(token.value) if '.' in token.value else int(token.value)
+
+
+class Column:
+    """Odwołanie do kolumny w wyrażeniu."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Literal:
+    """Stała w wyrażeniu."""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Parameter:
+    """Parametr '?' instrukcji przygotowanej, wiązany przy wykonaniu."""
+
+    def __init__(self, index):
+        self.index = index
+
+
+class Comparison:
+    """Porównanie dwóch operandów jednym z sześciu operatorów."""
+
+    def __init__(self, operator, left, right):
+        self.operator = operator
+        self.left = left
+        self.right = right
+
+
+class InList:
+    """Warunek [NOT] IN (wartość, ...)."""
+
+    def __init__(self, operand, values, negated=False):
+        self.operand = operand
+        self.values = values
+        self.negated = negated
+
+
+class Between:
+    """Warunek [NOT] BETWEEN dolna AND górna (obustronnie domknięty)."""
+
+    def __init__(self, operand, low, high, negated=False):
+        self.operand = operand
+        self.low = low
+        self.high = high
+        self.negated = negated
+
+
+class And:
+    """Koniunkcja warunków."""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class Or:
+    """Alternatywa warunków."""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class Not:
+    """Negacja warunku."""
+
+    def __init__(self, item):
+        self.item = item
+
+
+class Arithmetic:
+    """Działanie arytmetyczne +, -, * lub / na dwóch operandach (wyrażenie SET instrukcji UPDATE)."""
+
+    def __init__(self, operator, left, right):
+        self.operator = operator
+        self.left = left
+        self.right = right
+
+
+class Aggregate:
+    """Funkcja agregująca COUNT/SUM/AVG/MIN/MAX([DISTINCT] kolumna) lub COUNT(*)."""
+
+    def __init__(self, function, column=None, distinct=False):
+        self.function = function
+        self.column = column  # None dla COUNT(*)
+        self.distinct = distinct
+        # Nazwa wyniku, np. COUNT(*), AVG(score), COUNT(DISTINCT name)
+        self.key = f"{function}({'DISTINCT ' if distinct else ''}{column or '*'})"
+
+
+def find_aggregates(node, found=None):
+    """
+    Zwraca funkcje agregujące występujące w wyrażeniu (bez powtórzeń, w kolejności wystąpienia).
+
+    Parametry:
+        node: Drzewo wyrażenia.
+        found (dict, opcjonalnie): Słownik nazwa -> Aggregate uzupełniany o znalezione funkcje.
+
+    Zwraca:
+        dict: Słownik nazwa -> Aggregate.
+    """
+    found = {} if found is None else found
+    if isinstance(node, Aggregate):
+        found.setdefault(node.key, node)
+    elif isinstance(node, Comparison):
+        find_aggregates(node.left, found)
+        find_aggregates(node.right, found)
+    elif isinstance(node, InList):
+        for child in [node.operand] + node.values:
+            find_aggregates(child, found)
+    elif isinstance(node, Between):
+        for child in (node.operand, node.low, node.high):
+            find_aggregates(child, found)
+    elif isinstance(node, (And, Or)):
+        for child in node.items:
+            find_aggregates(child, found)
+    elif isinstance(node, Not):
+        find_aggregates(node.item, found)
+    return found
+
+
+class Join:
+    """Złączenie [INNER | LEFT [OUTER]] JOIN tabela [alias] ON kolumna = kolumna."""
+
+    def __init__(self, kind, table_name, alias, left, right):
+        self.kind = kind  # 'INNER' lub 'LEFT'
+        self.table_name = table_name
+        self.alias = alias
+        # Kolumny klucza złączenia (Column), np. o.customer_id i c.id
+        self.left = left
+        self.right = right
+
+
+class SelectStatement:
+    """
+    Instrukcja SELECT kolumny FROM tabela [alias] [JOIN ...] [WHERE warunek] [GROUP BY kolumny]
+    [HAVING warunek] [ORDER BY kolumna [ASC | DESC], ...] [LIMIT n [OFFSET m]].
+
+    Lista SELECT może zawierać kolumny i funkcje agregujące z opcjonalnym aliasem (AS).
+    """
+
+    kind = 'SELECT'
+
+    def __init__(self, table_name, columns, where=None, items=None):
+        self.table_name = table_name
+        self.columns = columns  # kolumny tabeli z listy SELECT (None dla *)
+        # Elementy listy SELECT: pary (Column lub Aggregate, nazwa w wyniku); None dla *
+        self.items = items if items is not None or columns is None else [(Column(name), name) for name in columns]
+        self.where = where
+        self.where_text = ''
+        self.compiled = None  # pamięć podręczna skompilowanego warunku (predicates.compiled_where)
+        self.alias = None  # alias tabeli z klauzuli FROM
+        self.joins = []  # złączenia (Join) w kolejności wykonania
+        self.group_by = []
+        self.having = None
+        self.having_text = ''
+        self.aggregates = {}  # nazwa -> Aggregate z listy SELECT i klauzuli HAVING
+        self.order_by = []  # pary (Column lub Aggregate, czy malejąco)
+        self.limit = None  # Literal lub Parameter
+        self.offset = None
+        self.text = ''
+        self.parameter_count = 0
+
+
+class InsertStatement:
+    """Instrukcja INSERT INTO tabela (kolumny) VALUES (wartości), (wartości), ..."""
+
+    kind = 'INSERT'
+
+    def __init__(self, table_name, columns, rows):
+        self.table_name = table_name
+        self.columns = columns
+        self.rows = rows
+        self.text = ''
+        self.parameter_count = 0
+
+
+class UpdateStatement:
+    """
+    Instrukcja UPDATE tabela SET kolumna = wyrażenie, ... [WHERE warunek].
+
+    Wyrażenie może zawierać kolumny, stałe, parametry, działania +, -, *, / i nawiasy.
+    """
+
+    kind = 'UPDATE'
+
+    def __init__(self, table_name, assignments, where=None):
+        self.table_name = table_name
+        self.assignments = assignments  # pary (kolumna, drzewo wyrażenia)
+        self.where = where
+        self.where_text = ''
+        self.compiled = None  # pamięć podręczna skompilowanego warunku (predicates.compiled_where)
+        self.compiled_assignments = None  # skompilowane wyrażenia SET (predicates.compiled_assignments)
+        self.text = ''
+        self.parameter_count = 0
+
+
+class DeleteStatement:
+    """Instrukcja DELETE FROM tabela [WHERE warunek]."""
+
+    kind = 'DELETE'
+
+    def __init__(self, table_name, where=None):
+        self.table_name = table_name
+        self.where = where
+        self.where_text = ''
+        self.compiled = None  # pamięć podręczna skompilowanego warunku (predicates.compiled_where)
+        self.text = ''
+        self.parameter_count = 0
+
+
+class ExplainStatement:
+    """Instrukcja EXPLAIN SELECT ... | UPDATE ... | DELETE ... - opis planu wykonania instrukcji."""
+
+    kind = 'EXPLAIN'
+
+    def __init__(self, statement):
+        self.statement = statement  # objaśniana instrukcja (SelectStatement, UpdateStatement lub DeleteStatement)
+        self.text = ''
+        self.parameter_count = 0
+
+
+class CreateIndexStatement:
+    """Instrukcja CREATE INDEX indeks ON tabela (kolumna) [USING HASH | SORTED]."""
+
+    kind = 'CREATE INDEX'
+
+    def __init__(self, index_name, table_name, column_name, index_type='HASH'):
+        self.index_name = index_name
+        self.table_name = table_name
+        self.column_name = column_name
+        self.index_type = index_type  # rodzaj indeksu wielkimi literami
+        self.text = ''
+        self.parameter_count = 0
+
+
+class DropIndexStatement:
+    """Instrukcja DROP INDEX indeks ON tabela."""
+
+    kind = 'DROP INDEX'
+
+    def __init__(self, index_name, table_name):
+        self.index_name = index_name
+        self.table_name = table_name
+        self.text = ''
+        self.parameter_count = 0
+
+
+class AnalyzeStatement:
+    """Instrukcja ANALYZE [tabela] - zebranie statystyk jednej lub wszystkich tabel."""
+
+    kind = 'ANALYZE'
+
+    def __init__(self, table_name=None):
+        self.table_name = table_name  # None dla wszystkich tabel
+        self.text = ''
+        self.parameter_count = 0
+
+
+class _Parser:
+    """Parser zstępujący budujący obiekty instrukcji i drzewa wyrażeń z listy tokenów."""
+
+    def __init__(self, tokens, text, label='statement'):
+        self.tokens = tokens
+        self.text = text
+        self.label = label
+        self.position = 0
+        self.parameter_count = 0
+
+    def error(self):
+        return ValueError(f"Invalid {self.label}: {self.text}")
+
+    def peek(self, kind=None, value=None, offset=0):
+        if self.position + offset >= len(self.tokens):
+            return None
+        token = self.tokens[self.position + offset]
+        if (kind is None or token.kind == kind) and (value is None or token.value == value):
+            return token
+        return None
+
+    def take(self, kind=None, value=None):
+        token = self.peek(kind, value)
+        if token is None:
+            raise self.error()
+        self.position += 1
+        return token
+
+    def at_end(self):
+        return self.position >= len(self.tokens) or self.peek('punct', ';') is not None
+
+    # --- instrukcje ---
+
+    def parse_statements(self):
+        statements = []
+        while self.position < len(self.tokens):
+            if self.peek('punct', ';'):
+                self.take()
+                continue
+            start_position = self.position
+            start = self.tokens[self.position].start
+            self.parameter_count = 0
+            statement = self.parse_statement()
+            if not self.at_end():
+                raise self.error()
+            end = self.tokens[self.position - 1].end
+            statement.text = self.text[start:end]
+            statement.parameter_count = self.parameter_count
+            if statement.kind == 'EXPLAIN':
+                statement.statement.text = self.text[self.tokens[start_position + 1].start:end]
+                statement.statement.parameter_count = self.parameter_count
+            statements.append(statement)
+        return statements
+
+    def parse_statement(self):
+        token = self.take('keyword')
+        if token.value == 'EXPLAIN':
+            statement = self.parse_statement()
+            if statement.kind not in ('SELECT', 'UPDATE', 'DELETE'):
+                raise self.error()
+            return ExplainStatement(statement)
+        if token.value == 'SELECT':
+            return self.parse_select()
+        if token.value == 'INSERT':
+            return self.parse_insert()
+        if token.value == 'UPDATE':
+            return self.parse_update()
+        if token.value == 'DELETE':
+            return self.parse_delete()
+        if token.value == 'CREATE':
+            return self.parse_create_index()
+        if token.value == 'DROP':
+            return self.parse_drop_index()
+        if token.value == 'ANALYZE':
+            return AnalyzeStatement(None if self.at_end() else self.take('name').value)
+        raise self.error()
+
+    def parse_where(self, statement):
+        if self.peek('keyword', 'WHERE'):
+            self.take()
+            start = self.peek().start if self.peek() else len(self.text)
+            statement.where = self.parse_expression()
+            statement.where_text = self.text[start:self.tokens[self.position - 1].end]
+        return statement
+
+    def parse_name_list(self):
+        names = [self.take('name').value]
+        while self.peek('punct', ','):
+            self.take()
+            names.append(self.take('name').value)
+        return names
+
+    def parse_select(self):
+        if self.peek('punct', '*'):
+            self.take()
+            items = None
+        else:
+            items = [self.parse_select_item()]
+            while self.peek('punct', ','):
+                self.take()
+                items.append(self.parse_select_item())
+        self.take('keyword', 'FROM')
+        columns = None if items is None else [node.name for node, _ in items if isinstance(node, Column)]
+        statement = SelectStatement(self.take('name').value, columns, items=items)
+        statement.alias = self.parse_alias()
+        while self.peek('keyword', 'JOIN') or self.peek('keyword', 'INNER') or self.peek('keyword', 'LEFT'):
+            statement.joins.append(self.parse_join())
+        self.parse_where(statement)
+        if self.peek('keyword', 'GROUP'):
+            self.take()
+            self.take('keyword', 'BY')
+            statement.group_by = self.parse_name_list()
+        if self.peek('keyword', 'HAVING'):
+            self.take()
+            start = self.peek().start if self.peek() else len(self.text)
+            statement.having = self.parse_expression()
+            statement.having_text = self.text[start:self.tokens[self.position - 1].end]
+        if self.peek('keyword', 'ORDER'):
+            self.take()
+            self.take('keyword', 'BY')
+            statement.order_by = [self.parse_order_item()]
+            while self.peek('punct', ','):
+                self.take()
+                statement.order_by.append(self.parse_order_item())
+        if self.peek('keyword', 'LIMIT'):
+            self.take()
+            statement.limit = self.parse_constant()
+            if self.peek('keyword', 'OFFSET'):
+                self.take()
+                statement.offset = self.parse_constant()
+        for node, _ in (items or []) + statement.order_by:
+            find_aggregates(node, statement.aggregates)
+        find_aggregates(statement.having, statement.aggregates)
+        return statement
+
+    def parse_order_item(self):
+        node = self.parse_aggregate() if self.at_aggregate() else Column(self.take('name').value)
+        descending = self.peek('keyword', 'DESC') is not None
+        if descending or self.peek('keyword', 'ASC'):
+            self.take()
+        return node, descending
+
+    def parse_constant(self):
+        node = self.parse_operand()
+        if not isinstance(node, (Literal, Parameter)):
+            raise self.error()
+        return node
+
+    def parse_alias(self):
+        if self.peek('keyword', 'AS'):
+            self.take()
+            return self.take('name').value
+        return self.take().value if self.peek('name') else None
+
+    def parse_join(self):
+        kind = 'INNER'
+        if self.peek('keyword', 'LEFT'):
+            self.take()
+            kind = 'LEFT'
+            if self.peek('keyword', 'OUTER'):
+                self.take()
+        elif self.peek('keyword', 'INNER'):
+            self.take()
+        self.take('keyword', 'JOIN')
+        table_name = self.take('name').value
+        alias = self.parse_alias()
+        self.take('keyword', 'ON')
+        left = self.parse_operand()
+        operator = _OPERATORS[self.take('operator').value]
+        right = self.parse_operand()
+        # Obsługiwane jest złączenie równościowe po jednej kolumnie z każdej strony
+        if operator != '==' or not isinstance(left, Column) or not isinstance(right, Column):
+            raise self.error()
+        return Join(kind, table_name, alias, left, right)
+
+    def parse_select_item(self):
+        if self.at_aggregate():
+            node = self.parse_aggregate()
+            name = node.key
+        else:
+            node = Column(self.take('name').value)
+            name = node.name
+        if self.peek('keyword', 'AS'):
+            self.take()
+            name = self.take('name').value
+        return node, name
+
+    def at_aggregate(self):
+        token = self.peek('name')
+        return token is not None and token.value.upper() in AGGREGATE_FUNCTIONS and self.peek('punct', '(', 1)
+
+    def parse_aggregate(self):
+        function = self.take('name').value.upper()
+        self.take('punct', '(')
+        distinct = self.peek('keyword', 'DISTINCT') is not None
+        if distinct:
+            self.take()
+        if function == 'COUNT' and not distinct and self.peek('punct', '*'):
+            self.take()
+            column = None
+        else:
+            column = self.take('name').value
+        self.take('punct', ')')
+        return Aggregate(function, column, distinct)
+
+    def parse_insert(self):
+        self.take('keyword', 'INTO')
+        table_name = self.take('name').value
+        self.take('punct', '(')
+        columns = self.parse_name_list()
+        self.take('punct', ')')
+        self.take('keyword', 'VALUES')
+        rows = [self.parse_value_list()]
+        while self.peek('punct', ','):  # multi-row insert: VALUES (...), (...), ...
+            self.take()
+            rows.append(self.parse_value_list())
+        return InsertStatement(table_name, columns, rows)
+
+    def parse_value_list(self):
+        self.take('punct', '(')
+        values = [self.parse_operand()]
+        while self.peek('punct', ','):
+            self.take()
+            values.append(self.parse_operand())
+        self.take('punct', ')')
+        return values
+
+    def parse_update(self):
+        table_name = self.take('name').value
+        self.take('keyword', 'SET')
+        assignments = [self.parse_assignment()]
+        while self.peek('punct', ','):
+            self.take()
+            assignments.append(self.parse_assignment())
+        return self.parse_where(UpdateStatement(table_name, assignments))
+
+    def parse_assignment(self):
+        column = self.take('name').value
+        if self.take('operator').value not in ('=', '=='):
+            raise self.error()
+        return column, self.parse_arithmetic()
+
+    def parse_delete(self):
+        self.take('keyword', 'FROM')
+        return self.parse_where(DeleteStatement(self.take('name').value))
+
+    def parse_create_index(self):
+        self.take('keyword', 'INDEX')
+        index_name = self.take('name').value
+        self.take('keyword', 'ON')
+        table_name = self.take('name').value
+        self.take('punct', '(')
+        column_name = self.take('name').value
+        self.take('punct', ')')
+        index_type = 'HASH'
+        if self.peek('keyword', 'USING'):
+            self.take()
+            index_type = self.take('name').value.upper()
+        return CreateIndexStatement(index_name, table_name, column_name, index_type)
+
+    def parse_drop_index(self):
+        self.take('keyword', 'INDEX')
+        index_name = self.take('name').value
+        self.take('keyword', 'ON')
+        return DropIndexStatement(index_name, self.take('name').value)
+
+    # --- wyrażenia ---
+
+    def parse_arithmetic(self):
+        node = self.parse_product()
+        while self.peek('punct', '+') or self.peek('punct', '-'):
+            operator = self.take().value
+            node = Arithmetic(operator, node, self.parse_product())
+        return node
+
+    def parse_product(self):
+        node = self.parse_factor()
+        while self.peek('punct', '*') or self.peek('punct', '/'):
+            operator = self.take().value
+            node = Arithmetic(operator, node, self.parse_factor())
+        return node
+
+    def parse_factor(self):
+        if self.peek('punct', '('):
+            self.take()
+            node = self.parse_arithmetic()
+            self.take('punct', ')')
+            return node
+        return self.parse_operand()
+
+    def parse_expression(self):
+        items = [self.parse_and()]
+        while self.peek('keyword', 'OR'):
+            self.take()
+            items.append(self.parse_and())
+        return items[0] if len(items) == 1 else Or(items)
+
+    def parse_and(self):
+        items = [self.parse_not()]
+        while self.peek('keyword', 'AND'):
+            self.take()
+            items.append(self.parse_not())
+        return items[0] if len(items) == 1 else And(items)
+
+    def parse_not(self):
+        if self.peek('keyword', 'NOT'):
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_predicate()
+
+    def parse_predicate(self):
+        if self.peek('punct', '('):
+            # Nawias może otaczać cały warunek albo tylko operand porównania
+            start = self.position
+            self.take()
+            node = self.parse_expression()
+            self.take('punct', ')')
+            if not self.peek('operator') and not self.peek('keyword', 'IN') and not self.peek('keyword', 'BETWEEN'):
+                return node
+            self.position = start
+        left = self.parse_operand()
+        negated = False
+        if self.peek('keyword', 'NOT'):
+            self.take()
+            negated = True
+            if not (self.peek('keyword', 'IN') or self.peek('keyword', 'BETWEEN')):
+                raise self.error()
+        if self.peek('operator') and not negated:
+            operator = _OPERATORS[self.take().value]
+            return Comparison(operator, left, self.parse_operand())
+        if self.peek('keyword', 'IN'):
+            self.take()
+            return InList(left, self.parse_value_list(), negated)
+        if self.peek('keyword', 'BETWEEN'):
+            self.take()
+            low = self.parse_operand()
+            self.take('keyword', 'AND')
+            return Between(left, low, self.parse_operand(), negated)
+        # Samodzielna kolumna lub stała traktowana jako wartość logiczna
+        return left
+
+    def parse_operand(self):
+        if self.at_aggregate():
+            return self.parse_aggregate()
+        token = self.take()
+        if token.kind in ('string', 'number'):
+            return Literal(token_value(token))
+        if token.kind == 'punct' and token.value == '-' and self.peek('number'):
+            literal = self.parse_operand()
+            return Literal(-literal.value)
+        if token.kind == 'keyword' and token.value in ('TRUE', 'FALSE', 'NULL'):
+            return Literal({'TRUE': True, 'FALSE': False, 'NULL': None}[token.value])
+        if token.kind == 'param':
+            self.parameter_count += 1
+            return Parameter(self.parameter_count - 1)
+        if token.kind == 'name':
+            return Column(token.value)
+        if token.kind == 'punct' and token.value == '(':
+            node = self.parse_operand()
+            self.take('punct', ')')
+            return node
+        raise self.error()
+
+
+def parse(sql):
+    """
+    Parsuje tekst zawierający jedną lub więcej instrukcji rozdzielonych średnikami.
+
+    Parametry:
+        sql (str): Tekst instrukcji.
+
+    Zwraca:
+        list: Obiekty instrukcji (SelectStatement, InsertStatement, UpdateStatement, DeleteStatement,
+            ExplainStatement, CreateIndexStatement, DropIndexStatement, AnalyzeStatement).
+
+    Podnosi:
+        ValueError: Jeśli instrukcja jest nieprawidłowa.
+    """
+    return _Parser(tokenize(sql), sql).parse_statements()
+
+
+def parse_expression(text):
+    """
+    Parsuje samodzielne wyrażenie warunku (treść klauzuli WHERE).
+
+    Parametry:
+        text (str): Tekst warunku.
+
+    Zwraca:
+        Drzewo warunku (Comparison, InList, Between, And, Or, Not, Column, Literal lub Parameter).
+
+    Podnosi:
+        ValueError: Jeśli warunek jest nieprawidłowy.
+    """
+    parser = _Parser(tokenize(text.rstrip().rstrip(';')), text, 'condition')
+    node = parser.parse_expression()
+    if parser.position != len(parser.tokens):
+        raise ValueError(f"Invalid condition: {text}")
+    return node
@@ -0,0 +1,266 @@
+import heapq
+from bisect import bisect_left, bisect_right
+
+_MASK = (1 << 64) - 1
+
+# Udział zmienionych wierszy, po którym histogram przestaje odpowiadać danym i nie jest używany
+_HISTOGRAM_STALE_FRACTION = 0.2
+
+
+def _hash64(value):
+    # Mieszanie splitmix64 rozkłada wartości hash() równomiernie na 64 bity
+    x = (hash(value) + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def range_may_contain(minimum, maximum, operator, value):
+    """
+    Sprawdza, czy jakaś wartość z przedziału od minimum do maximum może spełniać porównanie
+    "wartość operator value".
+
+    Parametry:
+    minimum: Najmniejsza wartość (różna od None).
+    maximum: Największa wartość (różna od None).
+    operator (str): Operator porównania.
+    value: Wartość porównywana.
+
+    Zwraca:
+    bool: False tylko wtedy, gdy przedział wyklucza każdą wartość.
+    """
+    if value is None:
+        return True
+    try:
+        if operator == '==':
+            return minimum <= value <= maximum
+        if operator == '<':
+            return minimum < value
+        if operator == '<=':
+            return minimum <= value
+        if operator == '>':
+            return maximum > value
+        if operator == '>=':
+            return maximum >= value
+    except TypeError:
+        pass
+    return True
+
+
+class DistinctSketch:
+    """
+    Szkic KMV (k najmniejszych wartości skrótu) do szacowania liczby różnych wartości.
+
+    Pamięta tylko size najmniejszych skrótów, więc zajmuje stałą pamięć i może być uzupełniany
+    o nowe wartości bez ponownego przeglądania kolumny.
+    """
+
+    def __init__(self, size=256):
+        """
+        Inicjalizuje pusty szkic.
+
+        Parametry:
+        size (int): Liczba pamiętanych skrótów (dokładność szacunku rośnie z pierwiastkiem size).
+        """
+        self.size = size
+        self._heap = []  # zanegowane skróty - kopiec, na którego szczycie jest największy z pamiętanych
+        self._members = set()
+
+    def add_many(self, values):
+        """
+        Dodaje wartości do szkicu.
+
+        Parametry:
+        values (iterable): Wartości różne od None.
+        """
+        heap, members, size = self._heap, self._members, self.size
+        for value in values:
+            digest = _hash64(value)
+            if digest in members:
+                continue
+            if len(heap) < size:
+                heapq.heappush(heap, -digest)
+                members.add(digest)
+            elif digest < -heap[0]:
+                members.discard(-heapq.heapreplace(heap, -digest))
+                members.add(digest)
+
+    def estimate(self):
+        """
+        Zwraca szacowaną liczbę różnych wartości.
+
+        Zwraca:
+        int: Dokładna liczba, jeśli różnych wartości jest mniej niż size, w przeciwnym razie szacunek.
+        """
+        if len(self._heap) < self.size:
+            return len(self._heap)
+        return int((self.size - 1) * (_MASK + 1) / -self._heap[0])
+
+
+class ColumnStatistics:
+    """
+    Statystyki kolumny: liczba wartości i wartości None, najmniejsza i największa wartość,
+    szkic liczby różnych wartości oraz histogram o przedziałach równolicznych.
+
+    Najmniejsza i największa wartość są poszerzane przy każdym zapisie (i nigdy nie są zawężane),
+    więc zawsze obejmują wszystkie wartości kolumny - planista może na ich podstawie stwierdzić,
+    że warunek nie pasuje do żadnego wiersza.
+    """
+
+    def __init__(self):
+        """
+        Inicjalizuje statystyki pustej kolumny.
+        """
+        self.count = 0  # liczba zapisanych wartości różnych od None
+        self.null_count = 0
+        self.minimum = None
+        self.maximum = None
+        self.sketch = DistinctSketch()
+        self.histogram = None  # granice przedziałów równolicznych z ostatniego ANALYZE
+
+    def add(self, values):
+        """
+        Uwzględnia w statystykach zapisane wartości.
+
+        Parametry:
+        values (list): Wartości kolumny (także None).
+        """
+        present = [value for value in values if value is not None]
+        self.null_count += len(values) - len(present)
+        if not present:
+            return
+        self.count += len(present)
+        low, high = min(present), max(present)
+        if self.minimum is None or low < self.minimum:
+            self.minimum = low
+        if self.maximum is None or high > self.maximum:
+            self.maximum = high
+        self.sketch.add_many(present)
+
+    def remove(self, values):
+        """
+        Wycofuje ze statystyk wartości zastąpione przy zmianie wierszy.
+
+        Zmniejszane są tylko liczby wartości i wartości None; najmniejsza i największa wartość
+        oraz szkic różnych wartości zostają bez zmian.
+
+        Parametry:
+        values (list): Dotychczasowe wartości kolumny (także None).
+        """
+        present = sum(value is not None for value in values)
+        self.null_count = max(0, self.null_count - (len(values) - present))
+        self.count = max(0, self.count - present)
+
+    def distinct(self):
+        """
+        Zwraca szacowaną liczbę różnych wartości (co najmniej 1).
+
+        Zwraca:
+        int: Liczba różnych wartości.
+        """
+        return max(1, self.sketch.estimate())
+
+    def null_fraction(self):
+        """
+        Zwraca udział wartości None w kolumnie.
+
+        Zwraca:
+        float: Udział od 0 do 1.
+        """
+        total = self.count + self.null_count
+        return self.null_count / total if total else 0.0
+
+    def may_contain(self, operator, value):
+        """
+        Sprawdza, czy jakaś wartość kolumny może spełniać porównanie "kolumna operator wartość".
+
+        Parametry:
+        operator (str): Operator porównania.
+        value: Wartość porównywana (dopasowana do typu kolumny).
+
+        Zwraca:
+        bool: False tylko wtedy, gdy zakres wartości kolumny wyklucza każdy wiersz.
+        """
+        if self.minimum is None:
+            return True
+        return range_may_contain(self.minimum, self.maximum, operator, value)
+
+    def fraction_below(self, value, inclusive):
+        """
+        Szacuje udział wartości kolumny mniejszych od podanej (lub równych, jeśli inclusive).
+
+        Używa histogramu, a bez niego - interpolacji liniowej między najmniejszą i największą wartością.
+
+        Parametry:
+        value: Wartość porównywana.
+        inclusive (bool): Czy wliczać wartości równe.
+
+        Zwraca:
+        float: Udział od 0 do 1 lub None, jeśli nie da się go oszacować (np. dla tekstu bez histogramu).
+        """
+        if self.minimum is None:
+            return 0.0
+        try:
+            if value < self.minimum or (value == self.minimum and not inclusive):
+                return 0.0
+            if value > self.maximum or (value == self.maximum and inclusive):
+                return 1.0
+            if self.histogram:
+                position = (bisect_right if inclusive else bisect_left)(self.histogram, value)
+                return position / len(self.histogram)
+            return (value - self.minimum) / (self.maximum - self.minimum)
+        except (TypeError, ZeroDivisionError):
+            return None
+
+
+class TableStatistics:
+    """
+    Statystyki wszystkich kolumn tabeli zebrane przez ANALYZE i uzupełniane przy zapisach.
+    """
+
+    def __init__(self, columns):
+        """
+        Inicjalizuje puste statystyki.
+
+        Parametry:
+        columns (iterable): Nazwy kolumn tabeli.
+        """
+        self.columns = {column: ColumnStatistics() for column in columns}
+        self.analyzed_rows = 0
+        self.changed_rows = 0  # wiersze wstawione, zmienione lub usunięte od ANALYZE
+
+    def record_changes(self, count):
+        """
+        Odnotowuje zmianę wierszy; po zmianie dużej części tabeli histogramy są porzucane.
+
+        Parametry:
+        count (int): Liczba zmienionych wierszy.
+        """
+        self.changed_rows += count
+        if self.changed_rows > _HISTOGRAM_STALE_FRACTION * max(self.analyzed_rows, 1):
+            for column in self.columns.values():
+                column.histogram = None
+
+
+def analyze(table, buckets=16):
+    """
+    Zbiera statystyki wszystkich kolumn tabeli (bez usuniętych wierszy).
+
+    Parametry:
+    table (Table): Tabela (z założoną blokadą odczytu).
+    buckets (int): Liczba przedziałów histogramu.
+
+    Zwraca:
+    TableStatistics: Statystyki tabeli.
+    """
+    statistics = TableStatistics(table.columns)
+    row_ids = table.all_rows()
+    statistics.analyzed_rows = len(row_ids)
+    for column, column_statistics in statistics.columns.items():
+        values = table.column_values(column, row_ids)
+        column_statistics.add(values)
+        present = sorted(value for value in values if value is not None)
+        if present and buckets > 0:
+            column_statistics.histogram = [present[i * len(present) // buckets] for i in range(buckets)]
+            column_statistics.histogram.append(present[-1])
+    return statistics
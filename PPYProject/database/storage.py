@@ -0,0 +1,757 @@
+from array import array
+from itertools import compress
+
+try:
+    import numpy as np
+except ImportError:  # numpy jest zależnością opcjonalną - bez niej dostępne są tylko kolumny listowe
+    np = None
+
+# Typy kolumn przechowywane jako tablice NumPy o stałej szerokości
+NUMPY_TYPES = {
+    'INTEGER': 'int64',
+    'FLOAT': 'float64',
+    'BOOLEAN': 'bool',
+    'DATE': 'datetime64[D]',
+}
+
+STORAGE_TYPES = ('list', 'numpy')
+
+# Kodowanie słownikowe kolumn TEXT tabel przechowywanych w listach: kolumna jest kodowana od początku,
+# a gdy po co najmniej ENCODING_MIN_ROWS wierszach różnych wartości jest więcej niż
+# MAX_DICTIONARY_FRACTION liczby wierszy, zamieniana na zwykłą listę (zob. settle_encoding)
+TEXT_ENCODING = True
+ENCODING_MIN_ROWS = 1024
+MAX_DICTIONARY_FRACTION = 0.2
+
+
+def numpy_available():
+    """
+    Sprawdza, czy biblioteka NumPy jest zainstalowana.
+
+    Zwraca:
+    bool: True, jeśli można używać kolumn NumPy.
+    """
+    return np is not None
+
+
+class NumpyColumn:
+    """
+    Kolumna przechowywana w tablicy NumPy o stałej szerokości.
+
+    Tablica rośnie geometrycznie, więc dopisywanie wierszy ma zamortyzowany koszt O(1).
+    Wartości None są zapamiętywane w osobnej masce tworzonej dopiero przy pierwszym None.
+    """
+
+    def __init__(self, dtype, capacity=16):
+        """
+        Inicjalizuje pustą kolumnę.
+
+        Parametry:
+        dtype (str): Typ elementów tablicy NumPy.
+        capacity (int): Początkowa pojemność tablicy.
+        """
+        self.dtype = np.dtype(dtype)
+        self.values = np.empty(capacity, dtype=self.dtype)
+        self.nulls = None
+        self.size = 0
+
+    @classmethod
+    def from_array(cls, values, nulls=None):
+        """
+        Tworzy kolumnę z istniejącej tablicy NumPy bez kopiowania danych.
+
+        Tablica może być widokiem na plik zmapowany do pamięci - zostanie skopiowana
+        dopiero przy pierwszym powiększeniu kolumny.
+
+        Parametry:
+        values (numpy.ndarray): Wartości kolumny.
+        nulls (numpy.ndarray, opcjonalnie): Maska komórek z None.
+
+        Zwraca:
+        NumpyColumn: Kolumna zawierająca podane wartości.
+        """
+        column = cls.__new__(cls)
+        column.dtype = values.dtype
+        column.values = values
+        column.nulls = nulls
+        column.size = len(values)
+        return column
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def _position(self, row_idx):
+        if row_idx < 0:
+            row_idx += self.size
+        if not 0 <= row_idx < self.size:
+            raise IndexError('column index out of range')
+        return row_idx
+
+    def _reserve(self, size):
+        if size <= len(self.values):
+            return
+        capacity = max(size, 2 * len(self.values))
+        values = np.empty(capacity, dtype=self.dtype)
+        values[:self.size] = self.values[:self.size]
+        self.values = values
+        if self.nulls is not None:
+            nulls = np.zeros(capacity, dtype=bool)
+            nulls[:self.size] = self.nulls[:self.size]
+            self.nulls = nulls
+
+    def _mark_null(self, row_idx):
+        if self.nulls is None:
+            self.nulls = np.zeros(len(self.values), dtype=bool)
+        self.nulls[row_idx] = True
+
+    def __getitem__(self, row_idx):
+        if isinstance(row_idx, slice):
+            return self.take(range(*row_idx.indices(self.size)))
+        row_idx = self._position(row_idx)
+        if self.nulls is not None and self.nulls[row_idx]:
+            return None
+        return self.values[row_idx].item()
+
+    def __setitem__(self, row_idx, value):
+        row_idx = self._position(row_idx)
+        if value is None:
+            self._mark_null(row_idx)
+            return
+        self.values[row_idx] = value
+        if self.nulls is not None:
+            self.nulls[row_idx] = False
+
+    def append(self, value):
+        """
+        Dopisuje wartość na końcu kolumny.
+
+        Parametry:
+        value: Wartość do dopisania (lub None).
+        """
+        self._reserve(self.size + 1)
+        self.size += 1
+        self[self.size - 1] = value
+
+    def extend(self, values):
+        """
+        Dopisuje wiele wartości na końcu kolumny jedną operacją.
+
+        Parametry:
+        values (iterable): Wartości do dopisania.
+        """
+        values = list(values)
+        start = self.size
+        self._reserve(start + len(values))
+        self.size += len(values)
+        if any(value is None for value in values):
+            for offset, value in enumerate(values):
+                self[start + offset] = value
+        else:
+            self.values[start:self.size] = np.array(values, dtype=self.dtype)
+            if self.nulls is not None:
+                self.nulls[start:self.size] = False
+
+    def array(self):
+        """
+        Zwraca widok tablicy NumPy z wartościami kolumny (bez kopiowania).
+
+        Zwraca:
+        numpy.ndarray: Wartości kolumny; komórki z None mają nieokreśloną wartość.
+        """
+        return self.values[:self.size]
+
+    def valid(self):
+        """
+        Zwraca maskę komórek różnych od None.
+
+        Zwraca:
+        numpy.ndarray: Maska logiczna lub None, jeśli kolumna nie zawiera żadnego None.
+        """
+        if self.nulls is None:
+            return None
+        return ~self.nulls[:self.size]
+
+    def take(self, row_ids):
+        """
+        Zwraca wartości z podanych wierszy jako listę obiektów Pythona.
+
+        Parametry:
+        row_ids (iterable): Numery wierszy.
+
+        Zwraca:
+        list: Wartości kolumny.
+        """
+        positions = np.asarray(row_ids, dtype=np.int64)
+        result = self.values[:self.size][positions].tolist()
+        if self.nulls is not None:
+            for offset in np.flatnonzero(self.nulls[:self.size][positions]):
+                result[offset] = None
+        return result
+
+    def put(self, row_ids, values):
+        """
+        Zapisuje wartości w podanych wierszach jedną operacją.
+
+        Parametry:
+        row_ids (list): Numery wierszy.
+        values (list): Nowe wartości (lub None) w kolejności numerów wierszy.
+        """
+        if any(value is None for value in values):
+            for row_idx, value in zip(row_ids, values):
+                self[row_idx] = value
+            return
+        positions = np.asarray(row_ids, dtype=np.int64)
+        self.values[:self.size][positions] = np.array(values, dtype=self.dtype)
+        if self.nulls is not None:
+            self.nulls[:self.size][positions] = False
+
+    def view(self, start, end):
+        """
+        Zwraca kolumnę obejmującą wiersze od start do end, współdzielącą dane z tą kolumną.
+
+        Parametry:
+        start (int): Numer pierwszego wiersza.
+        end (int): Numer wiersza za ostatnim.
+
+        Zwraca:
+        NumpyColumn: Widok fragmentu kolumny.
+        """
+        nulls = self.nulls[start:end] if self.nulls is not None else None
+        return NumpyColumn.from_array(self.values[start:end], nulls)
+
+    def to_list(self):
+        """
+        Zwraca wszystkie wartości kolumny jako listę obiektów Pythona.
+
+        Zwraca:
+        list: Wartości kolumny.
+        """
+        return self.take(range(self.size))
+
+    def delete(self, row_ids):
+        """
+        Usuwa podane wiersze w jednym przebiegu.
+
+        Parametry:
+        row_ids (iterable): Numery wierszy do usunięcia.
+        """
+        keep = np.ones(self.size, dtype=bool)
+        keep[np.asarray(list(row_ids), dtype=np.int64)] = False
+        self.keep(keep)
+
+    def keep(self, mask):
+        """
+        Zostawia tylko wiersze wskazane maską, w jednym przebiegu.
+
+        Parametry:
+        mask (numpy.ndarray): Maska logiczna długości kolumny.
+        """
+        self.values = self.values[:self.size][mask]
+        if self.nulls is not None:
+            self.nulls = self.nulls[:self.size][mask]
+        self.size = len(self.values)
+
+    def nbytes(self):
+        """
+        Zwraca liczbę bajtów zajmowanych przez dane kolumny.
+
+        Zwraca:
+        int: Rozmiar danych w bajtach.
+        """
+        return self.values.nbytes + (self.nulls.nbytes if self.nulls is not None else 0)
+
+
+class DictionaryColumn:
+    """
+    Kolumna TEXT kodowana słownikowo: każda różna wartość jest zapisana raz,
+    a wiersze przechowują jedynie kod wartości w słowniku.
+
+    Kody są trzymane w liście, a każdy kod jest jednym obiektem int współdzielonym przez wszystkie
+    wiersze z tą wartością (wiersz zajmuje tylko wskaźnik). Odczyt z listy nie tworzy nowych obiektów,
+    więc sprawdzanie warunku kod po kodzie jest szybsze niż na tablicy array('i').
+
+    Słownik nie jest zmniejszany przy usuwaniu i zmianie wierszy, więc kod raz nadany wartości
+    się nie zmienia. Warunki "kolumna = stała" i IN są sprawdzane przez porównanie kodów.
+    """
+
+    # Kod None oraz kod wartości, której nie ma w słowniku (nie pasuje do żadnego wiersza)
+    NULL_CODE = -1
+    MISSING_CODE = -2
+
+    def __init__(self):
+        """
+        Inicjalizuje pustą kolumnę.
+        """
+        self.dictionary = []
+        self.lookup = {}
+        self.codes = []
+        self._decoder = [None]
+
+    @classmethod
+    def from_codes(cls, dictionary, codes):
+        """
+        Tworzy kolumnę z gotowego słownika i kodów wierszy (np. wczytanych z migawki).
+
+        Parametry:
+        dictionary (list): Różne wartości kolumny; pozycja wartości jest jej kodem.
+        codes (iterable): Kody kolejnych wierszy (NULL_CODE dla None).
+
+        Zwraca:
+        DictionaryColumn: Kolumna zawierająca podane wiersze.
+        """
+        column = cls()
+        column.dictionary = list(dictionary)
+        # Wiersze dostają obiekty kodów ze słownika lookup (ostatni element - NULL_CODE)
+        shared = list(range(len(column.dictionary))) + [cls.NULL_CODE]
+        column.lookup = dict(zip(column.dictionary, shared))
+        column.codes.extend([shared[code] for code in codes])
+        return column
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, other):
+        if isinstance(other, (list, DictionaryColumn)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def encode(self, value):
+        """
+        Zwraca kod wartości, dopisując ją do słownika, jeśli to konieczne.
+
+        Parametry:
+        value (str): Wartość tekstowa lub None.
+
+        Zwraca:
+        int: Kod wartości.
+        """
+        if value is None:
+            return self.NULL_CODE
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.dictionary)
+            self.dictionary.append(value)
+            self.lookup[value] = code
+        return code
+
+    def code_of(self, value):
+        """
+        Zwraca kod wartości bez modyfikowania słownika.
+
+        Parametry:
+        value: Szukana wartość.
+
+        Zwraca:
+        int: Kod wartości lub MISSING_CODE, jeśli wartości nie ma w słowniku.
+        """
+        if value is None:
+            return self.NULL_CODE
+        try:
+            return self.lookup.get(value, self.MISSING_CODE)
+        except TypeError:
+            return self.MISSING_CODE
+
+    def decoder(self):
+        """
+        Zwraca listę wartości indeksowaną kodem: słownik uzupełniony o None na końcu,
+        więc kod NULL_CODE (-1) wskazuje None.
+
+        Lista jest uzupełniana tylko o wartości dopisane do słownika od poprzedniego wywołania.
+
+        Zwraca:
+        list: Wartości słownika i None.
+        """
+        decoder, dictionary = self._decoder, self.dictionary
+        if len(decoder) != len(dictionary) + 1:
+            # Słownik tylko rośnie, więc wystarczy dopisać jego nowe wartości przed końcowym None
+            decoder[len(decoder) - 1:] = dictionary[len(decoder) - 1:] + [None]
+        return decoder
+
+    def _decode(self, code):
+        return None if code == self.NULL_CODE else self.dictionary[code]
+
+    def __getitem__(self, row_idx):
+        if isinstance(row_idx, slice):
+            return self.take(range(*row_idx.indices(len(self))))
+        return self._decode(self.codes[row_idx])
+
+    def __setitem__(self, row_idx, value):
+        self.codes[row_idx] = self.encode(value)
+
+    def append(self, value):
+        """
+        Dopisuje wartość na końcu kolumny.
+
+        Parametry:
+        value (str): Wartość do dopisania (lub None).
+        """
+        self.codes.append(self.encode(value))
+
+    def extend(self, values):
+        """
+        Dopisuje wiele wartości na końcu kolumny.
+
+        Parametry:
+        values (iterable): Wartości do dopisania.
+        """
+        encode = self.encode
+        self.codes.extend([encode(value) for value in values])
+
+    def take(self, row_ids):
+        """
+        Zwraca wartości z podanych wierszy jako listę napisów.
+
+        Parametry:
+        row_ids (iterable): Numery wierszy.
+
+        Zwraca:
+        list: Wartości kolumny.
+        """
+        codes, decoder = self.codes, self.decoder()
+        return [decoder[codes[row_idx]] for row_idx in row_ids]
+
+    def put(self, row_ids, values):
+        """
+        Zapisuje wartości w podanych wierszach, kodując je przed zapisem.
+
+        Parametry:
+        row_ids (list): Numery wierszy.
+        values (list): Nowe wartości (lub None) w kolejności numerów wierszy.
+        """
+        codes, encode = self.codes, self.encode
+        for row_idx, value in zip(row_ids, values):
+            codes[row_idx] = encode(value)
+
+    def view(self, start, end):
+        """
+        Zwraca kolumnę z wierszami od start do end, współdzielącą słownik z tą kolumną.
+
+        Parametry:
+        start (int): Numer pierwszego wiersza.
+        end (int): Numer wiersza za ostatnim.
+
+        Zwraca:
+        DictionaryColumn: Fragment kolumny (kopia listy kodów).
+        """
+        column = DictionaryColumn.__new__(DictionaryColumn)
+        column.dictionary = self.dictionary
+        column.lookup = self.lookup
+        column.codes = self.codes[start:end]
+        column._decoder = [None]
+        return column
+
+    def to_list(self):
+        """
+        Zwraca wszystkie wartości kolumny jako listę napisów.
+
+        Zwraca:
+        list: Wartości kolumny.
+        """
+        return self.take(range(len(self)))
+
+    def code_bytes(self):
+        """
+        Zwraca kody wierszy jako bajty liczb int32 (w kolejności bajtów systemu).
+
+        Zwraca:
+        bytes: Kody kolejnych wierszy.
+        """
+        return array('i', self.codes).tobytes()
+
+    def delete(self, row_ids):
+        """
+        Usuwa podane wiersze w jednym przebiegu. Słownik nie jest zmniejszany.
+
+        Parametry:
+        row_ids (iterable): Numery wierszy do usunięcia.
+        """
+        removed = set(row_ids)
+        self.codes = [code for row_idx, code in enumerate(self.codes) if row_idx not in removed]
+
+    def keep(self, mask):
+        """
+        Zostawia tylko wiersze wskazane maską, w jednym przebiegu. Słownik nie jest zmniejszany.
+
+        Parametry:
+        mask (iterable): Wartości logiczne dla kolejnych wierszy (np. bytearray z Table.live).
+        """
+        self.codes = list(compress(self.codes, mask))
+
+    def nbytes(self):
+        """
+        Zwraca przybliżoną liczbę bajtów zajmowanych przez kody i słownik.
+
+        Zwraca:
+        int: Rozmiar danych w bajtach.
+        """
+        return 8 * len(self.codes) + sum(len(value) for value in self.dictionary)
+
+
+class EncodedTextColumn(DictionaryColumn):
+    """
+    Kolumna TEXT kodowana słownikowo w tabeli przechowywanej w NumPy:
+    kody wierszy są zapisane w kolumnie NumPy int32.
+    """
+
+    def __init__(self):
+        """
+        Inicjalizuje pustą kolumnę.
+        """
+        super().__init__()
+        self.codes = NumpyColumn('int32')
+
+    def array(self):
+        """
+        Zwraca zdekodowane wartości jako tablicę obiektów NumPy.
+
+        Zwraca:
+        numpy.ndarray: Wartości kolumny (None dla pustych komórek).
+        """
+        # Kod -1 (None) wskazuje na ostatni element słownika uzupełnionego o None
+        return np.array(self.dictionary + [None], dtype=object)[self.codes.array()]
+
+    def valid(self):
+        """
+        Zwraca maskę komórek różnych od None.
+
+        Zwraca:
+        numpy.ndarray: Maska logiczna.
+        """
+        return self.codes.array() != self.NULL_CODE
+
+    def take(self, row_ids):
+        """
+        Zwraca wartości z podanych wierszy jako listę napisów.
+
+        Parametry:
+        row_ids (iterable): Numery wierszy.
+
+        Zwraca:
+        list: Wartości kolumny.
+        """
+        decoder = self.decoder()
+        return [decoder[code] for code in self.codes.take(row_ids)]
+
+    def put(self, row_ids, values):
+        """
+        Zapisuje wartości w podanych wierszach, kodując je przed zapisem.
+
+        Parametry:
+        row_ids (list): Numery wierszy.
+        values (list): Nowe wartości (lub None) w kolejności numerów wierszy.
+        """
+        encode = self.encode
+        self.codes.put(row_ids, [encode(value) for value in values])
+
+    def view(self, start, end):
+        """
+        Zwraca kolumnę obejmującą wiersze od start do end, współdzielącą kody i słownik z tą kolumną.
+
+        Parametry:
+        start (int): Numer pierwszego wiersza.
+        end (int): Numer wiersza za ostatnim.
+
+        Zwraca:
+        EncodedTextColumn: Widok fragmentu kolumny.
+        """
+        column = EncodedTextColumn.__new__(EncodedTextColumn)
+        column.dictionary = self.dictionary
+        column.lookup = self.lookup
+        column.codes = self.codes.view(start, end)
+        column._decoder = [None]
+        return column
+
+    def code_bytes(self):
+        """
+        Zwraca kody wierszy jako bajty liczb int32 (w kolejności bajtów systemu).
+
+        Zwraca:
+        bytes: Kody kolejnych wierszy.
+        """
+        return self.codes.array().astype('int32').tobytes()
+
+    def delete(self, row_ids):
+        """
+        Usuwa podane wiersze w jednym przebiegu. Słownik nie jest zmniejszany.
+
+        Parametry:
+        row_ids (iterable): Numery wierszy do usunięcia.
+        """
+        self.codes.delete(row_ids)
+
+    def keep(self, mask):
+        """
+        Zostawia tylko wiersze wskazane maską, w jednym przebiegu. Słownik nie jest zmniejszany.
+
+        Parametry:
+        mask (numpy.ndarray): Maska logiczna długości kolumny.
+        """
+        self.codes.keep(mask)
+
+    def nbytes(self):
+        """
+        Zwraca przybliżoną liczbę bajtów zajmowanych przez kody i słownik.
+
+        Zwraca:
+        int: Rozmiar danych w bajtach.
+        """
+        return self.codes.nbytes() + sum(len(value) for value in self.dictionary)
+
+
+def make_column(column_type, storage='list'):
+    """
+    Tworzy pustą kolumnę w podanym sposobie przechowywania.
+
+    Parametry:
+    column_type (str): Typ kolumny (np. 'INTEGER', 'TEXT(50)').
+    storage (str): 'list' (listy Pythona) lub 'numpy' (tablice NumPy).
+
+    Zwraca:
+    Pusta lista, DictionaryColumn (kolumna TEXT w listach, jeśli TEXT_ENCODING), NumpyColumn
+    lub EncodedTextColumn. Typy bez odpowiednika w NumPy (np. TIME) są w tabelach NumPy
+    przechowywane jako listy.
+
+    Podnosi:
+    ValueError: Jeśli sposób przechowywania jest nieznany.
+    ImportError: Jeśli wybrano 'numpy', a biblioteka NumPy nie jest zainstalowana.
+    """
+    if storage not in STORAGE_TYPES:
+        raise ValueError(f"Unknown storage type: {storage}")
+    base_type = column_type.split('(')[0].strip().upper()
+    if storage == 'list':
+        return DictionaryColumn() if TEXT_ENCODING and base_type == 'TEXT' else []
+    if np is None:
+        raise ImportError("numpy storage requires the numpy package")
+    if base_type in NUMPY_TYPES:
+        return NumpyColumn(NUMPY_TYPES[base_type])
+    if base_type == 'TEXT':
+        return EncodedTextColumn()
+    return []
+
+
+def take(values, row_ids):
+    """
+    Zwraca wartości kolumny z podanych wierszy jako listę.
+
+    Parametry:
+    values: Kolumna (lista lub kolumna NumPy).
+    row_ids (iterable): Numery wierszy.
+
+    Zwraca:
+    list: Wartości kolumny.
+    """
+    if isinstance(values, list):
+        return [values[row_idx] for row_idx in row_ids]
+    return values.take(row_ids)
+
+
+def put(values, row_ids, new_values):
+    """
+    Zapisuje wartości w podanych wierszach kolumny.
+
+    Parametry:
+    values: Kolumna (lista lub kolumna NumPy).
+    row_ids (list): Numery wierszy.
+    new_values (list): Nowe wartości w kolejności numerów wierszy.
+    """
+    if isinstance(values, list):
+        for row_idx, value in zip(row_ids, new_values):
+            values[row_idx] = value
+    else:
+        values.put(row_ids, new_values)
+
+
+def view(values, start, end):
+    """
+    Zwraca fragment kolumny z wierszami od start do end.
+
+    Parametry:
+    values: Kolumna (lista lub kolumna NumPy).
+    start (int): Numer pierwszego wiersza.
+    end (int): Numer wiersza za ostatnim.
+
+    Zwraca:
+    Lista (kopia fragmentu) lub kolumna NumPy współdzieląca dane z kolumną.
+    """
+    if isinstance(values, list):
+        return values[start:end]
+    return values.view(start, end)
+
+
+def delete(values, row_ids):
+    """
+    Usuwa podane wiersze z kolumny.
+
+    Parametry:
+    values: Kolumna (lista lub kolumna NumPy).
+    row_ids (list): Numery wierszy do usunięcia.
+    """
+    if isinstance(values, list):
+        removed = set(row_ids)
+        values[:] = [value for row_idx, value in enumerate(values) if row_idx not in removed]
+    else:
+        values.delete(row_ids)
+
+
+def compact(values, live):
+    """
+    Zostawia w kolumnie tylko żywe wiersze, przepisując ją w jednym przebiegu.
+
+    Parametry:
+    values: Kolumna (lista lub kolumna NumPy).
+    live (bytearray): Mapa żywych wierszy (1 - wiersz zostaje, 0 - wiersz usunięty).
+    """
+    if isinstance(values, list):
+        values[:] = compress(values, live)
+    elif type(values) is DictionaryColumn:
+        values.keep(live)
+    else:
+        values.keep(np.frombuffer(live, dtype=np.uint8, count=len(values)).astype(bool))
+
+
+def settle_encoding(values):
+    """
+    Sprawdza, czy kolumnę kodowaną słownikowo (DictionaryColumn) opłaca się dalej kodować.
+
+    Kodowanie zmniejsza pamięć tylko wtedy, gdy wartości się powtarzają; kolumna, w której
+    po co najmniej ENCODING_MIN_ROWS wierszach różnych wartości jest więcej niż
+    MAX_DICTIONARY_FRACTION liczby wierszy, jest zamieniana na listę.
+
+    Parametry:
+    values: Kolumna.
+
+    Zwraca:
+    Ta sama kolumna albo lista z jej wartościami.
+    """
+    if type(values) is DictionaryColumn and len(values.codes) >= ENCODING_MIN_ROWS \
+            and len(values.dictionary) > MAX_DICTIONARY_FRACTION * len(values.codes):
+        return values.to_list()
+    return values
+
+
+def from_codes(values, dictionary, codes):
+    """
+    Wypełnia pustą kolumnę wierszami zapisanymi jako słownik wartości i kody.
+
+    Parametry:
+    values: Pusta kolumna utworzona przez make_column.
+    dictionary (list): Różne wartości kolumny; pozycja wartości jest jej kodem.
+    codes (iterable): Kody kolejnych wierszy (-1 dla None).
+
+    Zwraca:
+    Kolumna kodowana słownikowo tej samej klasy co values albo lista wartości,
+    jeśli kolumna nie jest kodowana.
+    """
+    if isinstance(values, DictionaryColumn):
+        return type(values).from_codes(dictionary, codes)
+    decoder = list(dictionary) + [None]
+    values.extend([decoder[code] for code in codes])
+    return values
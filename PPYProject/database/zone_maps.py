@@ -0,0 +1,235 @@
+from database import storage as column_storage
+from database.predicates import coerce_literal, constant_value, simple_comparison
+from database.sql_parser import And, Between, Column, InList, Literal, Or, Parameter
+from database.statistics import range_may_contain
+
+# Liczba kolejnych wierszy opisywanych jednym wpisem mapy stref
+BLOCK_SIZE = 1024
+
+
+class ZoneMap:
+    """
+    Mapa stref kolumny: najmniejsza i największa wartość oraz liczba wartości None
+    w każdym bloku kolejnych wierszy.
+
+    Granice bloku są poszerzane przy wstawianiu i zmianie wartości, ale nigdy nie są zawężane
+    (usunięcie wiersza ich nie zmienia), więc zawsze obejmują wszystkie wartości bloku.
+    Dokładne granice przywraca przebudowa mapy przy kompakcji tabeli.
+
+    Budowa mapy może zostać odłożona (defer) - np. po wczytaniu migawki, aby nie czytać
+    od razu wszystkich stron pliku zmapowanego do pamięci. Mapa jest wtedy budowana
+    przy pierwszym użyciu przez Table.zone_map.
+    """
+
+    def __init__(self, block_size=BLOCK_SIZE):
+        """
+        Inicjalizuje pustą mapę stref.
+
+        Parametry:
+        block_size (int): Liczba wierszy w bloku.
+        """
+        self.block_size = block_size
+        self.minimums = []  # None dla bloku bez wartości różnych od None
+        self.maximums = []
+        self.null_counts = []
+        self.rows = 0  # liczba wierszy objętych mapą
+        # True, gdy budowa mapy jest odłożona - zmiany wartości są wtedy pomijane,
+        # bo budowa odczyta aktualne wartości kolumny
+        self.stale = False
+
+    def build(self, column):
+        """
+        Buduje mapę od nowa na podstawie wartości kolumny.
+
+        Granice bloków kolumny NumPy bez kodowania słownikowego są wyznaczane wektorowo.
+
+        Parametry:
+        column: Kolumna (lista lub kolumna NumPy).
+        """
+        if isinstance(column, column_storage.NumpyColumn):
+            minimums, maximums, null_counts = _numpy_blocks(column, self.block_size)
+        else:
+            zone_map = ZoneMap(self.block_size)
+            size = len(column)
+            for start in range(0, size, self.block_size):
+                zone_map.extend(column_storage.take(column, range(start, min(start + self.block_size, size))))
+            minimums, maximums, null_counts = zone_map.minimums, zone_map.maximums, zone_map.null_counts
+        # Wyniki są podmieniane na końcu, bo mapę odłożoną może budować czytelnik tabeli
+        self.minimums, self.maximums, self.null_counts, self.rows = minimums, maximums, null_counts, len(column)
+        self.stale = False
+
+    def defer(self):
+        """
+        Odkłada budowę mapy do pierwszego użycia (zob. Table.zone_map).
+        """
+        self.stale = True
+        self.minimums, self.maximums, self.null_counts, self.rows = [], [], [], 0
+
+    def extend(self, values):
+        """
+        Uwzględnia wiersze dopisane na końcu kolumny.
+
+        Parametry:
+        values (list): Wartości nowych wierszy w kolejności numerów wierszy.
+        """
+        if self.stale:
+            return
+        position = 0
+        while position < len(values):
+            block, offset = divmod(self.rows, self.block_size)
+            if offset == 0:
+                self.minimums.append(None)
+                self.maximums.append(None)
+                self.null_counts.append(0)
+            chunk = values[position:position + self.block_size - offset]
+            present = [value for value in chunk if value is not None]
+            self.null_counts[block] += len(chunk) - len(present)
+            if present:
+                self._widen(block, min(present), max(present))
+            position += len(chunk)
+            self.rows += len(chunk)
+
+    def update(self, row_ids, old_values, new_values):
+        """
+        Uwzględnia zmianę wartości w istniejących wierszach.
+
+        Parametry:
+        row_ids (list): Numery wierszy.
+        old_values (list): Wartości sprzed zmiany.
+        new_values (list): Nowe wartości.
+        """
+        if self.stale:
+            return
+        for row_idx, old_value, value in zip(row_ids, old_values, new_values):
+            block = row_idx // self.block_size
+            self.null_counts[block] += (value is None) - (old_value is None)
+            if value is not None:
+                self._widen(block, value, value)
+
+    def _widen(self, block, low, high):
+        if self.minimums[block] is None or low < self.minimums[block]:
+            self.minimums[block] = low
+        if self.maximums[block] is None or high > self.maximums[block]:
+            self.maximums[block] = high
+
+    def blocks(self, operator, value):
+        """
+        Wyznacza bloki, w których jakiś wiersz może spełniać porównanie "kolumna operator wartość".
+
+        Parametry:
+        operator (str): Operator porównania.
+        value: Wartość porównywana (dopasowana do typu kolumny).
+
+        Zwraca:
+        list: Wartość logiczna dla każdego bloku.
+        """
+        if operator == '!=':
+            return [True] * len(self.minimums)
+        if value is None:
+            # "= NULL" wybiera tylko wiersze z NULL, a porównania <, <=, >, >= z NULL nie są spełnione
+            return [operator == '==' and count > 0 for count in self.null_counts]
+        # Porównania z wartością różną od NULL nie są spełnione przez NULL (tak samo jak w CompiledCondition
+        # i evaluate_mask), więc blok bez wartości różnych od None można pominąć
+        return [low is not None and range_may_contain(low, high, operator, value)
+                for low, high in zip(self.minimums, self.maximums)]
+
+
+def _numpy_blocks(column, block_size):
+    # Najmniejsze i największe wartości oraz liczby None bloków kolumny NumPy (wektorowo)
+    values = column.array()
+    if not len(values):
+        return [], [], []
+    starts = column_storage.np.arange(0, len(values), block_size)
+    minimums = column_storage.np.minimum.reduceat(values, starts).tolist()
+    maximums = column_storage.np.maximum.reduceat(values, starts).tolist()
+    valid = column.valid()
+    if valid is None:
+        return minimums, maximums, [0] * len(starts)
+    null_counts = column_storage.np.add.reduceat(~valid, starts, dtype=column_storage.np.int64).tolist()
+    # W blokach z None granice wyznaczane są tylko z wartości obecnych
+    for block, count in enumerate(null_counts):
+        if count:
+            start = block * block_size
+            present = values[start:start + block_size][valid[start:start + block_size]]
+            minimums[block] = present.min().item() if len(present) else None
+            maximums[block] = present.max().item() if len(present) else None
+    return minimums, maximums, null_counts
+
+
+def _constant(table, node, column, params):
+    if not isinstance(node, (Literal, Parameter)):
+        return None, False
+    return coerce_literal(constant_value(node, params), table.columns[column]), True
+
+
+def _combine(masks, function):
+    return [function(flags) for flags in zip(*masks)]
+
+
+def _block_mask(table, node, params):
+    if isinstance(node, And):
+        masks = [mask for mask in (_block_mask(table, item, params) for item in node.items) if mask is not None]
+        return _combine(masks, all) if masks else None
+    if isinstance(node, Or):
+        masks = [_block_mask(table, item, params) for item in node.items]
+        return None if any(mask is None for mask in masks) else _combine(masks, any)
+    comparison = simple_comparison(node, params)
+    if comparison is not None:
+        column, operator, value = comparison
+        if column not in table.zone_maps:
+            return None
+        return table.zone_map(column).blocks(operator, coerce_literal(value, table.columns[column]))
+    if not isinstance(node, (InList, Between)) or node.negated or not isinstance(node.operand, Column) \
+            or node.operand.name not in table.zone_maps:
+        return None
+    column = node.operand.name
+    zone_map = table.zone_map(column)
+    if isinstance(node, InList):
+        masks = []
+        for item in node.values:
+            value, constant = _constant(table, item, column, params)
+            if not constant:
+                return None
+            masks.append(zone_map.blocks('==', value))
+        return _combine(masks, any)
+    low, low_constant = _constant(table, node.low, column, params)
+    high, high_constant = _constant(table, node.high, column, params)
+    if not (low_constant and high_constant):
+        return None
+    return _combine([zone_map.blocks('>=', low), zone_map.blocks('<=', high)], all)
+
+
+def scan_ranges(table, condition, params=(), bounds=None):
+    """
+    Wyznacza zakresy wierszy tabeli, w których mogą być wiersze spełniające warunek.
+
+    Wykorzystywane są porównania kolumny ze stałą, BETWEEN i IN ze stałymi, połączone
+    przez AND i OR; pozostałe warunki nie wykluczają żadnego bloku.
+
+    Parametry:
+    table (Table): Tabela.
+    condition: Drzewo warunku WHERE.
+    params (sequence): Wartości parametrów '?'.
+    bounds (list, opcjonalnie): Pary (początek, koniec) skanowanych fragmentów. Domyślnie cała tabela.
+
+    Zwraca:
+    list: Pary (początek, koniec) fragmentów przyciętych do bloków, które trzeba przejrzeć,
+        lub None, jeśli mapy stref nie wykluczają żadnego bloku.
+    """
+    mask = _block_mask(table, condition, params)
+    if mask is None or all(mask):
+        return None
+    if bounds is None:
+        bounds = [(0, table.row_count())]
+    size = table.block_size
+    ranges = []
+    for start, end in bounds:
+        for block in range(start // size, (end - 1) // size + 1):
+            if not mask[block]:
+                continue
+            low, high = max(start, block * size), min(end, (block + 1) * size)
+            if ranges and ranges[-1][1] == low:
+                ranges[-1] = (ranges[-1][0], high)
+            else:
+                ranges.append((low, high))
+    return ranges
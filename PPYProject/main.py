@@ -1,8 +1,13 @@
-from database import DataModificationLanguage, DDL, DataQueryLanguage, Database
+import logging
+
+from database import DataModificationLanguage, DDL, DataQueryLanguage, Database, events, parallel
 from state_management import StateManagement
 
 
 def main():
+    # Show database events (table changes, saved and loaded state) without blocking on terminal output
+    events.configure(logging.INFO, queued=True)
+
     # Create a shared instance of the Database class
     db_instance = Database.get_instance()
 
@@ -64,6 +69,8 @@ def main():
     # Delete the table after all operations are done
     print(f"Dropping table '{table_name}'")
     ddl.drop_table(table_name)
+    parallel.shutdown()
+    events.shutdown()
 
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 # __init__.py in /state_management
 
 from .state_handler import StateManagement
+from .wal import WriteAheadLog
 
-__all__ = ['StateManagement']
+__all__ = ['StateManagement', 'WriteAheadLog']
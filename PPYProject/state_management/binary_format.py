@@ -0,0 +1,297 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from datetime import date, time
+
+from database.db_structure import Table
+from database.storage import np, DictionaryColumn, NumpyColumn, EncodedTextColumn
+
+# Układ pliku:
+#   MAGIC (8 B) | przesunięcie nagłówka (8 B) | długość nagłówka (8 B)
+#   segmenty kolumn (wyrównane do 8 B)
+#   nagłówek JSON: schemat, liczba wierszy oraz przesunięcia segmentów każdej kolumny
+MAGIC = b'PPYDB\x00\x01\x00'
+_PRELUDE = struct.Struct('<8sQQ')
+_ALIGNMENT = 8
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Kodowanie kolumny: kod typu modułu array oraz typ NumPy tego samego segmentu
+_FIXED_WIDTH = {
+    'int64': ('q', 'int64'),
+    'float64': ('d', 'float64'),
+    'bool': ('B', 'bool'),
+    'date': ('q', 'datetime64[D]'),
+    'time': ('q', 'int64'),
+}
+
+
+def is_binary_snapshot(filename):
+    """
+    Sprawdza, czy plik jest migawką w formacie binarnym.
+
+    Parametry:
+        filename (str): Ścieżka do pliku.
+
+    Zwraca:
+        bool: True, jeśli plik zaczyna się sygnaturą formatu binarnego.
+    """
+    with open(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def _encoding_for(column_type):
+    base_type = column_type.split('(')[0].strip().upper()
+    return {
+        'INTEGER': 'int64',
+        'FLOAT': 'float64',
+        'BOOLEAN': 'bool',
+        'DATE': 'date',
+        'TIME': 'time',
+        'TEXT': 'text',
+    }.get(base_type, 'json')
+
+
+def _to_storage_value(encoding, value):
+    if encoding == 'date':
+        return value.toordinal() - _EPOCH_ORDINAL
+    if encoding == 'time':
+        return ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+    return value
+
+
+def _from_storage_value(encoding, value):
+    if encoding == 'date':
+        return date.fromordinal(value + _EPOCH_ORDINAL)
+    if encoding == 'time':
+        seconds, microsecond = divmod(value, 1000000)
+        minutes, second = divmod(seconds, 60)
+        hour, minute = divmod(minutes, 60)
+        return time(hour, minute, second, microsecond)
+    if encoding == 'bool':
+        return bool(value)
+    return value
+
+
+def _text_segments(values):
+    """Koduje listę napisów jako przesunięcia (uint64, n+1) i wspólny blok UTF-8."""
+    offsets = array('Q', [0])
+    chunks = []
+    position = 0
+    for value in values:
+        encoded = b'' if value is None else value.encode('utf-8')
+        chunks.append(encoded)
+        position += len(encoded)
+        offsets.append(position)
+    return offsets.tobytes(), b''.join(chunks)
+
+
+def _column_segments(values, column_type):
+    """
+    Zwraca opis kodowania kolumny oraz listę nazwanych segmentów bajtów do zapisania.
+    """
+    if isinstance(values, DictionaryColumn):
+        offsets, blob = _text_segments(values.dictionary)
+        return 'dict', [('offsets', offsets), ('blob', blob), ('codes', values.code_bytes())]
+
+    encoding = _encoding_for(column_type)
+    if isinstance(values, NumpyColumn):
+        nulls = values.nulls[:values.size] if values.nulls is not None else None
+        data = values.array()
+        if encoding == 'date':
+            data = data.astype('datetime64[D]').view('int64')
+        segments = [('values', data.tobytes())]
+        if nulls is not None and nulls.any():
+            segments.append(('nulls', nulls.astype('uint8').tobytes()))
+        return encoding, segments
+
+    nulls = [value is None for value in values]
+    has_nulls = any(nulls)
+    if encoding == 'text':
+        offsets, blob = _text_segments(values)
+        segments = [('offsets', offsets), ('blob', blob)]
+    elif encoding in _FIXED_WIDTH:
+        typecode = _FIXED_WIDTH[encoding][0]
+        try:
+            segments = [('values', array(typecode, [0 if value is None else _to_storage_value(encoding, value)
+                                                    for value in values]).tobytes())]
+        except (OverflowError, TypeError, AttributeError):
+            # Wartości niemieszczące się w stałej szerokości zapisujemy jako JSON
+            return 'json', [('json', json.dumps(list(values), default=str).encode('utf-8'))]
+    else:
+        return 'json', [('json', json.dumps(list(values), default=str).encode('utf-8'))]
+    if has_nulls:
+        segments.append(('nulls', bytes(nulls)))
+    return encoding, segments
+
+
+def write_snapshot(filename, tables, lsn=0, base=None):
+    """
+    Zapisuje tabele do pliku w binarnym formacie kolumnowym.
+
+    Kolumny są kodowane i zapisywane kolejno, więc w pamięci znajduje się naraz
+    tylko zakodowana postać jednej kolumny.
+
+    Parametry:
+        filename (str): Ścieżka do pliku.
+        tables (dict): Słownik nazwa -> Table.
+        lsn (int, opcjonalnie): Numer ostatniej operacji dziennika WAL zawartej w migawce.
+        base (str, opcjonalnie): Identyfikator migawki bazowej łańcucha migawek przyrostowych.
+
+    Zwraca:
+        int: Liczba zapisanych bajtów.
+    """
+    header = {'byteorder': sys.byteorder, 'lsn': lsn, 'base': base, 'tables': {}}
+    with open(filename, 'wb') as file:
+        file.write(_PRELUDE.pack(MAGIC, 0, 0))
+        position = _PRELUDE.size
+        for table_name, table in tables.items():
+            table_info = {
+                'columns': table.columns,
+                'storage': table.storage,
+                'row_count': table.row_count(),
+                'indexes': {name: [index.column, index.kind] for name, index in table.indexes.items()},
+                # Usunięte wiersze oczekujące na kompakcję
+                'deleted': table.deleted_rows(),
+                'segments': {},
+            }
+            for column, values in table.data.items():
+                encoding, segments = _column_segments(values, table.columns[column])
+                column_info = {'encoding': encoding}
+                for segment_name, payload in segments:
+                    padding = -position % _ALIGNMENT
+                    file.write(b'\x00' * padding)
+                    position += padding
+                    column_info[segment_name] = [position, len(payload)]
+                    file.write(payload)
+                    position += len(payload)
+                table_info['segments'][column] = column_info
+            header['tables'][table_name] = table_info
+        encoded_header = json.dumps(header).encode('utf-8')
+        file.write(encoded_header)
+        file.seek(0)
+        file.write(_PRELUDE.pack(MAGIC, position, len(encoded_header)))
+    return position + len(encoded_header)
+
+
+def _read_text(buffer, offsets_segment, blob_segment):
+    offsets_start, offsets_length = offsets_segment
+    offsets = buffer[offsets_start:offsets_start + offsets_length].cast('Q')
+    blob_start = blob_segment[0]
+    blob = bytes(buffer[blob_start:blob_start + blob_segment[1]])
+    result = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+    offsets.release()
+    return result
+
+
+def _read_list_column(buffer, column_info):
+    encoding = column_info['encoding']
+    if encoding == 'json':
+        start, length = column_info['json']
+        return json.loads(bytes(buffer[start:start + length]).decode('utf-8'))
+    if encoding in ('text', 'dict'):
+        values = _read_text(buffer, column_info['offsets'], column_info['blob'])
+        if encoding == 'dict':
+            start, length = column_info['codes']
+            codes = buffer[start:start + length].cast('i')
+            values = [None if code < 0 else values[code] for code in codes]
+            codes.release()
+    else:
+        start, length = column_info['values']
+        view = buffer[start:start + length].cast(_FIXED_WIDTH[encoding][0])
+        values = view.tolist()
+        view.release()
+        if encoding in ('date', 'time', 'bool'):
+            values = [_from_storage_value(encoding, value) for value in values]
+    if 'nulls' in column_info:
+        start, length = column_info['nulls']
+        for row_idx, is_null in enumerate(buffer[start:start + length]):
+            if is_null:
+                values[row_idx] = None
+    return values
+
+
+def _read_numpy_column(mapping, column_info, row_count):
+    """Tworzy kolumnę NumPy będącą widokiem na zmapowany plik (bez kopiowania danych)."""
+    encoding = column_info['encoding']
+    if encoding == 'dict':
+        column = EncodedTextColumn()
+        column.dictionary = _read_text(memoryview(mapping), column_info['offsets'], column_info['blob'])
+        column.lookup = {value: code for code, value in enumerate(column.dictionary)}
+        start, _ = column_info['codes']
+        column.codes = NumpyColumn.from_array(np.frombuffer(mapping, dtype='int32', count=row_count, offset=start))
+        return column
+    if encoding not in _FIXED_WIDTH or encoding == 'time':
+        return None
+    start, _ = column_info['values']
+    values = np.frombuffer(mapping, dtype=_FIXED_WIDTH[encoding][1], count=row_count, offset=start)
+    nulls = None
+    if 'nulls' in column_info:
+        nulls = np.frombuffer(mapping, dtype='bool', count=row_count, offset=column_info['nulls'][0])
+    return NumpyColumn.from_array(values, nulls)
+
+
+def read_snapshot(filename):
+    """
+    Wczytuje tabele z pliku w binarnym formacie kolumnowym.
+
+    Plik jest mapowany do pamięci (mmap, kopia przy zapisie). Kolumny tabel przechowywanych
+    w NumPy są widokami na zmapowany plik, więc otwarcie bazy nie kopiuje danych, a strony
+    pliku są wczytywane dopiero przy pierwszym dostępie. Kolumny listowe są dekodowane
+    z bufora w całości.
+
+    Parametry:
+        filename (str): Ścieżka do pliku.
+
+    Zwraca:
+        tuple: Słownik nazwa -> Table oraz metadane migawki: numer ostatniej operacji dziennika WAL
+            ('lsn') i identyfikator migawki bazowej ('base').
+
+    Podnosi:
+        ValueError: Jeśli plik nie jest migawką binarną lub ma inną kolejność bajtów.
+    """
+    with open(filename, 'rb') as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, header_offset, header_length = _PRELUDE.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{filename} is not a binary database snapshot")
+    header = json.loads(mapping[header_offset:header_offset + header_length].decode('utf-8'))
+    if header['byteorder'] != sys.byteorder:
+        raise ValueError(f"Snapshot {filename} was written with {header['byteorder']}-endian byte order")
+
+    tables = {}
+    buffer = memoryview(mapping)
+    mapped_columns = False
+    for table_name, table_info in header['tables'].items():
+        table = Table(table_name, table_info['columns'], table_info['storage'])
+        row_count = table_info['row_count']
+        for column, column_info in table_info['segments'].items():
+            values = None
+            if table.storage == 'numpy':
+                values = _read_numpy_column(mapping, column_info, row_count)
+                mapped_columns = mapped_columns or values is not None
+            if values is None and column_info['encoding'] == 'dict' and type(table.data[column]) is DictionaryColumn:
+                # Słownik i kody są wczytywane bez dekodowania wierszy
+                codes_start, codes_length = column_info['codes']
+                codes = buffer[codes_start:codes_start + codes_length].cast('i')
+                values = DictionaryColumn.from_codes(
+                    _read_text(buffer, column_info['offsets'], column_info['blob']), codes)
+                codes.release()
+            if values is None:
+                values = _read_list_column(buffer, column_info)
+                if not isinstance(table.data[column], list):
+                    table.data[column].extend(values)
+                    continue
+            table.data[column] = values
+        table.settle_encoding()
+        table.defer_zone_maps()
+        for index_name, (column, index_type) in table_info.get('indexes', {}).items():
+            table.create_index(index_name, column, index_type)
+        table.delete_rows(table_info.get('deleted', []))
+        tables[table_name] = table
+    buffer.release()
+    if not mapped_columns:
+        # Żadna kolumna nie wskazuje na zmapowany plik - można go od razu zamknąć
+        mapping.close()
+    return tables, {'lsn': header.get('lsn', 0), 'base': header.get('base')}
@@ -1,67 +1,329 @@
 import json
+import logging
+import os
+import uuid
+from database import storage as column_storage
 from database.db_structure import Database, Table
-from datetime import date
+from database.events import log_event
+from database.locking import read_locked
+from datetime import date, time
+from state_management.binary_format import is_binary_snapshot, read_snapshot, write_snapshot
+from state_management.wal import WriteAheadLog
+
+logger = logging.getLogger(__name__)
+
+# Klucz pliku JSON z metadanymi migawki (numer operacji WAL, identyfikator migawki bazowej)
+_META_KEY = '__meta__'
+
+
+def delta_filename(filename, sequence):
+    """
+    Zwraca nazwę pliku delta o podanym numerze w łańcuchu migawki bazowej.
+
+    Parametry:
+        filename (str): Plik migawki bazowej.
+        sequence (int): Numer pliku delta (od 1).
+
+    Zwraca:
+        str: Ścieżka do pliku delta.
+    """
+    return f"{filename}.delta{sequence}"
+
+
+def _default_converter(o):
+    if isinstance(o, (date, time)):
+        return o.isoformat()
+    raise TypeError(f'Object of type {o.__class__.__name__} is not JSON serializable')
+
+
+def _decode_values(column_type, values):
+    base_type = column_type.split('(')[0].strip().upper()
+    if base_type == 'DATE':
+        return [date.fromisoformat(value) if value is not None else None for value in values]
+    if base_type == 'TIME':
+        return [time.fromisoformat(value) if value is not None else None for value in values]
+    return values
+
+
+def _column_list(values, start=0):
+    if isinstance(values, list):
+        return values[start:] if start else values
+    return values.take(range(start, len(values)))
+
+
+def _column_state(values):
+    if isinstance(values, column_storage.DictionaryColumn):
+        # Kolumna kodowana słownikowo: każda różna wartość jest zapisana raz, a wiersze jako kody
+        return {'dictionary': values.dictionary, 'codes': list(values.codes)}
+    return _column_list(values)
+
+
+def _table_state(table):
+    return {
+        'columns': table.columns,
+        'storage': table.storage,
+        'indexes': {name: [index.column, index.kind] for name, index in table.indexes.items()},
+        'data': {column: _column_state(values) for column, values in table.data.items()},
+        # Usunięte wiersze oczekujące na kompakcję są zapisywane razem z tabelą, żeby numery wierszy
+        # w migawce zgadzały się z numerami w rekordach WAL i plikach delta
+        'deleted': table.deleted_rows(),
+    }
+
+
+def _table_delta(table):
+    """Zmiany tabeli od ostatniej migawki: nowe, zmienione i usunięte wiersze albo cała tabela."""
+    if table.saved_rows is None:
+        return dict(_table_state(table), mode='full')
+    return {
+        'mode': 'append',
+        'start': table.saved_rows,
+        'data': {column: _column_list(values, table.saved_rows) for column, values in table.data.items()},
+        'updates': {
+            column: [[row_idx, table.data[column][row_idx]] for row_idx in sorted(row_ids)]
+            for column, row_ids in table.dirty_cells.items() if column in table.columns
+        },
+        'deleted': sorted(table.dirty_deletes),
+    }
+
+
+def _load_table(table_name, table_info):
+    table = Table(table_name, table_info['columns'], table_info.get('storage', 'list'))
+    for column, values in table_info['data'].items():
+        if isinstance(values, dict):
+            table.data[column] = column_storage.from_codes(table.data[column], values['dictionary'], values['codes'])
+            continue
+        values = _decode_values(table.columns[column], values)
+        if isinstance(table.data[column], list):
+            table.data[column] = values
+        else:
+            table.data[column].extend(values)
+    table.settle_encoding()
+    table.defer_zone_maps()
+    for index_name, (column, index_type) in table_info.get('indexes', {}).items():
+        table.create_index(index_name, column, index_type)
+    table.delete_rows(table_info.get('deleted', []))
+    return table
+
+
+def _apply_delta(db_instance, delta):
+    db_instance.tables = {name: db_instance.tables.get(name) for name in delta['table_names']}
+    for table_name, table_info in delta['tables'].items():
+        if table_info['mode'] == 'full':
+            db_instance.tables[table_name] = _load_table(table_name, table_info)
+            continue
+        table = db_instance.tables[table_name]
+        if table.row_count() != table_info['start']:
+            raise ValueError(f"Delta snapshot does not match table {table_name}")
+        for column, cells in table_info['updates'].items():
+            values = _decode_values(table.columns[column], [value for _, value in cells])
+            for (row_idx, _), value in zip(cells, values):
+                table.update_value(row_idx, column, value)
+        table.insert_columns({column: _decode_values(table.columns[column], values)
+                              for column, values in table_info['data'].items()})
+        table.delete_rows(table_info.get('deleted', []))
+    db_instance.lsn = delta.get('lsn', db_instance.lsn)
 
 
 class StateManagement:
     """Klasa do zarządzania stanem bazy danych."""
 
     @staticmethod
-    def save_state(filename):
+    def save_state(filename, format='json', incremental=False, max_deltas=8):
         """
         Zapisuje aktualny stan bazy danych do pliku.
 
+        W trybie przyrostowym pierwszy zapis tworzy migawkę bazową, a kolejne zapisują do plików
+        delta (filename.delta1, filename.delta2, ...) tylko tabele zmienione od poprzedniego zapisu:
+        nowe wiersze, zmienione komórki i usunięte wiersze albo całą tabelę po zmianie schematu lub kompakcji.
+        Po max_deltas plikach delta łańcuch jest scalany w nową migawkę bazową.
+
         Parametry:
             filename (str): Nazwa pliku, do którego ma być zapisany stan bazy danych.
+            format (str, opcjonalnie): 'json' lub 'binary' (kolumnowy format binarny) migawki pełnej
+                lub bazowej. Domyślnie 'json'. Pliki delta są zawsze zapisywane jako JSON.
+            incremental (bool, opcjonalnie): Zapis przyrostowy. Domyślnie False.
+            max_deltas (int, opcjonalnie): Liczba plików delta, po której tworzona jest nowa migawka bazowa.
 
         Zapisuje:
-            Plik JSON zawierający stan bazy danych.
+            Plik JSON lub binarny plik kolumnowy zawierający stan bazy danych albo plik delta.
+
+        Podnosi:
+            ValueError: Jeśli format jest nieznany.
         """
         db_instance = Database.get_instance()  # Get the shared database instance
+        if format not in ('json', 'binary'):
+            raise ValueError(f"Unknown state format: {format}")
 
-        def default_converter(o):
-            if isinstance(o, date):
-                return o.isoformat()
-            raise TypeError(f'Object of type {o.__class__.__name__} is not JSON serializable')
+        # Migawka jest spójna: w trakcie zapisu żadna tabela nie jest modyfikowana
+        with db_instance.lock, read_locked(db_instance.tables.values()):
+            saved_to = StateManagement._save_locked(filename, format, incremental, max_deltas, db_instance)
+        log_event(logger, logging.INFO, 'save', "Database state saved to %s", saved_to, filename=saved_to)
 
-        state = {
-            table_name: {
-                'columns': table.columns,
-                'data': table.data
+    @staticmethod
+    def _save_locked(filename, format, incremental, max_deltas, db_instance):
+        if not incremental:
+            # Zapis do pliku tymczasowego: kolumny wczytane z migawki binarnej mogą być mapowane z pliku filename
+            temporary = filename + '.tmp'
+            StateManagement._write_full(temporary, format, db_instance)
+            os.replace(temporary, filename)
+            StateManagement._end_chain(db_instance, filename)
+            return filename
+
+        chain = db_instance.snapshot_chain
+        if (chain is None or chain['filename'] != filename or chain['deltas'] >= max_deltas
+                or not os.path.exists(filename)):
+            # Nowa migawka bazowa (także scalenie łańcucha delta)
+            base = uuid.uuid4().hex
+            temporary = filename + '.tmp'
+            StateManagement._write_full(temporary, format, db_instance, base)
+            os.replace(temporary, filename)
+            sequence = 1
+            while os.path.exists(delta_filename(filename, sequence)):
+                os.remove(delta_filename(filename, sequence))
+                sequence += 1
+            db_instance.snapshot_chain = {'filename': filename, 'base': base, 'deltas': 0}
+            saved_to = filename
+        else:
+            sequence = chain['deltas'] + 1
+            delta = {
+                'base': chain['base'],
+                'sequence': sequence,
+                'lsn': db_instance.lsn,
+                'table_names': list(db_instance.tables),
+                'tables': {table_name: _table_delta(table)
+                           for table_name, table in db_instance.tables.items() if table.is_dirty()},
             }
-            for table_name, table in db_instance.tables.items()
-        }
+            saved_to = delta_filename(filename, sequence)
+            temporary = saved_to + '.tmp'
+            with open(temporary, 'w') as file:
+                json.dump(delta, file, default=_default_converter)
+            os.replace(temporary, saved_to)
+            chain['deltas'] = sequence
+
+        for table in db_instance.tables.values():
+            table.mark_clean()
+        return saved_to
+
+    @staticmethod
+    def _end_chain(db_instance, filename):
+        # Pełna migawka nadpisała migawkę bazową - dotychczasowe pliki delta nie mają już bazy
+        chain = db_instance.snapshot_chain
+        if chain is not None and chain['filename'] == filename:
+            db_instance.snapshot_chain = None
+
+    @staticmethod
+    def _write_full(filename, format, db_instance, base=None):
+        if format == 'binary':
+            write_snapshot(filename, db_instance.tables, db_instance.lsn, base)
+            return
+
+        state = {table_name: _table_state(table) for table_name, table in db_instance.tables.items()}
+        meta = {key: value for key, value in (('lsn', db_instance.lsn), ('base', base)) if value}
+        if meta:
+            state[_META_KEY] = meta
 
         with open(filename, 'w') as file:
-            json.dump(state, file, default=default_converter)
-        print(f"Database state saved to {filename}")
+            json.dump(state, file, default=_default_converter)
 
     @staticmethod
     def load_state(filename):
         """
         Wczytuje stan bazy danych z pliku.
 
+        Jeśli plik jest migawką bazową łańcucha przyrostowego, po nim wczytywane są kolejne
+        pliki delta należące do tego łańcucha.
+
         Parametry:
             filename (str): Nazwa pliku, z którego ma być wczytany stan bazy danych.
 
         Wczytuje:
-            Stan bazy danych z pliku JSON i aktualizuje obiekt Database.
+            Stan bazy danych z pliku JSON lub binarnego (rozpoznawanego po sygnaturze)
+            i aktualizuje obiekt Database. Plik binarny jest mapowany do pamięci.
         """
-        with open(filename, 'r') as file:
-            state = json.load(file)
-
         db_instance = Database.get_instance()  # Get the shared database instance
 
-        db_instance.tables = {
-            table_name: Table(table_name, table_info['columns'])
-            for table_name, table_info in state.items()
-        }
+        with db_instance.lock:
+            if is_binary_snapshot(filename):
+                db_instance.tables, meta = read_snapshot(filename)
+            else:
+                with open(filename, 'r') as file:
+                    state = json.load(file)
+                meta = state.pop(_META_KEY, {})
+                db_instance.tables = {table_name: _load_table(table_name, table_info)
+                                      for table_name, table_info in state.items()}
+            db_instance.lsn = meta.get('lsn', 0)
+
+            base = meta.get('base')
+            db_instance.snapshot_chain = None
+            if base:
+                sequence = 0
+                while os.path.exists(delta_filename(filename, sequence + 1)):
+                    with open(delta_filename(filename, sequence + 1), 'r') as file:
+                        delta = json.load(file)
+                    if delta['base'] != base or delta['sequence'] != sequence + 1:
+                        break  # pozostałość po poprzednim łańcuchu
+                    _apply_delta(db_instance, delta)
+                    sequence += 1
+                db_instance.snapshot_chain = {'filename': filename, 'base': base, 'deltas': sequence}
+            for table in db_instance.tables.values():
+                table.mark_clean()
+
+        log_event(logger, logging.INFO, 'load', "Database state loaded from %s", filename, filename=filename)
 
-        for table_name, table_info in state.items():
-            table = db_instance.tables[table_name]
-            table.data = table_info['data']
-            for column, values in table.data.items():
-                if table.columns[column] == 'DATE':
-                    table.data[column] = [date.fromisoformat(value) for value in values]
+    @staticmethod
+    def recover(filename, wal_filename, sync='commit', **wal_options):
+        """
+        Odtwarza bazę danych po uruchomieniu: wczytuje ostatnią migawkę (jeśli istnieje),
+        odtwarza nowsze operacje z dziennika WAL i podłącza dziennik do bazy danych,
+        tak aby kolejne operacje były w nim zapisywane.
+
+        Parametry:
+            filename (str): Plik migawki (JSON lub binarny).
+            wal_filename (str): Plik dziennika WAL.
+            sync (str, opcjonalnie): Polityka synchronizacji dziennika: 'commit', 'interval' lub 'group'.
+            wal_options: Dodatkowe parametry WriteAheadLog (interval_ms, group_window_ms).
+
+        Zwraca:
+            int: Liczba odtworzonych operacji z dziennika.
+        """
+        db_instance = Database.get_instance()
+        if db_instance.wal is not None:
+            db_instance.wal.close()
+            db_instance.wal = None
+        if os.path.exists(filename):
+            StateManagement.load_state(filename)
+        else:
+            db_instance.tables = {}
+            db_instance.lsn = 0
+            db_instance.snapshot_chain = None
+        wal = WriteAheadLog(wal_filename, sync, **wal_options)
+        applied = wal.replay(db_instance)
+        db_instance.wal = wal
+        log_event(logger, logging.INFO, 'recover', "Recovered %d operations from %s", applied, wal_filename,
+                  operations=applied, filename=wal_filename)
+        return applied
 
-        print(f"Database state loaded from {filename}")
+    @staticmethod
+    def checkpoint(filename, format='json', incremental=False):
+        """
+        Zapisuje migawkę bazy danych i czyści dziennik WAL.
+
+        Migawka jest zapisywana atomowo przez save_state, a zapisany w niej
+        numer operacji pozwala pominąć przy odtwarzaniu rekordy, których dziennik nie zdążył
+        wyczyścić przed awarią.
+
+        Parametry:
+            filename (str): Plik migawki.
+            format (str, opcjonalnie): 'json' lub 'binary'. Domyślnie 'json'.
+            incremental (bool, opcjonalnie): Zapis tylko zmian od poprzedniego punktu kontrolnego
+                (plik delta). Domyślnie False.
+        """
+        db_instance = Database.get_instance()
+        # Zmiany są wstrzymane od zapisu migawki do wyczyszczenia dziennika
+        with db_instance.lock, read_locked(db_instance.tables.values()):
+            if db_instance.wal is not None:
+                db_instance.wal.flush()
+            # save_state zapisuje do pliku tymczasowego i podmienia go atomowo
+            StateManagement.save_state(filename, format, incremental=incremental)
+            if db_instance.wal is not None:
+                db_instance.wal.reset()
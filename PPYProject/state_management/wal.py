@@ -0,0 +1,222 @@
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+from database import profiling
+from database.db_structure import Table
+
+# Nagłówek rekordu: długość danych, suma kontrolna CRC32, numer sekwencyjny (LSN)
+_FRAME = struct.Struct('<IIQ')
+
+SYNC_POLICIES = ('commit', 'interval', 'group')
+
+
+class WriteAheadLog:
+    """
+    Dziennik zapisu z wyprzedzeniem (WAL): plik, do którego dopisywany jest zwięzły rekord
+    każdej udanej operacji INSERT/UPDATE/DELETE i DDL.
+
+    Polityki synchronizacji z dyskiem (fsync):
+        'commit' - po każdym rekordzie; operacja kończy się dopiero po zapisie na dysk.
+        'interval' - rekordy trafiają do bufora, a wątek w tle zapisuje je co interval_ms milisekund.
+            Przy awarii można stracić co najwyżej ostatnie okno.
+        'group' - zatwierdzanie grupowe: operacja czeka na zapis swojego rekordu, ale jeden fsync
+            obejmuje wszystkie rekordy dopisane w tym czasie przez inne wątki.
+    """
+
+    def __init__(self, filename, sync='commit', interval_ms=10, group_window_ms=0):
+        """
+        Otwiera (lub tworzy) plik dziennika do dopisywania.
+
+        Parametry:
+        filename (str): Ścieżka do pliku dziennika.
+        sync (str): Polityka synchronizacji: 'commit', 'interval' lub 'group'. Domyślnie 'commit'.
+        interval_ms (int): Odstęp zapisu dla polityki 'interval' w milisekundach.
+        group_window_ms (int): Czas, przez który lider grupy czeka na kolejne rekordy przed fsync.
+
+        Podnosi:
+        ValueError: Jeśli polityka synchronizacji jest nieznana.
+        """
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"Unknown WAL sync policy: {sync}")
+        self.filename = filename
+        self.sync = sync
+        self.interval = interval_ms / 1000
+        self.group_window = group_window_ms / 1000
+        self.lsn = 0  # numer ostatniego dopisanego rekordu
+        self.durable_lsn = 0  # numer ostatniego rekordu zapisanego na dysk
+        self._buffer = []
+        self._flushing = False
+        self._condition = threading.Condition()
+        self._file = open(filename, 'ab')
+        self._closed = threading.Event()
+        self._flusher = None
+        if sync == 'interval':
+            self._flusher = threading.Thread(target=self._flush_periodically, name='wal-flusher', daemon=True)
+            self._flusher.start()
+
+    def append(self, record):
+        """
+        Dopisuje rekord do dziennika zgodnie z polityką synchronizacji.
+
+        Parametry:
+        record (tuple): Rekord operacji, np. ('insert', nazwa_tabeli, kolumny).
+
+        Zwraca:
+        int: Numer sekwencyjny (LSN) rekordu.
+        """
+        payload = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+        profiling.add('bytes_written', _FRAME.size + len(payload))
+        with self._condition:
+            self.lsn += 1
+            lsn = self.lsn
+            self._buffer.append(_FRAME.pack(len(payload), zlib.crc32(payload), lsn) + payload)
+            if self.sync == 'commit':
+                self._write(self._take_buffer(), lsn)
+            elif self.sync == 'group':
+                self._wait_durable(lsn)
+        return lsn
+
+    def _take_buffer(self):
+        frames, self._buffer = self._buffer, []
+        return frames
+
+    def _write(self, frames, lsn):
+        if frames:
+            self._file.write(b''.join(frames))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self.durable_lsn = max(self.durable_lsn, lsn)
+
+    def _wait_durable(self, lsn):
+        # Wywoływane z założoną blokadą _condition
+        while self.durable_lsn < lsn:
+            if self._flushing:
+                self._condition.wait()
+                continue
+            # Ten wątek zostaje liderem grupy i zapisuje rekordy wszystkich czekających
+            self._flushing = True
+            if self.group_window:
+                self._condition.wait(self.group_window)
+            frames, last_lsn = self._take_buffer(), self.lsn
+            self._condition.release()
+            try:
+                self._write(frames, last_lsn)
+            finally:
+                self._condition.acquire()
+                self._flushing = False
+                self._condition.notify_all()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Zapisuje na dysk wszystkie zbuforowane rekordy.
+        """
+        with self._condition:
+            if not self._file.closed:
+                self._write(self._take_buffer(), self.lsn)
+
+    def replay(self, db_instance):
+        """
+        Odtwarza rekordy dziennika nowsze niż stan bazy (db_instance.lsn).
+
+        Uszkodzony lub niedokończony rekord na końcu pliku (przerwany zapis) jest odcinany.
+
+        Parametry:
+        db_instance (Database): Baza danych, na której odtwarzane są operacje.
+
+        Zwraca:
+        int: Liczba odtworzonych rekordów.
+        """
+        applied = 0
+        valid_length = 0
+        with self._condition, open(self.filename, 'rb') as file:
+            content = file.read()
+            while valid_length + _FRAME.size <= len(content):
+                length, checksum, lsn = _FRAME.unpack_from(content, valid_length)
+                start = valid_length + _FRAME.size
+                payload = content[start:start + length]
+                if len(payload) != length or zlib.crc32(payload) != checksum:
+                    break
+                if lsn > db_instance.lsn:
+                    apply_record(db_instance, pickle.loads(payload))
+                    db_instance.lsn = lsn
+                    applied += 1
+                self.lsn = max(self.lsn, lsn)
+                valid_length = start + length
+            if valid_length < len(content):
+                self._file.truncate(valid_length)
+            self.lsn = max(self.lsn, db_instance.lsn)
+            self.durable_lsn = self.lsn
+        return applied
+
+    def reset(self):
+        """
+        Czyści plik dziennika po zapisaniu pełnej migawki (punkt kontrolny).
+        Numeracja rekordów jest kontynuowana.
+        """
+        with self._condition:
+            self._buffer = []
+            self._file.truncate(0)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.durable_lsn = self.lsn
+
+    def close(self):
+        """
+        Zapisuje zbuforowane rekordy i zamyka plik dziennika.
+        """
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._condition:
+            self._file.close()
+
+
+def apply_record(db_instance, record):
+    """
+    Wykonuje operację zapisaną w rekordzie dziennika bezpośrednio na tabelach (bez ponownego logowania).
+
+    Parametry:
+    db_instance (Database): Baza danych.
+    record (tuple): Rekord operacji.
+
+    Podnosi:
+    ValueError: Jeśli rodzaj rekordu jest nieznany.
+    """
+    operation, table_name, *args = record
+    if operation == 'create_table':
+        columns, storage = args
+        db_instance.tables[table_name] = Table(table_name, columns, storage)
+        return
+    if operation == 'drop_table':
+        del db_instance.tables[table_name]
+        return
+    table = db_instance.tables[table_name]
+    if operation == 'insert':
+        table.insert_columns(args[0])
+    elif operation == 'update':
+        row_ids, updates = args
+        table.update_columns(row_ids, {column: [value] * len(row_ids) for column, value in updates.items()})
+    elif operation == 'update_rows':
+        table.update_columns(*args)
+    elif operation == 'delete':
+        table.delete_rows(args[0])
+    elif operation == 'compact':
+        table.compact()
+    elif operation == 'add_column':
+        table.add_column(*args)
+    elif operation == 'drop_column':
+        table.drop_column(*args)
+    elif operation == 'create_index':
+        table.create_index(*args)
+    elif operation == 'drop_index':
+        table.drop_index(*args)
+    else:
+        raise ValueError(f"Unknown WAL record: {operation}")
@@ -1,9 +1,28 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time as clock
 import unittest
-from datetime import date
+from datetime import date, time
 
 from database.ddl_operations import DDL
 from database.db_structure import Table, Database
+from database.locking import ReadWriteLock
+from database import parallel, shared_columns
+from database.parallel import morsels
+from database.plan_cache import PlanCache, normalize
 from database.dml_operations import DataModificationLanguage
+from database.dql_operations import DataQueryLanguage
+from database import storage
+from database.storage import numpy_available, DictionaryColumn, NumpyColumn, EncodedTextColumn
+from benchmarks.benchmark import BenchmarkSuite, compare, parse_count, percentile
+from database import events, planner, zone_maps
+from database.predicates import compile_condition, compiled_where
+from database.prepared import prepare
+from database.sql_parser import parse
+from state_management import StateManagement
 
 
 class TestDDL(unittest.TestCase):
@@ -150,7 +169,80 @@ class TestDataModificationLanguage(unittest.TestCase):
         dml.read_instruction()
 
         # Sprawdzenie czy dane zostały poprawnie usunięte z tabeli
-        self.assertEqual(len(self.db_instance.tables[self.table_name].data['id']), 1)
+        self.assertEqual(len(self.db_instance.tables[self.table_name].data['id']), 0)
+
+    def test_update_multiple_columns(self):
+        """
+        Testuje operację UPDATE zmieniającą kilka kolumn naraz.
+        """
+        dml = DataModificationLanguage("INSERT INTO students (id, name, age) VALUES (1, 'John;Doe', 21);"
+                                       "INSERT INTO students (id, name, age) VALUES (2, 'Jane', 22);", self.db_instance)
+        self.assertTrue(dml.read_instruction())
+
+        dml = DataModificationLanguage("UPDATE students SET age = 30, name = 'Jan' WHERE id == 2;", self.db_instance)
+        dml.read_instruction()
+
+        table = self.db_instance.tables[self.table_name]
+        self.assertEqual(table.data['name'], ['John;Doe', 'Jan'])
+        self.assertEqual(table.data['age'], [21, 30])
+
+    def test_update_expressions(self):
+        """
+        Testuje UPDATE z wyrażeniami arytmetycznymi, parametrami i wartościami NULL.
+        """
+        DataModificationLanguage.executemany(self.table_name, [(1, 'Anna', 20), (2, 'Jan', None), (3, 'Ola', 25)],
+                                             db_instance=self.db_instance)
+        table = self.db_instance.tables[self.table_name]
+        table.create_index('idx_age', 'age', 'SORTED')
+        DataModificationLanguage("UPDATE students SET age = (age + 1) * 2 - id WHERE id < 3",
+                                 self.db_instance).read_instruction()
+        self.assertEqual(table.data['age'], [41, None, 25])
+        self.assertEqual(table.find_rows('age', '>', 30), [0])
+
+        # wyrażenia widzą wartości sprzed zmiany, a wynik jest konwertowany na typ kolumny
+        DataModificationLanguage("UPDATE students SET id = age / ?, age = id, name = name + '!' WHERE age > 30",
+                                 self.db_instance, (2,)).read_instruction()
+        self.assertEqual(table.column_values('id', range(3)), [20, 2, 3])
+        self.assertEqual(table.data['age'], [1, None, 25])
+        self.assertEqual(table.data['name'], ['Anna!', 'Jan', 'Ola'])
+        self.assertEqual(table.find_rows('age', '>', 30), [])
+
+        for instruction in ("UPDATE students SET age = age / 0", "UPDATE students SET age = name * 2",
+                            "UPDATE students SET age = missing + 1", "UPDATE students SET missing = 1"):
+            with self.assertRaises(ValueError):
+                DataModificationLanguage(instruction, self.db_instance).read_instruction()
+        self.assertEqual(table.data['age'], [1, None, 25])
+
+    def test_multi_row_insert(self):
+        """
+        Testuje INSERT z wieloma krotkami VALUES.
+        """
+        dml = DataModificationLanguage("INSERT INTO students (id, name, age) VALUES (1, 'Anna', 20), (2, 'Jan', 22),"
+                                       " (3, 'Ola', 25);", self.db_instance)
+        dml.read_instruction()
+        self.assertEqual(self.db_instance.tables[self.table_name].data['name'], ['Anna', 'Jan', 'Ola'])
+
+    def test_executemany(self):
+        """
+        Testuje wsadowe wstawianie wierszy z poziomu Pythona.
+        """
+        inserted = DataModificationLanguage.executemany(self.table_name, [(1, 'Anna', 20), (2, 'Jan', 22)],
+                                                        db_instance=self.db_instance)
+        inserted += DataModificationLanguage.executemany(self.table_name, [{'id': 3, 'name': 'Ola'}],
+                                                         db_instance=self.db_instance)
+        table = self.db_instance.tables[self.table_name]
+        self.assertEqual(inserted, 3)
+        self.assertEqual(table.data['id'], [1, 2, 3])
+        self.assertEqual(table.data['age'], [20, 22, None])
+
+    def test_executemany_is_atomic(self):
+        """
+        Testuje, że przy błędnym wierszu żaden wiersz z wsadu nie zostaje wstawiony.
+        """
+        with self.assertRaises(ValueError):
+            DataModificationLanguage.executemany(self.table_name, [(1, 'Anna', 20), (2, 'Jan', 'abc')],
+                                                 db_instance=self.db_instance)
+        self.assertEqual(self.db_instance.tables[self.table_name].data['id'], [])
 
     def test_invalid_instruction_type(self):
         """
@@ -168,5 +260,2067 @@ class TestDataModificationLanguage(unittest.TestCase):
             dml.read_instruction()
 
 
+class TestIndexes(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie tabeli z kilkoma wierszami przed każdym testem.
+        """
+        self.db_instance = Database.get_instance()
+        self.ddl = DDL(self.db_instance)
+        self.ddl.create_table('students', {'id': 'INTEGER', 'name': 'TEXT', 'age': 'INTEGER'})
+        for student_id, name, age in [(1, 'Anna', 20), (2, 'Jan', 22), (3, 'Ola', 25)]:
+            DataModificationLanguage(f"INSERT INTO students (id, name, age) VALUES ({student_id}, '{name}', {age});",
+                                     self.db_instance).read_instruction()
+        self.table = self.db_instance.tables['students']
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def test_create_index_syntax(self):
+        """
+        Testuje tworzenie i usuwanie indeksu składnią CREATE INDEX / DROP INDEX.
+        """
+        self.assertTrue(self.ddl.read_instruction("CREATE INDEX idx_age ON students (age) USING SORTED;"))
+        self.assertEqual(self.table.indexes['idx_age'].kind, 'SORTED')
+        self.assertTrue(self.ddl.read_instruction("DROP INDEX idx_age ON students;"))
+        self.assertNotIn('idx_age', self.table.indexes)
+
+    def test_parse_ddl_statements(self):
+        """
+        Testuje parsowanie instrukcji CREATE INDEX, DROP INDEX i ANALYZE oraz wykonanie kilku z nich naraz.
+        """
+        create, drop, analyze_all = parse("create index idx_age on students ( age ); DROP INDEX idx_age ON students;"
+                                          " ANALYZE")
+        self.assertEqual((create.kind, create.index_name, create.table_name, create.column_name, create.index_type),
+                         ('CREATE INDEX', 'idx_age', 'students', 'age', 'HASH'))
+        self.assertEqual((drop.kind, drop.index_name, drop.table_name), ('DROP INDEX', 'idx_age', 'students'))
+        self.assertEqual((analyze_all.kind, analyze_all.table_name), ('ANALYZE', None))
+
+        self.assertTrue(self.ddl.read_instruction("CREATE INDEX idx_id ON students (id) USING hash; ANALYZE students"))
+        self.assertEqual(self.table.indexes['idx_id'].kind, 'HASH')
+        self.assertIsNotNone(self.table.statistics)
+        self.assertFalse(self.ddl.read_instruction("SELECT id FROM students"))
+        with self.assertRaises(ValueError):
+            self.ddl.read_instruction("CREATE INDEX idx_name ON students name")
+
+    def test_hash_index_point_lookup(self):
+        """
+        Testuje wyszukiwanie po równości przy użyciu indeksu haszującego.
+        """
+        self.ddl.create_index('students', 'idx_id', 'id')
+        self.assertEqual(self.table.find_rows('id', '==', 2), [1])
+        results = DataQueryLanguage("SELECT name FROM students WHERE id = 2", self.db_instance).read_instruction()
+        self.assertEqual(results, [{'name': 'Jan'}])
+
+    def test_sorted_index_range_lookup(self):
+        """
+        Testuje wyszukiwanie zakresowe przy użyciu indeksu posortowanego.
+        """
+        self.ddl.create_index('students', 'idx_age', 'age', 'SORTED')
+        self.assertEqual(self.table.find_rows('age', '>', 20), [1, 2])
+        self.assertEqual(self.table.find_rows('age', '<=', 22), [0, 1])
+        self.assertIsNone(self.table.find_rows('age', '!=', 22))
+        results = DataQueryLanguage("SELECT name FROM students WHERE age > 20", self.db_instance).read_instruction()
+        self.assertEqual(results, [{'name': 'Jan'}, {'name': 'Ola'}])
+
+    def test_indexes_follow_modifications(self):
+        """
+        Testuje aktualizację indeksów po operacjach INSERT, UPDATE i DELETE.
+        """
+        self.ddl.create_index('students', 'idx_name', 'name')
+        self.ddl.create_index('students', 'idx_age', 'age', 'SORTED')
+        DataModificationLanguage("INSERT INTO students (id, name, age) VALUES (4, 'Ewa', 30);",
+                                 self.db_instance).read_instruction()
+        self.assertEqual(self.table.find_rows('name', '==', 'Ewa'), [3])
+
+        self.table.update_value(3, 'age', 40)
+        self.assertEqual(self.table.find_rows('age', '>', 30), [3])
+
+        DataModificationLanguage("DELETE FROM students WHERE name == 'Anna';", self.db_instance).read_instruction()
+        self.assertEqual(self.table.find_rows('name', '==', 'Ewa'), [3])
+        self.assertEqual(self.table.find_rows('name', '==', 'Anna'), [])
+        self.db_instance.compact('students')
+        self.assertEqual(self.table.find_rows('name', '==', 'Ewa'), [2])
+        self.assertEqual(self.table.find_rows('age', '>', 30), [2])
+        self.assertEqual(self.table.find_rows('name', '==', 'Anna'), [])
+
+    def test_sorted_index_insert_without_rebuild(self):
+        """
+        Testuje, że wstawienie pojedynczych wierszy nie przebudowuje indeksu posortowanego,
+        a większa partia jest scalana z zachowaniem kolejności.
+        """
+        self.ddl.create_index('students', 'idx_age', 'age', 'SORTED')
+        index = self.table.indexes['idx_age']
+        keys, rows = index.keys, index.rows
+        DataModificationLanguage("INSERT INTO students (id, name, age) VALUES (4, 'Ewa', 30);",
+                                 self.db_instance).read_instruction()
+        DataModificationLanguage("INSERT INTO students (id, name, age) VALUES (5, 'Iza', 22);",
+                                 self.db_instance).read_instruction()
+        self.assertIs(index.keys, keys)
+        self.assertIs(index.rows, rows)
+        self.assertEqual(list(zip(index.keys, index.rows)), [(20, 0), (22, 1), (22, 4), (25, 2), (30, 3)])
+
+        DataModificationLanguage.executemany('students', [(n, 'x', n % 7 + 20) for n in range(6, 106)],
+                                             db_instance=self.db_instance)
+        self.assertEqual(list(zip(index.keys, index.rows)),
+                         sorted((age, row_idx) for row_idx, age in enumerate(self.table.data['age'])))
+
+    def test_indexes_follow_bulk_update(self):
+        """
+        Testuje aktualizację indeksów kolumny o małej liczbie różnych wartości przez UPDATE wielu wierszy.
+        """
+        DataModificationLanguage.executemany('students', [(n, f'name{n % 4}', n % 4) for n in range(4, 404)],
+                                             db_instance=self.db_instance)
+        self.ddl.create_index('students', 'idx_name', 'name')
+        self.ddl.create_index('students', 'idx_age', 'age', 'SORTED')
+        DataModificationLanguage("UPDATE students SET name = 'name9', age = 9 WHERE id < 75",
+                                 self.db_instance).read_instruction()
+        names, ages = self.table.data['name'], self.table.data['age']
+        self.assertEqual(self.table.find_rows('name', '==', 'name9'), list(range(74)))
+        self.assertEqual(self.table.find_rows('name', '==', 'name0'),
+                         [row_idx for row_idx, name in enumerate(names) if name == 'name0'])
+        index = self.table.indexes['idx_age']
+        self.assertEqual(list(zip(index.keys, index.rows)), sorted((age, row_idx) for row_idx, age in enumerate(ages)))
+
+    def test_drop_column_drops_index(self):
+        """
+        Testuje usunięcie indeksu razem z kolumną.
+        """
+        self.ddl.create_index('students', 'idx_age', 'age', 'SORTED')
+        self.ddl.drop_column('students', 'age')
+        self.assertEqual(self.table.indexes, {})
+
+
+class TestDataQueryLanguage(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie tabeli z kilkoma wierszami przed każdym testem.
+        """
+        self.db_instance = Database.get_instance()
+        DDL(self.db_instance).create_table('students', {'id': 'INTEGER', 'name': 'TEXT', 'age': 'INTEGER',
+                                                        'enrollment_date': 'DATE'})
+        table = self.db_instance.tables['students']
+        for student_id, name, age, enrolled in [(1, 'Anna', 20, date(2021, 9, 1)), (2, 'Jan', 22, date(2022, 9, 1)),
+                                                (3, 'Ola', 25, date(2023, 9, 1)), (4, 'Ewa', 30, date(2024, 9, 1))]:
+            table.insert_row({'id': student_id, 'name': name, 'age': age, 'enrollment_date': enrolled})
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def select_ids(self, condition):
+        """
+        Zwraca identyfikatory wierszy spełniających warunek.
+        """
+        results = DataQueryLanguage(f"SELECT id FROM students WHERE {condition}", self.db_instance).read_instruction()
+        return [row['id'] for row in results]
+
+    def test_comparison_operators(self):
+        """
+        Testuje wszystkie operatory porównania.
+        """
+        self.assertEqual(self.select_ids("age = 22"), [2])
+        self.assertEqual(self.select_ids("age == 22"), [2])
+        self.assertEqual(self.select_ids("age != 22"), [1, 3, 4])
+        self.assertEqual(self.select_ids("age < 22"), [1])
+        self.assertEqual(self.select_ids("age <= 22"), [1, 2])
+        self.assertEqual(self.select_ids("age > 22"), [3, 4])
+        self.assertEqual(self.select_ids("age >= 22"), [2, 3, 4])
+
+    def test_logical_operators_and_parentheses(self):
+        """
+        Testuje operatory AND, OR, NOT oraz nawiasy.
+        """
+        self.assertEqual(self.select_ids("age > 20 AND name != 'Ola'"), [2, 4])
+        self.assertEqual(self.select_ids("id = 1 OR id = 4"), [1, 4])
+        self.assertEqual(self.select_ids("NOT (id = 1 OR id = 4)"), [2, 3])
+        self.assertEqual(self.select_ids("(id = 1 OR id = 2) AND age > 20"), [2])
+
+    def test_in_and_between(self):
+        """
+        Testuje warunki IN oraz BETWEEN.
+        """
+        self.assertEqual(self.select_ids("name IN ('Jan', 'Ewa')"), [2, 4])
+        self.assertEqual(self.select_ids("name NOT IN ('Jan', 'Ewa')"), [1, 3])
+        self.assertEqual(self.select_ids("age BETWEEN 22 AND 25"), [2, 3])
+        self.assertEqual(self.select_ids("age NOT BETWEEN 22 AND 25"), [1, 4])
+
+    def test_date_literal(self):
+        """
+        Testuje porównanie kolumny DATE z datą zapisaną jako tekst.
+        """
+        self.assertEqual(self.select_ids("enrollment_date >= '2023-01-01'"), [3, 4])
+
+    def test_null_values(self):
+        """
+        Testuje warunki na wierszu wstawionym bez części kolumn (NULL) i na kolumnie dodanej później.
+        """
+        DataModificationLanguage("INSERT INTO students (id) VALUES (5)", self.db_instance).read_instruction()
+        self.assertEqual(self.select_ids("age > 20"), [2, 3, 4])
+        self.assertEqual(self.select_ids("NOT (age > 20)"), [1, 5])
+        self.assertEqual(self.select_ids("age BETWEEN 20 AND 22"), [1, 2])
+        self.assertEqual(self.select_ids("age NOT BETWEEN 20 AND 22"), [3, 4, 5])
+        self.assertEqual(self.select_ids("enrollment_date < '2022-01-01'"), [1])
+        self.assertEqual(self.select_ids("age = NULL"), [5])
+        self.assertEqual(self.select_ids("age != 20"), [2, 3, 4, 5])
+        self.assertEqual(self.select_ids("age > NULL"), [])
+        DDL(self.db_instance).add_column('students', 'extra', 'INTEGER')
+        self.assertEqual(self.select_ids("extra > 1"), [])
+        self.assertEqual(self.select_ids("extra <= 1 OR id = 2"), [2])
+
+    def test_invalid_condition(self):
+        """
+        Testuje obsługę błędu dla niepoprawnego warunku.
+        """
+        with self.assertRaises(ValueError):
+            self.select_ids("age >")
+        with self.assertRaises(ValueError):
+            self.select_ids("unknown_column = 1")
+
+
+@unittest.skipUnless(numpy_available(), 'numpy is not installed')
+class TestNumpyStorage(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie tabeli przechowywanej w tablicach NumPy.
+        """
+        self.db_instance = Database.get_instance()
+        self.ddl = DDL(self.db_instance)
+        self.ddl.create_table('students', {'id': 'INTEGER', 'name': 'TEXT', 'score': 'FLOAT',
+                                           'enrollment_date': 'DATE'}, storage='numpy')
+        self.table = self.db_instance.tables['students']
+        for student_id, name, score, enrolled in [(1, 'Anna', 4.5, date(2021, 9, 1)), (2, 'Jan', 3.0, date(2022, 9, 1)),
+                                                  (3, 'Anna', 5.0, date(2023, 9, 1))]:
+            self.table.insert_row({'id': student_id, 'name': name, 'score': score, 'enrollment_date': enrolled})
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def select_ids(self, condition):
+        """
+        Zwraca identyfikatory wierszy spełniających warunek.
+        """
+        results = DataQueryLanguage(f"SELECT id FROM students WHERE {condition}", self.db_instance).read_instruction()
+        return [row['id'] for row in results]
+
+    def test_typed_columns(self):
+        """
+        Testuje wybór typu kolumny i odczyt wartości jako obiektów Pythona.
+        """
+        self.assertIsInstance(self.table.data['id'], NumpyColumn)
+        self.assertIsInstance(self.table.data['name'], EncodedTextColumn)
+        self.assertEqual(self.table.data['name'].dictionary, ['Anna', 'Jan'])
+        self.assertEqual(self.table.data['enrollment_date'][1], date(2022, 9, 1))
+        self.assertEqual(self.table.data['score'].to_list(), [4.5, 3.0, 5.0])
+
+    def test_mask_filtering(self):
+        """
+        Testuje warunki obliczane maską logiczną.
+        """
+        self.assertEqual(self.select_ids("name = 'Anna' AND score > 4.6"), [3])
+        self.assertEqual(self.select_ids("enrollment_date >= '2022-01-01'"), [2, 3])
+        self.assertEqual(self.select_ids("name IN ('Jan', 'Ola') OR id BETWEEN 3 AND 5"), [2, 3])
+        self.assertEqual(self.select_ids("name != 'Ola'"), [1, 2, 3])
+
+    def test_delete_and_null_column(self):
+        """
+        Testuje usuwanie wierszy oraz dodanie kolumny z wartościami None.
+        """
+        DataModificationLanguage("DELETE FROM students WHERE name == 'Jan';", self.db_instance).read_instruction()
+        self.assertEqual(self.table.data['id'].to_list(), [1, 3])
+        self.ddl.add_column('students', 'age', 'INTEGER')
+        self.table.update_value(0, 'age', 20)
+        self.assertEqual(self.table.data['age'].to_list(), [20, None])
+        self.assertEqual(self.select_ids("age > 10"), [1])
+
+    def test_update_expressions(self):
+        """
+        Testuje zbiorczy zapis wyników wyrażeń UPDATE do kolumn NumPy.
+        """
+        DataModificationLanguage("UPDATE students SET score = score * 2, name = 'Ewa', id = id + 10 WHERE score < 5",
+                                 self.db_instance).read_instruction()
+        self.assertEqual(self.table.data['score'].to_list(), [9.0, 6.0, 5.0])
+        self.assertEqual(self.table.data['id'].to_list(), [11, 12, 3])
+        self.assertEqual(self.select_ids("name = 'Ewa'"), [11, 12])
+
+    def test_null_semantics_match_list_storage(self):
+        """
+        Testuje, że warunki z wartościami NULL dają te same wyniki dla tabel w listach i w NumPy.
+        """
+        columns = {'id': 'INTEGER', 'age': 'INTEGER', 'status': 'TEXT', 'score': 'FLOAT', 'start': 'TIME'}
+        rows = [(i, None if i % 7 == 0 else i % 50, None if i % 5 == 0 else 'ab'[i % 2],
+                 None if i % 3 == 0 else i / 4, None if i % 11 == 0 else time(i % 24, 0)) for i in range(2100)]
+        for storage_type in ('list', 'numpy'):
+            self.ddl.create_table(f'people_{storage_type}', dict(columns), storage=storage_type)
+            DataModificationLanguage.executemany(f'people_{storage_type}', rows, db_instance=self.db_instance)
+        conditions = ["age > 20", "NOT (age > 20)", "age = NULL", "age != 3", "age BETWEEN 10 AND 20",
+                      "age NOT BETWEEN 10 AND 20", "age IN (1, 2, NULL)", "age NOT IN (1, 2)", "age > NULL",
+                      "status = 'a'", "status != 'a'", "status < 'b'", "status IN ('a', 'c')", "status NOT IN ('a')",
+                      "status = NULL", "score >= 100 OR age < 5", "age < score", "age = score", "age != score",
+                      "start >= '12:00:00'", "start = NULL", "NOT (start < '05:00:00') AND age > 40", "age",
+                      "20 < age AND status != 'b'"]
+        for condition in conditions:
+            results = [DataQueryLanguage(f"SELECT id FROM people_{storage_type} WHERE {condition}",
+                                         self.db_instance).read_instruction() for storage_type in ('list', 'numpy')]
+            self.assertEqual(results[0], results[1], condition)
+        count = len(DataQueryLanguage("SELECT id FROM people_numpy WHERE status != 'a'",
+                                      self.db_instance).read_instruction())
+        self.assertEqual(count, len([row for row in rows if row[2] != 'a']))
+
+
+class TestPreparedStatements(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych i tabeli przed każdym testem.
+        """
+        self.db_instance = Database.get_instance()
+        DDL(self.db_instance).create_table('students', {'id': 'INTEGER', 'name': 'TEXT', 'enrollment_date': 'DATE'})
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def test_parse_statements(self):
+        """
+        Testuje parsowanie kilku instrukcji z parametrami.
+        """
+        statements = parse("INSERT INTO students (id, name) VALUES (?, 'a;b'); SELECT id FROM students WHERE id > ?")
+        self.assertEqual([statement.kind for statement in statements], ['INSERT', 'SELECT'])
+        self.assertEqual(statements[0].parameter_count, 1)
+        self.assertEqual(statements[1].where_text, 'id > ?')
+
+    def test_prepared_insert_and_select(self):
+        """
+        Testuje wielokrotne wykonanie instrukcji przygotowanych.
+        """
+        insert = prepare("INSERT INTO students (id, name, enrollment_date) VALUES (?, ?, ?)", self.db_instance)
+        for student_id in range(5):
+            insert.execute((student_id, f'student{student_id}', date(2020, 1, student_id + 1)))
+
+        select = prepare("SELECT name FROM students WHERE id >= ? AND enrollment_date < ?", self.db_instance)
+        self.assertEqual(select.execute((3, '2020-01-05')), [{'name': 'student3'}])
+        self.assertEqual(select.execute((0, date(2020, 1, 2))), [{'name': 'student0'}])
+
+        delete = prepare("DELETE FROM students WHERE name IN (?, ?)", self.db_instance)
+        delete.execute(('student1', 'student2'))
+        self.assertEqual(self.db_instance.tables['students'].data['id'], [0, 3, 4])
+
+    def test_prepared_executemany(self):
+        """
+        Testuje wsadowe wykonanie przygotowanej instrukcji INSERT.
+        """
+        insert = prepare("INSERT INTO students (id, name, enrollment_date) VALUES (?, ?, ?)", self.db_instance)
+        self.assertEqual(insert.executemany([(1, 'Anna', '2021-09-01'), (2, 'Jan', date(2022, 9, 1))]), 2)
+        self.assertEqual(self.db_instance.tables['students'].data['enrollment_date'],
+                         [date(2021, 9, 1), date(2022, 9, 1)])
+
+    def test_wrong_parameter_count(self):
+        """
+        Testuje obsługę błędu dla niepoprawnej liczby parametrów.
+        """
+        with self.assertRaises(ValueError):
+            prepare("SELECT id FROM students WHERE id = ?", self.db_instance).execute(())
+        with self.assertRaises(ValueError):
+            prepare("SELECT id FROM students; SELECT name FROM students", self.db_instance)
+
+
 if __name__ == '__main__':
     unittest.main()
+
+
+class TestStateManagement(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z tabelą zawierającą wszystkie typy kolumn.
+        """
+        self.db_instance = Database.get_instance()
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'db_state.bin')
+        self.rows = [
+            {'id': 1, 'name': 'Anna', 'score': 4.5, 'active': True, 'born': date(2001, 5, 3), 'lesson': time(8, 15)},
+            {'id': 2, 'name': 'Żaneta', 'score': None, 'active': False, 'born': date(1999, 1, 1), 'lesson': None},
+            {'id': 3, 'name': None, 'score': 3.0, 'active': None, 'born': None, 'lesson': time(12, 0, 30)},
+        ]
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych i plików po każdym teście.
+        """
+        self.db_instance.tables.clear()
+        self.db_instance.snapshot_chain = None
+        self.directory.cleanup()
+
+    def create_students(self, storage):
+        DDL(self.db_instance).create_table('students', {'id': 'INTEGER', 'name': 'TEXT(20)', 'score': 'FLOAT',
+                                                        'active': 'BOOLEAN', 'born': 'DATE', 'lesson': 'TIME'},
+                                           storage=storage)
+        for row in self.rows:
+            self.db_instance.tables['students'].insert_row(row)
+
+    def reload(self):
+        StateManagement.save_state(self.filename, format='binary')
+        self.db_instance.tables.clear()
+        StateManagement.load_state(self.filename)
+        return self.db_instance.tables['students']
+
+    def test_binary_round_trip(self):
+        """
+        Testuje zapis i odczyt kolumn listowych w formacie binarnym.
+        """
+        self.create_students('list')
+        table = self.reload()
+        self.assertEqual(table.columns['name'], 'TEXT(20)')
+        for column in table.columns:
+            self.assertEqual(table.data[column], [row[column] for row in self.rows])
+        DataModificationLanguage("INSERT INTO students (id, name) VALUES (4, 'Ola')", self.db_instance).read_instruction()
+        self.assertEqual(table.row_count(), 4)
+
+    def test_json_format_still_loads(self):
+        """
+        Testuje, że wczytywanie rozpoznaje pliki JSON po zawartości.
+        """
+        DDL(self.db_instance).create_table('students', {'id': 'INTEGER', 'born': 'DATE'})
+        self.db_instance.tables['students'].insert_row({'id': 1, 'born': date(2000, 2, 29)})
+        StateManagement.save_state(self.filename)
+        self.db_instance.tables.clear()
+        StateManagement.load_state(self.filename)
+        self.assertEqual(self.db_instance.tables['students'].data['born'], [date(2000, 2, 29)])
+
+    @unittest.skipUnless(numpy_available(), 'numpy is not installed')
+    def test_binary_numpy_columns_are_mapped(self):
+        """
+        Testuje, że kolumny NumPy są po wczytaniu widokami na zmapowany plik i dają się modyfikować.
+        """
+        self.create_students('numpy')
+        table = self.reload()
+        self.assertIsInstance(table.data['id'], NumpyColumn)
+        self.assertFalse(table.data['id'].values.flags['OWNDATA'])
+        for column in table.columns:
+            self.assertEqual(list(table.data[column]), [row[column] for row in self.rows])
+        self.assertEqual(DataQueryLanguage("SELECT id FROM students WHERE name = 'Anna' OR born > '2000-01-01'",
+                                           self.db_instance).read_instruction(), [{'id': 1}])
+        table.update_value(0, 'id', 10)
+        table.insert_row({'id': 5, 'name': 'Anna'})
+        self.assertEqual(table.data['id'].to_list(), [10, 2, 3, 5])
+        self.assertEqual(table.data['name'].to_list(), ['Anna', 'Żaneta', None, 'Anna'])
+
+    def test_incremental_snapshots(self):
+        """
+        Testuje zapis przyrostowy: pliki delta zawierają tylko zmienione tabele i wiersze.
+        """
+        self.create_students('list')
+        DDL(self.db_instance).create_table('courses', {'id': 'INTEGER'})
+        self.db_instance.tables['courses'].insert_row({'id': 100})
+        filename = os.path.join(self.directory.name, 'db_state.json')
+        StateManagement.save_state(filename, incremental=True)
+
+        table = self.db_instance.tables['students']
+        table.update_value(0, 'lesson', time(9, 0))
+        table.insert_row({'id': 4, 'name': 'Ola', 'born': date(2002, 2, 2)})
+        StateManagement.save_state(filename, incremental=True)
+        with open(filename + '.delta1') as file:
+            delta = json.load(file)
+        self.assertEqual(list(delta['tables']), ['students'])
+        self.assertEqual(delta['tables']['students']['mode'], 'append')
+        self.assertEqual(delta['tables']['students']['data']['id'], [4])
+        self.assertEqual(delta['tables']['students']['updates'], {'lesson': [[0, '09:00:00']]})
+
+        DataModificationLanguage("DELETE FROM students WHERE id = 2", self.db_instance).read_instruction()
+        DDL(self.db_instance).drop_table('courses')
+        StateManagement.save_state(filename, incremental=True)
+        expected = {column: list(values) for column, values in table.data.items()}
+
+        self.db_instance.tables.clear()
+        StateManagement.load_state(filename)
+        self.assertEqual(list(self.db_instance.tables), ['students'])
+        self.assertEqual(self.db_instance.tables['students'].data, expected)
+        self.assertEqual(self.db_instance.snapshot_chain['deltas'], 2)
+
+    def test_incremental_compaction(self):
+        """
+        Testuje scalanie łańcucha plików delta w nową migawkę bazową.
+        """
+        self.create_students('list')
+        table = self.db_instance.tables['students']
+        StateManagement.save_state(self.filename, format='binary', incremental=True, max_deltas=1)
+        table.insert_row({'id': 4})
+        StateManagement.save_state(self.filename, format='binary', incremental=True, max_deltas=1)
+        self.assertTrue(os.path.exists(self.filename + '.delta1'))
+        table.insert_row({'id': 5})
+        StateManagement.save_state(self.filename, format='binary', incremental=True, max_deltas=1)
+        self.assertFalse(os.path.exists(self.filename + '.delta1'))
+
+        self.db_instance.tables.clear()
+        StateManagement.load_state(self.filename)
+        self.assertEqual(self.db_instance.tables['students'].data['id'], [1, 2, 3, 4, 5])
+
+
+class TestWriteAheadLog(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie katalogu na migawkę i dziennik WAL.
+        """
+        self.db_instance = Database.get_instance()
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.directory.name, 'db_state.json')
+        self.wal = os.path.join(self.directory.name, 'db.wal')
+
+    def tearDown(self):
+        """
+        Odłączenie dziennika i czyszczenie bazy danych po każdym teście.
+        """
+        if self.db_instance.wal is not None:
+            self.db_instance.wal.close()
+        self.db_instance.wal = None
+        self.db_instance.lsn = 0
+        self.db_instance.tables.clear()
+        self.directory.cleanup()
+
+    def crash_and_recover(self, **options):
+        """
+        Symuluje awarię (utratę stanu w pamięci) i odtwarza bazę z migawki oraz dziennika.
+        """
+        self.db_instance.wal.close()
+        self.db_instance.wal = None
+        self.db_instance.tables.clear()
+        return StateManagement.recover(self.snapshot, self.wal, **options)
+
+    def run_sql(self, instruction):
+        DataModificationLanguage(instruction, self.db_instance).read_instruction()
+
+    def test_replay_after_crash(self):
+        """
+        Testuje odtworzenie operacji DDL i DML z dziennika bez migawki.
+        """
+        self.assertEqual(StateManagement.recover(self.snapshot, self.wal), 0)
+        ddl = DDL(self.db_instance)
+        ddl.create_table('students', {'id': 'INTEGER', 'name': 'TEXT', 'enrollment_date': 'DATE'})
+        ddl.create_index('students', 'idx_id', 'id', 'SORTED')
+        self.run_sql("INSERT INTO students (id, name, enrollment_date) VALUES (1, 'Anna', '2021-09-01'), "
+                     "(2, 'Jan', '2022-09-01'), (3, 'Ola', '2023-09-01')")
+        self.run_sql("UPDATE students SET name = 'Janek' WHERE id = 2")
+        self.run_sql("DELETE FROM students WHERE id = 1")
+
+        # DELETE usunął jedną trzecią wierszy, więc dziennik zawiera też rekord kompakcji
+        self.assertEqual(self.crash_and_recover(), 6)
+        table = self.db_instance.tables['students']
+        self.assertEqual(table.data['name'], ['Janek', 'Ola'])
+        self.assertEqual(table.data['enrollment_date'], [date(2022, 9, 1), date(2023, 9, 1)])
+        self.assertEqual(table.find_rows('id', '>', 2), [1])
+
+    def test_replay_update_expressions(self):
+        """
+        Testuje odtworzenie z dziennika instrukcji UPDATE z wyrażeniem.
+        """
+        StateManagement.recover(self.snapshot, self.wal)
+        DDL(self.db_instance).create_table('counters', {'id': 'INTEGER', 'hits': 'INTEGER'})
+        self.run_sql("INSERT INTO counters (id, hits) VALUES (1, 5), (2, 7)")
+        self.run_sql("UPDATE counters SET hits = hits * 10 + id")
+        self.run_sql("UPDATE counters SET hits = 0 WHERE id = 1")
+        self.crash_and_recover()
+        self.assertEqual(self.db_instance.tables['counters'].data['hits'], [0, 72])
+
+    def test_checkpoint_and_torn_tail(self):
+        """
+        Testuje, że po punkcie kontrolnym odtwarzane są tylko nowsze operacje,
+        a niedokończony rekord na końcu dziennika jest pomijany.
+        """
+        StateManagement.recover(self.snapshot, self.wal, sync='interval', interval_ms=5)
+        DDL(self.db_instance).create_table('students', {'id': 'INTEGER'})
+        self.run_sql("INSERT INTO students (id) VALUES (1)")
+        StateManagement.checkpoint(self.snapshot)
+        self.assertEqual(os.path.getsize(self.wal), 0)
+        self.run_sql("INSERT INTO students (id) VALUES (2)")
+        self.db_instance.wal.flush()
+        with open(self.wal, 'ab') as file:
+            file.write(b'\x10\x00\x00\x00partial')
+
+        self.assertEqual(self.crash_and_recover(), 1)
+        self.assertEqual(self.db_instance.tables['students'].data['id'], [1, 2])
+        self.run_sql("INSERT INTO students (id) VALUES (3)")
+        self.assertEqual(self.crash_and_recover(), 2)
+        self.assertEqual(self.db_instance.tables['students'].data['id'], [1, 2, 3])
+
+    def test_group_commit(self):
+        """
+        Testuje zatwierdzanie grupowe przy zapisie z wielu wątków.
+        """
+        StateManagement.recover(self.snapshot, self.wal, sync='group', group_window_ms=1)
+        DDL(self.db_instance).create_table('events', {'id': 'INTEGER'})
+        threads = [threading.Thread(target=self.db_instance.log, args=('insert', 'events', {'id': [n]}))
+                   for n in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.db_instance.wal.durable_lsn, 21)
+        self.assertEqual(self.crash_and_recover(), 21)
+        self.assertEqual(sorted(self.db_instance.tables['events'].data['id']), list(range(20)))
+
+    def test_concurrent_writers_keep_lsn_order(self):
+        """
+        Testuje, że rekord starszej operacji zapisany później niż nowszy (inna tabela) nie cofa numeru
+        operacji bazy, więc migawka i dziennik nie odtwarzają operacji dwa razy.
+        """
+        StateManagement.recover(self.snapshot, self.wal)
+        ddl = DDL(self.db_instance)
+        ddl.create_table('first', {'id': 'INTEGER'})
+        ddl.create_table('second', {'id': 'INTEGER'})
+        wal = self.db_instance.wal
+        append, appended, second_done = wal.append, threading.Event(), threading.Event()
+
+        def delayed_append(record):
+            # Wstawienie do tabeli first otrzymuje numer, ale wraca z dziennika dopiero po wstawieniu do second
+            lsn = append(record)
+            if record[1] == 'first':
+                appended.set()
+                second_done.wait(5)
+            return lsn
+
+        wal.append = delayed_append
+        writer = threading.Thread(target=self.run_sql, args=("INSERT INTO first (id) VALUES (1)",))
+        writer.start()
+        self.assertTrue(appended.wait(5))
+        self.run_sql("INSERT INTO second (id) VALUES (2)")
+        second_done.set()
+        writer.join()
+        self.assertEqual(self.db_instance.lsn, wal.lsn)
+
+        StateManagement.save_state(self.snapshot)
+        self.run_sql("INSERT INTO first (id) VALUES (3)")
+        self.assertEqual(self.crash_and_recover(), 1)
+        self.assertEqual(self.db_instance.tables['first'].data['id'], [1, 3])
+        self.assertEqual(self.db_instance.tables['second'].data['id'], [2])
+
+
+class TestConcurrency(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie tabeli, w której każdy wiersz spełnia warunek double == 2 * id.
+        """
+        self.db_instance = Database.get_instance()
+        DDL(self.db_instance).create_table('numbers', {'id': 'INTEGER', 'double': 'INTEGER'})
+        DataModificationLanguage.executemany('numbers', [(n, 2 * n) for n in range(200)], db_instance=self.db_instance)
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def test_read_write_lock(self):
+        """
+        Testuje wyłączność blokady zapisu i wielowejściowość blokady.
+        """
+        lock = ReadWriteLock()
+        acquired = threading.Event()
+
+        def reader():
+            with lock.read():
+                acquired.set()
+
+        with lock.write():
+            with lock.read():  # the writer may also read
+                pass
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertFalse(acquired.wait(0.05))
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+        with lock.read():
+            with lock.read():
+                self.assertRaises(RuntimeError, lock.acquire_write)
+
+    def test_parallel_readers_and_writers(self):
+        """
+        Testuje, że zapytania wykonywane równolegle z zapisami widzą spójny stan tabeli.
+        """
+        errors = []
+
+        def writer(start):
+            try:
+                for n in range(start, start + 50):
+                    DataModificationLanguage(f"INSERT INTO numbers (id, double) VALUES ({n}, {2 * n})",
+                                             self.db_instance).read_instruction()
+                    # Każdy pisarz usuwa tylko wiersze z setUp, więc liczba wierszy nie zależy od kolejności
+                    DataModificationLanguage(f"DELETE FROM numbers WHERE id = {n - 200}",
+                                             self.db_instance).read_instruction()
+            except Exception as error:
+                errors.append(error)
+
+        def reader():
+            try:
+                for _ in range(30):
+                    rows = DataQueryLanguage("SELECT id, double FROM numbers WHERE id >= 0",
+                                             self.db_instance).read_instruction()
+                    if any(row['double'] != 2 * row['id'] for row in rows) or len(rows) < 100:
+                        errors.append(AssertionError('inconsistent read'))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=writer, args=(start,)) for start in (200, 300)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        table = self.db_instance.tables['numbers']
+        self.assertEqual(len(table.data['id']), len(table.data['double']))
+        self.assertEqual(len(table.all_rows()), 200)
+
+
+class TestParallelScan(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z włączonym skanowaniem równoległym w małych fragmentach.
+        """
+        self.db_instance = Database.get_instance()
+        self.db_instance.set_parallelism(3, min_rows=0, morsel_size=7)
+        self.rows = [(n, f'name{n % 5}', n / 4) for n in range(100)]
+
+    def tearDown(self):
+        """
+        Wyłączenie równoległości i czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.set_parallelism(1)
+        self.db_instance.tables.clear()
+
+    def check_scan(self, storage):
+        DDL(self.db_instance).create_table('numbers', {'id': 'INTEGER', 'name': 'TEXT', 'score': 'FLOAT'},
+                                           storage=storage)
+        DataModificationLanguage.executemany('numbers', self.rows, db_instance=self.db_instance)
+        results = DataQueryLanguage("SELECT id, name FROM numbers WHERE name = 'name3' AND score > 10",
+                                    self.db_instance).read_instruction()
+        self.assertEqual(results, [{'id': n, 'name': name} for n, name, score in self.rows
+                                   if name == 'name3' and score > 10])
+
+    def test_parallel_scan_list_storage(self):
+        """
+        Testuje równoległe skanowanie tabeli przechowywanej w listach.
+        """
+        self.check_scan('list')
+
+    @unittest.skipUnless(numpy_available(), 'numpy is not installed')
+    def test_parallel_scan_numpy_storage(self):
+        """
+        Testuje równoległe skanowanie tabeli przechowywanej w tablicach NumPy.
+        """
+        self.check_scan('numpy')
+
+    def test_process_pool_is_reused(self):
+        """
+        Testuje, że kolejne zapytania używają tej samej puli procesów, a zmiana równoległości ją zamyka.
+        """
+        self.check_scan('list')
+        pool = parallel._pool
+        self.assertIsNotNone(pool)
+        self.db_instance.tables.clear()
+        self.check_scan('list')
+        self.assertIs(parallel._pool, pool)
+        self.db_instance.set_parallelism(1)
+        self.assertIsNone(parallel._pool)
+
+    def test_shared_columns(self):
+        """
+        Testuje skanowanie równoległe tabeli list Pythona z kolumnami w pamięci współdzielonej:
+        wartości NULL, daty, usunięte wiersze oraz ponowne użycie segmentów do zmiany tabeli.
+        """
+        DDL(self.db_instance).create_table('events', {'id': 'INTEGER', 'day': 'DATE', 'note': 'TEXT'})
+        rows = [(n, date(2020, 1, 1 + n % 28), None if n % 3 == 0 else f'note{n % 4}') for n in range(100)]
+        DataModificationLanguage.executemany('events', rows, db_instance=self.db_instance)
+        DataModificationLanguage("DELETE FROM events WHERE id < 10", self.db_instance).read_instruction()
+        sql = "SELECT id FROM events WHERE day >= '2020-01-20' AND note != 'note1'"
+        expected = [{'id': n} for n, day, note in rows if n >= 10 and day >= date(2020, 1, 20) and note != 'note1']
+        self.assertEqual(DataQueryLanguage(sql, self.db_instance).read_instruction(), expected)
+        segments = {key: published[1] for key, published in shared_columns._published.items()}
+        self.assertEqual(set(segments), {('events', 'day'), ('events', 'note'), ('events', None)})
+        self.assertEqual(DataQueryLanguage(sql, self.db_instance).read_instruction(), expected)
+        self.assertEqual({key: published[1] for key, published in shared_columns._published.items()}, segments)
+
+        DataModificationLanguage("UPDATE events SET note = 'note1' WHERE id = 83", self.db_instance).read_instruction()
+        self.assertEqual(DataQueryLanguage(sql, self.db_instance).read_instruction(), expected[:-1])
+        self.assertNotEqual(shared_columns._published[('events', 'note')][1], segments[('events', 'note')])
+        self.db_instance.set_parallelism(1)
+        self.assertEqual(shared_columns._published, {})
+
+    def test_morsels(self):
+        """
+        Testuje podział zakresu wierszy na fragmenty.
+        """
+        self.assertEqual(morsels(10, 4), [(0, 4), (4, 8), (8, 10)])
+        self.assertEqual(morsels(0, 4), [])
+
+
+class TestAggregation(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z tabelą ocen.
+        """
+        self.db_instance = Database.get_instance()
+        self.rows = [
+            (1, 'Anna', 4.5, date(2021, 9, 1)),
+            (2, 'Jan', 3.0, date(2022, 9, 1)),
+            (3, 'Anna', 5.0, date(2020, 9, 1)),
+            (4, 'Ola', None, date(2023, 9, 1)),
+            (5, 'Jan', 4.0, None),
+            (6, None, 2.0, date(2019, 9, 1)),
+        ]
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def create_grades(self, storage):
+        DDL(self.db_instance).create_table('grades', {'id': 'INTEGER', 'name': 'TEXT', 'score': 'FLOAT',
+                                                      'enrolled': 'DATE'}, storage=storage)
+        DataModificationLanguage.executemany('grades', self.rows, db_instance=self.db_instance)
+
+    def query(self, instruction):
+        return DataQueryLanguage(instruction, self.db_instance).read_instruction()
+
+    def check_aggregates(self, storage):
+        self.create_grades(storage)
+        self.assertEqual(self.query("SELECT COUNT(*), COUNT(score), SUM(score), AVG(score), MIN(enrolled), "
+                                    "MAX(id) AS last FROM grades"),
+                         [{'COUNT(*)': 6, 'COUNT(score)': 5, 'SUM(score)': 18.5, 'AVG(score)': 3.7,
+                           'MIN(enrolled)': date(2019, 9, 1), 'last': 6}])
+        self.assertEqual(self.query("SELECT name, COUNT(*) AS n, MAX(score) FROM grades WHERE id > 1 "
+                                    "GROUP BY name HAVING COUNT(score) > 0 AND MAX(score) > 2.5"),
+                         [{'name': 'Jan', 'n': 2, 'MAX(score)': 4.0}, {'name': 'Anna', 'n': 1, 'MAX(score)': 5.0}])
+        self.assertEqual(self.query("SELECT name, SUM(id) FROM grades GROUP BY name HAVING SUM(id) > 4"),
+                         [{'name': 'Jan', 'SUM(id)': 7}, {'name': None, 'SUM(id)': 6}])
+        self.assertEqual(self.query("SELECT COUNT(*), SUM(score) FROM grades WHERE id > 100"),
+                         [{'COUNT(*)': 0, 'SUM(score)': None}])
+
+    def test_aggregates_list_storage(self):
+        """
+        Testuje funkcje agregujące, GROUP BY i HAVING dla tabeli przechowywanej w listach.
+        """
+        self.check_aggregates('list')
+
+    @unittest.skipUnless(numpy_available(), 'numpy is not installed')
+    def test_aggregates_numpy_storage(self):
+        """
+        Testuje wektorową agregację tabeli przechowywanej w tablicach NumPy.
+        """
+        self.check_aggregates('numpy')
+
+    def test_distinct_and_invalid_grouping(self):
+        """
+        Testuje COUNT(DISTINCT ...) oraz błędy grupowania.
+        """
+        self.create_grades('list')
+        self.assertEqual(self.query("SELECT COUNT(DISTINCT name) AS names FROM grades"), [{'names': 3}])
+        with self.assertRaises(ValueError):
+            self.query("SELECT name, COUNT(*) FROM grades")
+        with self.assertRaises(ValueError):
+            self.query("SELECT SUM(name) FROM grades")
+        with self.assertRaises(ValueError):
+            self.query("SELECT COUNT(*) FROM grades WHERE COUNT(*) > 1")
+
+
+class TestJoin(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z tabelami klientów i zamówień.
+        """
+        self.db_instance = Database.get_instance()
+        ddl = DDL(self.db_instance)
+        ddl.create_table('customers', {'id': 'INTEGER', 'name': 'TEXT', 'limit_amount': 'INTEGER'})
+        ddl.create_table('orders', {'id': 'INTEGER', 'customer_id': 'INTEGER', 'amount': 'INTEGER'})
+        DataModificationLanguage.executemany('customers', [(1, 'Anna', 100), (2, 'Jan', 10), (3, 'Ola', 50)],
+                                             db_instance=self.db_instance)
+        DataModificationLanguage.executemany('orders', [(10, 2, 30), (11, 1, 70), (12, 4, 20), (13, 2, 5),
+                                                        (14, None, 15)], db_instance=self.db_instance)
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def test_hash_join(self):
+        """
+        Testuje złączenie haszujące INNER JOIN z tablicą budowaną z mniejszej tabeli.
+        """
+        dql = DataQueryLanguage("SELECT o.id, name, amount FROM orders o JOIN customers c ON o.customer_id = c.id",
+                                self.db_instance)
+        self.assertEqual(dql.read_instruction(), [{'o.id': 10, 'name': 'Jan', 'amount': 30},
+                                                  {'o.id': 11, 'name': 'Anna', 'amount': 70},
+                                                  {'o.id': 13, 'name': 'Jan', 'amount': 5}])
+        self.assertEqual(dql.join_plan, [('HASH BUILD RIGHT', 'c')])
+        dql = DataQueryLanguage("SELECT c.name, o.id FROM customers c INNER JOIN orders o ON c.id = o.customer_id "
+                                "WHERE c.id = 2", self.db_instance)
+        self.assertEqual(dql.read_instruction(), [{'c.name': 'Jan', 'o.id': 10}, {'c.name': 'Jan', 'o.id': 13}])
+        self.assertEqual(dql.join_plan, [('HASH BUILD LEFT', 'o')])
+
+    def test_left_join_and_where(self):
+        """
+        Testuje LEFT JOIN oraz warunki WHERE przed złączeniem i po nim.
+        """
+        result = DataQueryLanguage("SELECT o.id, c.name FROM orders o LEFT OUTER JOIN customers c "
+                                   "ON c.id = o.customer_id WHERE o.amount >= 15", self.db_instance).read_instruction()
+        self.assertEqual(result, [{'o.id': 10, 'c.name': 'Jan'}, {'o.id': 11, 'c.name': 'Anna'},
+                                  {'o.id': 12, 'c.name': None}, {'o.id': 14, 'c.name': None}])
+        result = DataQueryLanguage("SELECT o.id FROM orders o LEFT JOIN customers c ON o.customer_id = c.id "
+                                   "WHERE name = 'Jan' AND amount > limit_amount", self.db_instance).read_instruction()
+        self.assertEqual(result, [{'o.id': 10}])
+
+    def test_index_nested_loop_join(self):
+        """
+        Testuje złączenie z użyciem indeksu na kolumnie klucza.
+        """
+        self.db_instance.get_table('customers').create_index('customers_id', 'id')
+        dql = DataQueryLanguage("SELECT * FROM orders JOIN customers ON orders.customer_id = customers.id "
+                                "WHERE orders.id = 11", self.db_instance)
+        self.assertEqual(dql.read_instruction(), [{'orders.id': 11, 'orders.customer_id': 1, 'orders.amount': 70,
+                                                   'customers.id': 1, 'customers.name': 'Anna',
+                                                   'customers.limit_amount': 100}])
+        self.assertEqual(dql.join_plan, [('INDEX NESTED LOOP', 'customers')])
+
+    def test_invalid_join(self):
+        """
+        Testuje błędy niejednoznacznych kolumn i nieprawidłowych warunków złączenia.
+        """
+        with self.assertRaises(ValueError):
+            DataQueryLanguage("SELECT id FROM orders o JOIN customers c ON o.customer_id = c.id",
+                              self.db_instance).read_instruction()
+        with self.assertRaises(ValueError):
+            DataQueryLanguage("SELECT o.id FROM orders o JOIN customers c ON o.customer_id > c.id",
+                              self.db_instance).read_instruction()
+        with self.assertRaises(ValueError):
+            DataQueryLanguage("SELECT o.id FROM orders o JOIN orders ON o.id = orders.missing",
+                              self.db_instance).read_instruction()
+
+
+class TestOrderBy(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z tabelą wyników.
+        """
+        self.db_instance = Database.get_instance()
+        DDL(self.db_instance).create_table('scores', {'id': 'INTEGER', 'name': 'TEXT', 'score': 'INTEGER'})
+        self.rows = [(1, 'Anna', 50), (2, 'Jan', None), (3, 'Ola', 70), (4, 'Ewa', 50), (5, 'Adam', 90)]
+        DataModificationLanguage.executemany('scores', self.rows, db_instance=self.db_instance)
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+        self.db_instance.set_sort_buffer()
+
+    def ids(self, instruction, params=()):
+        return [row['id'] for row in DataQueryLanguage(instruction, self.db_instance, params).read_instruction()]
+
+    def test_order_by(self):
+        """
+        Testuje sortowanie rosnące i malejące po kilku kolumnach (NULL jako najmniejsza wartość).
+        """
+        self.assertEqual(self.ids("SELECT id FROM scores ORDER BY score"), [2, 1, 4, 3, 5])
+        self.assertEqual(self.ids("SELECT id FROM scores ORDER BY score DESC, name ASC"), [5, 3, 1, 4, 2])
+        self.assertEqual(self.ids("SELECT id, score AS points FROM scores WHERE id > 1 ORDER BY points DESC"),
+                         [5, 3, 4, 2])
+
+    def test_limit_offset(self):
+        """
+        Testuje LIMIT i OFFSET z sortowaniem (kopiec top-k) i bez sortowania.
+        """
+        self.assertEqual(self.ids("SELECT id FROM scores ORDER BY score DESC LIMIT 2"), [5, 3])
+        self.assertEqual(self.ids("SELECT id FROM scores ORDER BY score DESC LIMIT ? OFFSET ?", (2, 1)), [3, 1])
+        self.assertEqual(self.ids("SELECT id FROM scores LIMIT 2 OFFSET 3"), [4, 5])
+        self.assertEqual(self.ids("SELECT id FROM scores LIMIT 0"), [])
+        with self.assertRaises(ValueError):
+            self.ids("SELECT id FROM scores LIMIT ?", (-1,))
+        with self.assertRaises(ValueError):
+            self.ids("SELECT id FROM scores ORDER BY missing")
+
+    def test_external_sort(self):
+        """
+        Testuje sortowanie przez scalanie serii zapisanych do plików tymczasowych.
+        """
+        self.db_instance.set_sort_buffer(2)
+        self.assertEqual(self.ids("SELECT id FROM scores ORDER BY score DESC, id"), [5, 3, 1, 4, 2])
+        self.assertEqual(self.ids("SELECT id FROM scores ORDER BY name LIMIT 10 OFFSET 1"), [1, 4, 2, 3])
+        self.assertEqual(self.ids("SELECT id FROM scores ORDER BY name"), [5, 1, 4, 2, 3])
+
+    def test_order_groups_and_joins(self):
+        """
+        Testuje ORDER BY dla wyników grupowania i złączeń.
+        """
+        result = DataQueryLanguage("SELECT score, COUNT(*) AS n FROM scores GROUP BY score ORDER BY n DESC, score "
+                                   "LIMIT 2", self.db_instance).read_instruction()
+        self.assertEqual(result, [{'score': 50, 'n': 2}, {'score': None, 'n': 1}])
+        result = DataQueryLanguage("SELECT a.id, b.id AS other FROM scores a JOIN scores b ON a.score = b.score "
+                                   "ORDER BY a.id DESC, other", self.db_instance).read_instruction()
+        self.assertEqual(result, [{'a.id': 5, 'other': 5}, {'a.id': 4, 'other': 1}, {'a.id': 4, 'other': 4},
+                                  {'a.id': 3, 'other': 3}, {'a.id': 1, 'other': 1}, {'a.id': 1, 'other': 4}])
+
+
+class TestCursor(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z tabelą liczb.
+        """
+        self.db_instance = Database.get_instance()
+        DDL(self.db_instance).create_table('numbers', {'n': 'INTEGER', 'square': 'INTEGER'})
+        DataModificationLanguage.executemany('numbers', [(n, n * n) for n in range(50)], db_instance=self.db_instance)
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def test_fetch(self):
+        """
+        Testuje pobieranie wierszy kursora: fetchone, fetchmany, iterację i fetchall.
+        """
+        cursor = DataQueryLanguage("SELECT n, square AS sq FROM numbers WHERE n >= 10",
+                                   self.db_instance).cursor(batch_size=7)
+        self.assertEqual(cursor.columns, ['n', 'sq'])
+        self.assertEqual(cursor.fetchone(), (10, 100))
+        self.assertEqual(cursor.fetchmany(3), [(11, 121), (12, 144), (13, 169)])
+        self.assertEqual(next(iter(cursor)), (14, 196))
+        rows = cursor.fetchall()
+        self.assertEqual(rows, [(n, n * n) for n in range(15, 50)])
+        self.assertIsNone(cursor.fetchone())
+        cursor.close()
+        with self.assertRaises(ValueError):
+            cursor.fetchone()
+
+    def test_limit_and_batches(self):
+        """
+        Testuje LIMIT/OFFSET kursora i pobieranie porcji kolumnowych.
+        """
+        with DataQueryLanguage("SELECT n FROM numbers LIMIT 12 OFFSET 5", self.db_instance).cursor(4) as cursor:
+            self.assertEqual([row[0] for row in cursor], list(range(5, 17)))
+        cursor = DataQueryLanguage("SELECT * FROM numbers WHERE n < 10", self.db_instance).cursor(4)
+        self.assertEqual(cursor.fetchone(), (0, 0))
+        batches = list(cursor.batches())
+        self.assertEqual([batch['n'] for batch in batches], [[1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertEqual(batches[0]['square'], [1, 4, 9])
+        cursor = DataQueryLanguage("SELECT n FROM numbers ORDER BY n DESC LIMIT 2", self.db_instance).cursor()
+        self.assertEqual(cursor.fetchall(), [(49,), (48,)])
+        cursor = prepare("SELECT square FROM numbers WHERE n BETWEEN ? AND ?", self.db_instance).cursor((3, 5), 2)
+        self.assertEqual(cursor.fetchall(), [(9,), (16,), (25,)])
+
+    def test_table_modified_during_iteration(self):
+        """
+        Testuje pomijanie wierszy usuniętych w trakcie odczytu i przerwanie odczytu kursora po kompakcji tabeli.
+        """
+        cursor = DataQueryLanguage("SELECT n FROM numbers", self.db_instance).cursor(10)
+        self.assertEqual(cursor.fetchone(), (0,))
+        DataModificationLanguage("INSERT INTO numbers (n, square) VALUES (50, 2500)", self.db_instance).read_instruction()
+        self.assertEqual(len(cursor.fetchmany(9)), 9)
+        DataModificationLanguage("DELETE FROM numbers WHERE n = 11", self.db_instance).read_instruction()
+        self.assertEqual(cursor.fetchmany(2), [(10,), (12,)])
+        DataModificationLanguage("DELETE FROM numbers WHERE n = 0", self.db_instance).read_instruction()
+        self.db_instance.compact('numbers')
+        with self.assertRaises(RuntimeError):
+            cursor.fetchall()
+
+
+class TestPlanCache(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z tabelą osób i pustą pamięcią podręczną planów.
+        """
+        self.db_instance = Database.get_instance()
+        DDL(self.db_instance).create_table('people', {'id': 'INTEGER', 'name': 'TEXT', 'balance': 'FLOAT'})
+        self.db_instance.plan_cache = PlanCache()
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+        self.db_instance.plan_cache = PlanCache()
+
+    def run_sql(self, sql, params=()):
+        if sql.lstrip().upper().startswith('SELECT'):
+            return DataQueryLanguage(sql, self.db_instance, params).read_instruction()
+        return DataModificationLanguage(sql, self.db_instance, params).read_instruction()
+
+    def test_normalize(self):
+        """
+        Testuje zamianę stałych na parametry w tekście instrukcji.
+        """
+        key, slots = normalize("select * from people where name = 'O''Hara' and balance > -1.5 and id = ?; ;"
+                               "DELETE FROM people WHERE id IN (1, 2)")
+        self.assertEqual(key, "SELECT * FROM people WHERE name = ? AND balance > ? AND id = ? ; ; "
+                              "DELETE FROM people WHERE id IN ( ? , ? )")
+        self.assertEqual(slots[0][:2], ["O'Hara", -1.5])
+        self.assertEqual(slots[1:], [[1, 2]])
+        self.assertEqual(normalize("UPDATE people SET balance = balance - 1 * -2"),
+                         ("UPDATE people SET balance = balance - ? * ?", [[1, -2]]))
+
+    def test_hits_and_results(self):
+        """
+        Testuje wspólny plan instrukcji różniących się stałymi i liczniki trafień.
+        """
+        self.run_sql("INSERT INTO people (id, name, balance) VALUES (1, 'Anna', 10.5)")
+        self.run_sql("INSERT INTO people (id, name, balance) VALUES (2, 'Jan', -3)")
+        self.run_sql("UPDATE people SET balance = 0 WHERE id = 2; UPDATE people SET name = ? WHERE id = 1", ('Ania',))
+        self.assertEqual(self.run_sql("SELECT name, balance FROM people WHERE id = 1"), [{'name': 'Ania', 'balance': 10.5}])
+        self.assertEqual(self.run_sql("select name, balance from people where id = 2"), [{'name': 'Jan', 'balance': 0.0}])
+        self.assertEqual(self.run_sql("SELECT id FROM people WHERE balance > ? AND name <> 'x'", (1,)), [{'id': 1}])
+        stats = self.db_instance.plan_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (2, 4, 4))
+
+    def test_invalidation_and_eviction(self):
+        """
+        Testuje czyszczenie planów po zmianie schematu i usuwanie najdawniej używanych planów.
+        """
+        self.run_sql("SELECT id FROM people WHERE id = 1")
+        DDL(self.db_instance).add_column('people', 'age', 'INTEGER')
+        self.assertEqual(self.db_instance.plan_cache.stats()['size'], 0)
+        self.db_instance.plan_cache = PlanCache(capacity=2)
+        for sql in ("SELECT id FROM people", "SELECT name FROM people", "SELECT id FROM people",
+                    "SELECT age FROM people", "SELECT id FROM people"):
+            self.run_sql(sql)
+        self.assertEqual(self.db_instance.plan_cache.stats(), {'hits': 2, 'misses': 3, 'size': 2, 'capacity': 2})
+
+    def test_in_list_set(self):
+        """
+        Testuje, że lista IN zamieniona na parametry jest sprawdzana jako zbiór wartości tworzony przy wiązaniu.
+        """
+        DataModificationLanguage.executemany('people', [(i, None, i / 2) for i in range(10)],
+                                             db_instance=self.db_instance)
+        dql = DataQueryLanguage("SELECT id FROM people WHERE id IN (1, 3, 8) OR balance IN (0.5, ?)",
+                                self.db_instance, (3,))
+        self.assertEqual([row['id'] for row in dql.read_instruction()], [1, 3, 6, 8])
+        condition = compiled_where(dql.statements[0], self.db_instance.tables['people'])
+        self.assertEqual([(literals, indexes) for _, literals, indexes, _ in condition.member_sets],
+                         [([], [0, 1, 2]), ([], [3, 4])])
+        self.assertEqual(condition.filter(self.db_instance.tables['people'].data, range(10), (5, 7, 9, 0.0, 1.0)),
+                         [0, 2, 5, 7, 9])
+        rows = self.run_sql("SELECT id FROM people WHERE id IN (2, 5) OR balance NOT IN (0.5, 1, 1.5, 2)")
+        self.assertEqual([row['id'] for row in rows], [0, 2, 5, 6, 7, 8, 9])
+
+    def test_errors(self):
+        """
+        Testuje błędy składni i brakujące parametry.
+        """
+        with self.assertRaises(ValueError) as context:
+            self.run_sql("SELECT FROM people WHERE id = 5")
+        self.assertIn("id = 5", str(context.exception))
+        with self.assertRaises(ValueError):
+            self.run_sql("SELECT id FROM people WHERE id = ?")
+        with self.assertRaises(ValueError):
+            self.run_sql("SELECT id FROM people WHERE id = ?", (1, 2))
+        with self.assertRaises(ValueError):
+            self.run_sql("SELECT id FROM people WHERE id = 1", (1,))
+
+    def test_errors_quote_original_text(self):
+        """
+        Testuje, że błędy wykonania planu z pamięci podręcznej podają tekst instrukcji ze stałymi.
+        """
+        with self.assertRaises(ValueError) as context:
+            self.run_sql("INSERT INTO people (id, name, balance) VALUES ('x7', 'Anna', 1.5)")
+        self.assertIn("VALUES ('x7', 'Anna', 1.5)", str(context.exception))
+        self.run_sql("INSERT INTO people (id, name, balance) VALUES (7, 'Anna', 1.5)")
+        with self.assertRaises(ValueError) as context:
+            self.run_sql("SELECT id FROM people WHERE name < 42")
+        self.assertIn("name < 42", str(context.exception))
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z tabelą produktów i włączoną pamięcią podręczną wyników.
+        """
+        self.db_instance = Database.get_instance()
+        DDL(self.db_instance).create_table('products', {'id': 'INTEGER', 'price': 'FLOAT'})
+        DataModificationLanguage.executemany('products', [(1, 9.5), (2, 20.0)], db_instance=self.db_instance)
+        self.cache = self.db_instance.enable_result_cache(max_entries=2)
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+        self.db_instance.disable_result_cache()
+
+    def query(self, sql, params=()):
+        return DataQueryLanguage(sql, self.db_instance, params).read_instruction()
+
+    def test_hit_and_invalidation(self):
+        """
+        Testuje ponowne użycie wyniku i unieważnienie po zmianach danych i schematu tabeli.
+        """
+        sql = "SELECT id FROM products WHERE price > ?"
+        self.assertEqual(self.query(sql, (10,)), [{'id': 2}])
+        result = self.query(sql, (10,))
+        result[0]['id'] = 99  # zmiana wyniku przez wywołującego nie psuje zapamiętanego wyniku
+        self.assertEqual(self.query(sql, (10,)), [{'id': 2}])
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+        changes = [
+            lambda: DataModificationLanguage("INSERT INTO products (id, price) VALUES (3, 30)",
+                                             self.db_instance).read_instruction(),
+            lambda: DataModificationLanguage("UPDATE products SET price = 5 WHERE id = 3",
+                                             self.db_instance).read_instruction(),
+            lambda: DataModificationLanguage("DELETE FROM products WHERE id = 1", self.db_instance).read_instruction(),
+        ]
+        expected = [[{'id': 2}, {'id': 3}], [{'id': 2}], [{'id': 2}]]
+        for change, rows in zip(changes, expected):
+            change()
+            self.assertEqual(self.query(sql, (10,)), rows)
+        self.assertEqual(self.query("SELECT * FROM products WHERE id = 2"), [{'id': 2, 'price': 20.0}])
+        DDL(self.db_instance).add_column('products', 'name', 'TEXT')
+        self.assertEqual(self.query("SELECT * FROM products WHERE id = 2"), [{'id': 2, 'price': 20.0, 'name': None}])
+        DDL(self.db_instance).drop_table('products')
+        DDL(self.db_instance).create_table('products', {'id': 'INTEGER', 'price': 'FLOAT'})
+        self.assertEqual(self.query(sql, (10,)), [])
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_join_invalidation(self):
+        """
+        Testuje unieważnienie wyniku złączenia po zmianie drugiej tabeli.
+        """
+        DDL(self.db_instance).create_table('stock', {'product_id': 'INTEGER', 'amount': 'INTEGER'})
+        sql = "SELECT id, amount FROM products JOIN stock ON id = product_id"
+        self.assertEqual(self.query(sql), [])
+        DataModificationLanguage("INSERT INTO stock (product_id, amount) VALUES (2, 7)", self.db_instance).read_instruction()
+        self.assertEqual(self.query(sql), [{'id': 2, 'amount': 7}])
+        self.assertEqual(self.query(sql), [{'id': 2, 'amount': 7}])
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_eviction(self):
+        """
+        Testuje usuwanie wyników po przekroczeniu liczby wyników, liczby wierszy i czasu życia.
+        """
+        for price in (1, 2, 3):
+            self.query("SELECT id FROM products WHERE price > ?", (price,))
+        self.assertEqual(self.cache.stats()['size'], 2)
+        cache = self.db_instance.enable_result_cache(max_rows=1)
+        self.query("SELECT id FROM products")
+        self.query("SELECT id FROM products WHERE id = 1")
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 2, 'size': 1, 'rows': 1})
+        cache = self.db_instance.enable_result_cache(ttl=0.01)
+        self.query("SELECT id FROM products")
+        clock.sleep(0.02)
+        self.query("SELECT id FROM products")
+        self.assertEqual(cache.stats()['hits'], 0)
+
+
+class TestCompaction(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z wyłączoną kompakcją automatyczną.
+        """
+        self.db_instance = Database.get_instance()
+        self.db_instance.set_compaction(None)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych i przywrócenie domyślnej kompakcji po każdym teście.
+        """
+        self.db_instance.tables.clear()
+        self.db_instance.snapshot_chain = None
+        self.db_instance.set_compaction()
+        self.directory.cleanup()
+
+    def create_numbers(self, storage='list', count=10):
+        DDL(self.db_instance).create_table('numbers', {'n': 'INTEGER', 'label': 'TEXT'}, storage=storage)
+        DataModificationLanguage.executemany('numbers', [(n, f'n{n}') for n in range(count)],
+                                             db_instance=self.db_instance)
+        return self.db_instance.tables['numbers']
+
+    def query(self, sql):
+        return [row['n'] for row in DataQueryLanguage(sql, self.db_instance).read_instruction()]
+
+    def delete(self, sql):
+        DataModificationLanguage(sql, self.db_instance).read_instruction()
+
+    def check_tombstones(self, storage):
+        table = self.create_numbers(storage)
+        self.db_instance.tables['numbers'].create_index('idx_n', 'n', 'SORTED')
+        self.delete("DELETE FROM numbers WHERE n < 3 OR n = 7")
+        self.assertEqual(table.row_count(), 10)
+        self.assertEqual(table.deleted_count, 4)
+        expected = [3, 4, 5, 6, 8, 9]
+        self.assertEqual(self.query("SELECT n FROM numbers"), expected)
+        self.assertEqual(self.query("SELECT n FROM numbers WHERE label != 'n5'"), [3, 4, 6, 8, 9])
+        self.assertEqual(self.query("SELECT n FROM numbers WHERE n >= 2"), expected)
+        self.assertEqual(DataQueryLanguage("SELECT COUNT(*) AS c FROM numbers", self.db_instance).read_instruction(),
+                         [{'c': 6}])
+        self.assertEqual([row[0] for row in DataQueryLanguage("SELECT n FROM numbers", self.db_instance).cursor(4)],
+                         expected)
+        self.delete("UPDATE numbers SET label = 'x' WHERE n < 5")
+        self.assertEqual(table.column_values('label', range(5)), ['n0', 'n1', 'n2', 'x', 'x'])
+
+        self.assertEqual(self.db_instance.compact('numbers'), 4)
+        self.assertEqual(table.row_count(), 6)
+        self.assertEqual(table.column_values('n', range(6)), expected)
+        self.assertEqual(table.find_rows('n', '>', 5), [3, 4, 5])
+        self.assertEqual(self.query("SELECT n FROM numbers WHERE n >= 2"), expected)
+        self.assertEqual(self.db_instance.compact('numbers'), 0)
+
+    def test_tombstones_list_storage(self):
+        """
+        Testuje pomijanie usuniętych wierszy przy skanowaniu i w indeksach oraz kompakcję tabeli listowej.
+        """
+        self.check_tombstones('list')
+
+    @unittest.skipUnless(numpy_available(), 'numpy is not installed')
+    def test_tombstones_numpy_storage(self):
+        """
+        Testuje pomijanie usuniętych wierszy i kompakcję tabeli przechowywanej w NumPy.
+        """
+        self.check_tombstones('numpy')
+
+    def test_threshold_compaction(self):
+        """
+        Testuje kompakcję uruchamianą przez DELETE po przekroczeniu progu usuniętych wierszy.
+        """
+        table = self.create_numbers()
+        self.db_instance.set_compaction(0.5)
+        self.delete("DELETE FROM numbers WHERE n < 4")
+        self.assertEqual(table.row_count(), 10)
+        self.delete("DELETE FROM numbers WHERE n = 9")
+        self.assertEqual(table.row_count(), 5)
+        self.assertIsNone(table.live)
+        self.assertEqual(table.data['n'], [4, 5, 6, 7, 8])
+        with self.assertRaises(ValueError):
+            self.db_instance.set_compaction(1.5)
+
+    def test_background_compaction(self):
+        """
+        Testuje kompakcję w wątku tła.
+        """
+        table = self.create_numbers(count=100)
+        self.db_instance.set_compaction(0.2, background=True)
+        self.delete("DELETE FROM numbers WHERE n >= 50")
+        self.assertEqual(table.compaction.result(), 50)
+        self.assertEqual(table.row_count(), 50)
+        self.assertEqual(self.query("SELECT n FROM numbers WHERE n > 47"), [48, 49])
+
+    def test_tombstones_survive_snapshots(self):
+        """
+        Testuje zapis usuniętych wierszy w migawkach JSON, binarnych i plikach delta.
+        """
+        self.create_numbers()
+        self.delete("DELETE FROM numbers WHERE n = 1")
+        for format in ('json', 'binary'):
+            filename = os.path.join(self.directory.name, f'state.{format}')
+            StateManagement.save_state(filename, format=format)
+            self.db_instance.tables.clear()
+            StateManagement.load_state(filename)
+            table = self.db_instance.tables['numbers']
+            self.assertEqual(table.row_count(), 10)
+            self.assertEqual(table.deleted_rows(), [1])
+
+        filename = os.path.join(self.directory.name, 'chain.json')
+        StateManagement.save_state(filename, incremental=True)
+        self.delete("DELETE FROM numbers WHERE n = 5")
+        StateManagement.save_state(filename, incremental=True)
+        with open(filename + '.delta1') as file:
+            self.assertEqual(json.load(file)['tables']['numbers']['deleted'], [5])
+        self.db_instance.tables.clear()
+        StateManagement.load_state(filename)
+        self.assertEqual(self.query("SELECT n FROM numbers"), [0, 2, 3, 4, 6, 7, 8, 9])
+
+
+class TestPlanner(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie tabeli z 1000 wierszami i dwoma indeksami.
+        """
+        self.db_instance = Database.get_instance()
+        self.ddl = DDL(self.db_instance)
+        self.ddl.create_table('orders', {'id': 'INTEGER', 'region': 'TEXT', 'amount': 'INTEGER'})
+        DataModificationLanguage.executemany('orders', [(i, f'r{i % 10}', i % 100) for i in range(1000)],
+                                             db_instance=self.db_instance)
+        self.table = self.db_instance.tables['orders']
+        self.table.create_index('idx_id', 'id', 'SORTED')
+        self.table.create_index('idx_region', 'region', 'HASH')
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+
+    def query(self, sql, params=()):
+        return [row['id'] for row in DataQueryLanguage(sql, self.db_instance, params).read_instruction()]
+
+    def test_analyze_collects_statistics(self):
+        """
+        Testuje statystyki kolumn zebrane przez ANALYZE i szacowanie liczby różnych wartości.
+        """
+        self.assertTrue(self.ddl.read_instruction("ANALYZE orders;"))
+        statistics = self.table.statistics
+        self.assertEqual(statistics.analyzed_rows, 1000)
+        amount = statistics.columns['amount']
+        self.assertEqual((amount.minimum, amount.maximum, amount.null_count), (0, 99, 0))
+        self.assertEqual(amount.distinct(), 100)
+        self.assertEqual(statistics.columns['region'].distinct(), 10)
+        self.assertAlmostEqual(statistics.columns['id'].distinct(), 1000, delta=150)
+        self.assertAlmostEqual(amount.fraction_below(50, False), 0.5, delta=0.07)
+
+    def test_update_keeps_statistics_counts(self):
+        """
+        Testuje, że wielokrotne UPDATE nie zawyża liczby wartości i wartości NULL w statystykach.
+        """
+        self.ddl.analyze('orders')
+        amount = self.table.statistics.columns['amount']
+        for _ in range(3):
+            DataModificationLanguage("UPDATE orders SET amount = NULL WHERE id < 100", self.db_instance).read_instruction()
+            DataModificationLanguage("UPDATE orders SET amount = 7 WHERE id < 50", self.db_instance).read_instruction()
+        self.table.update_value(0, 'amount', 8)
+        self.assertEqual((amount.count, amount.null_count), (950, 50))
+        self.assertAlmostEqual(amount.null_fraction(), 0.05)
+
+    def test_selectivity_orders_conjuncts_and_chooses_index(self):
+        """
+        Testuje szacowanie selektywności, kolejność warunków i wybór indeksu.
+        """
+        self.ddl.analyze('orders')
+        node = parse("SELECT id FROM orders WHERE amount > 50 AND region = 'r3' AND id >= 990")[0].where
+        self.assertAlmostEqual(planner.selectivity(node.items[0], self.table), 0.5, delta=0.07)
+        self.assertAlmostEqual(planner.selectivity(node.items[1], self.table), 0.1, delta=0.01)
+        ordered = [planner.describe(part) for part, _ in planner.order_conjuncts(node.items, self.table)]
+        self.assertEqual(ordered, ["id >= 990", "region = 'r3'", "amount > 50"])
+        self.assertEqual(planner.choose_index(self.table, node)[:3], ('id', '>=', 990))
+        self.assertEqual(self.table.candidate_rows(node), list(range(990, 1000)))
+        self.assertEqual(self.query("SELECT id FROM orders WHERE amount > 50 AND region = 'r3' AND id >= 990"),
+                         [993])
+
+    def test_provably_empty(self):
+        """
+        Testuje pominięcie wyszukiwania, gdy zakres wartości kolumny wyklucza każdy wiersz.
+        """
+        self.ddl.analyze('orders')
+        self.assertEqual(self.table.candidate_rows(parse("SELECT id FROM orders WHERE amount > 500")[0].where), [])
+        self.assertEqual(self.query("SELECT id FROM orders WHERE amount > ? OR id BETWEEN 2000 AND 3000", (99,)), [])
+        self.assertEqual(self.query("SELECT id FROM orders WHERE region IN ('a', 'b') AND id < 5"), [])
+        # Nowe wartości poszerzają zakres kolumny bez ponownego ANALYZE
+        DataModificationLanguage("INSERT INTO orders (id, region, amount) VALUES (1000, 'r0', 700)",
+                                 self.db_instance).read_instruction()
+        self.assertEqual(self.table.statistics.columns['amount'].maximum, 700)
+        self.assertEqual(self.query("SELECT id FROM orders WHERE amount > 500"), [1000])
+
+    def test_reordering_keeps_errors_and_none_semantics(self):
+        """
+        Testuje warunek, który w zmienionej kolejności porównywałby wartości None.
+        """
+        self.ddl.create_table('sparse', {'id': 'INTEGER', 'value': 'INTEGER'})
+        DataModificationLanguage.executemany('sparse', [(i, i if i > 90 else None) for i in range(100)],
+                                             db_instance=self.db_instance)
+        self.ddl.analyze('sparse')
+        result = DataQueryLanguage("SELECT id FROM sparse WHERE id > 90 AND value < 95",
+                                   self.db_instance).read_instruction()
+        self.assertEqual([row['id'] for row in result], [91, 92, 93, 94])
+
+    def test_explain(self):
+        """
+        Testuje EXPLAIN z szacowaną i rzeczywistą liczbą wierszy dla SELECT, UPDATE i DELETE.
+        """
+        self.ddl.analyze('orders')
+        steps = DataQueryLanguage("EXPLAIN SELECT id FROM orders WHERE amount < 50 AND region = 'r3'",
+                                  self.db_instance).read_instruction()
+        self.assertEqual([(step['step'], step['detail']) for step in steps],
+                         [('INDEX LOOKUP', "idx_region: region = 'r3'"), ('FILTER', "region = 'r3'"),
+                          ('FILTER', 'amount < 50'), ('RESULT', 'id')])
+        self.assertEqual([step['actual_rows'] for step in steps], [100, 100, 50, 50])
+        self.assertEqual(steps[0]['estimated_rows'], 100)
+        self.assertAlmostEqual(steps[-1]['estimated_rows'], 50, delta=7)
+
+        steps = DataQueryLanguage("EXPLAIN DELETE FROM orders WHERE amount > 200", self.db_instance).read_instruction()
+        self.assertEqual([step['step'] for step in steps], ['EMPTY RESULT', 'DELETE'])
+        steps = prepare("EXPLAIN UPDATE orders SET amount = amount + 1 WHERE id < ?", self.db_instance).execute((10,))
+        self.assertEqual([(step['step'], step['actual_rows']) for step in steps],
+                         [('INDEX LOOKUP', 10), ('FILTER', 10), ('UPDATE', 10)])
+        self.assertEqual(self.table.column_values('amount', range(3)), [0, 1, 2])
+
+        # Bez statystyk plan jest ten sam, a szacunki - domyślne
+        self.table.statistics = None
+        steps = DataQueryLanguage("EXPLAIN SELECT id FROM orders", self.db_instance).read_instruction()
+        self.assertEqual([(step['step'], step['actual_rows']) for step in steps],
+                         [('FULL SCAN', 1000), ('RESULT', 1000)])
+        with self.assertRaises(ValueError):
+            parse("EXPLAIN INSERT INTO orders (id) VALUES (1)")
+
+    def test_statistics_follow_schema_changes(self):
+        """
+        Testuje statystyki po dodaniu i usunięciu kolumny oraz po dużej liczbie zmian.
+        """
+        self.ddl.analyze()
+        self.ddl.add_column('orders', 'note', 'TEXT')
+        self.assertEqual(self.table.statistics.columns['note'].null_fraction(), 1.0)
+        self.ddl.drop_column('orders', 'note')
+        self.assertNotIn('note', self.table.statistics.columns)
+        self.assertIsNotNone(self.table.statistics.columns['amount'].histogram)
+        DataModificationLanguage("UPDATE orders SET amount = amount * 2 WHERE id < 300",
+                                 self.db_instance).read_instruction()
+        self.assertIsNone(self.table.statistics.columns['amount'].histogram)
+        self.assertEqual(self.table.statistics.columns['amount'].maximum, 198)
+
+
+class TestZoneMaps(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych przed każdym testem.
+        """
+        self.db_instance = Database.get_instance()
+        self.db_instance.set_compaction(None)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.tables.clear()
+        self.db_instance.snapshot_chain = None
+        self.db_instance.set_compaction()
+        self.directory.cleanup()
+
+    def create_series(self, storage='list', count=5000):
+        DDL(self.db_instance).create_table('series', {'id': 'INTEGER', 'enrollment_date': 'DATE', 'value': 'FLOAT'},
+                                           storage=storage)
+        start = date(2000, 1, 1).toordinal()
+        DataModificationLanguage.executemany(
+            'series', [(i, date.fromordinal(start + i), float(i % 7)) for i in range(count)],
+            db_instance=self.db_instance)
+        return self.db_instance.tables['series']
+
+    def ids(self, sql, params=()):
+        return [row['id'] for row in DataQueryLanguage(sql, self.db_instance, params).read_instruction()]
+
+    def check_tail_scans(self, storage):
+        table = self.create_series(storage)
+        zone_map = table.zone_maps['id']
+        self.assertEqual((zone_map.minimums, zone_map.maximums), ([0, 1024, 2048, 3072, 4096],
+                                                                  [1023, 2047, 3071, 4095, 4999]))
+        node = parse("SELECT id FROM series WHERE id >= 4990")[0].where
+        self.assertEqual(zone_maps.scan_ranges(table, node), [(4096, 5000)])
+        self.assertEqual(self.ids("SELECT id FROM series WHERE id >= 4990"), list(range(4990, 5000)))
+        self.assertEqual(self.ids("SELECT id FROM series WHERE enrollment_date > '2013-08-10' AND value = 0"),
+                         [4977, 4984, 4991, 4998])
+        self.assertEqual(self.ids("SELECT id FROM series WHERE id BETWEEN ? AND ? OR id IN (3, 4)", (2040, 2050)),
+                         [3, 4] + list(range(2040, 2051)))
+        self.assertEqual(self.ids("SELECT id FROM series WHERE id < 0"), [])
+        with DataQueryLanguage("SELECT id FROM series WHERE id > 4995", self.db_instance).cursor(1000) as cursor:
+            self.assertEqual([row[0] for row in cursor], [4996, 4997, 4998, 4999])
+
+        steps = DataQueryLanguage("EXPLAIN SELECT id FROM series WHERE id >= 4990",
+                                  self.db_instance).read_instruction()
+        self.assertEqual((steps[0]['step'], steps[0]['detail'], steps[0]['actual_rows']),
+                         ('BLOCK SCAN', 'series: 1 of 5 blocks (904 rows)', 904))
+        self.assertEqual(steps[-1]['actual_rows'], 10)
+
+        # Zmiana wartości poszerza granice bloku, więc wiersz nadal jest znajdowany
+        DataModificationLanguage("UPDATE series SET id = 100000, value = NULL WHERE id = 7",
+                                 self.db_instance).read_instruction()
+        self.assertEqual(zone_map.maximums[0], 100000)
+        self.assertEqual(table.zone_maps['value'].null_counts[0], 1)
+        self.assertEqual(self.ids("SELECT id FROM series WHERE id > 4998"), [100000, 4999])
+        DataModificationLanguage("DELETE FROM series WHERE id > 1000", self.db_instance).read_instruction()
+        self.assertEqual(self.ids("SELECT id FROM series WHERE id > 990"), list(range(991, 1001)))
+        self.db_instance.compact('series')
+        self.assertEqual((zone_map.minimums, zone_map.maximums), ([0], [1000]))
+
+    def check_null_blocks(self, storage):
+        table = self.create_series(storage, count=3000)
+        # Bloki 0 i 2 - wartości i NULL, blok 1 - bez NULL, blok 3 - same NULL; kolumna extra - same NULL
+        DataModificationLanguage("UPDATE series SET value = NULL WHERE id < 10", self.db_instance).read_instruction()
+        DDL(self.db_instance).add_column('series', 'extra', 'INTEGER')
+        DataModificationLanguage.executemany('series', [(3000 + i, None) for i in range(1000)], ['id', 'value'],
+                                             db_instance=self.db_instance)
+        self.assertEqual(table.zone_maps['value'].null_counts, [10, 0, 72, 928])
+        self.assertEqual(table.zone_maps['value'].minimums[3], None)
+        for column in ('value', 'enrollment_date', 'extra'):
+            rebuilt = zone_maps.ZoneMap()
+            rebuilt.build(table.data[column])
+            zone_map = table.zone_maps[column]
+            self.assertEqual((rebuilt.minimums, rebuilt.maximums, rebuilt.null_counts, rebuilt.rows),
+                             (zone_map.minimums, zone_map.maximums, zone_map.null_counts, zone_map.rows))
+        self.assertEqual(self.ids("SELECT id FROM series WHERE value > 5 AND id < 20"), [13])
+        self.assertEqual(self.ids("SELECT id FROM series WHERE extra > 1"), [])
+        self.assertEqual(self.ids("SELECT id FROM series WHERE NOT (extra > 1) AND id < 3"), [0, 1, 2])
+        expected = list(range(10)) + list(range(3000, 4000))
+        self.assertEqual(self.ids("SELECT id FROM series WHERE value = NULL"), expected)
+        node = parse("SELECT id FROM series WHERE value = NULL")[0].where
+        self.assertEqual(zone_maps.scan_ranges(table, node), [(0, 1024), (2048, 4000)])
+        self.assertEqual(self.ids("SELECT id FROM series WHERE value IN (6, NULL) AND id < 30"),
+                         list(range(10)) + [13, 20, 27])
+        self.assertEqual(self.ids("SELECT id FROM series WHERE value >= NULL"), [])
+
+    def test_null_blocks_list_storage(self):
+        """
+        Testuje, że pomijanie bloków z samymi NULL i bloków bez NULL nie zmienia wyniku warunku.
+        """
+        self.check_null_blocks('list')
+
+    @unittest.skipUnless(numpy_available(), "numpy is not installed")
+    def test_null_blocks_numpy_storage(self):
+        """
+        Testuje pomijanie bloków z wartościami NULL w tabeli przechowywanej w NumPy.
+        """
+        self.check_null_blocks('numpy')
+
+    def test_tail_scans_list_storage(self):
+        """
+        Testuje pomijanie bloków przy skanowaniu tabeli przechowywanej w listach.
+        """
+        self.check_tail_scans('list')
+
+    @unittest.skipUnless(numpy_available(), "numpy is not installed")
+    def test_tail_scans_numpy_storage(self):
+        """
+        Testuje pomijanie bloków przy skanowaniu tabeli przechowywanej w NumPy.
+        """
+        self.check_tail_scans('numpy')
+
+    def test_cursor_prunes_blocks_once(self):
+        """
+        Testuje, że kursor wyznacza pomijane bloki raz przy otwarciu, a nie przy każdej porcji.
+        """
+        table = self.create_series()
+        lookups = []
+        zone_map = table.zone_map
+        table.zone_map = lambda column: lookups.append(column) or zone_map(column)
+        cursor = DataQueryLanguage("SELECT id FROM series WHERE id > 4995 OR id < 3", self.db_instance).cursor(100)
+        with cursor:
+            self.assertEqual([row[0] for row in cursor], [0, 1, 2, 4996, 4997, 4998, 4999])
+        self.assertEqual(lookups, ['id', 'id'])
+
+    def test_parallel_scan_and_snapshots(self):
+        """
+        Testuje mapy stref w skanowaniu równoległym i po wczytaniu migawki.
+        """
+        self.create_series()
+        self.db_instance.set_parallelism(2, min_rows=0, morsel_size=1500)
+        try:
+            self.assertEqual(self.ids("SELECT id FROM series WHERE id >= 4995 OR id < 2"),
+                             [0, 1, 4995, 4996, 4997, 4998, 4999])
+            self.assertEqual(self.ids("SELECT id FROM series WHERE id > 9000"), [])
+        finally:
+            self.db_instance.set_parallelism(1)
+        filename = os.path.join(self.directory.name, 'state.json')
+        StateManagement.save_state(filename)
+        self.db_instance.tables.clear()
+        StateManagement.load_state(filename)
+        table = self.db_instance.tables['series']
+        # Mapy stref są budowane dopiero przy pierwszym skanowaniu, a zmiany przed nim są uwzględniane
+        self.assertTrue(table.zone_maps['id'].stale)
+        DataModificationLanguage("UPDATE series SET id = 7000 WHERE id = 3", self.db_instance).read_instruction()
+        self.assertEqual(self.ids("SELECT id FROM series WHERE id >= 4998"), [7000, 4998, 4999])
+        self.assertEqual(table.zone_maps['id'].rows, 5000)
+        self.assertEqual(table.zone_maps['id'].maximums[0], 7000)
+        self.assertEqual(table.zone_map('enrollment_date').minimums[1], date(2002, 10, 21))
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie bazy danych z profilerem zbierającym profile instrukcji.
+        """
+        self.db_instance = Database.get_instance()
+        self.directory = tempfile.TemporaryDirectory()
+        self.profiles = []
+        self.db_instance.add_profiler(self.profiles.append)
+
+    def tearDown(self):
+        """
+        Wyrejestrowanie profilerów, odłączenie dziennika i czyszczenie bazy danych po każdym teście.
+        """
+        self.db_instance.remove_profiler(self.profiles.append)
+        self.db_instance.disable_query_statistics()
+        if self.db_instance.wal is not None:
+            self.db_instance.wal.close()
+        self.db_instance.wal = None
+        self.db_instance.lsn = 0
+        self.db_instance.tables.clear()
+        self.directory.cleanup()
+
+    def create_items(self):
+        DDL(self.db_instance).create_table('items', {'id': 'INTEGER', 'name': 'TEXT'})
+        DataModificationLanguage.executemany('items', [(i, f'item{i}') for i in range(100)],
+                                             db_instance=self.db_instance)
+        self.db_instance.tables['items'].create_index('idx_id', 'id')
+        self.profiles.clear()
+
+    def test_statement_profiles(self):
+        """
+        Testuje czasy faz i liczniki profili instrukcji DQL, DML i DDL.
+        """
+        self.create_items()
+        result = DataQueryLanguage("SELECT name FROM items WHERE id = 7", self.db_instance).read_instruction()
+        DataQueryLanguage("SELECT name FROM items WHERE name > 'item90'", self.db_instance).read_instruction()
+        DataModificationLanguage("UPDATE items SET name = 'x' WHERE id < 3; DELETE FROM items WHERE id = 99",
+                                 self.db_instance).read_instruction()
+        self.assertEqual(result, [{'name': 'item7'}])
+        index_lookup, scan, update, delete = self.profiles
+        self.assertEqual((index_lookup.kind, index_lookup.text), ('SELECT', 'SELECT name FROM items WHERE id = ?'))
+        self.assertEqual((index_lookup.index_hits, index_lookup.rows_scanned, index_lookup.rows_returned), (1, 1, 1))
+        self.assertEqual((scan.index_hits, scan.rows_scanned, scan.rows_returned), (0, 100, 9))
+        self.assertEqual((update.kind, update.rows_affected, delete.kind, delete.rows_affected),
+                         ('UPDATE', 3, 'DELETE', 1))
+        self.assertGreater(update.parse_time, 0)
+        self.assertEqual(delete.parse_time, 0)
+        for profile in self.profiles:
+            self.assertGreater(profile.execute_time, 0)
+            self.assertGreaterEqual(profile.execute_time, profile.plan_time)
+            self.assertEqual(profile.as_dict()['total_time'], profile.parse_time + profile.execute_time)
+
+        self.profiles.clear()
+        with self.assertRaises(ValueError):
+            DataQueryLanguage("SELECT missing FROM items", self.db_instance).read_instruction()
+        DDL(self.db_instance).read_instruction("CREATE INDEX idx_name ON items (name) USING SORTED")
+        self.assertEqual([(profile.kind, profile.error) for profile in self.profiles],
+                         [('SELECT', 'ValueError'), ('CREATE INDEX', None)])
+        self.assertEqual(self.profiles[1].text, 'CREATE INDEX idx_name ON items')
+
+    def test_bytes_written(self):
+        """
+        Testuje liczbę bajtów dopisanych do dziennika WAL przez instrukcję.
+        """
+        StateManagement.recover(os.path.join(self.directory.name, 'db_state.json'),
+                                os.path.join(self.directory.name, 'db.wal'))
+        self.create_items()
+        DataModificationLanguage("INSERT INTO items (id, name) VALUES (100, 'new')",
+                                 self.db_instance).read_instruction()
+        DataQueryLanguage("SELECT id FROM items", self.db_instance).read_instruction()
+        insert, select = self.profiles
+        self.db_instance.wal.close()
+        self.assertGreater(insert.bytes_written, 0)
+        self.assertEqual(select.bytes_written, 0)
+
+    def test_query_statistics(self):
+        """
+        Testuje rejestr statystyk instrukcji i jego zapis do JSON.
+        """
+        self.create_items()
+        statistics = self.db_instance.enable_query_statistics()
+        for i in range(5):
+            DataQueryLanguage(f"SELECT name FROM items WHERE id = {i}", self.db_instance).read_instruction()
+        DataModificationLanguage.executemany('items', [(200, 'a'), (201, 'b')], db_instance=self.db_instance)
+        entries = {entry['text']: entry for entry in statistics.snapshot()}
+        select = entries['SELECT name FROM items WHERE id = ?']
+        self.assertEqual((select['count'], select['errors'], select['rows_returned'], select['index_hits']),
+                         (5, 0, 5, 5))
+        self.assertEqual(sum(select['latency_histogram']), 5)
+        self.assertAlmostEqual(select['mean_time'], select['total_time'] / 5)
+        self.assertEqual(entries['INSERT INTO items (id, name) VALUES (?, ?)']['rows_affected'], 2)
+
+        filename = os.path.join(self.directory.name, 'statistics.json')
+        statistics.dump(filename)
+        with open(filename) as file:
+            dumped = json.load(file)
+        self.assertEqual(len(dumped['latency_buckets_ms']) + 1, len(select['latency_histogram']))
+        self.assertEqual(len(dumped['statements']), 2)
+        self.db_instance.disable_query_statistics()
+        self.assertEqual(self.db_instance.profilers, [self.profiles.append])
+        statistics.clear()
+        self.assertEqual(statistics.snapshot(), [])
+
+
+class TestLogging(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowuje testy: czyści bazę danych.
+        """
+        self.db_instance = Database.get_instance()
+        self.db_instance.tables.clear()
+        self.ddl = DDL(self.db_instance)
+
+    def tearDown(self):
+        """
+        Sprząta po testach: usuwa konfigurację zdarzeń i czyści bazę danych.
+        """
+        events.shutdown()
+        for package in events.PACKAGES:
+            logging.getLogger(package).setLevel(logging.NOTSET)
+        self.db_instance.tables.clear()
+
+    def test_structured_events(self):
+        """
+        Testuje zdarzenia DDL i DML z polami strukturalnymi.
+        """
+        with self.assertLogs('database', logging.DEBUG) as captured:
+            self.ddl.create_table('items', {'id': 'INTEGER'})
+            DataModificationLanguage("INSERT INTO items (id) VALUES (1)", self.db_instance).read_instruction()
+        create, insert = captured.records
+        self.assertEqual((create.levelno, create.event, create.fields['table']),
+                         (logging.INFO, 'create_table', 'items'))
+        self.assertEqual((insert.levelno, insert.event), (logging.DEBUG, 'insert'))
+        self.assertIn('[[1]]', insert.getMessage())
+
+    def test_disabled_level_skips_formatting(self):
+        """
+        Testuje, że zdarzenia wyłączonego poziomu nie są formatowane.
+        """
+        class Counted:
+            formatted = 0
+
+            def __repr__(self):
+                Counted.formatted += 1
+                return 'counted'
+
+        logger = logging.getLogger('database.tests')
+        events.configure(logging.INFO, handler=logging.NullHandler())
+        events.log_event(logger, logging.DEBUG, 'debug', "Value %r", Counted())
+        self.assertEqual(Counted.formatted, 0)
+        with self.assertLogs('database', logging.INFO):
+            events.log_event(logger, logging.INFO, 'info', "Value %r", Counted())
+        self.assertEqual(Counted.formatted, 1)
+
+    def test_queued_handler(self):
+        """
+        Testuje zapis zdarzeń w osobnym wątku i format JSON.
+        """
+        records = []
+
+        class Collect(logging.Handler):
+            def emit(self, record):
+                records.append((threading.current_thread(), self.format(record)))
+
+        handler = Collect()
+        handler.setFormatter(events.EventFormatter(as_json=True))
+        events.configure(logging.INFO, handler=handler, queued=True)
+        self.ddl.create_table('items', {'id': 'INTEGER'})
+        events.shutdown()
+        (thread, line), = records
+        self.assertIsNot(thread, threading.current_thread())
+        event = json.loads(line)
+        self.assertEqual((event['event'], event['table'], event['level']), ('create_table', 'items', 'INFO'))
+        self.assertEqual(event['message'], "Table items created successfully with columns: {'id': 'INTEGER'}")
+
+
+class TestBenchmarks(unittest.TestCase):
+    def tearDown(self):
+        """
+        Sprząta po testach: czyści bazę danych.
+        """
+        Database.get_instance().tables.clear()
+
+    def test_suite_results(self):
+        """
+        Testuje wyniki zestawu testów wydajności na małej tabeli i porównanie z wynikami bazowymi.
+        """
+        results = BenchmarkSuite(rows=500, repeat=2, statements=20, batch_size=200).run()
+        benchmarks = results['benchmarks']
+        self.assertEqual(set(benchmarks), {'parse', 'insert_statement', 'insert_bulk', 'select_0.001', 'select_0.01',
+                                           'select_0.1', 'select_1', 'update', 'delete', 'save_state_json',
+                                           'load_state_json', 'save_state_binary', 'load_state_binary'})
+        self.assertEqual((benchmarks['insert_bulk']['operations'], benchmarks['insert_bulk']['rows']), (3, 500))
+        self.assertEqual(benchmarks['select_1']['rows'], 1000)
+        self.assertEqual(benchmarks['delete']['rows'], 10)
+        self.assertLessEqual(benchmarks['parse']['p50_ms'], benchmarks['parse']['p99_ms'])
+        self.assertEqual(Database.get_instance().tables, {})
+
+        slower = json.loads(json.dumps(results))
+        slower['benchmarks']['update']['p50_ms'] *= 2
+        regressions = [entry['name'] for entry in compare(slower, results, 0.5) if entry['regression']]
+        self.assertEqual(regressions, ['update'])
+
+    def test_helpers(self):
+        """
+        Testuje zapis liczby wierszy z przyrostkiem i wyznaczanie percentyli.
+        """
+        self.assertEqual((parse_count('10k'), parse_count('1.5M'), parse_count('300')), (10000, 1500000, 300))
+        values = list(range(1, 101))
+        self.assertEqual((percentile(values, 50), percentile(values, 99), percentile(values, 100)), (50, 99, 100))
+        self.assertIsNone(percentile([], 50))
+
+
+class TestDictionaryEncoding(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie tabeli z kolumnami TEXT o niewielu różnych wartościach.
+        """
+        self.db_instance = Database.get_instance()
+        self.db_instance.tables.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.min_rows = storage.ENCODING_MIN_ROWS
+        DDL(self.db_instance).create_table('orders', {'id': 'INTEGER', 'status': 'TEXT', 'country': 'TEXT(2)'})
+        self.statuses = ['new', 'paid', None, 'sent']
+        DataModificationLanguage.executemany('orders', [(i, self.statuses[i % 4], 'PL' if i % 3 else 'DE')
+                                                        for i in range(40)], db_instance=self.db_instance)
+        self.table = self.db_instance.tables['orders']
+
+    def tearDown(self):
+        """
+        Sprząta po testach: przywraca ustawienia kodowania i czyści bazę danych.
+        """
+        storage.ENCODING_MIN_ROWS = self.min_rows
+        self.db_instance.tables.clear()
+        self.db_instance.snapshot_chain = None
+        self.directory.cleanup()
+
+    def select_ids(self, where):
+        rows = DataQueryLanguage(f"SELECT id FROM orders WHERE {where}", self.db_instance).read_instruction()
+        return [row['id'] for row in rows]
+
+    def test_encoded_column(self):
+        """
+        Testuje, że kolumny TEXT są kodowane słownikowo, a warunki dają te same wyniki co na listach.
+        """
+        status = self.table.data['status']
+        self.assertIsInstance(status, DictionaryColumn)
+        self.assertEqual(status.dictionary, ['new', 'paid', 'sent'])
+        self.assertEqual(status[:4], ['new', 'paid', None, 'sent'])
+        self.assertEqual(status.codes[:4], [0, 1, DictionaryColumn.NULL_CODE, 2])
+
+        expected = {
+            "status = 'paid'": [i for i in range(40) if i % 4 == 1],
+            "status != 'paid' AND id < 8": [0, 2, 3, 4, 6, 7],
+            "status IN ('new', 'sent', 'lost') AND country = 'DE'": [0, 3, 12, 15, 24, 27, 36, 39],
+            "status NOT IN ('new', 'sent') AND id < 8": [1, 2, 5, 6],
+            "status = 'lost'": [],
+            "id IN (0, 1, 3) AND status > 'o'": [1, 3],
+        }
+        for where, ids in expected.items():
+            self.assertEqual(self.select_ids(where), ids, where)
+        statement = prepare("SELECT id FROM orders WHERE status = ? AND id < ?", self.db_instance)
+        self.assertEqual([row['id'] for row in statement.execute(('sent', 10))], [3, 7])
+
+        # Ten sam warunek na kolumnie kodowanej i na liście
+        condition = compile_condition("status IN ('paid', 'sent') OR status = 'new'", self.table.columns)
+        matching = condition.filter(self.table.data, range(8))
+        self.assertEqual(condition.filter({'status': status.to_list()}, range(8)), matching)
+        self.assertEqual(matching, [0, 1, 3, 4, 5, 7])
+
+    def test_in_list_compares_codes(self):
+        """
+        Testuje, że lista IN po zamianie stałych na parametry (PlanCache) porównuje kody, a nie napisy.
+        """
+        dql = DataQueryLanguage("SELECT id FROM orders WHERE status IN ('paid', 'lost', NULL) AND id < 10",
+                                self.db_instance)
+        self.assertEqual([row['id'] for row in dql.read_instruction()], [1, 2, 5, 6, 9])
+        variant = compiled_where(dql.statements[0], self.table)._variants[frozenset({'status'})]
+        self.assertEqual([(name, members) for _, name, members in variant.coded], [('status', True)])
+        self.assertEqual(variant.member_sets[0][1:3], ([None], [0, 1]))
+        self.assertEqual(self.select_ids("status NOT IN ('new', 'sent') AND id < 8"), [1, 2, 5, 6])
+        statement = prepare("SELECT id FROM orders WHERE status IN (?, ?) AND id < ?", self.db_instance)
+        self.assertEqual([row['id'] for row in statement.execute(('sent', 'new', 9))], [0, 3, 4, 7, 8])
+
+    def test_updates_and_compaction(self):
+        """
+        Testuje zmianę i usuwanie wierszy kolumny kodowanej oraz kompakcję.
+        """
+        DataModificationLanguage("UPDATE orders SET status = 'lost' WHERE id < 2", self.db_instance).read_instruction()
+        DataModificationLanguage("DELETE FROM orders WHERE id >= 4", self.db_instance).read_instruction()
+        self.db_instance.compact('orders')
+        self.assertEqual(self.table.data['status'], ['lost', 'lost', None, 'sent'])
+        self.assertEqual(self.table.data['status'].dictionary, ['new', 'paid', 'sent', 'lost'])
+        self.assertEqual(self.select_ids("status = 'lost'"), [0, 1])
+
+    def test_high_cardinality_column_is_decoded(self):
+        """
+        Testuje zamianę kolumny o zbyt wielu różnych wartościach na listę.
+        """
+        storage.ENCODING_MIN_ROWS = 50
+        DataModificationLanguage.executemany('orders', [(i, f'status {i}', 'PL') for i in range(40, 60)],
+                                             db_instance=self.db_instance)
+        self.assertIsInstance(self.table.data['status'], list)
+        self.assertIsInstance(self.table.data['country'], DictionaryColumn)
+        self.assertEqual(self.table.data['status'][:2] + self.table.data['status'][-1:], ['new', 'paid', 'status 59'])
+        self.assertEqual(self.select_ids("status IN ('paid', 'status 41')"), [i for i in range(40) if i % 4 == 1] + [41])
+
+    def test_snapshots_store_dictionary_once(self):
+        """
+        Testuje zapis słownika i kodów w migawce JSON i binarnej.
+        """
+        filename = os.path.join(self.directory.name, 'db_state.json')
+        StateManagement.save_state(filename)
+        with open(filename) as file:
+            status = json.load(file)['orders']['data']['status']
+        self.assertEqual(status['dictionary'], ['new', 'paid', 'sent'])
+        self.assertEqual(status['codes'][:4], [0, 1, -1, 2])
+
+        expected = self.table.data['status'].to_list()
+        for filename in (filename, os.path.join(self.directory.name, 'db_state.bin')):
+            if filename.endswith('.bin'):
+                StateManagement.save_state(filename, format='binary')
+            StateManagement.load_state(filename)
+            loaded = self.db_instance.tables['orders'].data['status']
+            self.assertIsInstance(loaded, DictionaryColumn)
+            self.assertEqual(loaded.to_list(), expected)
+            self.assertIs(loaded.codes[4], loaded.lookup['new'])
+            self.assertEqual(self.select_ids("status = 'sent' AND id < 10"), [3, 7])
+
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        """
+        Przygotowanie tabeli z kolumnami różnych typów.
+        """
+        self.db_instance = Database.get_instance()
+        self.db_instance.tables.clear()
+        DDL(self.db_instance).create_table('people', {'id': 'INTEGER', 'name': 'TEXT(5)', 'born': 'DATE',
+                                                      'active': 'BOOLEAN'})
+        self.table = self.db_instance.tables['people']
+
+    def tearDown(self):
+        """
+        Sprząta po testach: czyści bazę danych.
+        """
+        self.db_instance.tables.clear()
+
+    def execute(self, instruction):
+        DataModificationLanguage(instruction, self.db_instance).read_instruction()
+
+    def test_compiled_converters(self):
+        """
+        Testuje, że INSERT, UPDATE i wstawianie wsadowe konwertują wartości skompilowanymi funkcjami kolumn.
+        """
+        self.assertEqual(self.table.schema['name'].max_length, 5)
+        self.assertEqual(self.table.schema['born'].base_type, 'DATE')
+        self.execute("INSERT INTO people (id, name, born, active) VALUES (1, 'Ala', '2000-01-02', 'true')")
+        DataModificationLanguage.executemany('people', [('2', 'Ola', date(1999, 5, 6), 0), (3, None, None, None)],
+                                             db_instance=self.db_instance)
+        self.execute("UPDATE people SET active = 't' WHERE id = 2")
+        self.assertEqual(self.table.data['id'][:], [1, 2, 3])
+        self.assertEqual(self.table.data['born'][:], [date(2000, 1, 2), date(1999, 5, 6), None])
+        self.assertEqual(self.table.data['active'][:], [True, True, None])
+
+    def test_text_length(self):
+        """
+        Testuje, że za długi tekst jest odrzucany przez INSERT, UPDATE i wstawianie wsadowe bez zmiany danych.
+        """
+        self.execute("INSERT INTO people (id, name) VALUES (1, 'Ala')")
+        with self.assertRaisesRegex(ValueError, 'expected max 5, got 6'):
+            self.execute("INSERT INTO people (id, name) VALUES (2, 'Marian')")
+        with self.assertRaisesRegex(ValueError, 'expected max 5'):
+            DataModificationLanguage.executemany('people', [(2, 'Ewa'), (3, 'Bartosz')], columns=['id', 'name'],
+                                                 db_instance=self.db_instance)
+        with self.assertRaisesRegex(ValueError, 'expected max 5'):
+            self.execute("UPDATE people SET name = 'Aleksandra' WHERE id = 1")
+        self.assertEqual(self.table.data['name'][:], ['Ala'])
+        with self.assertRaises(ValueError):
+            self.db_instance.validate_columns('people', {'name': ['Marian']})
+        with self.assertRaises(TypeError):
+            self.db_instance.validate_data('people', {'id': 'abc'})
+
+    def test_schema_change(self):
+        """
+        Testuje, że dodanie i usunięcie kolumny aktualizuje skompilowany schemat tabeli.
+        """
+        ddl = DDL(self.db_instance)
+        ddl.add_column('people', 'score', 'FLOAT')
+        self.assertIn('score', self.table.schema)
+        self.execute("INSERT INTO people (id, score) VALUES (1, '2.5')")
+        self.assertEqual(self.table.data['score'][:], [2.5])
+        ddl.drop_column('people', 'score')
+        self.assertNotIn('score', self.table.schema)
+        with self.assertRaisesRegex(ValueError, 'does not exist'):
+            self.execute("INSERT INTO people (id, score) VALUES (2, 1.5)")